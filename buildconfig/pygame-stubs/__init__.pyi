@@ -3,6 +3,7 @@ from typing import Any
 import pygame.event as event
 import pygame.joystick as joystick
 from pygame.rect import Rect as Rect
+from pygame.rect import Region as Region
 from pygame.surface import *  # noqa: F403
 
 import pygame.color
@@ -1,4 +1,5 @@
-from typing import Dict, Iterable, List, Sequence, Tuple, TypeVar, Union, overload
+from array import array
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, TypeVar, Union, overload
 
 _K = TypeVar("_K")
 _V = TypeVar("_V")
@@ -59,8 +60,12 @@ class Rect(object):
     @overload
     def collidepoint(self, x_y: Iterable[float]) -> bool: ...
     def colliderect(self, rect: "Rect") -> bool: ...
-    def collidelist(self, rect_list: List["Rect"]) -> int: ...
-    def collidelistall(self, rect_list: List["Rect"]) -> List[int]: ...
+    # rect_list may also be a packed array of x, y, w, h integers, for
+    # example a numpy array of shape (N, 4) or an array.array('i').
+    def collidelist(self, rect_list: Union[List["Rect"], Any]) -> int: ...
+    def collidelistall(self, rect_list: Union[List["Rect"], Any]) -> List[int]: ...
+    @staticmethod
+    def collide_pairs(rects_a: Union[List["Rect"], Any], rects_b: Union[List["Rect"], Any]) -> array: ...
     # Also undocumented: the dict collision methods take a 'values' argument
     # that defaults to False. If it is False, the keys in rect_dict must be
     # Rect-like; otherwise, the values must be Rects.
@@ -72,3 +77,10 @@ class Rect(object):
     def collidedictall(self, rect_dict: Dict[_RectStyle, _V], values: bool = ...) -> List[Tuple[_RectStyle, _V]]: ...
     @overload
     def collidedictall(self, rect_dict: Dict[_K, "Rect"], values: bool) -> List[Tuple[_K, "Rect"]]: ...
+
+class Region:
+    def __init__(self, exact: bool = ..., max_overhead: float = ...) -> None: ...
+    def __len__(self) -> int: ...
+    def add(self, rect: _RectStyle) -> None: ...
+    def rects(self) -> List[Rect]: ...
+    def clear(self) -> None: ...
@@ -1,4 +1,4 @@
-from typing import Any, List, Optional, Sequence, Text, Tuple, Union, overload
+from typing import Any, Iterable, List, Optional, Sequence, Text, Tuple, Union, overload
 from pygame.bufferproxy import BufferProxy
 from pygame.rect import Rect
 
@@ -8,6 +8,7 @@ _RgbaOutput = Tuple[int, int, int, int]
 
 class Surface(object):
     _pixels_address: int
+    _pixels_version: int
     @overload
     def __init__(
         self, width_height: Tuple[float, float], flags: int = ...,
@@ -17,6 +18,8 @@ class Surface(object):
                  surface: Surface = ...) -> None: ...
     def blit(self, source: Surface, dest: Union[Sequence[float], Rect],
              area: Optional[Rect] = ..., special_flags: int = ...) -> Rect: ...
+    def blits(self, blit_sequence: Iterable[Sequence[Any]],
+              doreturn: int = ..., threads: int = ...) -> Optional[List[Rect]]: ...
     @overload
     def convert(self, surface: Surface) -> Surface: ...
     @overload
@@ -32,6 +35,9 @@ class Surface(object):
     def copy(self) -> Surface: ...
     def fill(self, color: _ColorInput, rect: Optional[Rect] = ...,
              special_flags: int = ...) -> Rect: ...
+    def fill_rects(self, color: _ColorInput,
+                   rects: Union[Iterable[Union[Rect, Sequence[int]]], Any],
+                   special_flags: int = ...) -> None: ...
     def scroll(self, dx: int = ..., dy: int = ...) -> None: ...
     @overload
     def set_colorkey(self, color: _ColorInput, flags: int = ...) -> None: ...
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+""" pygame.examples.blend_benchmark
+
+Times blits with the 32 bit blend modes that have SSE2 and AVX2
+versions, for a few surface sizes, on each blitter backend this machine
+supports.
+
+Every backend must give the same pixels as the generic C code, which
+is checked as the times are taken.
+
+No window is opened, so this also runs on a headless machine.
+
+    python -m pygame.examples.blend_benchmark [width height]
+"""
+
+import sys
+from time import time
+
+import pygame
+import pygame.surface
+from pygame.locals import (SRCALPHA, BLEND_RGBA_MULT, BLEND_ADD,
+                           BLEND_PREMULTIPLIED)
+
+REPEATS = 5
+BLITS = 10
+SIZES = ((64, 64), (256, 256), (1000, 1000))
+BACKENDS = ('GENERIC', 'SSE2', 'AVX2')
+FLAGS = (('BLEND_RGBA_MULT', BLEND_RGBA_MULT),
+         ('BLEND_ADD', BLEND_ADD),
+         ('BLEND_PREMULTIPLIED', BLEND_PREMULTIPLIED))
+
+
+def make_surface(size, seed):
+    surf = pygame.Surface(size, SRCALPHA, 32)
+    w, h = size
+    for y in range(0, h, 8):
+        for x in range(0, w, 8):
+            value = (x * 7 + y * 13 + seed) % 256
+            surf.fill((value, 255 - value, (value * 3) % 256, value),
+                      (x, y, 8, 8))
+    return surf
+
+
+def best_of(func):
+    best = None
+    for i in range(REPEATS):
+        start = time()
+        func()
+        duration = time() - start
+        if best is None or duration < best:
+            best = duration
+    return best * 1000
+
+
+def bench_size(size):
+    src = make_surface(size, 0)
+    background = make_surface(size, 100)
+
+    backends = []
+    original = pygame.surface._get_blit_backend()
+    for backend in BACKENDS:
+        try:
+            pygame.surface._set_blit_backend(backend)
+        except ValueError:
+            continue
+        backends.append(backend)
+
+    print("\n%d blits of %d x %d, best of %d, in ms\n"
+          % (BLITS, size[0], size[1], REPEATS))
+    print("%-20s" % "flags" + "".join("%10s" % b for b in backends))
+    try:
+        for name, flags in FLAGS:
+            def blit():
+                dst = background.copy()
+                for i in range(BLITS):
+                    dst.blit(src, (0, 0), None, flags)
+
+            line = "%-20s" % name
+            expected = None
+            for backend in backends:
+                pygame.surface._set_blit_backend(backend)
+                duration = best_of(blit)
+                dst = background.copy()
+                dst.blit(src, (0, 0), None, flags)
+                pixels = pygame.image.tostring(dst, 'RGBA')
+                if expected is None:
+                    expected = pixels
+                line += "%10.2f" % duration
+                if pixels != expected:
+                    line += "  (differs!)"
+            print(line)
+    finally:
+        pygame.surface._set_blit_backend(original)
+
+
+def main(sizes=SIZES):
+    for size in sizes:
+        bench_size(size)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        main([(int(sys.argv[1]), int(sys.argv[2]))])
+    else:
+        main()
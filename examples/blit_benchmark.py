@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+""" pygame.examples.blit_benchmark
+
+Times Surface.blits() drawing a scene of overlapping images with
+different numbers of threads.
+
+Each thread draws a horizontal band of the destination, with the GIL
+released, so more threads only help on a machine with more CPU cores.
+The scene drawn is checked to be the same as the one drawn serially.
+
+No window is opened, so this also runs on a headless machine.
+
+    python -m pygame.examples.blit_benchmark [width height [images]]
+"""
+
+import sys
+from random import Random
+from time import time
+
+import pygame
+from pygame.locals import SRCALPHA
+
+REPEATS = 5
+
+
+def make_scene(size, count, rng):
+    images = []
+    for i in range(8):
+        image = pygame.Surface((rng.randrange(32, 256), rng.randrange(32, 256)),
+                               SRCALPHA, 32)
+        image.fill((rng.randrange(256), rng.randrange(256),
+                    rng.randrange(256), rng.randrange(64, 256)))
+        images.append(image)
+    opaque = pygame.Surface((128, 128))
+    opaque.fill((0, 0, 255))
+    images.append(opaque)
+
+    return [(rng.choice(images),
+             (rng.randrange(-64, size[0]), rng.randrange(-64, size[1])))
+            for i in range(count)]
+
+
+def best_of(func):
+    best = None
+    for i in range(REPEATS):
+        start = time()
+        func()
+        duration = time() - start
+        if best is None or duration < best:
+            best = duration
+    return best * 1000
+
+
+def main(size=(3840, 2160), count=2000):
+    rng = Random(42)
+    scene = make_scene(size, count, rng)
+    screen = pygame.Surface(size, 0, 32)
+
+    screen.fill((0, 0, 0))
+    screen.blits(scene, doreturn=0)
+    expected = pygame.image.tostring(screen, 'RGB')
+
+    print("%d images onto %d x %d, best of %d, in ms\n"
+          % (count, size[0], size[1], REPEATS))
+    print("%-8s %10s" % ("threads", "blits"))
+    for threads in (1, 2, 4, 8, 0):
+        def draw():
+            screen.blits(scene, doreturn=0, threads=threads)
+
+        duration = best_of(draw)
+        screen.fill((0, 0, 0))
+        draw()
+        same = pygame.image.tostring(screen, 'RGB') == expected
+        print("%-8s %10.2f%s" % (threads or "cores", duration,
+                                 "" if same else "  (differs!)"))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 3:
+        main((int(sys.argv[1]), int(sys.argv[2])), int(sys.argv[3]))
+    elif len(sys.argv) > 2:
+        main((int(sys.argv[1]), int(sys.argv[2])))
+    else:
+        main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+""" pygame.examples.collide_benchmark
+
+Times pygame.sprite.groupcollide with and without a spatial index.
+
+A hundred moving "bullets" are tested against groups of 1000, 10000
+and 100000 sprites, once with a plain linear scan and once with the
+group indexed through Group.set_spatial_index().
+
+Games often call spritecollide() for each bullet instead, so a frame of
+that is timed too, with the enemies standing still and with every enemy
+moved by Group.update() first.
+
+Then LayeredUpdates.get_sprites_at() is timed for a hundred points over
+a map of N tiles, as an editor picking tiles under the mouse would.
+
+No window is opened, so this also runs on a headless machine.
+
+    python -m pygame.examples.collide_benchmark [-quick]
+
+-quick skips the 100000 sprite group, whose linear scan takes a while.
+"""
+
+import sys
+from random import Random
+from time import time
+
+import pygame
+from pygame.sprite import (Sprite, Group, LayeredUpdates, groupcollide,
+                           spritecollide)
+
+WORLD_SIZE = 4000
+NUM_BULLETS = 100
+REPEATS = 5
+
+
+class Walker(Sprite):
+    """a sprite which steps back and forth on each update()"""
+
+    def __init__(self, *groups):
+        Sprite.__init__(self, *groups)
+        self.step = 1
+
+    def update(self):
+        self.rect.x += self.step
+        self.step = -self.step
+
+
+def make_group(count, size, rng, sprite_class=Sprite):
+    group = Group()
+    for i in range(count):
+        s = sprite_class(group)
+        s.rect = pygame.Rect(rng.randrange(WORLD_SIZE),
+                             rng.randrange(WORLD_SIZE),
+                             size, size)
+    return group
+
+
+def time_groupcollide(bullets, enemies):
+    best = None
+    hits = 0
+    for i in range(REPEATS):
+        start = time()
+        crashed = groupcollide(bullets, enemies, False, False)
+        duration = time() - start
+        if best is None or duration < best:
+            best = duration
+        hits = sum(len(v) for v in crashed.values())
+    return best, hits
+
+
+def time_frames(bullets, enemies, moving):
+    best = None
+    hits = 0
+    for i in range(REPEATS):
+        start = time()
+        if moving:
+            enemies.update()
+        hits = sum(len(spritecollide(b, enemies, False)) for b in bullets)
+        duration = time() - start
+        if best is None or duration < best:
+            best = duration
+    return best, hits
+
+
+def spritecollide_frames(sizes):
+    rng = Random(42)
+    bullets = make_group(NUM_BULLETS, 8, rng).sprites()
+
+    print("\nspritecollide for each of %d bullets per frame, best of %d\n"
+          % (len(bullets), REPEATS))
+    print("%8s %8s %14s %14s %8s" % ("N", "enemies", "linear (ms)",
+                                     "indexed (ms)", "hits"))
+    for count in sizes:
+        enemies = make_group(count, 24, rng, Walker)
+        for moving in (False, True):
+            enemies.set_spatial_index(None)
+            linear, linear_hits = time_frames(bullets, enemies, moving)
+            # an even number of steps puts the walkers back
+            if moving and REPEATS % 2:
+                enemies.update()
+
+            enemies.set_spatial_index(32)
+            spritecollide(bullets[0], enemies, False)
+            indexed, indexed_hits = time_frames(bullets, enemies, moving)
+
+            assert linear_hits == indexed_hits
+            print("%8d %8s %14.3f %14.3f %8d"
+                  % (count, moving and "moving" or "still", linear * 1000,
+                     indexed * 1000, indexed_hits))
+
+
+def time_get_sprites_at(tiles, points):
+    best = None
+    hits = 0
+    for i in range(REPEATS):
+        start = time()
+        hits = sum(len(tiles.get_sprites_at(pos)) for pos in points)
+        duration = time() - start
+        if best is None or duration < best:
+            best = duration
+    return best, hits
+
+
+def pick_tiles(sizes):
+    rng = Random(42)
+    points = [(rng.randrange(WORLD_SIZE), rng.randrange(WORLD_SIZE))
+              for i in range(NUM_BULLETS)]
+
+    print("\nget_sprites_at for %d points over N tiles, best of %d\n"
+          % (len(points), REPEATS))
+    print("%8s %14s %14s %8s" % ("N", "linear (ms)", "indexed (ms)", "hits"))
+    for count in sizes:
+        tiles = LayeredUpdates()
+        # two layers of tiles, so sprites overlap
+        side = int((count // 2) ** 0.5) or 1
+        tile_size = WORLD_SIZE // side + 1
+        for i in range(count):
+            s = Sprite()
+            col, row = divmod(i // 2, side)
+            s.rect = pygame.Rect(col * tile_size, row * tile_size,
+                                 tile_size, tile_size)
+            tiles.add(s, layer=i % 2)
+
+        tiles.set_spatial_index(None)
+        linear, linear_hits = time_get_sprites_at(tiles, points)
+
+        tiles.set_spatial_index(64)
+        tiles.get_sprites_at(points[0])
+        indexed, indexed_hits = time_get_sprites_at(tiles, points)
+
+        assert linear_hits == indexed_hits
+        print("%8d %14.3f %14.3f %8d" % (count, linear * 1000,
+                                         indexed * 1000, indexed_hits))
+
+
+def main(sizes):
+    rng = Random(42)
+    bullets = make_group(NUM_BULLETS, 8, rng)
+
+    print("groupcollide of %d bullets against N enemies, best of %d\n"
+          % (NUM_BULLETS, REPEATS))
+    print("%8s %14s %14s %8s" % ("N", "linear (ms)", "indexed (ms)", "hits"))
+    for count in sizes:
+        enemies = make_group(count, 24, rng)
+
+        enemies.set_spatial_index(None)
+        linear, linear_hits = time_groupcollide(bullets, enemies)
+
+        enemies.set_spatial_index(32)
+        # building the index is part of the cost of the first call
+        start = time()
+        groupcollide(bullets, enemies, False, False)
+        build = time() - start
+        indexed, indexed_hits = time_groupcollide(bullets, enemies)
+
+        assert linear_hits == indexed_hits
+        print("%8d %14.3f %14.3f %8d" % (count, linear * 1000,
+                                         indexed * 1000, indexed_hits))
+        print("%8s %14s %14.3f   (first call, builds the index)"
+              % ("", "", build * 1000))
+
+    spritecollide_frames(sizes)
+    pick_tiles(sizes)
+
+
+if __name__ == '__main__':
+    if '-quick' in sys.argv:
+        main([1000, 10000])
+    else:
+        main([1000, 10000, 100000])
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+""" pygame.examples.fill_benchmark
+
+Times clearing a list of dirty rects with a Surface.fill call for each
+rect against one Surface.fill_rects call, with and without a blend mode,
+on each blitter backend this machine supports.
+
+Both ways must give the same pixels, which is checked as the times are
+taken.
+
+No window is opened, so this also runs on a headless machine.
+
+    python -m pygame.examples.fill_benchmark [rects]
+"""
+
+import random
+import sys
+from time import time
+
+import pygame
+import pygame.surface
+from pygame.locals import SRCALPHA, BLEND_ADD, BLEND_RGBA_MULT
+
+REPEATS = 5
+SIZE = (800, 600)
+RECTS = 500
+BACKENDS = ('GENERIC', 'SSE2', 'AVX2')
+FLAGS = (('fill', 0),
+         ('BLEND_ADD', BLEND_ADD),
+         ('BLEND_RGBA_MULT', BLEND_RGBA_MULT))
+COLOR = (40, 80, 120, 200)
+
+
+def make_rects(count):
+    random.seed(0)
+    w, h = SIZE
+    return [pygame.Rect(random.randint(0, w - 32), random.randint(0, h - 32),
+                        random.randint(8, 32), random.randint(8, 32))
+            for i in range(count)]
+
+
+def best_of(func):
+    best = None
+    for i in range(REPEATS):
+        start = time()
+        func()
+        duration = time() - start
+        if best is None or duration < best:
+            best = duration
+    return best * 1000
+
+
+def main(count=RECTS):
+    surf = pygame.Surface(SIZE, SRCALPHA, 32)
+    surf.fill((100, 100, 100, 255))
+    rects = make_rects(count)
+
+    backends = []
+    original = pygame.surface._get_blit_backend()
+    for backend in BACKENDS:
+        try:
+            pygame.surface._set_blit_backend(backend)
+        except ValueError:
+            continue
+        backends.append(backend)
+
+    print("\n%d rects on %d x %d, best of %d, in ms\n"
+          % (count, SIZE[0], SIZE[1], REPEATS))
+    print("%-20s%-8s%10s%12s" % ("flags", "", "fill", "fill_rects"))
+    try:
+        for name, flags in FLAGS:
+            def fill_each():
+                for rect in rects:
+                    surf.fill(COLOR, rect, flags)
+
+            def fill_all():
+                surf.fill_rects(COLOR, rects, flags)
+
+            for backend in backends:
+                pygame.surface._set_blit_backend(backend)
+                line = "%-20s%-8s%10.2f%12.2f" % (name, backend,
+                                                  best_of(fill_each),
+                                                  best_of(fill_all))
+                first = surf.copy()
+                second = surf.copy()
+                for rect in rects:
+                    first.fill(COLOR, rect, flags)
+                second.fill_rects(COLOR, rects, flags)
+                if (pygame.image.tostring(first, 'RGBA') !=
+                        pygame.image.tostring(second, 'RGBA')):
+                    line += "  (differs!)"
+                print(line)
+    finally:
+        pygame.surface._set_blit_backend(original)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+""" pygame.examples.import_benchmark
+
+Times "import pygame" in fresh python processes, importing every module
+up front as usual and with PYGAME_LAZY_IMPORT set, which leaves modules
+like pygame.surfarray and pygame.sprite until they are first used.
+
+Each process also uses pygame.display, to show what the first use of a
+lazy module costs.
+
+    python -m pygame.examples.import_benchmark [processes]
+"""
+
+import os
+import subprocess
+import sys
+
+PROCESSES = 20
+CODE = """
+from time import time
+start = time()
+import pygame
+imported = time()
+pygame.display
+used = time()
+print("%f %f" % (imported - start, used - imported))
+"""
+
+
+def run(count, lazy):
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    env.pop('PYGAME_LAZY_IMPORT', None)
+    if lazy:
+        env['PYGAME_LAZY_IMPORT'] = '1'
+    imports = []
+    uses = []
+    for i in range(count):
+        output = subprocess.check_output([sys.executable, '-c', CODE],
+                                         env=env)
+        imported, used = output.split()[-2:]
+        imports.append(float(imported) * 1000)
+        uses.append(float(used) * 1000)
+    imports.sort()
+    return imports[0], imports[len(imports) // 2], sum(uses) / len(uses)
+
+
+def main(count=PROCESSES):
+    print("\n%d processes, in ms\n" % count)
+    print("%-10s%10s%10s%16s" % ("mode", "best", "median", "first display"))
+    for name, lazy in (("eager", False), ("lazy", True)):
+        print("%-10s%10.1f%10.1f%16.2f" % ((name,) + run(count, lazy)))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+""" pygame.examples.smoothscale_benchmark
+
+Times pygame.transform.smoothscale, shrinking a 4K frame to 1080p and
+growing a small image, on each smoothscale backend this machine supports
+and with a few thread counts.
+
+Every backend and thread count must give the same pixels as the generic
+C code with one thread, which is checked as the times are taken.
+
+No window is opened, so this also runs on a headless machine.
+
+    python -m pygame.examples.smoothscale_benchmark [threads ...]
+"""
+
+import sys
+from time import time
+
+import pygame
+import pygame.transform
+
+REPEATS = 5
+JOBS = (((3840, 2160), (1920, 1080)),
+        ((320, 240), (1280, 960)))
+BACKENDS = ('GENERIC', 'MMX', 'SSE', 'AVX2')
+THREADS = (1, 2, 4, 0)
+
+
+def make_surface(size):
+    surf = pygame.Surface(size, 0, 32)
+    w, h = size
+    for y in range(0, h, 16):
+        for x in range(0, w, 16):
+            value = (x * 7 + y * 13) % 256
+            surf.fill((value, 255 - value, (value * 3) % 256), (x, y, 16, 16))
+    return surf
+
+
+def best_of(func):
+    best = None
+    for i in range(REPEATS):
+        start = time()
+        func()
+        duration = time() - start
+        if best is None or duration < best:
+            best = duration
+    return best * 1000
+
+
+def main(threads=THREADS):
+    backends = []
+    original = pygame.transform.get_smoothscale_backend()
+    for backend in BACKENDS:
+        try:
+            pygame.transform.set_smoothscale_backend(backend)
+        except ValueError:
+            continue
+        backends.append(backend)
+
+    try:
+        for src_size, dst_size in JOBS:
+            src = make_surface(src_size)
+            dst = pygame.Surface(dst_size, 0, 32)
+
+            print("\n%d x %d to %d x %d, best of %d, in ms\n"
+                  % (src_size + dst_size + (REPEATS,)))
+            print("%-10s" % "backend" +
+                  "".join("%10s" % ("threads=%d" % t) for t in threads))
+            expected = None
+            for backend in backends:
+                pygame.transform.set_smoothscale_backend(backend)
+                line = "%-10s" % backend
+                for count in threads:
+                    def scale():
+                        pygame.transform.smoothscale(src, dst_size, dst,
+                                                     threads=count)
+
+                    line += "%10.2f" % best_of(scale)
+                    pixels = pygame.image.tostring(dst, 'RGB')
+                    if expected is None:
+                        expected = pixels
+                    elif pixels != expected:
+                        line += " (differs!)"
+                print(line)
+    finally:
+        pygame.transform.set_smoothscale_backend(original)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main([int(arg) for arg in sys.argv[1:]])
+    else:
+        main()
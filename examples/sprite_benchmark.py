@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+""" pygame.examples.sprite_benchmark
+
+Times the pure Python pygame.sprite module against the Cython
+pygame._sprite module.
+
+Sprites are added to a group, updated, drawn and removed again, and the
+best time of a few runs is printed for each step and each module.
+
+Then a frame of moving particles is timed with a Group calling
+Sprite.update() on each of them, and with a ParticleGroup.
+
+No window is opened, so this also runs on a headless machine.
+
+    python -m pygame.examples.sprite_benchmark [number of sprites]
+
+Setting the PYGAME_CYTHON_SPRITE environment variable makes
+"import pygame.sprite" give the Cython module to every program.
+"""
+
+import sys
+from random import Random
+from time import time
+
+import pygame
+import pygame.sprite
+
+try:
+    import pygame._sprite
+except ImportError:
+    cython_sprite = None
+else:
+    cython_sprite = pygame._sprite
+
+REPEATS = 5
+SCREEN_SIZE = (640, 480)
+
+
+def make_sprites(module, count, image, rng):
+    sprites = []
+    for i in range(count):
+        s = module.DirtySprite()
+        s.image = image
+        s.rect = image.get_rect(topleft=(rng.randrange(SCREEN_SIZE[0]),
+                                         rng.randrange(SCREEN_SIZE[1])))
+        s.dirty = 2
+        sprites.append(s)
+    return sprites
+
+
+def best_of(func):
+    best = None
+    for i in range(REPEATS):
+        start = time()
+        func()
+        duration = time() - start
+        if best is None or duration < best:
+            best = duration
+    return best * 1000
+
+
+def run(module, group_name, count):
+    rng = Random(42)
+    screen = pygame.Surface(SCREEN_SIZE)
+    background = pygame.Surface(SCREEN_SIZE)
+    image = pygame.Surface((16, 16))
+    image.fill((255, 0, 0))
+    sprites = make_sprites(module, count, image, rng)
+    group_class = getattr(module, group_name)
+
+    group = group_class()
+    times = {}
+
+    def add():
+        group.empty()
+        group.add(*sprites)
+
+    def remove():
+        group.add(*sprites)
+        group.remove(*sprites)
+
+    def update():
+        group.update()
+
+    def draw():
+        group.clear(screen, background)
+        group.draw(screen)
+
+    times['add'] = best_of(add)
+    times['remove'] = best_of(remove)
+    group.add(*sprites)
+    times['update'] = best_of(update)
+    times['draw'] = best_of(draw)
+    return times
+
+
+class MovingSprite(pygame.sprite.Sprite):
+    def update(self):
+        self.rect.move_ip(self.velocity)
+
+
+def run_particles(count):
+    rng = Random(42)
+    screen = pygame.Surface(SCREEN_SIZE)
+    image = pygame.Surface((2, 2))
+    sprites = []
+    for i in range(count):
+        s = MovingSprite()
+        s.image = image
+        s.rect = image.get_rect(topleft=(rng.randrange(SCREEN_SIZE[0]),
+                                         rng.randrange(SCREEN_SIZE[1])))
+        s.velocity = (rng.choice((-1, 1)), 1)
+        sprites.append(s)
+
+    groups = [('Group', pygame.sprite.Group(sprites)),
+              ('ParticleGroup', pygame.sprite.ParticleGroup(sprites))]
+    try:
+        import numpy
+    except ImportError:
+        groups[-1] = ('ParticleGroup (array)', groups[-1][1])
+    else:
+        groups.append(('ParticleGroup (array)',
+                       pygame.sprite.ParticleGroup(sprites, use_numpy=False)))
+
+    print("\n%d particles, best of %d, in ms\n" % (count, REPEATS))
+    print("%-22s %8s %8s" % ("group", "update", "draw"))
+    for name, group in groups:
+        update = best_of(group.update)
+        draw = best_of(lambda: group.draw(screen))
+        print("%-22s %8.2f %8.2f" % (name, update, draw))
+
+
+def main(count=5000):
+    modules = [('sprite', pygame.sprite)]
+    if cython_sprite is None:
+        print("pygame._sprite is not built, timing pygame.sprite only")
+    else:
+        modules.append(('_sprite', cython_sprite))
+
+    print("%d sprites, best of %d, in ms\n" % (count, REPEATS))
+    print("%-14s %-8s %8s %8s %8s %8s"
+          % ("group", "module", "add", "remove", "update", "draw"))
+    for group_name in ('Group', 'RenderUpdates', 'LayeredUpdates',
+                       'LayeredDirty'):
+        for name, module in modules:
+            times = run(module, group_name, count)
+            print("%-14s %-8s %8.2f %8.2f %8.2f %8.2f"
+                  % (group_name, name, times['add'], times['remove'],
+                     times['update'], times['draw']))
+
+    run_particles(count * 10)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -81,6 +81,12 @@ if "-alpha" in sys.argv:
 else:
     use_alpha = False
 
+# stop after this many frames, for timing runs. 0 runs until a key is hit.
+max_frames = 0
+if "-frames" in sys.argv:
+    i = sys.argv.index("-frames")
+    max_frames = int(sys.argv[i+1])
+
 print (screen_dims)
 
 
@@ -141,6 +147,7 @@ def main(update_rects = True,
         screen_dims = [640, 480],
         use_alpha = False,
         flags = 0,
+        max_frames = 0,
         ):
     """Show lots of sprites moving around
 
@@ -151,6 +158,8 @@ def main(update_rects = True,
     screen_dims - Pygame window dimensions (default [640, 480])
     use_alpha - use alpha blending (default False)
     flags - additional display mode flags (default no addiontal flags)
+    max_frames - stop after this many frames, 0 to run until a key is hit
+                 (default 0)
 
     """
 
@@ -254,6 +263,8 @@ def main(update_rects = True,
 
 
         frames += 1
+        if frames == max_frames:
+            done = True
     end = time()
     print ("FPS: %f" % (frames / ((end - start))))
     pygame.quit()
@@ -266,4 +277,5 @@ if __name__ == "__main__":
           use_FastRenderGroup,
           screen_dims,
           use_alpha,
-          flags )
+          flags,
+          max_frames )
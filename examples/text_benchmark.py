@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+""" pygame.examples.text_benchmark
+
+Times drawing many short labels with pygame.freetype: a Font.render_to
+call for each label, one Font.render_to_many call, and a TextAtlas,
+which renders each different label once and then copies it.
+
+Labels which repeat, like the names over a crowd of sprites, show what
+reusing the text layout and the rendered strings saves.
+
+No window is opened, so this also runs on a headless machine.
+
+    python -m pygame.examples.text_benchmark [labels]
+"""
+
+import os
+import sys
+from time import time
+
+import pygame
+import pygame.freetype
+
+REPEATS = 5
+LABELS = 500
+SIZE = (1280, 720)
+
+
+def best_of(func):
+    best = None
+    for i in range(REPEATS):
+        start = time()
+        func()
+        duration = time() - start
+        if best is None or duration < best:
+            best = duration
+    return best * 1000
+
+
+def make_items(count, different):
+    w, h = SIZE
+    return [((i * 37 % (w - 100), i * 13 % (h - 30)),
+             "label %d" % (i % different), (255, i % 256, 0))
+            for i in range(count)]
+
+
+def main(count=LABELS):
+    pygame.freetype.init()
+    path = os.path.join(os.path.split(os.path.abspath(__file__))[0],
+                        'data', 'sans.ttf')
+    font = pygame.freetype.Font(path, 18)
+    surf = pygame.Surface(SIZE, 0, 32)
+    atlas = pygame.freetype.TextAtlas(font)
+
+    print("\n%d labels, best of %d, in ms\n" % (count, REPEATS))
+    print("%-16s%12s%16s%12s" % ("labels", "render_to", "render_to_many",
+                                 "TextAtlas"))
+    try:
+        for different in (count, 40, 1):
+            items = make_items(count, different)
+
+            def one_by_one():
+                for item in items:
+                    font.render_to(surf, *item)
+
+            line = "%-16s" % ("%d different" % different)
+            line += "%12.2f" % best_of(one_by_one)
+            line += "%16.2f" % best_of(lambda: font.render_to_many(surf,
+                                                                   items))
+            line += "%12.2f" % best_of(lambda: atlas.render_to_many(surf,
+                                                                    items))
+            print(line)
+    finally:
+        pygame.freetype.quit()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+""" pygame.examples.threads_benchmark
+
+Times pygame.threads.map_tiles running transform, draw and pixelcopy
+functions over the tiles of a large surface, with a few worker counts.
+
+The C functions release the GIL while they work on pixels, so they run
+at the same time on machines with more than one cpu. The get_at job
+holds the GIL for every pixel, so it shows what happens when a function
+does not release it: the time stays the same, or gets worse.
+
+No window is opened, so this also runs on a headless machine.
+
+    python -m pygame.examples.threads_benchmark [workers ...]
+"""
+
+import sys
+from time import time
+
+import pygame
+import pygame.draw
+import pygame.pixelcopy
+import pygame.transform
+from pygame import threads
+
+REPEATS = 3
+SIZE = (1920, 1080)
+TILE = (240, 270)
+WORKERS = (0, 1, 2, 4, 8)
+
+
+def make_surface(size):
+    surf = pygame.Surface(size, 0, 32)
+    w, h = size
+    for y in range(0, h, 16):
+        for x in range(0, w, 16):
+            value = (x * 7 + y * 13) % 256
+            surf.fill((value, 255 - value, (value * 3) % 256), (x, y, 16, 16))
+    return surf
+
+
+def draw_circles(tile):
+    w, h = tile.get_size()
+    for radius in range(min(w, h) // 2, 0, -4):
+        pygame.draw.circle(tile, (radius % 256, 0, 255), (w // 2, h // 2),
+                           radius)
+
+
+def get_at(tile):
+    w, h = tile.get_size()
+    for y in range(0, h, 2):
+        for x in range(w):
+            tile.get_at((x, y))
+
+
+def make_jobs():
+    jobs = [("gaussian_blur", lambda tile: pygame.transform.gaussian_blur(
+                tile, 4)),
+            ("laplacian", pygame.transform.laplacian),
+            ("rotozoom", lambda tile: pygame.transform.rotozoom(tile, 0, 1.0)),
+            ("smoothscale", lambda tile: pygame.transform.smoothscale(
+                tile, tile.get_size())),
+            ("draw.circle", draw_circles)]
+    try:
+        import numpy
+    except ImportError:
+        pass
+    else:
+        def surface_to_array(tile):
+            array = numpy.empty(tile.get_size(), numpy.uint32)
+            pygame.pixelcopy.surface_to_array(array, tile)
+            pygame.pixelcopy.array_to_surface(tile, array)
+
+        jobs.append(("pixelcopy", surface_to_array))
+    jobs.append(("get_at (GIL)", get_at))
+    return jobs
+
+
+def best_of(func):
+    best = None
+    for i in range(REPEATS):
+        start = time()
+        func()
+        duration = time() - start
+        if best is None or duration < best:
+            best = duration
+    return best * 1000
+
+
+def main(workers=WORKERS):
+    surf = make_surface(SIZE)
+    queues = dict((count, threads.WorkerQueue(count)) for count in workers)
+
+    print("\n%d x %d in %d x %d tiles, best of %d, in ms\n"
+          % (SIZE + TILE + (REPEATS,)))
+    print("%-16s" % "function" +
+          "".join("%12s" % ("workers=%d" % count) for count in workers) +
+          "%10s" % "speedup")
+    try:
+        for name, func in make_jobs():
+            line = "%-16s" % name
+            times = []
+            for count in workers:
+                def run():
+                    threads.map_tiles(func, surf, TILE,
+                                      worker_queue=queues[count])
+
+                times.append(best_of(run))
+                line += "%12.2f" % times[-1]
+            print(line + "%9.2fx" % (times[0] / min(times)))
+    finally:
+        for queue in queues.values():
+            queue.stop()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main([int(arg) for arg in sys.argv[1:]])
+    else:
+        main()
@@ -89,6 +89,8 @@ _ftfont_render(pgFontObject *, PyObject *, PyObject *);
 static PyObject *
 _ftfont_render_to(pgFontObject *, PyObject *, PyObject *);
 static PyObject *
+_ftfont_render_to_many(pgFontObject *, PyObject *, PyObject *);
+static PyObject *
 _ftfont_render_raw(pgFontObject *, PyObject *, PyObject *);
 static PyObject *
 _ftfont_render_raw_to(pgFontObject *, PyObject *, PyObject *);
@@ -562,6 +564,8 @@ static PyMethodDef _ftfont_methods[] = {
      DOC_FONTRENDER},
     {"render_to", (PyCFunction)_ftfont_render_to, METH_VARARGS | METH_KEYWORDS,
      DOC_FONTRENDERTO},
+    {"render_to_many", (PyCFunction)_ftfont_render_to_many,
+     METH_VARARGS | METH_KEYWORDS, DOC_FONTRENDERTOMANY},
     {"render_raw", (PyCFunction)_ftfont_render_raw,
      METH_VARARGS | METH_KEYWORDS, DOC_FONTRENDERRAW},
     {"render_raw_to", (PyCFunction)_ftfont_render_raw_to,
@@ -1944,6 +1948,8 @@ _ftfont_render_to(pgFontObject *self, PyObject *args, PyObject *kwds)
         PyErr_SetString(pgExc_SDLError, "display Surface quit");
         goto error;
     }
+    /* the pixels are written behind the surface object's back */
+    pgSurface_Touch(surface_obj);
     if (_PGFT_Render_ExistingSurface(self->freetype, self, &render, text,
                                      surface, xpos, ypos, &fg_color,
                                      bg_color_obj ? &bg_color : 0, &r))
@@ -1958,6 +1964,163 @@ error:
 #endif  // HAVE_PYGAME_SDL_VIDEO
 }
 
+static PyObject *
+_ftfont_render_to_many(pgFontObject *self, PyObject *args, PyObject *kwds)
+{
+#ifndef HAVE_PYGAME_SDL_VIDEO
+
+    PyErr_SetString(PyExc_RuntimeError,
+                    "SDL support is missing. Cannot render on surfaces");
+    return 0;
+
+#else
+    /* keyword list */
+    static char *kwlist[] = {"surf", "items", "style", "rotation", "size", 0};
+
+    /* input arguments */
+    PyObject *surface_obj = 0;
+    PyObject *items = 0;
+    PyObject *seq = 0;
+    PyObject *item;
+    PyObject *dest;
+    PyObject *textobj;
+    PyObject *last_textobj = 0;
+    PyObject *fg_color_obj;
+    PyObject *bg_color_obj;
+    PGFT_String *text = 0;
+    Scale_t face_size = FACE_SIZE_NONE;
+    Angle_t rotation = self->rotation;
+    int style = FT_STYLE_DEFAULT;
+    SDL_Surface *surface = 0;
+    Py_ssize_t i, count;
+    int xpos, ypos;
+    int same_text;
+
+    /* output arguments */
+    PyObject *rects = 0;
+    PyObject *rect_obj;
+    SDL_Rect r;
+
+    FontColor fg_color;
+    FontColor bg_color;
+    FontRenderMode render;
+
+    if (!PyArg_ParseTupleAndKeywords(
+            args, kwds, "O!O|iO&O&", kwlist,
+            /* required */
+            &pgSurface_Type, &surface_obj, &items,
+            /* optional */
+            &style, obj_to_rotation, (void *)&rotation, obj_to_scale,
+            (void *)&face_size))
+        return 0;
+
+    ASSERT_SELF_IS_ALIVE(self);
+
+    seq = PySequence_Fast(items, "items must be a sequence of "
+                                 "(dest, text, fgcolor) tuples");
+    if (!seq)
+        return 0;
+    count = PySequence_Fast_GET_SIZE(seq);
+    rects = PyList_New(count);
+    if (!rects)
+        goto error;
+
+    /* The render mode is built once for all the items */
+    if (_PGFT_BuildRenderMode(self->freetype, self, &render, face_size, style,
+                              rotation))
+        goto error;
+
+    surface = pgSurface_AsSurface(surface_obj);
+    if (!surface) {
+        PyErr_SetString(pgExc_SDLError, "display Surface quit");
+        goto error;
+    }
+    /* the pixels are written behind the surface object's back */
+    pgSurface_Touch(surface_obj);
+
+    for (i = 0; i < count; ++i) {
+        item = PySequence_Fast_GET_ITEM(seq, i);
+        fg_color_obj = 0;
+        bg_color_obj = 0;
+        if (!PyTuple_Check(item)) {
+            PyErr_SetString(PyExc_TypeError,
+                            "items must be a sequence of "
+                            "(dest, text, fgcolor) tuples");
+            goto error;
+        }
+        if (!PyArg_ParseTuple(item, "OO|OO:render_to_many", &dest, &textobj,
+                              &fg_color_obj, &bg_color_obj))
+            goto error;
+
+        if (fg_color_obj == Py_None) {
+            fg_color_obj = 0;
+        }
+        if (bg_color_obj == Py_None) {
+            bg_color_obj = 0;
+        }
+
+        if (parse_dest(dest, &xpos, &ypos))
+            goto error;
+        if (fg_color_obj) {
+            if (!pg_RGBAFromColorObj(fg_color_obj, (Uint8 *)&fg_color)) {
+                PyErr_SetString(PyExc_TypeError, "fgcolor must be a Color");
+                goto error;
+            }
+        }
+        else {
+            fg_color.r = self->fgcolor[0];
+            fg_color.g = self->fgcolor[1];
+            fg_color.b = self->fgcolor[2];
+            fg_color.a = self->fgcolor[3];
+        }
+        if (bg_color_obj) {
+            if (!pg_RGBAFromColorObj(bg_color_obj, (Uint8 *)&bg_color)) {
+                PyErr_SetString(PyExc_TypeError, "bgcolor must be a Color");
+                goto error;
+            }
+        }
+
+        /* The same text as the item before reuses its layout, as a None
+         * text does for render_to.
+         */
+        same_text = textobj == Py_None || textobj == last_textobj;
+        if (!same_text && last_textobj) {
+            same_text = PyObject_RichCompareBool(textobj, last_textobj, Py_EQ);
+            if (same_text == -1)
+                goto error;
+        }
+        if (!same_text) {
+            text = _PGFT_EncodePyString(textobj,
+                                        self->render_flags & FT_RFLAG_UCS4);
+            if (!text)
+                goto error;
+            last_textobj = textobj;
+        }
+
+        if (_PGFT_Render_ExistingSurface(self->freetype, self, &render, text,
+                                         surface, xpos, ypos, &fg_color,
+                                         bg_color_obj ? &bg_color : 0, &r))
+            goto error;
+        free_string(text);
+        text = 0;
+
+        rect_obj = pgRect_New(&r);
+        if (!rect_obj)
+            goto error;
+        PyList_SET_ITEM(rects, i, rect_obj);
+    }
+
+    Py_DECREF(seq);
+    return rects;
+
+error:
+    free_string(text);
+    Py_XDECREF(rects);
+    Py_DECREF(seq);
+    return 0;
+#endif  // HAVE_PYGAME_SDL_VIDEO
+}
+
 /****************************************************
  * C API CALLS
  ****************************************************/
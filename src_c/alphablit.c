@@ -24,31 +24,131 @@
 
 #define NO_PYGAME_C_API
 #include "_surface.h"
+#include "simd_blitters.h"
 
-/* The structure passed to the low level blit functions */
-typedef struct
+static const char *blit_backend_names[] = {"GENERIC", "SSE2", "AVX2"};
+
+/* The blitters in use, picked from what the processor has on first use */
+static int blit_backend = BLIT_BACKEND_AUTO;
+
+static int
+get_blit_backend (void)
 {
-    int              width;
-    int              height;
-    Uint8           *s_pixels;
-    int              s_pxskip;
-    int              s_skip;
-    Uint8           *d_pixels;
-    int              d_pxskip;
-    int              d_skip;
-    SDL_PixelFormat *src;
-    SDL_PixelFormat *dst;
-#if IS_SDLv1
-    Uint32           src_flags;
-    Uint32           dst_flags;
-#else /* IS_SDLv2 */
-    Uint8            src_blanket_alpha;
-    int              src_has_colorkey;
-    Uint32           src_colorkey;
-    SDL_BlendMode    src_blend;
-    SDL_BlendMode    dst_blend;
-#endif /* IS_SDLv2 */
-} SDL_BlitInfo;
+    if (blit_backend == BLIT_BACKEND_AUTO)
+    {
+        blit_backend = BLIT_BACKEND_GENERIC;
+#if defined(PG_ENABLE_SSE2)
+        if (SDL_HasSSE2 ())
+            blit_backend = BLIT_BACKEND_SSE2;
+#endif /* PG_ENABLE_SSE2 */
+#if defined(PG_ENABLE_AVX2)
+        if (SDL_HasAVX2 ())
+            blit_backend = BLIT_BACKEND_AVX2;
+#endif /* PG_ENABLE_AVX2 */
+    }
+    return blit_backend;
+}
+
+int
+pygame_BlitBackend (void)
+{
+    return get_blit_backend ();
+}
+
+const char *
+pygame_GetBlitBackend (void)
+{
+    return blit_backend_names[get_blit_backend ()];
+}
+
+/* Returns 0, or -1 for an unknown backend and -2 for one this build or
+   processor does not have.
+*/
+int
+pygame_SetBlitBackend (const char *type)
+{
+    if (strcmp (type, "GENERIC") == 0)
+    {
+        blit_backend = BLIT_BACKEND_GENERIC;
+        return 0;
+    }
+    if (strcmp (type, "SSE2") == 0)
+    {
+#if defined(PG_ENABLE_SSE2)
+        if (SDL_HasSSE2 ())
+        {
+            blit_backend = BLIT_BACKEND_SSE2;
+            return 0;
+        }
+#endif /* PG_ENABLE_SSE2 */
+        return -2;
+    }
+    if (strcmp (type, "AVX2") == 0)
+    {
+#if defined(PG_ENABLE_AVX2)
+        if (SDL_HasAVX2 ())
+        {
+            blit_backend = BLIT_BACKEND_AVX2;
+            return 0;
+        }
+#endif /* PG_ENABLE_AVX2 */
+        return -2;
+    }
+    return -1;
+}
+
+/* Hand the blit to a SIMD blitter, if there is one for the backend in use,
+   and return from the calling blitter.
+*/
+#if defined(PG_ENABLE_AVX2)
+#define SIMD_BLIT_AVX2(call)                              \
+    if (get_blit_backend () == BLIT_BACKEND_AVX2)         \
+    {                                                     \
+        call;                                             \
+        return;                                           \
+    }
+#else
+#define SIMD_BLIT_AVX2(call)
+#endif /* PG_ENABLE_AVX2 */
+#if defined(PG_ENABLE_SSE2)
+#define SIMD_BLIT_SSE2(call)                              \
+    if (get_blit_backend () == BLIT_BACKEND_SSE2)         \
+    {                                                     \
+        call;                                             \
+        return;                                           \
+    }
+#else
+#define SIMD_BLIT_SSE2(call)
+#endif /* PG_ENABLE_SSE2 */
+#define SIMD_BLIT(avx2_call, sse2_call) \
+    SIMD_BLIT_AVX2(avx2_call)           \
+    SIMD_BLIT_SSE2(sse2_call)
+
+#if defined(PG_SIMD_BLITTERS)
+/* Can a SIMD blitter take the blit? They need 4 byte pixels with 8 bit
+   red, green and blue in the same places in both surfaces.
+*/
+static int
+simd_can_blit (SDL_BlitInfo * info)
+{
+    SDL_PixelFormat *srcfmt = info->src;
+    SDL_PixelFormat *dstfmt = info->dst;
+
+    return (srcfmt->BytesPerPixel == 4 && dstfmt->BytesPerPixel == 4 &&
+            srcfmt->Rmask == dstfmt->Rmask &&
+            srcfmt->Gmask == dstfmt->Gmask &&
+            srcfmt->Bmask == dstfmt->Bmask &&
+            !srcfmt->Rloss && !srcfmt->Gloss && !srcfmt->Bloss);
+}
+
+/* ... and 8 bit alpha in the same place in both */
+static int
+simd_can_blit_alpha (SDL_BlitInfo * info)
+{
+    return (simd_can_blit (info) && info->src->Amask &&
+            info->src->Amask == info->dst->Amask && !info->src->Aloss);
+}
+#endif /* PG_SIMD_BLITTERS */
 
 static void alphablit_alpha (SDL_BlitInfo * info);
 static void alphablit_colorkey (SDL_BlitInfo * info);
@@ -639,6 +739,10 @@ blit_blend_rgba_mul (SDL_BlitInfo * info)
 #endif /* IS_SDLv2 */
     {
         int incr = srcpxskip > 0 ? 1 : -1;
+#if defined(PG_SIMD_BLITTERS)
+        SIMD_BLIT (blit_blend_rgba_mul_avx2 (info),
+                   blit_blend_rgba_mul_sse2 (info));
+#endif /* PG_SIMD_BLITTERS */
         if (incr < 0)
         {
             src += 3;
@@ -1070,6 +1174,14 @@ blit_blend_premultiplied (SDL_BlitInfo * info)
     printf ("Premultiplied alpha blit with %d and %d\n", srcbpp, dstbpp);
     */
 
+#if defined(PG_SIMD_BLITTERS)
+    if (srcppa && dstppa && simd_can_blit_alpha (info))
+    {
+        SIMD_BLIT (blit_blend_premultiplied_avx2 (info),
+                   blit_blend_premultiplied_sse2 (info));
+    }
+#endif /* PG_SIMD_BLITTERS */
+
     if (srcbpp == 1)
     {
         if (dstbpp == 1)
@@ -1201,6 +1313,14 @@ blit_blend_add (SDL_BlitInfo * info)
     {
         size_t srcoffsetR, srcoffsetG, srcoffsetB;
         size_t dstoffsetR, dstoffsetG, dstoffsetB;
+
+#if defined(PG_SIMD_BLITTERS)
+        if (simd_can_blit (info))
+        {
+            SIMD_BLIT (blit_blend_rgb_add_avx2 (info, 0xFFFFFFFF, 0),
+                       blit_blend_rgb_add_sse2 (info, 0xFFFFFFFF, 0));
+        }
+#endif /* PG_SIMD_BLITTERS */
         if (srcbpp == 3)
         {
             SET_OFFSETS_24 (srcoffsetR, srcoffsetG, srcoffsetB, srcfmt);
@@ -1236,6 +1356,22 @@ blit_blend_add (SDL_BlitInfo * info)
         return;
     }
 
+#if defined(PG_SIMD_BLITTERS)
+    if (simd_can_blit (info))
+    {
+        /* Give the destination alpha what CREATE_PIXEL would */
+        Uint32 and_mask = 0xFFFFFFFF;
+        Uint32 or_mask = 0;
+
+        if (!dstfmt->Amask)
+            and_mask = dstfmt->Rmask | dstfmt->Gmask | dstfmt->Bmask;
+        else if (!dstppa)
+            or_mask = dstfmt->Amask;
+        SIMD_BLIT (blit_blend_rgb_add_avx2 (info, and_mask, or_mask),
+                   blit_blend_rgb_add_sse2 (info, and_mask, or_mask));
+    }
+#endif /* PG_SIMD_BLITTERS */
+
     if (srcbpp == 1)
     {
         if (dstbpp == 1)
@@ -2225,6 +2361,13 @@ alphablit_alpha (SDL_BlitInfo * info)
        printf ("Alpha blit with %d and %d\n", srcbpp, dstbpp);
        */
 
+#if defined(PG_SIMD_BLITTERS)
+    if (simd_can_blit_alpha (info))
+    {
+        SIMD_BLIT (alphablit_alpha_avx2 (info), alphablit_alpha_sse2 (info));
+    }
+#endif /* PG_SIMD_BLITTERS */
+
     if (srcbpp == 1)
     {
         if (dstbpp == 1)
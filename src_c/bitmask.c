@@ -82,6 +82,392 @@ bitcount(BITMASK_W n)
     }
 }
 
+/* The overlap functions below work one stripe at a time, on the rows that
+   the two masks share. These loops over those rows come in plain C, SSE2
+   and AVX2 versions. The SIMD ones do two to eight words at a time and
+   leave the last few rows to the C loop.
+
+   SSE2 is always there on x86-64. AVX2 is looked for at run time, and
+   only with compilers that can build a function for it on its own. */
+#if defined(__SSE2__) || defined(_M_X64) || \
+    (defined(_M_IX86_FP) && _M_IX86_FP >= 2)
+#define BITMASK_SSE2
+#include <emmintrin.h>
+#endif
+
+#if defined(BITMASK_SSE2) &&                                    \
+    ((defined(__GNUC__) && !defined(__clang__) &&               \
+      (__GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 9))) || \
+     (defined(__clang__) && __clang_major__ >= 4)) &&           \
+    (defined(__x86_64__) || defined(__i386__))
+#define BITMASK_AVX2
+#define BITMASK_TARGET_AVX2 __attribute__((target("avx2")))
+#include <immintrin.h>
+#endif
+
+#if ULONG_MAX > 0xFFFFFFFFUL
+#define BITMASK_SSE2_SRL _mm_srl_epi64
+#define BITMASK_SSE2_SLL _mm_sll_epi64
+#define BITMASK_AVX2_SRL _mm256_srl_epi64
+#define BITMASK_AVX2_SLL _mm256_sll_epi64
+#else
+#define BITMASK_SSE2_SRL _mm_srl_epi32
+#define BITMASK_SSE2_SLL _mm_sll_epi32
+#define BITMASK_AVX2_SRL _mm256_srl_epi32
+#define BITMASK_AVX2_SLL _mm256_sll_epi32
+#endif
+
+#define SSE2_WORDS (16 / sizeof(BITMASK_W))
+#define AVX2_WORDS (32 / sizeof(BITMASK_W))
+
+#define SHIFTED(w, shift, left) ((left) ? (w) << (shift) : (w) >> (shift))
+
+/* Returns nonzero if ((*ap >> shift) | (*app << (BITMASK_W_LEN - shift)))
+   & *bp is set for any of the n rows. app may be NULL, and must be if shift
+   is 0. */
+static int
+overlap_rows_c(const BITMASK_W *ap, const BITMASK_W *app,
+               const BITMASK_W *bp, unsigned int n, unsigned int shift)
+{
+    unsigned int i;
+
+    if (app) {
+        for (i = 0; i < n; i++)
+            if ((ap[i] >> shift) & bp[i] ||
+                (app[i] << (BITMASK_W_LEN - shift)) & bp[i])
+                return 1;
+    }
+    else {
+        for (i = 0; i < n; i++)
+            if ((ap[i] >> shift) & bp[i])
+                return 1;
+    }
+    return 0;
+}
+
+/* Counts the bits set in those same words */
+static unsigned int
+overlap_rows_count_c(const BITMASK_W *ap, const BITMASK_W *app,
+                     const BITMASK_W *bp, unsigned int n, unsigned int shift)
+{
+    unsigned int i, count = 0;
+
+    if (app) {
+        for (i = 0; i < n; i++)
+            count += bitcount(((ap[i] >> shift) |
+                               (app[i] << (BITMASK_W_LEN - shift))) &
+                              bp[i]);
+    }
+    else {
+        for (i = 0; i < n; i++)
+            count += bitcount((ap[i] >> shift) & bp[i]);
+    }
+    return count;
+}
+
+/* Returns the first of the n rows where *ap & (*bp shifted left or right)
+   is not 0, or n if there is none. */
+static unsigned int
+first_overlap_row_c(const BITMASK_W *ap, const BITMASK_W *bp, unsigned int n,
+                    unsigned int shift, int left)
+{
+    unsigned int i;
+
+    for (i = 0; i < n; i++)
+        if (ap[i] & SHIFTED(bp[i], shift, left))
+            return i;
+    return n;
+}
+
+/* Sets *cp to *ap & (*bp shifted left or right) for the n rows, or ors that
+   into *cp if accumulate is set. */
+static void
+and_rows_c(BITMASK_W *cp, const BITMASK_W *ap, const BITMASK_W *bp,
+           unsigned int n, unsigned int shift, int left, int accumulate)
+{
+    unsigned int i;
+
+    if (accumulate) {
+        for (i = 0; i < n; i++)
+            cp[i] |= ap[i] & SHIFTED(bp[i], shift, left);
+    }
+    else {
+        for (i = 0; i < n; i++)
+            cp[i] = ap[i] & SHIFTED(bp[i], shift, left);
+    }
+}
+
+#if defined(BITMASK_SSE2)
+#define LOAD_SSE2(p) _mm_loadu_si128((const __m128i *)(p))
+
+static int
+overlap_rows_sse2(const BITMASK_W *ap, const BITMASK_W *app,
+                  const BITMASK_W *bp, unsigned int n, unsigned int shift)
+{
+    unsigned int i;
+    __m128i rcount = _mm_cvtsi32_si128(shift);
+    __m128i lcount = _mm_cvtsi32_si128(BITMASK_W_LEN - shift);
+    __m128i zero = _mm_setzero_si128();
+    __m128i a;
+
+    for (i = 0; i + SSE2_WORDS <= n; i += SSE2_WORDS) {
+        a = BITMASK_SSE2_SRL(LOAD_SSE2(ap + i), rcount);
+        if (app)
+            a = _mm_or_si128(a, BITMASK_SSE2_SLL(LOAD_SSE2(app + i), lcount));
+        a = _mm_cmpeq_epi8(_mm_and_si128(a, LOAD_SSE2(bp + i)), zero);
+        if (_mm_movemask_epi8(a) != 0xFFFF)
+            return 1;
+    }
+    return overlap_rows_c(ap + i, app ? app + i : NULL, bp + i, n - i, shift);
+}
+
+static unsigned int
+overlap_rows_count_sse2(const BITMASK_W *ap, const BITMASK_W *app,
+                        const BITMASK_W *bp, unsigned int n,
+                        unsigned int shift)
+{
+    unsigned int i;
+    __m128i rcount = _mm_cvtsi32_si128(shift);
+    __m128i lcount = _mm_cvtsi32_si128(BITMASK_W_LEN - shift);
+    __m128i zero = _mm_setzero_si128();
+    __m128i m1 = _mm_set1_epi8(0x55);
+    __m128i m2 = _mm_set1_epi8(0x33);
+    __m128i m4 = _mm_set1_epi8(0x0F);
+    __m128i sum = zero;
+    __m128i a;
+
+    for (i = 0; i + SSE2_WORDS <= n; i += SSE2_WORDS) {
+        a = BITMASK_SSE2_SRL(LOAD_SSE2(ap + i), rcount);
+        if (app)
+            a = _mm_or_si128(a, BITMASK_SSE2_SLL(LOAD_SSE2(app + i), lcount));
+        a = _mm_and_si128(a, LOAD_SSE2(bp + i));
+        /* the bits in each byte, then the bytes in each half */
+        a = _mm_sub_epi8(a, _mm_and_si128(_mm_srli_epi16(a, 1), m1));
+        a = _mm_add_epi8(_mm_and_si128(a, m2),
+                         _mm_and_si128(_mm_srli_epi16(a, 2), m2));
+        a = _mm_and_si128(_mm_add_epi8(a, _mm_srli_epi16(a, 4)), m4);
+        sum = _mm_add_epi64(sum, _mm_sad_epu8(a, zero));
+    }
+    return (_mm_cvtsi128_si32(sum) +
+            _mm_cvtsi128_si32(_mm_srli_si128(sum, 8)) +
+            overlap_rows_count_c(ap + i, app ? app + i : NULL, bp + i, n - i,
+                                 shift));
+}
+
+static unsigned int
+first_overlap_row_sse2(const BITMASK_W *ap, const BITMASK_W *bp,
+                       unsigned int n, unsigned int shift, int left)
+{
+    unsigned int i;
+    __m128i count = _mm_cvtsi32_si128(shift);
+    __m128i zero = _mm_setzero_si128();
+    __m128i b;
+
+    for (i = 0; i + SSE2_WORDS <= n; i += SSE2_WORDS) {
+        b = LOAD_SSE2(bp + i);
+        b = left ? BITMASK_SSE2_SLL(b, count) : BITMASK_SSE2_SRL(b, count);
+        b = _mm_cmpeq_epi8(_mm_and_si128(LOAD_SSE2(ap + i), b), zero);
+        if (_mm_movemask_epi8(b) != 0xFFFF)
+            break; /* the C loop finds which row */
+    }
+    return i + first_overlap_row_c(ap + i, bp + i, n - i, shift, left);
+}
+
+static void
+and_rows_sse2(BITMASK_W *cp, const BITMASK_W *ap, const BITMASK_W *bp,
+              unsigned int n, unsigned int shift, int left, int accumulate)
+{
+    unsigned int i;
+    __m128i count = _mm_cvtsi32_si128(shift);
+    __m128i b;
+
+    for (i = 0; i + SSE2_WORDS <= n; i += SSE2_WORDS) {
+        b = LOAD_SSE2(bp + i);
+        b = left ? BITMASK_SSE2_SLL(b, count) : BITMASK_SSE2_SRL(b, count);
+        b = _mm_and_si128(LOAD_SSE2(ap + i), b);
+        if (accumulate)
+            b = _mm_or_si128(b, LOAD_SSE2(cp + i));
+        _mm_storeu_si128((__m128i *)(cp + i), b);
+    }
+    and_rows_c(cp + i, ap + i, bp + i, n - i, shift, left, accumulate);
+}
+#endif /* BITMASK_SSE2 */
+
+#if defined(BITMASK_AVX2)
+#define LOAD_AVX2(p) _mm256_loadu_si256((const __m256i *)(p))
+
+static int
+has_avx2(void)
+{
+    static int avx2 = -1;
+
+    if (avx2 < 0) {
+        __builtin_cpu_init();
+        avx2 = __builtin_cpu_supports("avx2") != 0;
+    }
+    return avx2;
+}
+
+BITMASK_TARGET_AVX2 static int
+overlap_rows_avx2(const BITMASK_W *ap, const BITMASK_W *app,
+                  const BITMASK_W *bp, unsigned int n, unsigned int shift)
+{
+    unsigned int i;
+    __m128i rcount = _mm_cvtsi32_si128(shift);
+    __m128i lcount = _mm_cvtsi32_si128(BITMASK_W_LEN - shift);
+    __m256i a;
+
+    for (i = 0; i + AVX2_WORDS <= n; i += AVX2_WORDS) {
+        a = BITMASK_AVX2_SRL(LOAD_AVX2(ap + i), rcount);
+        if (app)
+            a = _mm256_or_si256(a,
+                                BITMASK_AVX2_SLL(LOAD_AVX2(app + i), lcount));
+        if (!_mm256_testz_si256(a, LOAD_AVX2(bp + i)))
+            return 1;
+    }
+    return overlap_rows_c(ap + i, app ? app + i : NULL, bp + i, n - i, shift);
+}
+
+BITMASK_TARGET_AVX2 static unsigned int
+overlap_rows_count_avx2(const BITMASK_W *ap, const BITMASK_W *app,
+                        const BITMASK_W *bp, unsigned int n,
+                        unsigned int shift)
+{
+    unsigned int i;
+    __m128i rcount = _mm_cvtsi32_si128(shift);
+    __m128i lcount = _mm_cvtsi32_si128(BITMASK_W_LEN - shift);
+    __m256i zero = _mm256_setzero_si256();
+    __m256i m4 = _mm256_set1_epi8(0x0F);
+    /* the bits in each nibble */
+    __m256i nibble_bits =
+        _mm256_setr_epi8(0, 1, 1, 2, 1, 2, 2, 3, 1, 2, 2, 3, 2, 3, 3, 4, 0, 1,
+                         1, 2, 1, 2, 2, 3, 1, 2, 2, 3, 2, 3, 3, 4);
+    __m256i sum = zero;
+    __m256i a;
+    __m128i half;
+
+    for (i = 0; i + AVX2_WORDS <= n; i += AVX2_WORDS) {
+        a = BITMASK_AVX2_SRL(LOAD_AVX2(ap + i), rcount);
+        if (app)
+            a = _mm256_or_si256(a,
+                                BITMASK_AVX2_SLL(LOAD_AVX2(app + i), lcount));
+        a = _mm256_and_si256(a, LOAD_AVX2(bp + i));
+        a = _mm256_add_epi8(
+            _mm256_shuffle_epi8(nibble_bits, _mm256_and_si256(a, m4)),
+            _mm256_shuffle_epi8(nibble_bits,
+                                _mm256_and_si256(_mm256_srli_epi16(a, 4), m4)));
+        sum = _mm256_add_epi64(sum, _mm256_sad_epu8(a, zero));
+    }
+    half = _mm_add_epi64(_mm256_castsi256_si128(sum),
+                         _mm256_extracti128_si256(sum, 1));
+    return (_mm_cvtsi128_si32(half) +
+            _mm_cvtsi128_si32(_mm_srli_si128(half, 8)) +
+            overlap_rows_count_c(ap + i, app ? app + i : NULL, bp + i, n - i,
+                                 shift));
+}
+
+BITMASK_TARGET_AVX2 static unsigned int
+first_overlap_row_avx2(const BITMASK_W *ap, const BITMASK_W *bp,
+                       unsigned int n, unsigned int shift, int left)
+{
+    unsigned int i;
+    __m128i count = _mm_cvtsi32_si128(shift);
+    __m256i b;
+
+    for (i = 0; i + AVX2_WORDS <= n; i += AVX2_WORDS) {
+        b = LOAD_AVX2(bp + i);
+        b = left ? BITMASK_AVX2_SLL(b, count) : BITMASK_AVX2_SRL(b, count);
+        if (!_mm256_testz_si256(LOAD_AVX2(ap + i), b))
+            break; /* the C loop finds which row */
+    }
+    return i + first_overlap_row_c(ap + i, bp + i, n - i, shift, left);
+}
+
+BITMASK_TARGET_AVX2 static void
+and_rows_avx2(BITMASK_W *cp, const BITMASK_W *ap, const BITMASK_W *bp,
+              unsigned int n, unsigned int shift, int left, int accumulate)
+{
+    unsigned int i;
+    __m128i count = _mm_cvtsi32_si128(shift);
+    __m256i b;
+
+    for (i = 0; i + AVX2_WORDS <= n; i += AVX2_WORDS) {
+        b = LOAD_AVX2(bp + i);
+        b = left ? BITMASK_AVX2_SLL(b, count) : BITMASK_AVX2_SRL(b, count);
+        b = _mm256_and_si256(LOAD_AVX2(ap + i), b);
+        if (accumulate)
+            b = _mm256_or_si256(b, LOAD_AVX2(cp + i));
+        _mm256_storeu_si256((__m256i *)(cp + i), b);
+    }
+    and_rows_c(cp + i, ap + i, bp + i, n - i, shift, left, accumulate);
+}
+#endif /* BITMASK_AVX2 */
+
+/* Pick the version of each row loop. Too few rows for one SIMD step go
+   straight to the C loop. */
+#if defined(BITMASK_AVX2)
+#define DISPATCH_AVX2(n, call)                \
+    if ((n) >= AVX2_WORDS && has_avx2()) { \
+        return call;                          \
+    }
+#else
+#define DISPATCH_AVX2(n, call)
+#endif /* BITMASK_AVX2 */
+#if defined(BITMASK_SSE2)
+#define DISPATCH_SSE2(n, call)  \
+    if ((n) >= SSE2_WORDS) { \
+        return call;            \
+    }
+#else
+#define DISPATCH_SSE2(n, call)
+#endif /* BITMASK_SSE2 */
+
+static INLINE int
+overlap_rows(const BITMASK_W *ap, const BITMASK_W *app, const BITMASK_W *bp,
+             unsigned int n, unsigned int shift)
+{
+    DISPATCH_AVX2(n, overlap_rows_avx2(ap, app, bp, n, shift))
+    DISPATCH_SSE2(n, overlap_rows_sse2(ap, app, bp, n, shift))
+    return overlap_rows_c(ap, app, bp, n, shift);
+}
+
+static INLINE unsigned int
+overlap_rows_count(const BITMASK_W *ap, const BITMASK_W *app,
+                   const BITMASK_W *bp, unsigned int n, unsigned int shift)
+{
+    DISPATCH_AVX2(n, overlap_rows_count_avx2(ap, app, bp, n, shift))
+    DISPATCH_SSE2(n, overlap_rows_count_sse2(ap, app, bp, n, shift))
+    return overlap_rows_count_c(ap, app, bp, n, shift);
+}
+
+static INLINE unsigned int
+first_overlap_row(const BITMASK_W *ap, const BITMASK_W *bp, unsigned int n,
+                  unsigned int shift, int left)
+{
+    DISPATCH_AVX2(n, first_overlap_row_avx2(ap, bp, n, shift, left))
+    DISPATCH_SSE2(n, first_overlap_row_sse2(ap, bp, n, shift, left))
+    return first_overlap_row_c(ap, bp, n, shift, left);
+}
+
+static INLINE void
+and_rows(BITMASK_W *cp, const BITMASK_W *ap, const BITMASK_W *bp,
+         unsigned int n, unsigned int shift, int left, int accumulate)
+{
+#if defined(BITMASK_AVX2)
+    if (n >= AVX2_WORDS && has_avx2()) {
+        and_rows_avx2(cp, ap, bp, n, shift, left, accumulate);
+        return;
+    }
+#endif /* BITMASK_AVX2 */
+#if defined(BITMASK_SSE2)
+    if (n >= SSE2_WORDS) {
+        and_rows_sse2(cp, ap, bp, n, shift, left, accumulate);
+        return;
+    }
+#endif /* BITMASK_SSE2 */
+    and_rows_c(cp, ap, bp, n, shift, left, accumulate);
+}
+
 bitmask_t *
 bitmask_create(int w, int h)
 {
@@ -202,10 +588,8 @@ int
 bitmask_overlap(const bitmask_t *a, const bitmask_t *b, int xoffset,
                 int yoffset)
 {
-    const BITMASK_W *a_entry, *a_end;
-    const BITMASK_W *b_entry;
-    const BITMASK_W *ap, *app, *bp;
-    unsigned int shift, rshift, i, astripes, bstripes;
+    const BITMASK_W *a_entry, *b_entry;
+    unsigned int shift, i, astripes, bstripes, rows;
 
     /* Return if no overlap or one mask has a width/height of 0. */
     if ((xoffset >= a->w) || (yoffset >= a->h) || (yoffset <= -b->h) ||
@@ -218,47 +602,37 @@ bitmask_overlap(const bitmask_t *a, const bitmask_t *b, int xoffset,
         if (yoffset >= 0) {
             a_entry = a->bits +
                       a->h * ((unsigned int)xoffset / BITMASK_W_LEN) + yoffset;
-            a_end = a_entry + MIN(b->h, a->h - yoffset);
+            rows = MIN(b->h, a->h - yoffset);
             b_entry = b->bits;
         }
         else {
             a_entry = a->bits + a->h * ((unsigned int)xoffset / BITMASK_W_LEN);
-            a_end = a_entry + MIN(b->h + yoffset, a->h);
+            rows = MIN(b->h + yoffset, a->h);
             b_entry = b->bits - yoffset;
         }
         shift = xoffset & BITMASK_W_MASK;
         if (shift) {
-            rshift = BITMASK_W_LEN - shift;
             astripes = ((unsigned int)(a->w - 1)) / BITMASK_W_LEN -
                        (unsigned int)xoffset / BITMASK_W_LEN;
             bstripes = ((unsigned int)(b->w - 1)) / BITMASK_W_LEN + 1;
             if (bstripes > astripes) /* zig-zag .. zig*/
             {
                 for (i = 0; i < astripes; i++) {
-                    for (ap = a_entry, app = ap + a->h, bp = b_entry;
-                         ap < a_end;)
-                        if ((*ap++ >> shift) & *bp ||
-                            (*app++ << rshift) & *bp++)
-                            return 1;
+                    if (overlap_rows(a_entry, a_entry + a->h, b_entry, rows,
+                                     shift))
+                        return 1;
                     a_entry += a->h;
-                    a_end += a->h;
                     b_entry += b->h;
                 }
-                for (ap = a_entry, bp = b_entry; ap < a_end;)
-                    if ((*ap++ >> shift) & *bp++)
-                        return 1;
-                return 0;
+                return overlap_rows(a_entry, NULL, b_entry, rows, shift);
             }
             else /* zig-zag */
             {
                 for (i = 0; i < bstripes; i++) {
-                    for (ap = a_entry, app = ap + a->h, bp = b_entry;
-                         ap < a_end;)
-                        if ((*ap++ >> shift) & *bp ||
-                            (*app++ << rshift) & *bp++)
-                            return 1;
+                    if (overlap_rows(a_entry, a_entry + a->h, b_entry, rows,
+                                     shift))
+                        return 1;
                     a_entry += a->h;
-                    a_end += a->h;
                     b_entry += b->h;
                 }
                 return 0;
@@ -269,11 +643,9 @@ bitmask_overlap(const bitmask_t *a, const bitmask_t *b, int xoffset,
         {
             astripes = (MIN(b->w, a->w - xoffset) - 1) / BITMASK_W_LEN + 1;
             for (i = 0; i < astripes; i++) {
-                for (ap = a_entry, bp = b_entry; ap < a_end;)
-                    if (*ap++ & *bp++)
-                        return 1;
+                if (overlap_rows(a_entry, NULL, b_entry, rows, 0))
+                    return 1;
                 a_entry += a->h;
-                a_end += a->h;
                 b_entry += b->h;
             }
             return 0;
@@ -307,8 +679,8 @@ int
 bitmask_overlap_pos(const bitmask_t *a, const bitmask_t *b, int xoffset,
                     int yoffset, int *x, int *y)
 {
-    const BITMASK_W *a_entry, *a_end, *b_entry, *ap, *bp;
-    unsigned int shift, rshift, i, astripes, bstripes, xbase;
+    const BITMASK_W *a_entry, *b_entry;
+    unsigned int shift, rshift, i, astripes, bstripes, xbase, rows, row;
 
     /* Return if no overlap or one mask has a width/height of 0. */
     if ((xoffset >= a->w) || (yoffset >= a->h) || (yoffset <= -b->h) ||
@@ -316,16 +688,27 @@ bitmask_overlap_pos(const bitmask_t *a, const bitmask_t *b, int xoffset,
         return 0;
     }
 
+/* Returns the first point of intersection in the rows of a_entry, which is
+   stripe number xstripe of mask a, if there is one. */
+#define FIRST_OVERLAP(xstripe, shift, left)                                 \
+    row = first_overlap_row(a_entry, b_entry, rows, shift, left);           \
+    if (row < rows) {                                                       \
+        *y = row + yoffset;                                                 \
+        *x = (xstripe) * BITMASK_W_LEN +                                    \
+             firstsetbit(a_entry[row] & SHIFTED(b_entry[row], shift, left)); \
+        return 1;                                                           \
+    }
+
     if (xoffset >= 0) {
         xbase = xoffset / BITMASK_W_LEN; /* first stripe from mask a */
         if (yoffset >= 0) {
             a_entry = a->bits + a->h * xbase + yoffset;
-            a_end = a_entry + MIN(b->h, a->h - yoffset);
+            rows = MIN(b->h, a->h - yoffset);
             b_entry = b->bits;
         }
         else {
             a_entry = a->bits + a->h * xbase;
-            a_end = a_entry + MIN(b->h + yoffset, a->h);
+            rows = MIN(b->h + yoffset, a->h);
             b_entry = b->bits - yoffset;
             yoffset = 0; /* relied on below */
         }
@@ -337,52 +720,20 @@ bitmask_overlap_pos(const bitmask_t *a, const bitmask_t *b, int xoffset,
             if (bstripes > astripes) /* zig-zag .. zig*/
             {
                 for (i = 0; i < astripes; i++) {
-                    for (ap = a_entry, bp = b_entry; ap < a_end; ap++, bp++)
-                        if (*ap & (*bp << shift)) {
-                            *y = ap - a_entry + yoffset;
-                            *x = (xbase + i) * BITMASK_W_LEN +
-                                 firstsetbit(*ap & (*bp << shift));
-                            return 1;
-                        }
+                    FIRST_OVERLAP(xbase + i, shift, 1)
                     a_entry += a->h;
-                    a_end += a->h;
-                    for (ap = a_entry, bp = b_entry; ap < a_end; ap++, bp++)
-                        if (*ap & (*bp >> rshift)) {
-                            *y = ap - a_entry + yoffset;
-                            *x = (xbase + i + 1) * BITMASK_W_LEN +
-                                 firstsetbit(*ap & (*bp >> rshift));
-                            return 1;
-                        }
+                    FIRST_OVERLAP(xbase + i + 1, rshift, 0)
                     b_entry += b->h;
                 }
-                for (ap = a_entry, bp = b_entry; ap < a_end; ap++, bp++)
-                    if (*ap & (*bp << shift)) {
-                        *y = ap - a_entry + yoffset;
-                        *x = (xbase + astripes) * BITMASK_W_LEN +
-                             firstsetbit(*ap & (*bp << shift));
-                        return 1;
-                    }
+                FIRST_OVERLAP(xbase + astripes, shift, 1)
                 return 0;
             }
             else /* zig-zag */
             {
                 for (i = 0; i < bstripes; i++) {
-                    for (ap = a_entry, bp = b_entry; ap < a_end; ap++, bp++)
-                        if (*ap & (*bp << shift)) {
-                            *y = ap - a_entry + yoffset;
-                            *x = (xbase + i) * BITMASK_W_LEN +
-                                 firstsetbit(*ap & (*bp << shift));
-                            return 1;
-                        }
+                    FIRST_OVERLAP(xbase + i, shift, 1)
                     a_entry += a->h;
-                    a_end += a->h;
-                    for (ap = a_entry, bp = b_entry; ap < a_end; ap++, bp++)
-                        if (*ap & (*bp >> rshift)) {
-                            *y = ap - a_entry + yoffset;
-                            *x = (xbase + i + 1) * BITMASK_W_LEN +
-                                 firstsetbit(*ap & (*bp >> rshift));
-                            return 1;
-                        }
+                    FIRST_OVERLAP(xbase + i + 1, rshift, 0)
                     b_entry += b->h;
                 }
                 return 0;
@@ -394,20 +745,13 @@ bitmask_overlap_pos(const bitmask_t *a, const bitmask_t *b, int xoffset,
         {
             astripes = (MIN(b->w, a->w - xoffset) - 1) / BITMASK_W_LEN + 1;
             for (i = 0; i < astripes; i++) {
-                for (ap = a_entry, bp = b_entry; ap < a_end; ap++, bp++) {
-                    if (*ap & *bp) {
-                        *y = ap - a_entry + yoffset;
-                        *x = (xbase + i) * BITMASK_W_LEN +
-                             firstsetbit(*ap & *bp);
-                        return 1;
-                    }
-                }
+                FIRST_OVERLAP(xbase + i, 0, 1)
                 a_entry += a->h;
-                a_end += a->h;
                 b_entry += b->h;
             }
             return 0;
         }
+#undef FIRST_OVERLAP
     }
     else {
         if (bitmask_overlap_pos(b, a, -xoffset, -yoffset, x, y)) {
@@ -424,8 +768,8 @@ int
 bitmask_overlap_area(const bitmask_t *a, const bitmask_t *b, int xoffset,
                      int yoffset)
 {
-    const BITMASK_W *a_entry, *a_end, *b_entry, *ap, *bp;
-    unsigned int shift, rshift, i, astripes, bstripes;
+    const BITMASK_W *a_entry, *b_entry;
+    unsigned int shift, i, astripes, bstripes, rows;
     unsigned int count = 0;
 
     /* Return if no overlap or one mask has a width/height of 0. */
@@ -438,41 +782,35 @@ bitmask_overlap_area(const bitmask_t *a, const bitmask_t *b, int xoffset,
     swapentry:
         if (yoffset >= 0) {
             a_entry = a->bits + a->h * (xoffset / BITMASK_W_LEN) + yoffset;
-            a_end = a_entry + MIN(b->h, a->h - yoffset);
+            rows = MIN(b->h, a->h - yoffset);
             b_entry = b->bits;
         }
         else {
             a_entry = a->bits + a->h * (xoffset / BITMASK_W_LEN);
-            a_end = a_entry + MIN(b->h + yoffset, a->h);
+            rows = MIN(b->h + yoffset, a->h);
             b_entry = b->bits - yoffset;
         }
         shift = xoffset & BITMASK_W_MASK;
         if (shift) {
-            rshift = BITMASK_W_LEN - shift;
             astripes = (a->w - 1) / BITMASK_W_LEN - xoffset / BITMASK_W_LEN;
             bstripes = (b->w - 1) / BITMASK_W_LEN + 1;
             if (bstripes > astripes) /* zig-zag .. zig*/
             {
                 for (i = 0; i < astripes; i++) {
-                    for (ap = a_entry, bp = b_entry; ap < a_end; ap++, bp++)
-                        count += bitcount(
-                            ((*ap >> shift) | (*(ap + a->h) << rshift)) & *bp);
+                    count += overlap_rows_count(a_entry, a_entry + a->h,
+                                                b_entry, rows, shift);
                     a_entry += a->h;
-                    a_end += a->h;
                     b_entry += b->h;
                 }
-                for (ap = a_entry, bp = b_entry; ap < a_end;)
-                    count += bitcount((*ap++ >> shift) & *bp++);
-                return count;
+                return count +
+                       overlap_rows_count(a_entry, NULL, b_entry, rows, shift);
             }
             else /* zig-zag */
             {
                 for (i = 0; i < bstripes; i++) {
-                    for (ap = a_entry, bp = b_entry; ap < a_end; ap++, bp++)
-                        count += bitcount(
-                            ((*ap >> shift) | (*(ap + a->h) << rshift)) & *bp);
+                    count += overlap_rows_count(a_entry, a_entry + a->h,
+                                                b_entry, rows, shift);
                     a_entry += a->h;
-                    a_end += a->h;
                     b_entry += b->h;
                 }
                 return count;
@@ -483,11 +821,8 @@ bitmask_overlap_area(const bitmask_t *a, const bitmask_t *b, int xoffset,
         {
             astripes = (MIN(b->w, a->w - xoffset) - 1) / BITMASK_W_LEN + 1;
             for (i = 0; i < astripes; i++) {
-                for (ap = a_entry, bp = b_entry; ap < a_end;)
-                    count += bitcount(*ap++ & *bp++);
-
+                count += overlap_rows_count(a_entry, NULL, b_entry, rows, 0);
                 a_entry += a->h;
-                a_end += a->h;
                 b_entry += b->h;
             }
             return count;
@@ -508,10 +843,9 @@ void
 bitmask_overlap_mask(const bitmask_t *a, const bitmask_t *b, bitmask_t *c,
                      int xoffset, int yoffset)
 {
-    const BITMASK_W *a_entry, *a_end, *ap;
-    const BITMASK_W *b_entry, *b_end, *bp;
+    const BITMASK_W *a_entry, *b_entry;
     BITMASK_W *c_entry, *c_end, *cp;
-    int shift, rshift, i, astripes, bstripes;
+    int shift, rshift, i, astripes, bstripes, rows;
 
     /* Return if no overlap or one mask has a width/height of 0. */
     if ((xoffset >= a->w) || (yoffset >= a->h) || (yoffset <= -b->h) ||
@@ -523,13 +857,13 @@ bitmask_overlap_mask(const bitmask_t *a, const bitmask_t *b, bitmask_t *c,
         if (yoffset >= 0) {
             a_entry = a->bits + a->h * (xoffset / BITMASK_W_LEN) + yoffset;
             c_entry = c->bits + c->h * (xoffset / BITMASK_W_LEN) + yoffset;
-            a_end = a_entry + MIN(b->h, a->h - yoffset);
+            rows = MIN(b->h, a->h - yoffset);
             b_entry = b->bits;
         }
         else {
             a_entry = a->bits + a->h * (xoffset / BITMASK_W_LEN);
             c_entry = c->bits + c->h * (xoffset / BITMASK_W_LEN);
-            a_end = a_entry + MIN(b->h + yoffset, a->h);
+            rows = MIN(b->h + yoffset, a->h);
             b_entry = b->bits - yoffset;
         }
         shift = xoffset & BITMASK_W_MASK;
@@ -540,42 +874,30 @@ bitmask_overlap_mask(const bitmask_t *a, const bitmask_t *b, bitmask_t *c,
             if (bstripes > astripes) /* zig-zag .. zig*/
             {
                 for (i = 0; i < astripes; i++) {
-                    for (ap = a_entry, bp = b_entry, cp = c_entry; ap < a_end;
-                         ap++, bp++, cp++)
-                        *cp |= *ap & (*bp << shift);
+                    and_rows(c_entry, a_entry, b_entry, rows, shift, 1, 1);
 
                     /* The c_entry (output mask) must advance with a_entry. */
                     a_entry += a->h;
-                    a_end += a->h;
                     c_entry += c->h;
 
-                    for (ap = a_entry, bp = b_entry, cp = c_entry; ap < a_end;
-                         ap++, bp++, cp++)
-                        *cp |= *ap & (*bp >> rshift);
+                    and_rows(c_entry, a_entry, b_entry, rows, rshift, 0, 1);
 
                     b_entry += b->h;
                 }
 
                 /* This is the '.. zig' to handle the remaining bits. */
-                for (ap = a_entry, bp = b_entry, cp = c_entry; ap < a_end;
-                     ap++, bp++, cp++)
-                    *cp |= *ap & (*bp << shift);
+                and_rows(c_entry, a_entry, b_entry, rows, shift, 1, 1);
             }
             else /* zig-zag */
             {
                 for (i = 0; i < bstripes; i++) {
-                    for (ap = a_entry, bp = b_entry, cp = c_entry; ap < a_end;
-                         ap++, bp++, cp++)
-                        *cp |= *ap & (*bp << shift);
+                    and_rows(c_entry, a_entry, b_entry, rows, shift, 1, 1);
 
                     /* The c_entry (output mask) must advance with a_entry. */
                     a_entry += a->h;
-                    a_end += a->h;
                     c_entry += c->h;
 
-                    for (ap = a_entry, bp = b_entry, cp = c_entry; ap < a_end;
-                         ap++, bp++, cp++)
-                        *cp |= *ap & (*bp >> rshift);
+                    and_rows(c_entry, a_entry, b_entry, rows, rshift, 0, 1);
 
                     b_entry += b->h;
                 }
@@ -586,13 +908,9 @@ bitmask_overlap_mask(const bitmask_t *a, const bitmask_t *b, bitmask_t *c,
         {
             astripes = (MIN(b->w, a->w - xoffset) - 1) / BITMASK_W_LEN + 1;
             for (i = 0; i < astripes; i++) {
-                for (ap = a_entry, bp = b_entry, cp = c_entry; ap < a_end;
-                     ap++, bp++, cp++) {
-                    *cp = *ap & *bp;
-                }
+                and_rows(c_entry, a_entry, b_entry, rows, 0, 1, 0);
                 a_entry += a->h;
                 c_entry += c->h;
-                a_end += a->h;
                 b_entry += b->h;
             }
         }
@@ -603,13 +921,13 @@ bitmask_overlap_mask(const bitmask_t *a, const bitmask_t *b, bitmask_t *c,
 
         if (yoffset >= 0) {
             b_entry = b->bits + b->h * (xoffset / BITMASK_W_LEN) + yoffset;
-            b_end = b_entry + MIN(a->h, b->h - yoffset);
+            rows = MIN(a->h, b->h - yoffset);
             a_entry = a->bits;
             c_entry = c->bits;
         }
         else {
             b_entry = b->bits + b->h * (xoffset / BITMASK_W_LEN);
-            b_end = b_entry + MIN(a->h + yoffset, b->h);
+            rows = MIN(a->h + yoffset, b->h);
             a_entry = a->bits - yoffset;
             c_entry = c->bits - yoffset;
         }
@@ -621,32 +939,20 @@ bitmask_overlap_mask(const bitmask_t *a, const bitmask_t *b, bitmask_t *c,
             if (bstripes > astripes) /* zig-zag .. zig*/
             {
                 for (i = 0; i < astripes; i++) {
-                    for (bp = b_entry, ap = a_entry, cp = c_entry; bp < b_end;
-                         bp++, ap++, cp++)
-                        *cp = *ap & (*bp >> shift);
+                    and_rows(c_entry, a_entry, b_entry, rows, shift, 0, 0);
                     b_entry += b->h;
-                    b_end += b->h;
-                    for (bp = b_entry, ap = a_entry, cp = c_entry; bp < b_end;
-                         bp++, ap++, cp++)
-                        *cp |= *ap & (*bp << rshift);
+                    and_rows(c_entry, a_entry, b_entry, rows, rshift, 1, 1);
                     a_entry += a->h;
                     c_entry += c->h;
                 }
-                for (bp = b_entry, ap = a_entry, cp = c_entry; bp < b_end;
-                     bp++, ap++, cp++)
-                    *cp = *ap & (*bp >> shift);
+                and_rows(c_entry, a_entry, b_entry, rows, shift, 0, 0);
             }
             else /* zig-zag */
             {
                 for (i = 0; i < bstripes; i++) {
-                    for (bp = b_entry, ap = a_entry, cp = c_entry; bp < b_end;
-                         bp++, ap++, cp++)
-                        *cp = *ap & (*bp >> shift);
+                    and_rows(c_entry, a_entry, b_entry, rows, shift, 0, 0);
                     b_entry += b->h;
-                    b_end += b->h;
-                    for (bp = b_entry, ap = a_entry, cp = c_entry; bp < b_end;
-                         bp++, ap++, cp++)
-                        *cp |= *ap & (*bp << rshift);
+                    and_rows(c_entry, a_entry, b_entry, rows, rshift, 1, 1);
                     a_entry += a->h;
                     c_entry += c->h;
                 }
@@ -657,12 +963,8 @@ bitmask_overlap_mask(const bitmask_t *a, const bitmask_t *b, bitmask_t *c,
         {
             astripes = (MIN(a->w, b->w - xoffset) - 1) / BITMASK_W_LEN + 1;
             for (i = 0; i < astripes; i++) {
-                for (bp = b_entry, ap = a_entry, cp = c_entry; bp < b_end;
-                     bp++, ap++, cp++) {
-                    *cp = *ap & *bp;
-                }
+                and_rows(c_entry, a_entry, b_entry, rows, 0, 1, 0);
                 b_entry += b->h;
-                b_end += b->h;
                 a_entry += a->h;
                 c_entry += c->h;
             }
@@ -6,7 +6,8 @@
 #define DOC_PYGAMEFONTGETDEFAULTFONT "get_default_font() -> string\nget the filename of the default font"
 #define DOC_PYGAMEFONTGETFONTS "get_fonts() -> list of strings\nget all available fonts"
 #define DOC_PYGAMEFONTMATCHFONT "match_font(name, bold=False, italic=False) -> path\nfind a specific font on the system"
-#define DOC_PYGAMEFONTSYSFONT "SysFont(name, size, bold=False, italic=False) -> Font\ncreate a Font object from the system fonts"
+#define DOC_PYGAMEFONTSYSFONT "SysFont(name, size, bold=False, italic=False, constructor=None, cache=False) -> Font\ncreate a Font object from the system fonts"
+#define DOC_PYGAMEFONTUPDATEFONTINDEX "update_font_index(rebuild=False) -> path\nread the system fonts again, and save them for next time"
 #define DOC_PYGAMEFONTFONT "Font(filename, size) -> Font\nFont(object, size) -> Font\ncreate a new Font object from a file"
 #define DOC_FONTRENDER "render(text, antialias, color, background=None) -> Surface\ndraw text on a new Surface"
 #define DOC_FONTSIZE "size(text) -> (width, height)\ndetermine the amount of space needed to render text"
@@ -55,9 +56,13 @@ pygame.font.match_font
 find a specific font on the system
 
 pygame.font.SysFont
- SysFont(name, size, bold=False, italic=False) -> Font
+ SysFont(name, size, bold=False, italic=False, constructor=None, cache=False) -> Font
 create a Font object from the system fonts
 
+pygame.font.update_font_index
+ update_font_index(rebuild=False) -> path
+read the system fonts again, and save them for next time
+
 pygame.font.Font
  Font(filename, size) -> Font
  Font(object, size) -> Font
@@ -27,6 +27,7 @@
 #define DOC_FONTGETSIZES "get_sizes() -> [(int, int, int, float, float), ...]\nget_sizes() -> []\nreturn the available sizes of embedded bitmaps"
 #define DOC_FONTRENDER "render(text, fgcolor=None, bgcolor=None, style=STYLE_DEFAULT, rotation=0, size=0) -> (Surface, Rect)\nReturn rendered text as a surface"
 #define DOC_FONTRENDERTO "render_to(surf, dest, text, fgcolor=None, bgcolor=None, style=STYLE_DEFAULT, rotation=0, size=0) -> Rect\nRender text onto an existing surface"
+#define DOC_FONTRENDERTOMANY "render_to_many(surf, items, style=STYLE_DEFAULT, rotation=0, size=0) -> [Rect, ...]\nRender many strings onto an existing surface in one call"
 #define DOC_FONTRENDERRAW "render_raw(text, style=STYLE_DEFAULT, rotation=0, size=0, invert=False) -> (bytes, (int, int))\nReturn rendered text as a string of bytes"
 #define DOC_FONTRENDERRAWTO "render_raw_to(array, text, dest=None, style=STYLE_DEFAULT, rotation=0, size=0, invert=False) -> (int, int)\nRender text into an array of ints"
 #define DOC_FONTSTYLE "style -> int\nThe font's style flags"
@@ -49,6 +50,10 @@
 #define DOC_FONTPAD "pad -> bool\npadded boundary mode"
 #define DOC_FONTUCS4 "ucs4 -> bool\nEnable UCS-4 mode"
 #define DOC_FONTRESOLUTION "resolution -> int\nPixel resolution in dots per inch"
+#define DOC_PYGAMEFREETYPETEXTATLAS "TextAtlas(font, size=(1024, 1024)) -> TextAtlas\npygame object that keeps rendered strings on one surface"
+#define DOC_TEXTATLASGET "get(text, fgcolor=None, style=STYLE_DEFAULT, rotation=0, size=0) -> (Rect, (x, y))\nthe area of the atlas surface holding a string, and its offset"
+#define DOC_TEXTATLASRENDERTOMANY "render_to_many(surf, items, style=STYLE_DEFAULT, rotation=0, size=0) -> [Rect, ...]\ndraw (dest, text, fgcolor) items with one Surface.blits call"
+#define DOC_TEXTATLASCLEAR "clear() -> None\nforget every string, and empty the atlas surface"
 
 
 /* Docs in a comment... slightly easier to read. */
@@ -168,6 +173,10 @@ pygame.freetype.Font.render_to
  render_to(surf, dest, text, fgcolor=None, bgcolor=None, style=STYLE_DEFAULT, rotation=0, size=0) -> Rect
 Render text onto an existing surface
 
+pygame.freetype.Font.render_to_many
+ render_to_many(surf, items, style=STYLE_DEFAULT, rotation=0, size=0) -> [Rect, ...]
+Render many strings onto an existing surface in one call
+
 pygame.freetype.Font.render_raw
  render_raw(text, style=STYLE_DEFAULT, rotation=0, size=0, invert=False) -> (bytes, (int, int))
 Return rendered text as a string of bytes
@@ -256,4 +265,20 @@ pygame.freetype.Font.resolution
  resolution -> int
 Pixel resolution in dots per inch
 
+pygame.freetype.TextAtlas
+ TextAtlas(font, size=(1024, 1024)) -> TextAtlas
+pygame object that keeps rendered strings on one surface
+
+pygame.freetype.TextAtlas.get
+ get(text, fgcolor=None, style=STYLE_DEFAULT, rotation=0, size=0) -> (Rect, (x, y))
+the area of the atlas surface holding a string, and its offset
+
+pygame.freetype.TextAtlas.render_to_many
+ render_to_many(surf, items, style=STYLE_DEFAULT, rotation=0, size=0) -> [Rect, ...]
+draw (dest, text, fgcolor) items with one Surface.blits call
+
+pygame.freetype.TextAtlas.clear
+ clear() -> None
+forget every string, and empty the atlas surface
+
 */
\ No newline at end of file
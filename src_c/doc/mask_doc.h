@@ -10,6 +10,7 @@
 #define DOC_MASKOVERLAP "overlap(othermask, offset) -> (x, y)\noverlap(othermask, offset) -> None\nReturns the point of intersection"
 #define DOC_MASKOVERLAPAREA "overlap_area(othermask, offset) -> numbits\nReturns the number of overlapping set bits"
 #define DOC_MASKOVERLAPMASK "overlap_mask(othermask, offset) -> Mask\nReturns a mask of the overlapping set bits"
+#define DOC_MASKOVERLAPBATCH "overlap_batch(masks, offsets) -> [index, ...]\noverlap_batch(masks, offsets, points=True) -> [(index, (x, y)), ...]\nReturns which of many masks overlap this mask"
 #define DOC_MASKFILL "fill() -> None\nSets all bits to 1"
 #define DOC_MASKCLEAR "clear() -> None\nSets all bits to 0"
 #define DOC_MASKINVERT "invert() -> None\nFlips all the bits"
@@ -22,8 +23,12 @@
 #define DOC_MASKOUTLINE "outline() -> [(x, y), ...]\noutline(every=1) -> [(x, y), ...]\nReturns a list of points outlining an object"
 #define DOC_MASKCONVOLVE "convolve(othermask) -> Mask\nconvolve(othermask, outputmask=None, offset=(0, 0)) -> Mask\nReturns the convolution of this mask with another mask"
 #define DOC_MASKCONNECTEDCOMPONENT "connected_component() -> Mask\nconnected_component((x, y)) -> Mask\nReturns a mask containing a connected component"
-#define DOC_MASKCONNECTEDCOMPONENTS "connected_components() -> [Mask, ...]\nconnected_components(min=0) -> [Mask, ...]\nReturns a list of masks of connected components"
+#define DOC_MASKCONNECTEDCOMPONENTS "connected_components() -> [Mask, ...]\nconnected_components(min=0, threads=1) -> [Mask, ...]\nconnected_components(min=0, threads=1, compact=True) -> (BufferProxy, [(area, Rect, (x, y)), ...])\nReturns a list of masks of connected components"
 #define DOC_MASKGETBOUNDINGRECTS "get_bounding_rects() -> [Rect, ...]\nReturns a list of bounding rects of connected components"
+#define DOC_MASKDISTANCEFIELD "distance_field(limit=32) -> BufferProxy\nReturns the signed distance field of the mask"
+#define DOC_MASKRAYCAST "raycast(origin, direction, max_dist=None) -> (x, y)\nraycast(origin, direction, max_dist=None) -> None\nReturns the first set bit along a ray"
+#define DOC_MASKRAYCASTMANY "raycast_many(origins, directions, max_dist=None) -> [(x, y) or None, ...]\nReturns the first set bit along each of many rays"
+#define DOC_MASKUPDATEFROMSURFACE "update_from_surface(surface, threshold=127, rect=None) -> None\nSets the bits of this mask from a surface"
 #define DOC_MASKTOSURFACE "to_surface(surface)) -> Surface\nto_surface(surface, setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 255)) -> Surface\nReturns a surface with the mask drawn on it"
 
 
@@ -79,6 +84,11 @@ pygame.mask.Mask.overlap_mask
  overlap_mask(othermask, offset) -> Mask
 Returns a mask of the overlapping set bits
 
+pygame.mask.Mask.overlap_batch
+ overlap_batch(masks, offsets) -> [index, ...]
+ overlap_batch(masks, offsets, points=True) -> [(index, (x, y)), ...]
+Returns which of many masks overlap this mask
+
 pygame.mask.Mask.fill
  fill() -> None
 Sets all bits to 1
@@ -132,13 +142,31 @@ Returns a mask containing a connected component
 
 pygame.mask.Mask.connected_components
  connected_components() -> [Mask, ...]
- connected_components(min=0) -> [Mask, ...]
+ connected_components(min=0, threads=1) -> [Mask, ...]
+ connected_components(min=0, threads=1, compact=True) -> (BufferProxy, [(area, Rect, (x, y)), ...])
 Returns a list of masks of connected components
 
 pygame.mask.Mask.get_bounding_rects
  get_bounding_rects() -> [Rect, ...]
 Returns a list of bounding rects of connected components
 
+pygame.mask.Mask.distance_field
+ distance_field(limit=32) -> BufferProxy
+Returns the signed distance field of the mask
+
+pygame.mask.Mask.raycast
+ raycast(origin, direction, max_dist=None) -> (x, y)
+ raycast(origin, direction, max_dist=None) -> None
+Returns the first set bit along a ray
+
+pygame.mask.Mask.raycast_many
+ raycast_many(origins, directions, max_dist=None) -> [(x, y) or None, ...]
+Returns the first set bit along each of many rays
+
+pygame.mask.Mask.update_from_surface
+ update_from_surface(surface, threshold=127, rect=None) -> None
+Sets the bits of this mask from a surface
+
 pygame.mask.Mask.to_surface
  to_surface(surface)) -> Surface
  to_surface(surface, setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 255)) -> Surface
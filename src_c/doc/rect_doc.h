@@ -19,9 +19,15 @@
 #define DOC_RECTCOLLIDERECT "colliderect(Rect) -> bool\ntest if two rectangles overlap"
 #define DOC_RECTCOLLIDELIST "collidelist(list) -> index\ntest if one rectangle in a list intersects"
 #define DOC_RECTCOLLIDELISTALL "collidelistall(list) -> indices\ntest if all rectangles in a list intersect"
+#define DOC_RECTCOLLIDEPAIRS "collide_pairs(rects_a, rects_b) -> array\nfind all intersecting pairs between two lists of rectangles"
 #define DOC_RECTCOLLIDEDICT "collidedict(dict) -> (key, value)\ntest if one rectangle in a dictionary intersects"
 #define DOC_RECTCOLLIDEDICTALL "collidedictall(dict) -> [(key, value), ...]\ntest if all rectangles in a dictionary intersect"
 
+#define DOC_PYGAMEREGION "Region(exact=False, max_overhead=0.0) -> Region\npygame object for accumulating dirty rectangles"
+#define DOC_REGIONADD "add(Rect) -> None\nadd a rectangle to the region"
+#define DOC_REGIONRECTS "rects() -> list\nget the merged rectangles of the region"
+#define DOC_REGIONCLEAR "clear() -> None\nremove all rectangles from the region"
+
 
 /* Docs in a comment... slightly easier to read. */
 
@@ -110,6 +116,10 @@ pygame.Rect.collidelistall
  collidelistall(list) -> indices
 test if all rectangles in a list intersect
 
+pygame.Rect.collide_pairs
+ collide_pairs(rects_a, rects_b) -> array
+find all intersecting pairs between two lists of rectangles
+
 pygame.Rect.collidedict
  collidedict(dict) -> (key, value)
 test if one rectangle in a dictionary intersects
@@ -118,4 +128,20 @@ pygame.Rect.collidedictall
  collidedictall(dict) -> [(key, value), ...]
 test if all rectangles in a dictionary intersect
 
+pygame.Region
+ Region(exact=False, max_overhead=0.0) -> Region
+pygame object for accumulating dirty rectangles
+
+pygame.Region.add
+ add(Rect) -> None
+add a rectangle to the region
+
+pygame.Region.rects
+ rects() -> list
+get the merged rectangles of the region
+
+pygame.Region.clear
+ clear() -> None
+remove all rectangles from the region
+
 */
\ No newline at end of file
@@ -18,16 +18,27 @@
 #define DOC_GROUPDRAW "draw(Surface) -> None\nblit the Sprite images"
 #define DOC_GROUPCLEAR "clear(Surface_dest, background) -> None\ndraw a background over the Sprites"
 #define DOC_GROUPEMPTY "empty() -> None\nremove all Sprites"
+#define DOC_GROUPSETSPATIALINDEX "set_spatial_index(cell_size=64) -> None\nindex the Sprites in a grid to speed up collision tests"
+#define DOC_GROUPREINDEX "reindex(*sprites) -> None\ntell the spatial index that Sprites have moved"
 #define DOC_PYGAMESPRITERENDERPLAIN "Same as pygame.sprite.Group"
 #define DOC_PYGAMESPRITERENDERCLEAR "Same as pygame.sprite.Group"
 #define DOC_PYGAMESPRITERENDERUPDATES "RenderUpdates(*sprites) -> RenderUpdates\nGroup sub-class that tracks dirty updates."
-#define DOC_RENDERUPDATESDRAW "draw(surface) -> Rect_list\nblit the Sprite images and track changed areas"
+#define DOC_RENDERUPDATESDRAW "draw(surface, merge=False) -> Rect_list\nblit the Sprite images and track changed areas"
 #define DOC_PYGAMESPRITEORDEREDUPDATES "OrderedUpdates(*spites) -> OrderedUpdates\nRenderUpdates sub-class that draws Sprites in order of addition."
+#define DOC_PYGAMESPRITEPARTICLEGROUP "ParticleGroup(*sprites, use_numpy=None) -> ParticleGroup\nGroup sub-class that moves its Sprites in bulk."
+#define DOC_PARTICLEGROUPUPDATE "update(dt=1.0) -> None\nmove every Sprite by its velocity"
+#define DOC_PARTICLEGROUPGETPOSITION "get_position(sprite) -> (x, y)\nget the position of a Sprite"
+#define DOC_PARTICLEGROUPSETPOSITION "set_position(sprite, (x, y)) -> None\nmove a Sprite"
+#define DOC_PARTICLEGROUPGETVELOCITY "get_velocity(sprite) -> (vx, vy)\nget the velocity of a Sprite"
+#define DOC_PARTICLEGROUPSETVELOCITY "set_velocity(sprite, (vx, vy)) -> None\nchange the velocity of a Sprite"
+#define DOC_PARTICLEGROUPPOSITIONS "positions -> array\nthe positions of the Sprites"
+#define DOC_PARTICLEGROUPVELOCITIES "velocities -> array\nthe velocities of the Sprites"
 #define DOC_PYGAMESPRITELAYEREDUPDATES "LayeredUpdates(*spites, **kwargs) -> LayeredUpdates\nLayeredUpdates is a sprite group that handles layers and draws like OrderedUpdates."
 #define DOC_LAYEREDUPDATESADD "add(*sprites, **kwargs) -> None\nadd a sprite or sequence of sprites to a group"
 #define DOC_LAYEREDUPDATESSPRITES "sprites() -> sprites\nreturns a ordered list of sprites (first back, last top)."
-#define DOC_LAYEREDUPDATESDRAW "draw(surface) -> Rect_list\ndraw all sprites in the right order onto the passed surface."
+#define DOC_LAYEREDUPDATESDRAW "draw(surface, merge=False) -> Rect_list\ndraw all sprites in the right order onto the passed surface."
 #define DOC_LAYEREDUPDATESGETSPRITESAT "get_sprites_at(pos) -> colliding_sprites\nreturns a list with all sprites at that position."
+#define DOC_LAYEREDUPDATESGETSPRITESINRECT "get_sprites_in_rect(rect) -> colliding_sprites\nreturns a list with all sprites colliding with a rect."
 #define DOC_LAYEREDUPDATESGETSPRITE "get_sprite(idx) -> sprite\nreturns the sprite at the index idx from the groups sprites"
 #define DOC_LAYEREDUPDATESREMOVESPRITESOFLAYER "remove_sprites_of_layer(layer_nr) -> sprites\nremoves all sprites from a layer and returns them as a list."
 #define DOC_LAYEREDUPDATESLAYERS "layers() -> layers\nreturns a list of layers defined (unique), sorted from bottom up."
@@ -138,6 +149,14 @@ pygame.sprite.Group.empty
  empty() -> None
 remove all Sprites
 
+pygame.sprite.Group.set_spatial_index
+ set_spatial_index(cell_size=64) -> None
+index the Sprites in a grid to speed up collision tests
+
+pygame.sprite.Group.reindex
+ reindex(*sprites) -> None
+tell the spatial index that Sprites have moved
+
 pygame.sprite.RenderPlain
 Same as pygame.sprite.Group
 
@@ -149,13 +168,45 @@ pygame.sprite.RenderUpdates
 Group sub-class that tracks dirty updates.
 
 pygame.sprite.RenderUpdates.draw
- draw(surface) -> Rect_list
+ draw(surface, merge=False) -> Rect_list
 blit the Sprite images and track changed areas
 
 pygame.sprite.OrderedUpdates
  OrderedUpdates(*spites) -> OrderedUpdates
 RenderUpdates sub-class that draws Sprites in order of addition.
 
+pygame.sprite.ParticleGroup
+ ParticleGroup(*sprites, use_numpy=None) -> ParticleGroup
+Group sub-class that moves its Sprites in bulk.
+
+pygame.sprite.ParticleGroup.update
+ update(dt=1.0) -> None
+move every Sprite by its velocity
+
+pygame.sprite.ParticleGroup.get_position
+ get_position(sprite) -> (x, y)
+get the position of a Sprite
+
+pygame.sprite.ParticleGroup.set_position
+ set_position(sprite, (x, y)) -> None
+move a Sprite
+
+pygame.sprite.ParticleGroup.get_velocity
+ get_velocity(sprite) -> (vx, vy)
+get the velocity of a Sprite
+
+pygame.sprite.ParticleGroup.set_velocity
+ set_velocity(sprite, (vx, vy)) -> None
+change the velocity of a Sprite
+
+pygame.sprite.ParticleGroup.positions
+ positions -> array
+the positions of the Sprites
+
+pygame.sprite.ParticleGroup.velocities
+ velocities -> array
+the velocities of the Sprites
+
 pygame.sprite.LayeredUpdates
  LayeredUpdates(*spites, **kwargs) -> LayeredUpdates
 LayeredUpdates is a sprite group that handles layers and draws like OrderedUpdates.
@@ -169,13 +220,17 @@ pygame.sprite.LayeredUpdates.sprites
 returns a ordered list of sprites (first back, last top).
 
 pygame.sprite.LayeredUpdates.draw
- draw(surface) -> Rect_list
+ draw(surface, merge=False) -> Rect_list
 draw all sprites in the right order onto the passed surface.
 
 pygame.sprite.LayeredUpdates.get_sprites_at
  get_sprites_at(pos) -> colliding_sprites
 returns a list with all sprites at that position.
 
+pygame.sprite.LayeredUpdates.get_sprites_in_rect
+ get_sprites_in_rect(rect) -> colliding_sprites
+returns a list with all sprites colliding with a rect.
+
 pygame.sprite.LayeredUpdates.get_sprite
  get_sprite(idx) -> sprite
 returns the sprite at the index idx from the groups sprites
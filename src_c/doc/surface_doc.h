@@ -1,11 +1,12 @@
 /* Auto generated file: with makeref.py .  Docs go in docs/reST/ref/ . */
 #define DOC_PYGAMESURFACE "Surface((width, height), flags=0, depth=0, masks=None) -> Surface\nSurface((width, height), flags=0, Surface) -> Surface\npygame object for representing images"
 #define DOC_SURFACEBLIT "blit(source, dest, area=None, special_flags=0) -> Rect\ndraw one image onto another"
-#define DOC_SURFACEBLITS "blits(blit_sequence=(source, dest), ...), doreturn=1) -> [Rect, ...] or None\nblits((source, dest, area), ...)) -> [Rect, ...]\nblits((source, dest, area, special_flags), ...)) -> [Rect, ...]\ndraw many images onto another"
+#define DOC_SURFACEBLITS "blits(blit_sequence=(source, dest), ...), doreturn=1, threads=1) -> [Rect, ...] or None\nblits((source, dest, area), ...)) -> [Rect, ...]\nblits((source, dest, area, special_flags), ...)) -> [Rect, ...]\ndraw many images onto another"
 #define DOC_SURFACECONVERT "convert(Surface=None) -> Surface\nconvert(depth, flags=0) -> Surface\nconvert(masks, flags=0) -> Surface\nchange the pixel format of an image"
 #define DOC_SURFACECONVERTALPHA "convert_alpha(Surface) -> Surface\nconvert_alpha() -> Surface\nchange the pixel format of an image including per pixel alphas"
 #define DOC_SURFACECOPY "copy() -> Surface\ncreate a new copy of a Surface"
 #define DOC_SURFACEFILL "fill(color, rect=None, special_flags=0) -> Rect\nfill Surface with a solid color"
+#define DOC_SURFACEFILLRECTS "fill_rects(color, rects, special_flags=0) -> None\nfill many areas of the Surface with a solid color"
 #define DOC_SURFACESCROLL "scroll(dx=0, dy=0) -> None\nShift the surface image in place"
 #define DOC_SURFACESETCOLORKEY "set_colorkey(Color, flags=0) -> None\nset_colorkey(None) -> None\nSet the transparent colorkey"
 #define DOC_SURFACEGETCOLORKEY "get_colorkey() -> RGB or None\nGet the current transparent colorkey"
@@ -65,7 +66,7 @@ pygame.Surface.blit
 draw one image onto another
 
 pygame.Surface.blits
- blits(blit_sequence=(source, dest), ...), doreturn=1) -> [Rect, ...] or None
+ blits(blit_sequence=(source, dest), ...), doreturn=1, threads=1) -> [Rect, ...] or None
  blits((source, dest, area), ...)) -> [Rect, ...]
  blits((source, dest, area, special_flags), ...)) -> [Rect, ...]
 draw many images onto another
@@ -89,6 +90,10 @@ pygame.Surface.fill
  fill(color, rect=None, special_flags=0) -> Rect
 fill Surface with a solid color
 
+pygame.Surface.fill_rects
+ fill_rects(color, rects, special_flags=0) -> None
+fill many areas of the Surface with a solid color
+
 pygame.Surface.scroll
  scroll(dx=0, dy=0) -> None
 Shift the surface image in place
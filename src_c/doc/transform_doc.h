@@ -2,17 +2,28 @@
 #define DOC_PYGAMETRANSFORM "pygame module to transform surfaces"
 #define DOC_PYGAMETRANSFORMFLIP "flip(Surface, xbool, ybool) -> Surface\nflip vertically and horizontally"
 #define DOC_PYGAMETRANSFORMSCALE "scale(Surface, (width, height), DestSurface = None) -> Surface\nresize to new resolution"
+#define DOC_PYGAMETRANSFORMSCALEBY "scale_by(Surface, factor, DestSurface = None) -> Surface\nresize to new resolution, using a scale factor"
 #define DOC_PYGAMETRANSFORMROTATE "rotate(Surface, angle) -> Surface\nrotate an image"
 #define DOC_PYGAMETRANSFORMROTOZOOM "rotozoom(Surface, angle, scale) -> Surface\nfiltered scale and rotation"
 #define DOC_PYGAMETRANSFORMSCALE2X "scale2x(Surface, DestSurface = None) -> Surface\nspecialized image doubler"
-#define DOC_PYGAMETRANSFORMSMOOTHSCALE "smoothscale(Surface, (width, height), DestSurface = None) -> Surface\nscale a surface to an arbitrary size smoothly"
-#define DOC_PYGAMETRANSFORMGETSMOOTHSCALEBACKEND "get_smoothscale_backend() -> String\nreturn smoothscale filter version in use: 'GENERIC', 'MMX', or 'SSE'"
-#define DOC_PYGAMETRANSFORMSETSMOOTHSCALEBACKEND "set_smoothscale_backend(type) -> None\nset smoothscale filter version to one of: 'GENERIC', 'MMX', or 'SSE'"
+#define DOC_PYGAMETRANSFORMSCALE3X "scale3x(Surface, DestSurface = None) -> Surface\nspecialized image tripler"
+#define DOC_PYGAMETRANSFORMSMOOTHSCALE "smoothscale(Surface, (width, height), DestSurface = None, threads = 1) -> Surface\nscale a surface to an arbitrary size smoothly"
+#define DOC_PYGAMETRANSFORMGETSMOOTHSCALEBACKEND "get_smoothscale_backend() -> String\nreturn smoothscale filter version in use: 'GENERIC', 'MMX', 'SSE', or 'AVX2'"
+#define DOC_PYGAMETRANSFORMSETSMOOTHSCALEBACKEND "set_smoothscale_backend(type) -> None\nset smoothscale filter version to one of: 'GENERIC', 'MMX', 'SSE', or 'AVX2'"
 #define DOC_PYGAMETRANSFORMCHOP "chop(Surface, rect) -> Surface\ngets a copy of an image with an interior area removed"
 #define DOC_PYGAMETRANSFORMLAPLACIAN "laplacian(Surface, DestSurface = None) -> Surface\nfind edges in a surface"
+#define DOC_PYGAMETRANSFORMBOXBLUR "box_blur(Surface, radius, repeat_edge_pixels = True, DestSurface = None, threads = 1) -> Surface\nblur a surface with a box filter"
+#define DOC_PYGAMETRANSFORMGAUSSIANBLUR "gaussian_blur(Surface, radius, repeat_edge_pixels = True, DestSurface = None, threads = 1) -> Surface\nblur a surface with a gaussian filter"
+#define DOC_PYGAMETRANSFORMCONVOLVE "convolve(Surface, kernel, repeat_edge_pixels = True, DestSurface = None, threads = 1) -> Surface\nfilter a surface with a kernel of weights"
 #define DOC_PYGAMETRANSFORMAVERAGESURFACES "average_surfaces(Surfaces, DestSurface = None, palette_colors = 1) -> Surface\nfind the average surface from many surfaces."
-#define DOC_PYGAMETRANSFORMAVERAGECOLOR "average_color(Surface, Rect = None) -> Color\nfinds the average color of a surface"
+#define DOC_PYGAMETRANSFORMAVERAGECOLOR "average_color(Surface, Rect = None) -> Color\naverage_color(Surface, rects = [Rect, ...]) -> [Color, ...]\nfinds the average color of a surface"
 #define DOC_PYGAMETRANSFORMTHRESHOLD "threshold(dest_surf, surf, search_color, threshold=(0,0,0,0), set_color=(0,0,0,0), set_behavior=1, search_surf=None, inverse_set=False) -> num_threshold_pixels\nfinds which, and how many pixels in a surface are within a threshold of a 'search_color' or a 'search_surf'."
+#define DOC_PYGAMETRANSFORMROTATIONCACHE "RotationCache(max_bytes=16777216, angle_step=1.0, check_source=True) -> RotationCache\npygame object that keeps rotated surfaces for reuse"
+#define DOC_ROTATIONCACHEROTATE "rotate(Surface, angle) -> Surface\nrotate an image, reusing an earlier result for the same angle"
+#define DOC_ROTATIONCACHEROTOZOOM "rotozoom(Surface, angle, scale) -> Surface\nfiltered scale and rotation, reusing an earlier result"
+#define DOC_ROTATIONCACHEINVALIDATE "invalidate(Surface=None) -> None\nforget the results for a surface, or for every surface"
+#define DOC_ROTATIONCACHEGETSTATS "get_stats() -> dict\nget the hit, miss and size counts of the cache"
+#define DOC_PYGAMETRANSFORMROTATIONATLAS "rotation_atlas(Surface, count, scale=1.0, columns=None) -> (Surface, rects)\ndraw a surface at many angles into one surface"
 
 
 /* Docs in a comment... slightly easier to read. */
@@ -30,6 +41,10 @@ pygame.transform.scale
  scale(Surface, (width, height), DestSurface = None) -> Surface
 resize to new resolution
 
+pygame.transform.scale_by
+ scale_by(Surface, factor, DestSurface = None) -> Surface
+resize to new resolution, using a scale factor
+
 pygame.transform.rotate
  rotate(Surface, angle) -> Surface
 rotate an image
@@ -42,17 +57,21 @@ pygame.transform.scale2x
  scale2x(Surface, DestSurface = None) -> Surface
 specialized image doubler
 
+pygame.transform.scale3x
+ scale3x(Surface, DestSurface = None) -> Surface
+specialized image tripler
+
 pygame.transform.smoothscale
- smoothscale(Surface, (width, height), DestSurface = None) -> Surface
+ smoothscale(Surface, (width, height), DestSurface = None, threads = 1) -> Surface
 scale a surface to an arbitrary size smoothly
 
 pygame.transform.get_smoothscale_backend
  get_smoothscale_backend() -> String
-return smoothscale filter version in use: 'GENERIC', 'MMX', or 'SSE'
+return smoothscale filter version in use: 'GENERIC', 'MMX', 'SSE', or 'AVX2'
 
 pygame.transform.set_smoothscale_backend
  set_smoothscale_backend(type) -> None
-set smoothscale filter version to one of: 'GENERIC', 'MMX', or 'SSE'
+set smoothscale filter version to one of: 'GENERIC', 'MMX', 'SSE', or 'AVX2'
 
 pygame.transform.chop
  chop(Surface, rect) -> Surface
@@ -62,16 +81,53 @@ pygame.transform.laplacian
  laplacian(Surface, DestSurface = None) -> Surface
 find edges in a surface
 
+pygame.transform.box_blur
+ box_blur(Surface, radius, repeat_edge_pixels = True, DestSurface = None, threads = 1) -> Surface
+blur a surface with a box filter
+
+pygame.transform.gaussian_blur
+ gaussian_blur(Surface, radius, repeat_edge_pixels = True, DestSurface = None, threads = 1) -> Surface
+blur a surface with a gaussian filter
+
+pygame.transform.convolve
+ convolve(Surface, kernel, repeat_edge_pixels = True, DestSurface = None, threads = 1) -> Surface
+filter a surface with a kernel of weights
+
 pygame.transform.average_surfaces
  average_surfaces(Surfaces, DestSurface = None, palette_colors = 1) -> Surface
 find the average surface from many surfaces.
 
 pygame.transform.average_color
  average_color(Surface, Rect = None) -> Color
+ average_color(Surface, rects = [Rect, ...]) -> [Color, ...]
 finds the average color of a surface
 
 pygame.transform.threshold
  threshold(dest_surf, surf, search_color, threshold=(0,0,0,0), set_color=(0,0,0,0), set_behavior=1, search_surf=None, inverse_set=False) -> num_threshold_pixels
 finds which, and how many pixels in a surface are within a threshold of a 'search_color' or a 'search_surf'.
 
+pygame.transform.RotationCache
+ RotationCache(max_bytes=16777216, angle_step=1.0, check_source=True) -> RotationCache
+pygame object that keeps rotated surfaces for reuse
+
+pygame.transform.RotationCache.rotate
+ rotate(Surface, angle) -> Surface
+rotate an image, reusing an earlier result for the same angle
+
+pygame.transform.RotationCache.rotozoom
+ rotozoom(Surface, angle, scale) -> Surface
+filtered scale and rotation, reusing an earlier result
+
+pygame.transform.RotationCache.invalidate
+ invalidate(Surface=None) -> None
+forget the results for a surface, or for every surface
+
+pygame.transform.RotationCache.get_stats
+ get_stats() -> dict
+get the hit, miss and size counts of the cache
+
+pygame.transform.rotation_atlas
+ rotation_atlas(Surface, count, scale=1.0, columns=None) -> (Surface, rects)
+draw a surface at many angles into one surface
+
 */
\ No newline at end of file
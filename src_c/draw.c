@@ -79,7 +79,7 @@ draw_arc(SDL_Surface *dst, int x, int y, int radius1, int radius2,
 static void
 draw_ellipse(SDL_Surface *dst, int x, int y, int width, int height, int solid,
              Uint32 color);
-static void
+static int
 draw_fillpoly(SDL_Surface *dst, int *vx, int *vy, int n, Uint32 color);
 
 // validation of a draw color
@@ -142,7 +142,9 @@ aaline(PyObject *self, PyObject *arg, PyObject *kwargs)
     pts[1] = starty;
     pts[2] = endx;
     pts[3] = endy;
+    Py_BEGIN_ALLOW_THREADS;
     anydraw = clip_and_draw_aaline(surf, &surf->clip_rect, color, pts, blend);
+    Py_END_ALLOW_THREADS;
 
     if (!pgSurface_Unlock(surfobj)) {
         return RAISE(PyExc_RuntimeError, "error unlocking surface");
@@ -227,8 +229,10 @@ line(PyObject *self, PyObject *arg, PyObject *kwargs)
     pts[1] = starty;
     pts[2] = endx;
     pts[3] = endy;
+    Py_BEGIN_ALLOW_THREADS;
     anydraw =
         clip_and_draw_line_width(surf, &surf->clip_rect, color, width, pts);
+    Py_END_ALLOW_THREADS;
 
     if (!pgSurface_Unlock(surfobj)) {
         return RAISE(PyExc_RuntimeError, "error unlocking surface");
@@ -306,6 +310,7 @@ aalines(PyObject *self, PyObject *arg)
         return NULL;
     }
 
+    Py_BEGIN_ALLOW_THREADS;
     for (loop = 1; loop < length; ++loop) {
         pts[0] = xlist[loop - 1];
         pts[1] = ylist[loop - 1];
@@ -320,6 +325,7 @@ aalines(PyObject *self, PyObject *arg)
         pts[3] = ylist[0];
         clip_and_draw_aaline(surf, &surf->clip_rect, color, pts, blend);
     }
+    Py_END_ALLOW_THREADS;
 
     PyMem_Del(xlist);
     PyMem_Del(ylist);
@@ -401,6 +407,7 @@ lines(PyObject *self, PyObject *arg)
         return NULL;
     }
 
+    Py_BEGIN_ALLOW_THREADS;
     for (loop = 1; loop < length; ++loop) {
         pts[0] = xlist[loop - 1];
         pts[1] = ylist[loop - 1];
@@ -415,6 +422,7 @@ lines(PyObject *self, PyObject *arg)
         pts[3] = ylist[0];
         clip_and_draw_line_width(surf, &surf->clip_rect, color, width, pts);
     }
+    Py_END_ALLOW_THREADS;
 
     PyMem_Del(xlist);
     PyMem_Del(ylist);
@@ -481,11 +489,13 @@ arc(PyObject *self, PyObject *arg, PyObject *kwargs)
 
     width = MIN(width, MIN(rect->w, rect->h) / 2);
 
+    Py_BEGIN_ALLOW_THREADS;
     for (loop = 0; loop < width; ++loop) {
         draw_arc(surf, rect->x + rect->w / 2, rect->y + rect->h / 2,
                  rect->w / 2 - loop, rect->h / 2 - loop, angle_start,
                  angle_stop, color);
     }
+    Py_END_ALLOW_THREADS;
 
     if (!pgSurface_Unlock(surfobj)) {
         return RAISE(PyExc_RuntimeError, "error unlocking surface");
@@ -544,6 +554,7 @@ ellipse(PyObject *self, PyObject *arg, PyObject *kwargs)
         return RAISE(PyExc_RuntimeError, "error locking surface");
     }
 
+    Py_BEGIN_ALLOW_THREADS;
     if (!width) {
         /* Draw a filled ellipse. */
         draw_ellipse(surf, rect->x + rect->w / 2, rect->y + rect->h / 2,
@@ -556,6 +567,7 @@ ellipse(PyObject *self, PyObject *arg, PyObject *kwargs)
                          rect->w - loop, rect->h - loop, 0, color);
         }
     }
+    Py_END_ALLOW_THREADS;
 
     if (!pgSurface_Unlock(surfobj)) {
         return RAISE(PyExc_RuntimeError, "error unlocking surface");
@@ -620,6 +632,7 @@ circle(PyObject *self, PyObject *args, PyObject *kwargs)
         return RAISE(PyExc_RuntimeError, "error locking surface");
     }
 
+    Py_BEGIN_ALLOW_THREADS;
     if (!width) {
         draw_ellipse(surf, posx, posy, radius * 2, radius * 2, 1, color);
     }
@@ -640,6 +653,7 @@ circle(PyObject *self, PyObject *args, PyObject *kwargs)
                          2 * (radius - loop), 0, color);
         }
     }
+    Py_END_ALLOW_THREADS;
 
     if (!pgSurface_Unlock(surfobj)) {
         return RAISE(PyExc_RuntimeError, "error unlocking surface");
@@ -736,7 +750,9 @@ polygon(PyObject *self, PyObject *arg, PyObject *kwargs)
         return RAISE(PyExc_RuntimeError, "error locking surface");
     }
 
-    draw_fillpoly(surf, xlist, ylist, length, color);
+    Py_BEGIN_ALLOW_THREADS;
+    result = draw_fillpoly(surf, xlist, ylist, length, color);
+    Py_END_ALLOW_THREADS;
     PyMem_Del(xlist);
     PyMem_Del(ylist);
 
@@ -744,6 +760,10 @@ polygon(PyObject *self, PyObject *arg, PyObject *kwargs)
         return RAISE(PyExc_RuntimeError, "error unlocking surface");
     }
 
+    if (result) {
+        return PyErr_NoMemory();
+    }
+
     left = MAX(left, surf->clip_rect.x);
     top = MAX(top, surf->clip_rect.y);
     right = MIN(right, surf->clip_rect.x + surf->clip_rect.w);
@@ -1780,7 +1800,9 @@ compare_int(const void *a, const void *b)
     return (*(const int *)a) - (*(const int *)b);
 }
 
-static void
+/* Called without the GIL, so returns -1 rather than raising MemoryError.
+ */
+static int
 draw_fillpoly(SDL_Surface *dst, int *point_x, int *point_y, int num_points,
               Uint32 color)
 {
@@ -1794,10 +1816,9 @@ draw_fillpoly(SDL_Surface *dst, int *point_x, int *point_y, int num_points,
     int x2, y2;
     /* x_intersect are the x-coordinates of intersections of the polygon
      * with some horizontal line */
-    int *x_intersect = PyMem_New(int, num_points);
+    int *x_intersect = (int *)malloc(sizeof(int) * num_points);
     if (x_intersect == NULL) {
-        PyErr_NoMemory();
-        return;
+        return -1;
     }
 
     /* Determine Y maxima */
@@ -1819,8 +1840,8 @@ draw_fillpoly(SDL_Surface *dst, int *point_x, int *point_y, int num_points,
             maxx = MAX(maxx, point_x[i]);
         }
         drawhorzlineclip(dst, color, minx, miny, maxx);
-        PyMem_Free(x_intersect);
-        return;
+        free(x_intersect);
+        return 0;
     }
 
     /* Draw, scanning y
@@ -1886,7 +1907,8 @@ draw_fillpoly(SDL_Surface *dst, int *point_x, int *point_y, int num_points,
             drawhorzlineclip(dst, color, point_x[i], y, point_x[i_previous]);
         }
     }
-    PyMem_Free(x_intersect);
+    free(x_intersect);
+    return 0;
 }
 
 static PyMethodDef _draw_methods[] = {
@@ -182,10 +182,34 @@ font_resource(const char *filename)
     return result;
 }
 
+/* Drop the fonts kept by SysFont(..., cache=True) while they can still be
+   closed, so the cache holds no TTF_Font from before a quit. */
+static void
+font_clear_sysfont_cache(void)
+{
+    PyObject *sysfont, *cache, *result;
+    PyObject *type, *value, *traceback;
+
+    sysfont = PyDict_GetItemString(PyImport_GetModuleDict(), "pygame.sysfont");
+    if (!sysfont) {
+        return;
+    }
+    PyErr_Fetch(&type, &value, &traceback);
+    cache = PyObject_GetAttrString(sysfont, "Fontcache");
+    if (cache) {
+        result = PyObject_CallMethod(cache, "clear", NULL);
+        Py_XDECREF(result);
+        Py_DECREF(cache);
+    }
+    PyErr_Clear();
+    PyErr_Restore(type, value, traceback);
+}
+
 static void
 font_autoquit(void)
 {
     if (font_initialized) {
+        font_clear_sysfont_cache();
         font_initialized = 0;
         TTF_Quit();
     }
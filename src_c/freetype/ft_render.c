@@ -317,6 +317,9 @@ _PGFT_Render_ExistingSurface(FreeTypeInstance *ft, pgFontObject *fontobj,
     }
     if (font_text->length == 0) {
         /* Nothing to rendering */
+        if (locked) {
+            SDL_UnlockSurface(surface);
+        }
         r->x = 0;
         r->y = 0;
         r->w = 0;
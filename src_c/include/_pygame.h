@@ -247,6 +247,10 @@ typedef struct {
     (*(GAME_Rect * (*)(PyObject *, GAME_Rect *)) \
         PYGAMEAPI_GET_SLOT(rect, 3))
 
+#define pgRect_RectsFromObject                      \
+    (*(GAME_Rect * (*)(PyObject *, Py_ssize_t *)) \
+        PYGAMEAPI_GET_SLOT(rect, 4))
+
 #define import_pygame_rect() IMPORT_PYGAME_MODULE(rect)
 #endif /* ~PYGAMEAPI_RECT_INTERNAL */
 
@@ -369,8 +373,10 @@ typedef struct {
     PyObject *weakreflist;
     PyObject *locklist;
     PyObject *dependency;
+    unsigned long version; /* changes whenever the pixels may have */
 } pgSurfaceObject;
 #define pgSurface_AsSurface(x) (((pgSurfaceObject *)x)->surf)
+#define pgSurface_Touch(x) (++((pgSurfaceObject *)x)->version)
 
 #ifndef PYGAMEAPI_SURFACE_INTERNAL
 #define pgSurface_Type \
@@ -26,6 +26,7 @@ typedef struct {
   PyObject_HEAD
   bitmask_t *mask;
   void *bufdata;
+  void *dfdata;
 } pgMaskObject;
 
 #define pgMask_AsBitmap(x) (((pgMaskObject*)x)->mask)
@@ -33,6 +33,8 @@
 
 #include "pgcompat.h"
 
+#include "pgbufferproxy.h"
+
 #include "doc/mask_doc.h"
 
 #include "structmember.h"
@@ -43,6 +45,12 @@
 #define M_PI 3.14159265358979323846
 #endif
 
+#if SDL_BYTEORDER == SDL_LIL_ENDIAN
+#define MASK_MY_ENDIAN '<'
+#else
+#define MASK_MY_ENDIAN '>'
+#endif
+
 /* Macro to create mask objects. This will call the type's tp_new and tp_init.
  * Params:
  *     w: width of mask
@@ -59,6 +67,63 @@ static PyTypeObject pgMask_Type;
 static PG_INLINE pgMaskObject *
 _create_mask_using_bitmask(bitmask_t *bitmask);
 
+/* The cached distance field of a mask, see Mask.distance_field().
+ * Everything in the area from (x0, y0) to (x1, y1) may have changed since
+ * the field was last brought up to date, nothing has when x0 >= x1.
+ */
+typedef struct {
+    PyObject *field; /* bytes of w * h floats, row by row */
+    float *blocks;   /* the least distance in each block of the field */
+    int limit;
+    int x0, y0, x1, y1;
+    int busy; /* calls using the blocks with the GIL released */
+} mask_dfield;
+
+/* Records that the bits of a mask in the given rect may have changed, so
+ * its distance field, if it has one, is brought up to date before it is
+ * used again. The rect is clipped to the mask.
+ */
+static void
+_mask_changed(PyObject *maskobj, int x, int y, int w, int h)
+{
+    mask_dfield *dfield;
+    bitmask_t *mask;
+    int x1, y1;
+
+    if (!PyObject_TypeCheck(maskobj, &pgMask_Type)) {
+        return;
+    }
+    dfield = (mask_dfield *)((pgMaskObject *)maskobj)->dfdata;
+    mask = pgMask_AsBitmap(maskobj);
+    if (NULL == dfield || NULL == mask) {
+        return;
+    }
+
+    x1 = MIN(mask->w, x + MAX(w, 0));
+    y1 = MIN(mask->h, y + MAX(h, 0));
+    x = MAX(x, 0);
+    y = MAX(y, 0);
+    if (x >= x1 || y >= y1) {
+        return;
+    }
+
+    if (dfield->x0 >= dfield->x1) {
+        dfield->x0 = x;
+        dfield->y0 = y;
+        dfield->x1 = x1;
+        dfield->y1 = y1;
+    }
+    else {
+        dfield->x0 = MIN(dfield->x0, x);
+        dfield->y0 = MIN(dfield->y0, y);
+        dfield->x1 = MAX(dfield->x1, x1);
+        dfield->y1 = MAX(dfield->y1, y1);
+    }
+}
+
+#define _mask_changed_all(maskobj) _mask_changed((maskobj), 0, 0, INT_MAX, \
+                                                 INT_MAX)
+
 /* mask object methods */
 
 static PyObject *
@@ -146,6 +211,7 @@ mask_set_at(PyObject *self, PyObject *args)
         else {
             bitmask_clearbit(mask, x, y);
         }
+        _mask_changed(self, x, y, 1, 1);
     }
     else {
         PyErr_Format(PyExc_IndexError, "%d, %d is out of bounds", x, y);
@@ -219,12 +285,113 @@ mask_overlap_mask(PyObject *self, PyObject *args)
     return (PyObject *)output_maskobj;
 }
 
+/* Overlaps this mask with every mask in a sequence, each at its own offset.
+ *
+ * Returns a list of the indices of the masks that overlap, or of
+ * (index, (x, y)) tuples, with the first point of intersection, if the
+ * points keyword is true.
+ */
+static PyObject *
+mask_overlap_batch(PyObject *self, PyObject *args, PyObject *kwargs)
+{
+    bitmask_t *mask = pgMask_AsBitmap(self);
+    PyObject *masks = NULL, *offsets = NULL;
+    PyObject *masks_seq = NULL, *offsets_seq = NULL;
+    PyObject *hits = NULL, *hit = NULL;
+    PyObject *maskobj;
+    Py_ssize_t i, length;
+    int x, y, xp, yp, val;
+    int points = 0; /* Default is false. */
+    static char *keywords[] = {"masks", "offsets", "points", NULL};
+#if PY3
+    const char *format = "OO|p";
+#else
+    const char *format = "OO|i";
+#endif
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, format, keywords, &masks,
+                                     &offsets, &points)) {
+        return NULL; /* Exception already set. */
+    }
+
+    masks_seq = PySequence_Fast(masks, "masks must be a sequence of masks");
+    if (NULL == masks_seq) {
+        return NULL; /* Exception already set. */
+    }
+    offsets_seq =
+        PySequence_Fast(offsets, "offsets must be a sequence of offsets");
+    if (NULL == offsets_seq) {
+        goto error; /* Exception already set. */
+    }
+
+    length = PySequence_Fast_GET_SIZE(masks_seq);
+    if (PySequence_Fast_GET_SIZE(offsets_seq) != length) {
+        PyErr_SetString(PyExc_ValueError,
+                        "masks and offsets must be the same length");
+        goto error;
+    }
+
+    hits = PyList_New(0);
+    if (NULL == hits) {
+        goto error; /* Exception already set. */
+    }
+
+    for (i = 0; i < length; ++i) {
+        maskobj = PySequence_Fast_GET_ITEM(masks_seq, i);
+        if (!PyObject_TypeCheck(maskobj, &pgMask_Type)) {
+            PyErr_Format(PyExc_TypeError,
+                         "masks[%zd] must be a Mask, not %.100s", i,
+                         Py_TYPE(maskobj)->tp_name);
+            goto error;
+        }
+        if (!pg_TwoIntsFromObj(PySequence_Fast_GET_ITEM(offsets_seq, i), &x,
+                               &y)) {
+            PyErr_Format(PyExc_TypeError,
+                         "offsets[%zd] must be a pair of integers", i);
+            goto error;
+        }
+
+        if (!points) {
+            if (!bitmask_overlap(mask, pgMask_AsBitmap(maskobj), x, y)) {
+                continue;
+            }
+            hit = PyInt_FromSsize_t(i);
+        }
+        else {
+            val = bitmask_overlap_pos(mask, pgMask_AsBitmap(maskobj), x, y,
+                                      &xp, &yp);
+            if (!val) {
+                continue;
+            }
+            hit = Py_BuildValue("(n(ii))", i, xp, yp);
+        }
+
+        if (NULL == hit || PyList_Append(hits, hit)) {
+            goto error; /* Exception already set. */
+        }
+        Py_DECREF(hit);
+        hit = NULL;
+    }
+
+    Py_DECREF(masks_seq);
+    Py_DECREF(offsets_seq);
+    return hits;
+
+error:
+    Py_XDECREF(hit);
+    Py_XDECREF(hits);
+    Py_XDECREF(offsets_seq);
+    Py_DECREF(masks_seq);
+    return NULL;
+}
+
 static PyObject *
 mask_fill(PyObject *self, PyObject *args)
 {
     bitmask_t *mask = pgMask_AsBitmap(self);
 
     bitmask_fill(mask);
+    _mask_changed_all(self);
 
     Py_RETURN_NONE;
 }
@@ -235,6 +402,7 @@ mask_clear(PyObject *self, PyObject *args)
     bitmask_t *mask = pgMask_AsBitmap(self);
 
     bitmask_clear(mask);
+    _mask_changed_all(self);
 
     Py_RETURN_NONE;
 }
@@ -245,6 +413,7 @@ mask_invert(PyObject *self, PyObject *args)
     bitmask_t *mask = pgMask_AsBitmap(self);
 
     bitmask_invert(mask);
+    _mask_changed_all(self);
 
     Py_RETURN_NONE;
 }
@@ -286,6 +455,7 @@ mask_draw(PyObject *self, PyObject *args)
     othermask = pgMask_AsBitmap(maskobj);
 
     bitmask_draw(mask, othermask, x, y);
+    _mask_changed(self, x, y, othermask->w, othermask->h);
 
     Py_RETURN_NONE;
 }
@@ -304,6 +474,7 @@ mask_erase(PyObject *self, PyObject *args)
     othermask = pgMask_AsBitmap(maskobj);
 
     bitmask_erase(mask, othermask, x, y);
+    _mask_changed(self, x, y, othermask->w, othermask->h);
 
     Py_RETURN_NONE;
 }
@@ -538,6 +709,7 @@ mask_convolve(PyObject *aobj, PyObject *args)
     }
 
     bitmask_convolve(a, b, pgMask_AsBitmap(oobj), xoffset, yoffset);
+    _mask_changed_all(oobj);
 
     return oobj;
 }
@@ -607,68 +779,221 @@ set_pixel_color(Uint8 *pixel, Uint8 bpp, Uint32 color)
     }
 }
 
-/* For each surface pixel's alpha that is greater than the threshold,
- * the corresponding bitmask bit is set.
+/* set_from_threshold() and set_from_colorkey() work out the bits of a row
+ * a word at a time, with a mask word's worth of pixels. For 32 bit pixels
+ * this is done four pixels at a time with SSE2, which is always there on
+ * x86-64.
+ */
+#if defined(__SSE2__) || defined(_M_X64) || \
+    (defined(_M_IX86_FP) && _M_IX86_FP >= 2)
+#define MASK_SSE2
+#include <emmintrin.h>
+#endif
+
+/* Gets the bits for n <= BITMASK_W_LEN 32 bit pixels, with bit i set if
+ * the alpha of pixel i, which has no loss, is greater than the threshold.
+ */
+static PG_INLINE BITMASK_W
+alpha_bits32(const Uint32 *pixels, int n, int ashift, int threshold)
+{
+    BITMASK_W bits = 0;
+    int i = 0;
+#if defined(MASK_SSE2)
+    __m128i shift = _mm_cvtsi32_si128(ashift);
+    __m128i byte = _mm_set1_epi32(0xFF);
+    __m128i limit = _mm_set1_epi32(threshold);
+    __m128i alpha;
+
+    for (; i + 4 <= n; i += 4) {
+        alpha = _mm_and_si128(
+            _mm_srl_epi32(_mm_loadu_si128((const __m128i *)(pixels + i)),
+                          shift),
+            byte);
+        bits |= (BITMASK_W)_mm_movemask_ps(
+                    _mm_castsi128_ps(_mm_cmpgt_epi32(alpha, limit)))
+                << i;
+    }
+#endif /* MASK_SSE2 */
+
+    for (; i < n; ++i) {
+        bits |= (BITMASK_W)((int)((pixels[i] >> ashift) & 0xFF) > threshold)
+                << i;
+    }
+    return bits;
+}
+
+/* Gets the bits for n <= BITMASK_W_LEN 32 bit pixels, with bit i set if
+ * pixel i is not the colorkey.
+ */
+static PG_INLINE BITMASK_W
+colorkey_bits32(const Uint32 *pixels, int n, Uint32 colorkey)
+{
+    BITMASK_W bits = 0;
+    int i = 0;
+#if defined(MASK_SSE2)
+    __m128i key = _mm_set1_epi32((int)colorkey);
+
+    for (; i + 4 <= n; i += 4) {
+        bits |=
+            (BITMASK_W)(_mm_movemask_ps(_mm_castsi128_ps(_mm_cmpeq_epi32(
+                            _mm_loadu_si128((const __m128i *)(pixels + i)),
+                            key))) ^
+                        0xF)
+            << i;
+    }
+#endif /* MASK_SSE2 */
+
+    for (; i < n; ++i) {
+        bits |= (BITMASK_W)(pixels[i] != colorkey) << i;
+    }
+    return bits;
+}
+
+/* Puts n bits into a row of a bitmask, from bit x on, where the n bits are
+ * all in one word.
+ */
+static PG_INLINE void
+put_row_bits(bitmask_t *bitmask, int x, int y, int n, BITMASK_W bits)
+{
+    BITMASK_W *word = bitmask->bits + x / BITMASK_W_LEN * bitmask->h + y;
+    int offset = x % BITMASK_W_LEN;
+    BITMASK_W keep =
+        n < (int)BITMASK_W_LEN ? ~(((((BITMASK_W)1) << n) - 1) << offset) : 0;
+
+    *word = (*word & keep) | (bits << offset);
+}
+
+/* For each surface pixel's alpha that is greater than the threshold, the
+ * corresponding bitmask bit is set, and the other bits are cleared, in the
+ * given area of the surface.
  *
  * Params:
  *     surf: surface
  *     bitmask: bitmask to alter
  *     threshold: threshold used check surface pixels (alpha) against
+ *     area: the area to set, which must be inside the surface and the
+ *         bitmask
  *
  * Returns:
  *     void
  */
 static void
-set_from_threshold(SDL_Surface *surf, bitmask_t *bitmask, int threshold)
+set_from_threshold(SDL_Surface *surf, bitmask_t *bitmask, int threshold,
+                   SDL_Rect *area)
 {
     SDL_PixelFormat *format = surf->format;
     Uint8 bpp = format->BytesPerPixel;
-    Uint8 *pixel = NULL;
+    Uint8 *row, *pixel;
     Uint8 rgba[4];
-    int x, y;
+    BITMASK_W bits;
+    int x, y, i, n;
+    int x_end = area->x + area->w;
+    /* can the alpha be read straight from 32 bit pixels? */
+    int fast = (bpp == 4 && format->Amask == (Uint32)0xFF << format->Ashift);
 
-    for (y = 0; y < surf->h; ++y) {
-        pixel = (Uint8 *)surf->pixels + y * surf->pitch;
+    for (y = area->y; y < area->y + area->h; ++y) {
+        row = (Uint8 *)surf->pixels + y * surf->pitch;
+
+        for (x = area->x; x < x_end; x += n) {
+            n = MIN((int)BITMASK_W_LEN - x % (int)BITMASK_W_LEN, x_end - x);
 
-        for (x = 0; x < surf->w; ++x, pixel += bpp) {
-            SDL_GetRGBA(get_pixel_color(pixel, bpp), format, rgba, rgba + 1,
-                        rgba + 2, rgba + 3);
-            if (rgba[3] > threshold) {
-                bitmask_setbit(bitmask, x, y);
+            if (fast) {
+                bits = alpha_bits32((Uint32 *)row + x, n, format->Ashift,
+                                    MAX(MIN(threshold, 255), -1));
+            }
+            else {
+                bits = 0;
+                pixel = row + x * bpp;
+                for (i = 0; i < n; ++i, pixel += bpp) {
+                    SDL_GetRGBA(get_pixel_color(pixel, bpp), format, rgba,
+                                rgba + 1, rgba + 2, rgba + 3);
+                    bits |= (BITMASK_W)(rgba[3] > threshold) << i;
+                }
             }
+            put_row_bits(bitmask, x, y, n, bits);
         }
     }
 }
 
 /* For each surface pixel's color that is not equal to the colorkey, the
- * corresponding bitmask bit is set.
+ * corresponding bitmask bit is set, and the other bits are cleared, in the
+ * given area of the surface.
  *
  * Params:
  *     surf: surface
  *     bitmask: bitmask to alter
  *     colorkey: color used to check surface pixels against
+ *     area: the area to set, which must be inside the surface and the
+ *         bitmask
  *
  * Returns:
  *     void
  */
 static void
-set_from_colorkey(SDL_Surface *surf, bitmask_t *bitmask, Uint32 colorkey)
+set_from_colorkey(SDL_Surface *surf, bitmask_t *bitmask, Uint32 colorkey,
+                  SDL_Rect *area)
 {
     Uint8 bpp = surf->format->BytesPerPixel;
-    Uint8 *pixel = NULL;
-    int x, y;
+    Uint8 *row, *pixel;
+    BITMASK_W bits;
+    int x, y, i, n;
+    int x_end = area->x + area->w;
 
-    for (y = 0; y < surf->h; ++y) {
-        pixel = (Uint8 *)surf->pixels + y * surf->pitch;
+    for (y = area->y; y < area->y + area->h; ++y) {
+        row = (Uint8 *)surf->pixels + y * surf->pitch;
 
-        for (x = 0; x < surf->w; ++x, pixel += bpp) {
-            if (get_pixel_color(pixel, bpp) != colorkey) {
-                bitmask_setbit(bitmask, x, y);
+        for (x = area->x; x < x_end; x += n) {
+            n = MIN((int)BITMASK_W_LEN - x % (int)BITMASK_W_LEN, x_end - x);
+
+            if (bpp == 4) {
+                bits = colorkey_bits32((Uint32 *)row + x, n, colorkey);
+            }
+            else {
+                bits = 0;
+                pixel = row + x * bpp;
+                for (i = 0; i < n; ++i, pixel += bpp) {
+                    bits |= (BITMASK_W)(get_pixel_color(pixel, bpp) !=
+                                        colorkey)
+                            << i;
+                }
             }
+            put_row_bits(bitmask, x, y, n, bits);
         }
     }
 }
 
+/* Sets the bits of a mask in an area from a surface, by its colorkey if it
+ * has one, otherwise by the alpha threshold. The surface must be locked.
+ * The GIL is released.
+ */
+static void
+set_from_surface(SDL_Surface *surf, bitmask_t *bitmask, int threshold,
+                 SDL_Rect *area)
+{
+    Uint32 colorkey;
+    int use_thresh = 1;
+
+    Py_BEGIN_ALLOW_THREADS; /* Release the GIL. */
+
+#if IS_SDLv1
+    if (surf->flags & SDL_SRCCOLORKEY) {
+        colorkey = surf->format->colorkey;
+        use_thresh = 0;
+    }
+#else  /* IS_SDLv2 */
+    use_thresh = (SDL_GetColorKey(surf, &colorkey) == -1);
+#endif /* IS_SDLv2 */
+
+    if (use_thresh) {
+        set_from_threshold(surf, bitmask, threshold, area);
+    }
+    else {
+        set_from_colorkey(surf, bitmask, colorkey, area);
+    }
+
+    Py_END_ALLOW_THREADS; /* Obtain the GIL. */
+}
+
 /* Creates a mask from a given surface.
  *
  * Returns:
@@ -680,9 +1005,8 @@ mask_from_surface(PyObject *self, PyObject *args)
     SDL_Surface *surf = NULL;
     PyObject *surfobj = NULL;
     pgMaskObject *maskobj = NULL;
-    Uint32 colorkey;
+    SDL_Rect area;
     int threshold = 127; /* default value */
-    int use_thresh = 1;
 
     if (!PyArg_ParseTuple(args, "O!|i", &pgSurface_Type, &surfobj,
                           &threshold)) {
@@ -712,25 +1036,10 @@ mask_from_surface(PyObject *self, PyObject *args)
         return RAISE(PyExc_RuntimeError, "cannot lock surface");
     }
 
-    Py_BEGIN_ALLOW_THREADS; /* Release the GIL. */
-
-#if IS_SDLv1
-    if (surf->flags & SDL_SRCCOLORKEY) {
-        colorkey = surf->format->colorkey;
-        use_thresh = 0;
-    }
-#else  /* IS_SDLv2 */
-    use_thresh = (SDL_GetColorKey(surf, &colorkey) == -1);
-#endif /* IS_SDLv2 */
-
-    if (use_thresh) {
-        set_from_threshold(surf, maskobj->mask, threshold);
-    }
-    else {
-        set_from_colorkey(surf, maskobj->mask, colorkey);
-    }
-
-    Py_END_ALLOW_THREADS; /* Obtain the GIL. */
+    area.x = area.y = 0;
+    area.w = surf->w;
+    area.h = surf->h;
+    set_from_surface(surf, maskobj->mask, threshold, &area);
 
     if (!pgSurface_Unlock(surfobj)) {
         Py_DECREF((PyObject *)maskobj);
@@ -992,31 +1301,38 @@ mask_from_threshold(PyObject *self, PyObject *args)
  * need to be checked. It stores equivalence information in an array based
  * union-find.
  *
+ * This labels the rows y0 to y1 - 1 only, as if they were the whole mask.
+ * New labels start after first_label, so bands of rows can be labelled
+ * apart, each with its own range of labels, and joined afterwards (see
+ * cc_label_tiled()).
+ *
  * Params:
  *     input - the input mask
- *     image - an array to store labelled pixels
+ *     y0 - the first row to label
+ *     y1 - the row after the last row to label
+ *     image - an array to store labelled pixels, for the whole mask
  *     ufind - the union-find label equivalence array
  *     largest - an array to store the number of pixels for each label
+ *     first_label - the labels given out start after this one
  *
  * Returns:
- *     the highest label in the labelled image
+ *     the highest label in the labelled rows
  */
-unsigned int
-cc_label(bitmask_t *input, unsigned int *image, unsigned int *ufind,
-         unsigned int *largest)
+static unsigned int
+cc_label_rows(bitmask_t *input, unsigned int y0, unsigned int y1,
+              unsigned int *image, unsigned int *ufind, unsigned int *largest,
+              unsigned int first_label)
 {
     unsigned int *buf;
-    unsigned int x, y, w, h, root, aroot, croot, temp, label;
+    unsigned int x, y, w, root, aroot, croot, temp, label;
 
-    label = 0;
+    label = first_label;
     w = input->w;
-    h = input->h;
 
-    ufind[0] = 0;
-    buf = image;
+    buf = image + (size_t)y0 * w;
 
     /* special case for first pixel */
-    if (bitmask_getbit(input, 0, 0)) { /* process for a new connected comp: */
+    if (bitmask_getbit(input, 0, y0)) { /* process for a new connected comp: */
         label++;                       /* create a new label */
         *buf = label;                  /* give the pixel the label */
         ufind[label] = label; /* put the label in the equivalence array */
@@ -1031,7 +1347,7 @@ cc_label(bitmask_t *input, unsigned int *image, unsigned int *ufind,
            Go over the first row except the first pixel.
     */
     for (x = 1; x < w; x++) {
-        if (bitmask_getbit(input, x, 0)) {
+        if (bitmask_getbit(input, x, y0)) {
             if (*(buf - 1)) { /* d label */
                 *buf = *(buf - 1);
             }
@@ -1050,13 +1366,13 @@ cc_label(bitmask_t *input, unsigned int *image, unsigned int *ufind,
     }
 
     /* the rest of the image */
-    for (y = 1; y < h; y++) {
+    for (y = y0 + 1; y < y1; y++) {
         /* first pixel of the row */
         if (bitmask_getbit(input, 0, y)) {
             if (*(buf - w)) { /* b label */
                 *buf = *(buf - w);
             }
-            else if (*(buf - w + 1)) { /* c label */
+            else if (w > 1 && *(buf - w + 1)) { /* c label */
                 *buf = *(buf - w + 1);
             }
             else { /* create label */
@@ -1183,6 +1499,248 @@ cc_label(bitmask_t *input, unsigned int *image, unsigned int *ufind,
     return label;
 }
 
+/* Labels the whole of the input mask, see cc_label_rows().
+ *
+ * Returns:
+ *     the highest label in the labelled image
+ */
+unsigned int
+cc_label(bitmask_t *input, unsigned int *image, unsigned int *ufind,
+         unsigned int *largest)
+{
+    ufind[0] = 0;
+    return cc_label_rows(input, 0, input->h, image, ufind, largest, 0);
+}
+
+/* The number of labels a band of w x h pixels can need, not counting 0 */
+#define CC_MAX_LABELS(w, h) (((w) / 2 + 1) * ((h) / 2 + 1))
+
+/* A band of rows for cc_label_tiled() to label */
+typedef struct {
+    bitmask_t *input;
+    unsigned int *image;
+    unsigned int *ufind;
+    unsigned int *largest;
+    unsigned int y0, y1;
+    unsigned int first_label;
+    unsigned int last_label;
+} cc_band;
+
+static int
+cc_label_band(void *data)
+{
+    cc_band *band = (cc_band *)data;
+
+    band->last_label =
+        cc_label_rows(band->input, band->y0, band->y1, band->image,
+                      band->ufind, band->largest, band->first_label);
+    return 0;
+}
+
+/* Joins the labels a and b, the lower root becoming the root of both */
+static void
+cc_union(unsigned int *ufind, unsigned int a, unsigned int b)
+{
+    while (ufind[a] < a) {
+        a = ufind[a];
+    }
+    while (ufind[b] < b) {
+        b = ufind[b];
+    }
+    if (a < b) {
+        ufind[b] = a;
+    }
+    else if (b < a) {
+        ufind[a] = b;
+    }
+}
+
+/* The number of entries the ufind and largest arrays need for
+ * cc_label_tiled() to label a w x h mask in the given number of bands.
+ */
+static size_t
+cc_tiled_size(unsigned int w, unsigned int h, int bands)
+{
+    size_t size = 1;
+    int k;
+
+    for (k = 0; k < bands; ++k) {
+        size += CC_MAX_LABELS(w, h * (k + 1) / bands - h * k / bands);
+    }
+    return size;
+}
+
+/* Labels the input mask in horizontal bands, each band in its own thread
+ * when SDL threads are available, then joins the labels that meet across
+ * the edges between the bands.
+ *
+ * Each band gets a range of labels above those of the bands over it, so
+ * labels still go up in raster order and every component has the label of
+ * its first pixel as its root, as it does with cc_label(). The labels of a
+ * range a band does not use are left out of the union-find array with a
+ * root of 0.
+ *
+ * The ufind and largest arrays need cc_tiled_size() entries. The GIL may
+ * be released.
+ *
+ * Params:
+ *     input - the input mask
+ *     image - an array to store labelled pixels
+ *     ufind - the union-find label equivalence array
+ *     largest - an array to store the number of pixels for each label
+ *     bands - the number of bands, from 1 to the mask height
+ *
+ * Returns:
+ *     the highest label in the labelled image
+ *     0 on memory allocation error, with nothing labelled
+ */
+static unsigned int
+cc_label_tiled(bitmask_t *input, unsigned int *image, unsigned int *ufind,
+               unsigned int *largest, int bands)
+{
+    cc_band *band;
+#if IS_SDLv2
+    SDL_Thread **threads;
+#endif /* IS_SDLv2 */
+    unsigned int w = input->w, h = input->h;
+    unsigned int *row, *above;
+    unsigned int x, label, next;
+    int k;
+
+    if (bands <= 1) {
+        return cc_label(input, image, ufind, largest);
+    }
+
+    band = (cc_band *)malloc(sizeof(cc_band) * bands);
+    if (!band) {
+        return 0;
+    }
+#if IS_SDLv2
+    threads = (SDL_Thread **)calloc(bands, sizeof(SDL_Thread *));
+    if (!threads) {
+        free(band);
+        return 0;
+    }
+#endif /* IS_SDLv2 */
+
+    ufind[0] = 0;
+    largest[0] = 0;
+    label = 0;
+    for (k = 0; k < bands; ++k) {
+        band[k].input = input;
+        band[k].image = image;
+        band[k].ufind = ufind;
+        band[k].largest = largest;
+        band[k].y0 = h * k / bands;
+        band[k].y1 = h * (k + 1) / bands;
+        band[k].first_label = label;
+        label += CC_MAX_LABELS(w, band[k].y1 - band[k].y0);
+    }
+
+#if IS_SDLv2
+    for (k = 1; k < bands; ++k) {
+        threads[k] = SDL_CreateThread(cc_label_band, "pgmaskcc", band + k);
+        if (!threads[k]) {
+            /* this thread labels the band itself */
+            cc_label_band(band + k);
+        }
+    }
+    cc_label_band(band);
+    for (k = 1; k < bands; ++k) {
+        if (threads[k]) {
+            SDL_WaitThread(threads[k], NULL);
+        }
+    }
+    free(threads);
+#else  /* IS_SDLv1 */
+    for (k = 0; k < bands; ++k) {
+        cc_label_band(band + k);
+    }
+#endif /* IS_SDLv1 */
+
+    /* take the unused labels out */
+    for (k = 0; k < bands; ++k) {
+        next = k + 1 < bands ? band[k + 1].first_label : label;
+        for (x = band[k].last_label + 1; x <= next; ++x) {
+            ufind[x] = 0;
+            largest[x] = 0;
+        }
+    }
+
+    /* join the first row of each band to the row over it */
+    for (k = 1; k < bands; ++k) {
+        row = image + (size_t)band[k].y0 * w;
+        above = row - w;
+        for (x = 0; x < w; ++x) {
+            if (!row[x]) {
+                continue;
+            }
+            if (x > 0 && above[x - 1]) {
+                cc_union(ufind, row[x], above[x - 1]);
+            }
+            if (above[x]) {
+                cc_union(ufind, row[x], above[x]);
+            }
+            if (x + 1 < w && above[x + 1]) {
+                cc_union(ufind, row[x], above[x + 1]);
+            }
+        }
+    }
+
+    label = band[bands - 1].last_label;
+    free(band);
+    return label;
+}
+
+/* Flattens the union-find array from cc_label() or cc_label_tiled() and
+ * gives each component with at least min pixels a label from 1 up, in the
+ * order their first pixels come in the image. Afterwards ufind maps each
+ * label in the image to its component's new label, or 0 for a component
+ * with too few pixels, and largest holds the pixel count of each new label.
+ *
+ * Params:
+ *     ufind - the union-find label equivalence array, ufind[0] is 0
+ *     largest - the number of pixels for each label
+ *     label - the highest label in the labelled image
+ *     min - minimum number of pixels for a component to be kept
+ *
+ * Returns:
+ *     the number of components kept
+ */
+static unsigned int
+cc_resolve(unsigned int *ufind, unsigned int *largest, unsigned int label,
+           int min)
+{
+    unsigned int x, relabel = 0;
+
+    /* point every label at its root, adding its pixels to the root's.
+       Roots always have a lower label, so they are flattened first. */
+    for (x = 1; x <= label; x++) {
+        if (ufind[x] < x) {
+            ufind[x] = ufind[ufind[x]];
+            largest[ufind[x]] += largest[x];
+        }
+    }
+
+    for (x = 1; x <= label; x++) {
+        if (ufind[x] == x) { /* its a root */
+            if (min <= 0 || largest[x] >= (unsigned int)min) {
+                relabel++;
+                ufind[x] = relabel; /* assign the lowest label available */
+                largest[relabel] = largest[x];
+            }
+            else {
+                ufind[x] = 0;
+            }
+        }
+        else { /* its root was relabelled already */
+            ufind[x] = ufind[ufind[x]];
+        }
+    }
+
+    return relabel;
+}
+
 /* Creates a bounding rect for each connected component in the given mask.
  *
  * Allocates memory for rects.
@@ -1351,7 +1909,57 @@ mask_get_bounding_rects(PyObject *self, PyObject *args)
     return ret;
 }
 
-/* Finds all the connected components in a given mask.
+/* Labels the connected components of a mask, see cc_label_tiled() and
+ * cc_resolve().
+ *
+ * Allocates memory for labels.
+ *
+ * Params:
+ *     mask - mask to search in for the connected components
+ *     image - an array of w * h to store labelled pixels
+ *     min - minimum number of pixels for a component to be considered
+ *     bands - the number of bands to label the mask in
+ *     labels - passes back an array mapping the labels in image to the
+ *         component labels, from 1 up, or 0 for pixels of no component,
+ *         memory is allocated
+ *
+ * Returns:
+ *     the number of connected components (>= 0)
+ *     -2 on memory allocation error
+ */
+static int
+label_connected_components(bitmask_t *mask, unsigned int *image, int min,
+                           int bands, unsigned int **labels)
+{
+    unsigned int *ufind, *largest;
+    unsigned int label;
+    size_t size;
+
+    size = cc_tiled_size(mask->w, mask->h, bands);
+
+    /* the union-find array. see wikipedia for info on union find */
+    ufind = (unsigned int *)malloc(sizeof(int) * size);
+    if (!ufind) {
+        return -2;
+    }
+
+    largest = (unsigned int *)malloc(sizeof(int) * size);
+    if (!largest) {
+        free(ufind);
+        return -2;
+    }
+
+    /* do the initial labelling */
+    label = cc_label_tiled(mask, image, ufind, largest, bands);
+
+    label = cc_resolve(ufind, largest, label, min);
+
+    free(largest);
+    *labels = ufind;
+    return (int)label;
+}
+
+/* Finds all the connected components in a given mask.
  *
  * Allocates memory for components.
  *
@@ -1362,20 +1970,20 @@ mask_get_bounding_rects(PyObject *self, PyObject *args)
  *     components - passes back an array of connected component masks with the
  *         first component at index 1, memory is allocated
  *     min - minimum number of pixels for a component to be considered
+ *     bands - the number of bands to label the mask in
  *
  * Returns:
  *     the number of connected components (>= 0)
  *     -2 on memory allocation error
  */
 static int
-get_connected_components(bitmask_t *mask, bitmask_t ***components, int min)
+get_connected_components(bitmask_t *mask, bitmask_t ***components, int min,
+                         int bands)
 {
-    unsigned int *image, *ufind, *largest, *buf;
-    int x, y, w, h, label, relabel;
+    unsigned int *image, *ufind, *buf;
+    int x, y, w, h, relabel;
     bitmask_t **comps;
 
-    label = 0;
-
     w = mask->w;
     h = mask->h;
 
@@ -1389,54 +1997,16 @@ get_connected_components(bitmask_t *mask, bitmask_t ***components, int min)
         return -2;
     }
 
-    /* allocate enough space for the maximum possible connected components */
-    /* the union-find array. see wikipedia for info on union find */
-    ufind = (unsigned int *)malloc(sizeof(int) * (w / 2 + 1) * (h / 2 + 1));
-    if (!ufind) {
-        free(image);
-        return -2;
-    }
-
-    largest = (unsigned int *)malloc(sizeof(int) * (w / 2 + 1) * (h / 2 + 1));
-    if (!largest) {
+    relabel = label_connected_components(mask, image, min, bands, &ufind);
+    if (relabel == -2) {
         free(image);
-        free(ufind);
         return -2;
     }
 
-    /* do the initial labelling */
-    label = cc_label(mask, image, ufind, largest);
-
-    for (x = 1; x <= label; x++) {
-        if (ufind[x] < x) {
-            largest[ufind[x]] += largest[x];
-        }
-    }
-
-    relabel = 0;
-    /* flatten and relabel the union-find equivalence array.  Start at label 1
-       because label 0 indicates an unset pixel.  For this reason, we also use
-       <= label rather than < label. */
-    for (x = 1; x <= label; x++) {
-        if (ufind[x] < x) {             /* is it a union find root? */
-            ufind[x] = ufind[ufind[x]]; /* relabel it to its root */
-        }
-        else { /* its a root */
-            if (largest[x] >= min) {
-                relabel++;
-                ufind[x] = relabel; /* assign the lowest label available */
-            }
-            else {
-                ufind[x] = 0;
-            }
-        }
-    }
-
     if (relabel == 0) {
         /* early out, as we didn't find anything. */
         free(image);
         free(ufind);
-        free(largest);
         return 0;
     }
 
@@ -1445,7 +2015,6 @@ get_connected_components(bitmask_t *mask, bitmask_t ***components, int min)
     if (!comps) {
         free(image);
         free(ufind);
-        free(largest);
         return -2;
     }
 
@@ -1467,28 +2036,238 @@ get_connected_components(bitmask_t *mask, bitmask_t ***components, int min)
 
     free(image);
     free(ufind);
-    free(largest);
 
     *components = comps;
 
     return relabel;
 }
 
+/* The area, bounding box and pixel sums of one connected component */
+typedef struct {
+    unsigned int area;
+    int x0, y0, x1, y1;
+    PY_LONG_LONG xsum, ysum;
+} cc_stats;
+
+/* Labels the connected components of a mask in a single image, for
+ * connected_components(compact=True).
+ *
+ * Allocates memory for stats.
+ *
+ * Params:
+ *     mask - mask to search in for the connected components
+ *     image - an array of w * h, passes back the component label of each
+ *         pixel, from 1 up, or 0 for pixels of no component
+ *     min - minimum number of pixels for a component to be considered
+ *     bands - the number of bands to label the mask in
+ *     stats - passes back the stats of each component, with the first
+ *         component at index 1, memory is allocated
+ *
+ * Returns:
+ *     the number of connected components (>= 0)
+ *     -2 on memory allocation error
+ */
+static int
+get_connected_component_labels(bitmask_t *mask, unsigned int *image, int min,
+                               int bands, cc_stats **stats)
+{
+    unsigned int *ufind, *buf;
+    int x, y, w, h, num;
+    cc_stats *st, *comp;
+
+    w = mask->w;
+    h = mask->h;
+
+    *stats = NULL;
+    if (!w || !h) {
+        return 0;
+    }
+
+    num = label_connected_components(mask, image, min, bands, &ufind);
+    if (num == -2) {
+        return -2;
+    }
+
+    st = (cc_stats *)calloc(num + 1, sizeof(cc_stats));
+    if (!st) {
+        free(ufind);
+        return -2;
+    }
+
+    /* relabel the image and gather the stats in one pass */
+    buf = image;
+    for (y = 0; y < h; y++) {
+        for (x = 0; x < w; x++) {
+            *buf = ufind[*buf];
+            if (*buf) {
+                comp = st + *buf;
+                if (!comp->area) {
+                    comp->x0 = comp->x1 = x;
+                    comp->y0 = y;
+                }
+                else {
+                    comp->x0 = MIN(comp->x0, x);
+                    comp->x1 = MAX(comp->x1, x);
+                }
+                comp->y1 = y;
+                comp->area++;
+                comp->xsum += x;
+                comp->ysum += y;
+            }
+            buf++;
+        }
+    }
+
+    free(ufind);
+    *stats = st;
+    return num;
+}
+
+/* Gets the number of bands to label a mask in from the threads argument.
+ * Returns -1 with an exception set if threads is invalid.
+ */
+static int
+connected_components_bands(bitmask_t *mask, int threads)
+{
+    if (threads < 0) {
+        RAISE(PyExc_ValueError, "threads must not be negative");
+        return -1;
+    }
+#if IS_SDLv2
+    if (threads == 0)
+        threads = SDL_GetCPUCount();
+#else  /* IS_SDLv1 */
+    threads = 1;
+#endif /* IS_SDLv1 */
+    /* every band needs a row */
+    return MAX(MIN(threads, mask->h), 1);
+}
+
+/* Makes a read only BufferProxy of a (w, h) array of 4 byte items, of the
+ * given kind, 'u' or 'f', indexed like pygame.surfarray arrays. The items
+ * are in data, a bytes object, row by row.
+ */
+static PyObject *
+_mask_array_proxy(PyObject *data, char kind, int w, int h)
+{
+    PyObject *dict, *proxy;
+
+    dict = Py_BuildValue(
+        "{sN sN s(nn) s(nn) sO}", "typestr",
+        Text_FromFormat("%c%c4", MASK_MY_ENDIAN, kind), "data",
+        Py_BuildValue("(NO)", PyLong_FromVoidPtr(Bytes_AS_STRING(data)),
+                      Py_True),
+        "shape", (Py_ssize_t)w, (Py_ssize_t)h, "strides", (Py_ssize_t)4,
+        (Py_ssize_t)4 * w, "parent", data);
+    if (!dict) {
+        return NULL; /* Exception already set. */
+    }
+    proxy = PyObject_CallFunctionObjArgs((PyObject *)&pgBufproxy_Type, dict,
+                                         NULL);
+    Py_DECREF(dict);
+    return proxy;
+}
+
+/* Creates the (labels, stats) tuple of connected_components(compact=True).
+ */
+static PyObject *
+connected_components_compact(bitmask_t *mask, int min, int bands)
+{
+    PyObject *data, *labels, *stats, *item, *tmp;
+    cc_stats *st = NULL;
+    Py_ssize_t i;
+    int num;
+
+    data = Bytes_FromStringAndSize(NULL, (Py_ssize_t)sizeof(Uint32) *
+                                             mask->w * mask->h);
+    if (!data) {
+        return NULL; /* Exception already set. */
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    num = get_connected_component_labels(
+        mask, (unsigned int *)Bytes_AS_STRING(data), min, bands, &st);
+    Py_END_ALLOW_THREADS;
+
+    if (num == -2) {
+        Py_DECREF(data);
+        return RAISE(PyExc_MemoryError,
+                     "cannot allocate memory for connected components");
+    }
+
+    labels = _mask_array_proxy(data, 'u', mask->w, mask->h);
+    Py_DECREF(data);
+    if (!labels) {
+        free(st);
+        return NULL; /* Exception already set. */
+    }
+
+    stats = PyList_New(num);
+    if (!stats) {
+        free(st);
+        Py_DECREF(labels);
+        return NULL; /* Exception already set. */
+    }
+
+    for (i = 1; i <= num; ++i) {
+        tmp = pgRect_New4(st[i].x0, st[i].y0, st[i].x1 - st[i].x0 + 1,
+                          st[i].y1 - st[i].y0 + 1);
+        if (!tmp) {
+            break;
+        }
+        item = Py_BuildValue("(IN(LL))", st[i].area, tmp,
+                             st[i].xsum / st[i].area,
+                             st[i].ysum / st[i].area);
+        if (!item) {
+            break;
+        }
+        PyList_SET_ITEM(stats, i - 1, item);
+    }
+    free(st);
+
+    if (PyErr_Occurred()) {
+        Py_DECREF(labels);
+        Py_DECREF(stats);
+        return NULL;
+    }
+
+    return Py_BuildValue("(NN)", labels, stats);
+}
+
 static PyObject *
-mask_connected_components(PyObject *self, PyObject *args)
+mask_connected_components(PyObject *self, PyObject *args, PyObject *kwargs)
 {
     PyObject *mask_list = NULL;
     pgMaskObject *maskobj = NULL;
     bitmask_t **components = NULL;
     bitmask_t *mask = pgMask_AsBitmap(self);
-    int i, m, num_components, min = 0; /* Default min value. */
+    int i, m, num_components, bands, min = 0; /* Default min value. */
+    int threads = 1, compact = 0;
+    static char *keywords[] = {"min", "threads", "compact", NULL};
+
+#if PY3
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|iip", keywords, &min,
+                                     &threads, &compact)) {
+        return NULL; /* Exception already set. */
+    }
+#else
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|iii", keywords, &min,
+                                     &threads, &compact)) {
+        return NULL; /* Exception already set. */
+    }
+#endif
 
-    if (!PyArg_ParseTuple(args, "|i", &min)) {
+    bands = connected_components_bands(mask, threads);
+    if (bands < 0) {
         return NULL; /* Exception already set. */
     }
 
+    if (compact) {
+        return connected_components_compact(mask, min, bands);
+    }
+
     Py_BEGIN_ALLOW_THREADS;
-    num_components = get_connected_components(mask, &components, min);
+    num_components = get_connected_components(mask, &components, min, bands);
     Py_END_ALLOW_THREADS;
 
     if (num_components == -2) {
@@ -1740,6 +2519,79 @@ draw_to_surface(SDL_Surface *surf, bitmask_t *bitmask, int draw_setbits,
     }
 }
 
+/* Sets the bits of a mask from a surface the same size as the mask, like
+ * from_surface() does, but without creating a new mask. Only the area in the
+ * optional rect is set.
+ *
+ * Returns:
+ *     None or NULL to indicate a fail.
+ */
+static PyObject *
+mask_update_from_surface(PyObject *self, PyObject *args, PyObject *kwargs)
+{
+    bitmask_t *mask = pgMask_AsBitmap(self);
+    SDL_Surface *surf = NULL;
+    PyObject *surfobj = NULL, *rectobj = Py_None;
+    GAME_Rect *rect, temp;
+    SDL_Rect area;
+    int x0, y0, x1, y1;
+    int threshold = 127; /* default value */
+    static char *keywords[] = {"surface", "threshold", "rect", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O!|iO", keywords,
+                                     &pgSurface_Type, &surfobj, &threshold,
+                                     &rectobj)) {
+        return NULL; /* Exception already set. */
+    }
+
+    surf = pgSurface_AsSurface(surfobj);
+
+    if (surf->w != mask->w || surf->h != mask->h) {
+        return RAISE(PyExc_ValueError,
+                     "surface must be the same size as the mask");
+    }
+
+    x0 = y0 = 0;
+    x1 = mask->w;
+    y1 = mask->h;
+
+    if (rectobj != Py_None) {
+        rect = pgRect_FromObject(rectobj, &temp);
+
+        if (!rect) {
+            return RAISE(PyExc_TypeError, "rect argument is invalid");
+        }
+
+        /* Clip the rect to the mask. */
+        x0 = MAX(rect->x, 0);
+        y0 = MAX(rect->y, 0);
+        x1 = MIN(rect->x + rect->w, mask->w);
+        y1 = MIN(rect->y + rect->h, mask->h);
+    }
+
+    if (x1 <= x0 || y1 <= y0) {
+        Py_RETURN_NONE; /* Nothing to set. */
+    }
+
+    area.x = x0;
+    area.y = y0;
+    area.w = x1 - x0;
+    area.h = y1 - y0;
+
+    if (!pgSurface_Lock(surfobj)) {
+        return RAISE(PyExc_RuntimeError, "cannot lock surface");
+    }
+
+    set_from_surface(surf, mask, threshold, &area);
+
+    if (!pgSurface_Unlock(surfobj)) {
+        return RAISE(PyExc_RuntimeError, "cannot unlock surface");
+    }
+
+    _mask_changed(self, x0, y0, x1 - x0, y1 - y0);
+    Py_RETURN_NONE;
+}
+
 /* Draws a mask on a surface.
  *
  * Returns:
@@ -1801,6 +2653,639 @@ mask_to_surface(PyObject *self, PyObject *args, PyObject *kwargs)
     return surfobj;
 }
 
+/* Distance fields and raycasts.
+ *
+ * A distance field holds a float for each bit of a mask. For a bit that is
+ * not set it is the distance from its center to the center of the nearest
+ * set bit, and for a set bit it is minus the distance to the nearest bit
+ * that is not set. Distances are clamped to the field's limit, so a bit can
+ * only change the field within limit of itself. After a change, only the
+ * changed area grown by limit is worked out again, from the bits within
+ * twice limit of it.
+ *
+ * Distances are found with the squared Euclidean distance transform of
+ * Felzenszwalb and Huttenlocher, "Distance Transforms of Sampled Functions",
+ * down the columns and then along the rows.
+ *
+ * Raycasts use the least distance in each block of MASK_DFIELD_BLOCK x
+ * MASK_DFIELD_BLOCK bits rather than the field itself. That is 64 times
+ * smaller, so it stays in the cache while the field would not.
+ */
+
+#define MASK_DFIELD_SHIFT 3
+#define MASK_DFIELD_BLOCK (1 << MASK_DFIELD_SHIFT)
+#define MASK_DFIELD_BLOCKS(n) (((n) + MASK_DFIELD_BLOCK - 1) >> MASK_DFIELD_SHIFT)
+
+/* The 1D squared distance transform of the n values of f into d. v needs n
+ * entries and z n + 1.
+ */
+static void
+_dfield_1d(const double *f, double *d, int *v, double *z, int n)
+{
+    int k = 0, q;
+    double s;
+
+    v[0] = 0;
+    z[0] = -HUGE_VAL;
+    z[1] = HUGE_VAL;
+    for (q = 1; q < n; ++q) {
+        s = ((f[q] + (double)q * q) - (f[v[k]] + (double)v[k] * v[k])) /
+            (2.0 * (q - v[k]));
+        while (s <= z[k]) {
+            --k;
+            s = ((f[q] + (double)q * q) - (f[v[k]] + (double)v[k] * v[k])) /
+                (2.0 * (q - v[k]));
+        }
+        ++k;
+        v[k] = q;
+        z[k] = s;
+        z[k + 1] = HUGE_VAL;
+    }
+
+    k = 0;
+    for (q = 0; q < n; ++q) {
+        while (z[k + 1] < q) {
+            ++k;
+        }
+        d[q] = (double)(q - v[k]) * (q - v[k]) + f[v[k]];
+    }
+}
+
+/* Works out the distance field of a mask in the rect from (x0, y0) to
+ * (x1, y1), which must be inside the mask. The field has a float for every
+ * bit of the mask, row by row.
+ *
+ * Returns:
+ *     0 on success
+ *     -2 on memory allocation error
+ */
+static int
+_dfield_compute(bitmask_t *mask, float *field, int limit, int x0, int y0,
+                int x1, int y1)
+{
+    int ix0, iy0, ix1, iy1, iw, ih, n, x, y, set;
+    int reach = MIN(limit, mask->w + mask->h);
+    double cap = ((double)limit + 1.0) * ((double)limit + 1.0);
+    double dist, *f, *d, *z;
+    float *cols;
+    int *v;
+
+    /* only the bits within limit of the rect can be the nearest to it */
+    ix0 = MAX(x0 - reach, 0);
+    iy0 = MAX(y0 - reach, 0);
+    ix1 = MIN(x1 + reach, mask->w);
+    iy1 = MIN(y1 + reach, mask->h);
+    iw = ix1 - ix0;
+    ih = iy1 - iy0;
+    n = MAX(iw, ih);
+
+    cols = (float *)malloc(sizeof(float) * iw * ih);
+    f = (double *)malloc(sizeof(double) * n);
+    d = (double *)malloc(sizeof(double) * n);
+    z = (double *)malloc(sizeof(double) * (n + 1));
+    v = (int *)malloc(sizeof(int) * n);
+    if (!cols || !f || !d || !z || !v) {
+        free(cols);
+        free(f);
+        free(d);
+        free(z);
+        free(v);
+        return -2;
+    }
+
+    /* first the distances from the bits not set to the set ones, then the
+       other way around */
+    for (set = 1; set >= 0; --set) {
+        for (x = ix0; x < ix1; ++x) {
+            for (y = iy0; y < iy1; ++y) {
+                f[y - iy0] = (bitmask_getbit(mask, x, y) != 0) == set ? 0.0
+                                                                      : cap;
+            }
+            _dfield_1d(f, d, v, z, ih);
+            for (y = 0; y < ih; ++y) {
+                cols[y * iw + x - ix0] = (float)MIN(d[y], cap);
+            }
+        }
+        for (y = y0; y < y1; ++y) {
+            for (x = 0; x < iw; ++x) {
+                f[x] = cols[(y - iy0) * iw + x];
+            }
+            _dfield_1d(f, d, v, z, iw);
+            for (x = x0; x < x1; ++x) {
+                if ((bitmask_getbit(mask, x, y) != 0) == set) {
+                    continue;
+                }
+                dist = MIN(sqrt(d[x - ix0]), (double)limit);
+                field[(size_t)y * mask->w + x] = (float)(set ? dist : -dist);
+            }
+        }
+    }
+
+    free(cols);
+    free(f);
+    free(d);
+    free(z);
+    free(v);
+    return 0;
+}
+
+/* Works out the least distance in each block of the field with a bit in
+ * the rect from (x0, y0) to (x1, y1).
+ */
+static void
+_dfield_blocks(bitmask_t *mask, const float *field, float *blocks, int x0,
+               int y0, int x1, int y1)
+{
+    int bx, by, x, y, xend, yend;
+    int bw = MASK_DFIELD_BLOCKS(mask->w);
+    float least;
+
+    for (by = y0 >> MASK_DFIELD_SHIFT; by < MASK_DFIELD_BLOCKS(y1); ++by) {
+        for (bx = x0 >> MASK_DFIELD_SHIFT; bx < MASK_DFIELD_BLOCKS(x1);
+             ++bx) {
+            xend = MIN((bx + 1) << MASK_DFIELD_SHIFT, mask->w);
+            yend = MIN((by + 1) << MASK_DFIELD_SHIFT, mask->h);
+            least = HUGE_VAL;
+            for (y = by << MASK_DFIELD_SHIFT; y < yend; ++y) {
+                for (x = bx << MASK_DFIELD_SHIFT; x < xend; ++x) {
+                    least = MIN(least, field[(size_t)y * mask->w + x]);
+                }
+            }
+            blocks[by * bw + bx] = least;
+        }
+    }
+}
+
+/* Brings the distance field of a mask up to date, first making one if the
+ * mask has none or has one with another limit. While a buffer of the bits
+ * is held, they may change at any time, so the whole field is worked out.
+ * A field that has been handed out is left as it is, and a copy changed.
+ * The GIL is released while the field is worked out. It cannot be changed
+ * while another thread works it out, or casts rays with it.
+ *
+ * Returns 0 on success, -1 with an exception set on failure.
+ */
+static int
+_mask_update_dfield(PyObject *self, int limit)
+{
+    pgMaskObject *maskobj = (pgMaskObject *)self;
+    bitmask_t *mask = maskobj->mask;
+    mask_dfield *dfield = (mask_dfield *)maskobj->dfdata;
+    Py_ssize_t size = (Py_ssize_t)sizeof(float) * mask->w * mask->h;
+    PyObject *field;
+    int x0, y0, x1, y1, result;
+
+    if (NULL == dfield) {
+        dfield = PyMem_New(mask_dfield, 1);
+        if (NULL == dfield) {
+            PyErr_NoMemory();
+            return -1;
+        }
+        dfield->field = NULL;
+        dfield->blocks = NULL;
+        dfield->x0 = dfield->y0 = dfield->x1 = dfield->y1 = 0;
+        dfield->busy = 0;
+        maskobj->dfdata = dfield;
+    }
+
+    if (dfield->busy &&
+        (NULL == dfield->field || Bytes_GET_SIZE(dfield->field) != size ||
+         dfield->limit != limit || NULL != maskobj->bufdata ||
+         dfield->x0 < dfield->x1)) {
+        /* the blocks would be changed, or freed, under the other thread */
+        PyErr_SetString(PyExc_RuntimeError,
+                        "the mask is in use by another thread");
+        return -1;
+    }
+
+    if (NULL != dfield->field && Bytes_GET_SIZE(dfield->field) != size) {
+        /* the mask was made again with another size */
+        Py_CLEAR(dfield->field);
+    }
+    if (NULL == dfield->field) {
+        PyMem_Free(dfield->blocks);
+        dfield->blocks = PyMem_New(float, MASK_DFIELD_BLOCKS(mask->w) *
+                                                  MASK_DFIELD_BLOCKS(mask->h) +
+                                              1);
+        if (NULL == dfield->blocks) {
+            PyErr_NoMemory();
+            return -1;
+        }
+        dfield->field = Bytes_FromStringAndSize(NULL, size);
+        if (NULL == dfield->field) {
+            return -1; /* Exception already set. */
+        }
+        _mask_changed_all(self);
+    }
+    if (dfield->limit != limit || NULL != maskobj->bufdata) {
+        _mask_changed_all(self);
+    }
+    dfield->limit = limit;
+
+    if (dfield->x0 >= dfield->x1) {
+        return 0;
+    }
+    x0 = dfield->x0;
+    y0 = dfield->y0;
+    x1 = dfield->x1;
+    y1 = dfield->y1;
+
+    field = dfield->field;
+    if (Py_REFCNT(field) > 1) {
+        field = Bytes_FromStringAndSize(Bytes_AS_STRING(field), size);
+        if (NULL == field) {
+            return -1; /* Exception already set. */
+        }
+    }
+    else {
+        Py_INCREF(field);
+    }
+
+    /* a change can move the distances within limit of it */
+    x0 = MAX(x0 - limit, 0);
+    y0 = MAX(y0 - limit, 0);
+    x1 = MIN(x1, mask->w - limit) + limit;
+    y1 = MIN(y1, mask->h - limit) + limit;
+
+    ++dfield->busy;
+    Py_BEGIN_ALLOW_THREADS;
+    result = _dfield_compute(mask, (float *)Bytes_AS_STRING(field), limit,
+                             x0, y0, x1, y1);
+    if (result == 0) {
+        _dfield_blocks(mask, (float *)Bytes_AS_STRING(field), dfield->blocks,
+                       x0, y0, x1, y1);
+    }
+    Py_END_ALLOW_THREADS;
+    --dfield->busy;
+
+    if (result == -2) {
+        Py_DECREF(field);
+        PyErr_SetString(PyExc_MemoryError,
+                        "cannot allocate memory for distance field");
+        return -1;
+    }
+
+    Py_DECREF(dfield->field);
+    dfield->field = field;
+    dfield->x0 = dfield->y0 = dfield->x1 = dfield->y1 = 0;
+    return 0;
+}
+
+static PyObject *
+mask_distance_field(PyObject *self, PyObject *args, PyObject *kwargs)
+{
+    bitmask_t *mask = pgMask_AsBitmap(self);
+    int limit = 32;
+    static char *keywords[] = {"limit", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|i", keywords, &limit)) {
+        return NULL; /* Exception already set. */
+    }
+
+    if (limit < 1) {
+        return RAISE(PyExc_ValueError, "limit must be positive");
+    }
+
+    if (_mask_update_dfield(self, limit)) {
+        return NULL; /* Exception already set. */
+    }
+
+    return _mask_array_proxy(
+        ((mask_dfield *)((pgMaskObject *)self)->dfdata)->field, 'f', mask->w,
+        mask->h);
+}
+
+/* Follows a ray from (ox, oy) in the direction (dx, dy), which has a length
+ * of 1, for up to max_dist, and finds the first set bit it passes through.
+ * Bit (x, y) covers the square from (x, y) to (x + 1, y + 1).
+ *
+ * The bits are walked one at a time, except where the blocks of an up to
+ * date distance field are given. Then the ray jumps over the space they
+ * show to be empty. Any point of a bit in a block with least distance d is
+ * at least d - sqrt(2) from every set bit.
+ *
+ * Returns:
+ *     1 if a set bit is hit, passing back its position in (*hx, *hy)
+ *     0 otherwise
+ */
+static int
+_mask_raycast(bitmask_t *mask, const float *blocks, double ox, double oy,
+              double dx, double dy, double max_dist, int *hx, int *hy)
+{
+    int w = mask->w, h = mask->h;
+    int cx, cy, step_x, step_y;
+    int bw = MASK_DFIELD_BLOCKS(w);
+    double t = 0.0, t_end = max_dist, t1, t2, px, py, skip = 0.0;
+    double tmax_x, tmax_y, tdelta_x, tdelta_y;
+
+    if (!w || !h) {
+        return 0;
+    }
+
+    /* clip the ray to the mask */
+    if (dx == 0.0) {
+        if (ox < 0.0 || ox >= w) {
+            return 0;
+        }
+    }
+    else {
+        t1 = -ox / dx;
+        t2 = (w - ox) / dx;
+        t = MAX(t, MIN(t1, t2));
+        t_end = MIN(t_end, MAX(t1, t2));
+    }
+    if (dy == 0.0) {
+        if (oy < 0.0 || oy >= h) {
+            return 0;
+        }
+    }
+    else {
+        t1 = -oy / dy;
+        t2 = (h - oy) / dy;
+        t = MAX(t, MIN(t1, t2));
+        t_end = MIN(t_end, MAX(t1, t2));
+    }
+    if (t > t_end) {
+        return 0;
+    }
+
+    step_x = dx > 0.0 ? 1 : -1;
+    step_y = dy > 0.0 ? 1 : -1;
+    tdelta_x = dx != 0.0 ? fabs(1.0 / dx) : HUGE_VAL;
+    tdelta_y = dy != 0.0 ? fabs(1.0 / dy) : HUGE_VAL;
+
+    for (;;) {
+        /* start walking the bits from the point at t */
+        px = ox + dx * t;
+        py = oy + dy * t;
+        cx = MIN(MAX((int)floor(px), 0), w - 1);
+        cy = MIN(MAX((int)floor(py), 0), h - 1);
+        tmax_x = dx > 0.0   ? t + (cx + 1 - px) / dx
+                 : dx < 0.0 ? t + (cx - px) / dx
+                            : HUGE_VAL;
+        tmax_y = dy > 0.0   ? t + (cy + 1 - py) / dy
+                 : dy < 0.0 ? t + (cy - py) / dy
+                            : HUGE_VAL;
+
+        for (;;) {
+            if (bitmask_getbit(mask, cx, cy)) {
+                *hx = cx;
+                *hy = cy;
+                return 1;
+            }
+            if (NULL != blocks) {
+                skip = blocks[(cy >> MASK_DFIELD_SHIFT) * bw +
+                              (cx >> MASK_DFIELD_SHIFT)] -
+                       1.5;
+                if (skip > 2.0) {
+                    break;
+                }
+            }
+            if (tmax_x < tmax_y) {
+                t = tmax_x;
+                tmax_x += tdelta_x;
+                cx += step_x;
+                if (cx < 0 || cx >= w) {
+                    return 0;
+                }
+            }
+            else {
+                t = tmax_y;
+                tmax_y += tdelta_y;
+                cy += step_y;
+                if (cy < 0 || cy >= h) {
+                    return 0;
+                }
+            }
+            if (t > t_end) {
+                return 0;
+            }
+        }
+
+        /* jump over the empty space */
+        t += skip;
+        if (t > t_end) {
+            return 0;
+        }
+    }
+}
+
+/* Gets a ray for _mask_raycast() from Python objects, with a direction of
+ * length 1. Returns 0 with an exception set on failure.
+ */
+static int
+_mask_get_ray(PyObject *origin, PyObject *direction, double *ray)
+{
+    float ox, oy, dx, dy;
+    double length;
+
+    if (!pg_TwoFloatsFromObj(origin, &ox, &oy)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "origin must be a pair of numbers");
+        return 0;
+    }
+    if (!pg_TwoFloatsFromObj(direction, &dx, &dy)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "direction must be a pair of numbers");
+        return 0;
+    }
+
+    length = sqrt((double)dx * dx + (double)dy * dy);
+    if (length == 0.0) {
+        PyErr_SetString(PyExc_ValueError, "direction must not be (0, 0)");
+        return 0;
+    }
+
+    ray[0] = ox;
+    ray[1] = oy;
+    ray[2] = dx / length;
+    ray[3] = dy / length;
+    return 1;
+}
+
+/* Gets max_dist for the raycast methods, where None means no limit.
+ * Returns 0 with an exception set on failure.
+ */
+static int
+_mask_get_max_dist(PyObject *obj, double *max_dist)
+{
+    if (NULL == obj || obj == Py_None) {
+        *max_dist = HUGE_VAL;
+        return 1;
+    }
+    *max_dist = PyFloat_AsDouble(obj);
+    if (*max_dist == -1.0 && PyErr_Occurred()) {
+        return 0;
+    }
+    if (*max_dist < 0.0) {
+        PyErr_SetString(PyExc_ValueError, "max_dist must not be negative");
+        return 0;
+    }
+    return 1;
+}
+
+/* Gets the blocks of the distance field of a mask for raycasts, brought up
+ * to date, or NULL if the mask has no field. Returns -1 with an exception
+ * set on failure.
+ */
+static int
+_mask_raycast_blocks(PyObject *self, float **blocks)
+{
+    mask_dfield *dfield = (mask_dfield *)((pgMaskObject *)self)->dfdata;
+
+    *blocks = NULL;
+    if (NULL == dfield) {
+        return 0;
+    }
+    if (_mask_update_dfield(self, dfield->limit)) {
+        return -1; /* Exception already set. */
+    }
+    *blocks = dfield->blocks;
+    return 0;
+}
+
+static PyObject *
+mask_raycast(PyObject *self, PyObject *args, PyObject *kwargs)
+{
+    bitmask_t *mask = pgMask_AsBitmap(self);
+    PyObject *origin, *direction, *max_dist_obj = Py_None;
+    double ray[4], max_dist;
+    float *blocks;
+    int x, y, hit;
+    static char *keywords[] = {"origin", "direction", "max_dist", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|O", keywords, &origin,
+                                     &direction, &max_dist_obj)) {
+        return NULL; /* Exception already set. */
+    }
+
+    if (!_mask_get_ray(origin, direction, ray) ||
+        !_mask_get_max_dist(max_dist_obj, &max_dist)) {
+        return NULL; /* Exception already set. */
+    }
+
+    if (_mask_raycast_blocks(self, &blocks)) {
+        return NULL; /* Exception already set. */
+    }
+
+    hit = _mask_raycast(mask, blocks, ray[0], ray[1], ray[2], ray[3],
+                        max_dist, &x, &y);
+
+    if (!hit) {
+        Py_RETURN_NONE;
+    }
+    return Py_BuildValue("(ii)", x, y);
+}
+
+static PyObject *
+mask_raycast_many(PyObject *self, PyObject *args, PyObject *kwargs)
+{
+    bitmask_t *mask = pgMask_AsBitmap(self);
+    mask_dfield *dfield;
+    PyObject *origins, *directions, *max_dist_obj = Py_None;
+    PyObject *origins_seq = NULL, *directions_seq = NULL;
+    PyObject *hits = NULL, *hit;
+    double *rays = NULL, max_dist;
+    float *blocks;
+    int *points = NULL;
+    Py_ssize_t i, length;
+    static char *keywords[] = {"origins", "directions", "max_dist", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|O", keywords,
+                                     &origins, &directions, &max_dist_obj)) {
+        return NULL; /* Exception already set. */
+    }
+
+    if (!_mask_get_max_dist(max_dist_obj, &max_dist)) {
+        return NULL; /* Exception already set. */
+    }
+
+    origins_seq =
+        PySequence_Fast(origins, "origins must be a sequence of points");
+    if (NULL == origins_seq) {
+        return NULL; /* Exception already set. */
+    }
+    directions_seq = PySequence_Fast(
+        directions, "directions must be a sequence of directions");
+    if (NULL == directions_seq) {
+        goto error; /* Exception already set. */
+    }
+
+    length = PySequence_Fast_GET_SIZE(origins_seq);
+    if (PySequence_Fast_GET_SIZE(directions_seq) != length) {
+        PyErr_SetString(PyExc_ValueError,
+                        "origins and directions must be the same length");
+        goto error;
+    }
+
+    rays = PyMem_New(double, 4 * length + 1);
+    points = PyMem_New(int, 3 * length + 1);
+    if (NULL == rays || NULL == points) {
+        PyErr_NoMemory();
+        goto error;
+    }
+
+    for (i = 0; i < length; ++i) {
+        if (!_mask_get_ray(PySequence_Fast_GET_ITEM(origins_seq, i),
+                           PySequence_Fast_GET_ITEM(directions_seq, i),
+                           rays + 4 * i)) {
+            goto error; /* Exception already set. */
+        }
+    }
+
+    if (_mask_raycast_blocks(self, &blocks)) {
+        goto error; /* Exception already set. */
+    }
+
+    /* keeps the blocks, and the mask, as they are until the rays are done */
+    dfield = (mask_dfield *)((pgMaskObject *)self)->dfdata;
+    if (NULL != dfield) {
+        ++dfield->busy;
+    }
+    Py_BEGIN_ALLOW_THREADS;
+    for (i = 0; i < length; ++i) {
+        points[3 * i] = _mask_raycast(
+            mask, blocks, rays[4 * i], rays[4 * i + 1], rays[4 * i + 2],
+            rays[4 * i + 3], max_dist, points + 3 * i + 1, points + 3 * i + 2);
+    }
+    Py_END_ALLOW_THREADS;
+    if (NULL != dfield) {
+        --dfield->busy;
+    }
+
+    hits = PyList_New(length);
+    if (NULL == hits) {
+        goto error; /* Exception already set. */
+    }
+    for (i = 0; i < length; ++i) {
+        if (points[3 * i]) {
+            hit = Py_BuildValue("(ii)", points[3 * i + 1], points[3 * i + 2]);
+            if (NULL == hit) {
+                goto error; /* Exception already set. */
+            }
+        }
+        else {
+            Py_INCREF(Py_None);
+            hit = Py_None;
+        }
+        PyList_SET_ITEM(hits, i, hit);
+    }
+
+    PyMem_Free(rays);
+    PyMem_Free(points);
+    Py_DECREF(origins_seq);
+    Py_DECREF(directions_seq);
+    return hits;
+
+error:
+    Py_XDECREF(hits);
+    PyMem_Free(rays);
+    PyMem_Free(points);
+    Py_XDECREF(directions_seq);
+    Py_DECREF(origins_seq);
+    return NULL;
+}
+
 static PyMethodDef mask_methods[] = {
     {"get_size", mask_get_size, METH_VARARGS, DOC_MASKGETSIZE},
     {"get_rect", (PyCFunction)mask_get_rect, METH_VARARGS | METH_KEYWORDS,
@@ -1810,6 +3295,8 @@ static PyMethodDef mask_methods[] = {
     {"overlap", mask_overlap, METH_VARARGS, DOC_MASKOVERLAP},
     {"overlap_area", mask_overlap_area, METH_VARARGS, DOC_MASKOVERLAPAREA},
     {"overlap_mask", mask_overlap_mask, METH_VARARGS, DOC_MASKOVERLAPMASK},
+    {"overlap_batch", (PyCFunction)mask_overlap_batch,
+     METH_VARARGS | METH_KEYWORDS, DOC_MASKOVERLAPBATCH},
     {"fill", mask_fill, METH_NOARGS, DOC_MASKFILL},
     {"clear", mask_clear, METH_NOARGS, DOC_MASKCLEAR},
     {"invert", mask_invert, METH_NOARGS, DOC_MASKINVERT},
@@ -1823,10 +3310,18 @@ static PyMethodDef mask_methods[] = {
     {"convolve", mask_convolve, METH_VARARGS, DOC_MASKCONVOLVE},
     {"connected_component", mask_connected_component, METH_VARARGS,
      DOC_MASKCONNECTEDCOMPONENT},
-    {"connected_components", mask_connected_components, METH_VARARGS,
-     DOC_MASKCONNECTEDCOMPONENTS},
+    {"connected_components", (PyCFunction)mask_connected_components,
+     METH_VARARGS | METH_KEYWORDS, DOC_MASKCONNECTEDCOMPONENTS},
     {"get_bounding_rects", mask_get_bounding_rects, METH_NOARGS,
      DOC_MASKGETBOUNDINGRECTS},
+    {"distance_field", (PyCFunction)mask_distance_field,
+     METH_VARARGS | METH_KEYWORDS, DOC_MASKDISTANCEFIELD},
+    {"raycast", (PyCFunction)mask_raycast, METH_VARARGS | METH_KEYWORDS,
+     DOC_MASKRAYCAST},
+    {"raycast_many", (PyCFunction)mask_raycast_many,
+     METH_VARARGS | METH_KEYWORDS, DOC_MASKRAYCASTMANY},
+    {"update_from_surface", (PyCFunction)mask_update_from_surface,
+     METH_VARARGS | METH_KEYWORDS, DOC_MASKUPDATEFROMSURFACE},
     {"to_surface", (PyCFunction)mask_to_surface, METH_VARARGS | METH_KEYWORDS,
      DOC_MASKTOSURFACE},
 
@@ -1863,12 +3358,20 @@ static void
 mask_dealloc(PyObject *self)
 {
     bitmask_t *bitmask = pgMask_AsBitmap(self);
+    mask_dfield *dfield = (mask_dfield *)((pgMaskObject *)self)->dfdata;
 
     if (NULL != bitmask) {
         /* Free up the bitmask. */
         bitmask_free(bitmask);
     }
 
+    if (NULL != dfield) {
+        /* Free up the distance field. */
+        Py_XDECREF(dfield->field);
+        PyMem_Free(dfield->blocks);
+        PyMem_Free(dfield);
+    }
+
     /* Free up the mask. */
     Py_TYPE(self)->tp_free(self);
 }
@@ -1897,6 +3400,8 @@ static int
 mask_init(PyObject *self, PyObject *args, PyObject *kwargs)
 {
     bitmask_t *bitmask = NULL;
+    bitmask_t *oldmask;
+    mask_dfield *dfield;
     int w, h;
     int fill = 0; /* Default is false. */
     char *keywords[] = {"size", "fill", NULL};
@@ -1917,6 +3422,13 @@ mask_init(PyObject *self, PyObject *args, PyObject *kwargs)
         return -1;
     }
 
+    dfield = (mask_dfield *)((pgMaskObject *)self)->dfdata;
+    if (NULL != dfield && dfield->busy) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "cannot reinitialize a mask in use by another thread");
+        return -1;
+    }
+
     bitmask = bitmask_create(w, h);
 
     if (NULL == bitmask) {
@@ -1929,7 +3441,16 @@ mask_init(PyObject *self, PyObject *args, PyObject *kwargs)
         bitmask_fill(bitmask);
     }
 
+    /* __init__ can be called again on a mask with a distance field, which
+       is then out of date, and made again if the size changed */
+    oldmask = ((pgMaskObject *)self)->mask;
+    if (NULL != dfield && NULL != oldmask &&
+        (oldmask->w != w || oldmask->h != h)) {
+        Py_CLEAR(dfield->field);
+    }
+
     ((pgMaskObject *)self)->mask = bitmask;
+    _mask_changed_all(self);
     return 0;
 }
 
@@ -1993,6 +3514,9 @@ pgMask_ReleaseBuffer(pgMaskObject *self, Py_buffer *view)
 {
     mask_bufinfo *bufinfo = (mask_bufinfo*)view->internal;
 
+    /* the bits may have been written through the buffer */
+    _mask_changed_all((PyObject *)self);
+
     bufinfo->numbufs--;
     if (bufinfo->numbufs == 0) {
         PyMem_RawFree(bufinfo);
@@ -2096,6 +3620,10 @@ MODINIT_DEFINE(mask)
     if (PyErr_Occurred()) {
         MODINIT_ERROR;
     }
+    import_pygame_bufferproxy();
+    if (PyErr_Occurred()) {
+        MODINIT_ERROR;
+    }
 
     /* create the mask type */
     if (PyType_Ready(&pgMask_Type) < 0) {
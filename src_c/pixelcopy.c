@@ -237,6 +237,7 @@ _copy_mapped(Py_buffer *view_p, SDL_Surface *surf)
         dz_dst = -1;
     }
 #endif
+    Py_BEGIN_ALLOW_THREADS;
     for (x = 0; x < w; ++x) {
         for (y = 0; y < h; ++y) {
             for (z = 0; z < pixelsize; ++z) {
@@ -249,6 +250,7 @@ _copy_mapped(Py_buffer *view_p, SDL_Surface *surf)
             }
         }
     }
+    Py_END_ALLOW_THREADS;
 
     return 0;
 }
@@ -329,6 +331,7 @@ _copy_colorplane(Py_buffer *view_p, SDL_Surface *surf,
         dz_dst = -1;
     }
 #endif
+    Py_BEGIN_ALLOW_THREADS;
 #if IS_SDLv1
     if (view_kind == VIEWKIND_COLORKEY && flags & SDL_SRCCOLORKEY) {
         colorkey = format->colorkey;
@@ -379,6 +382,7 @@ _copy_colorplane(Py_buffer *view_p, SDL_Surface *surf,
             }
         }
     }
+    Py_END_ALLOW_THREADS;
 
     return 0;
 }
@@ -431,6 +435,7 @@ _copy_unmapped(Py_buffer *view_p, SDL_Surface *surf)
         dz_dst = -1;
     }
 #endif
+    Py_BEGIN_ALLOW_THREADS;
     for (x = 0; x < w; ++x) {
         for (y = 0; y < h; ++y) {
             for (z = 0; z < pixelsize; ++z) {
@@ -451,20 +456,24 @@ _copy_unmapped(Py_buffer *view_p, SDL_Surface *surf)
             }
         }
     }
+    Py_END_ALLOW_THREADS;
 
     return 0;
 }
 
-/*macros used to blit arrays*/
+/*macros used to blit arrays, without holding the GIL*/
 #define COPYMACRO_2D(DST, SRC)                                               \
+    Py_BEGIN_ALLOW_THREADS;                                                  \
     for (loopy = 0; loopy < sizey; ++loopy) {                                \
         DST *imgrow = (DST *)(((char *)surf->pixels) + loopy * surf->pitch); \
         Uint8 *datarow = (Uint8 *)array_data + stridey * loopy;              \
         for (loopx = 0; loopx < sizex; ++loopx)                              \
             *(imgrow + loopx) = (DST) * (SRC *)(datarow + stridex * loopx);  \
-    }
+    }                                                                        \
+    Py_END_ALLOW_THREADS
 
 #define COPYMACRO_3D(DST, SRC)                                              \
+    Py_BEGIN_ALLOW_THREADS;                                                 \
     for (loopy = 0; loopy < sizey; ++loopy) {                               \
         DST *pix = (DST *)(((char *)surf->pixels) + surf->pitch * loopy);   \
         char *data = array_data + stridey * loopy;                          \
@@ -475,7 +484,8 @@ _copy_unmapped(Py_buffer *view_p, SDL_Surface *surf)
                            alpha);                                          \
             data += stridex;                                                \
         }                                                                   \
-    }
+    }                                                                       \
+    Py_END_ALLOW_THREADS
 
 static PyObject *
 array_to_surface(PyObject *self, PyObject *arg)
@@ -687,6 +697,7 @@ array_to_surface(PyObject *self, PyObject *arg)
                          offset);
                 }
 #endif
+                Py_BEGIN_ALLOW_THREADS;
                 for (loopy = 0; loopy < sizey; ++loopy) {
                     Uint8 *pix = ((Uint8 *)surf->pixels) + surf->pitch * loopy;
                     Uint8 *data = (Uint8 *)array_data + stridey * loopy;
@@ -698,6 +709,7 @@ array_to_surface(PyObject *self, PyObject *arg)
                         data += stridex;
                     }
                 }
+                Py_END_ALLOW_THREADS;
             }
             else {
                 pgBuffer_Release(&pg_view);
@@ -1071,6 +1083,7 @@ map_array(PyObject *self, PyObject *args)
     dim = 0;
     topdim = ndim - 1;
     counters[0] = shape[0];
+    Py_BEGIN_ALLOW_THREADS;
     while (counters[0]) {
         if (!counters[dim]) {
             /* Leave loop, moving left one index
@@ -1115,6 +1128,7 @@ map_array(PyObject *self, PyObject *args)
             counters[dim] = shape[dim];
         }
     }
+    Py_END_ALLOW_THREADS;
 
     /* Cleanup
      */
@@ -231,6 +231,186 @@ _pg_do_rects_intersect(GAME_Rect *A, GAME_Rect *B)
             A->y + A->h > B->y);
 }
 
+/* Packed rect arrays
+ *
+ * collidelist, collidelistall and collide_pairs also accept any object
+ * exporting a C contiguous buffer of signed 32 or 64 bit integers laid out
+ * as x, y, w, h quadruples, like a numpy array of shape (N, 4) or an
+ * array.array('i') of length 4 * N. The rects are then read in place,
+ * without converting every item to a Rect. Arrays of any other shape are
+ * still taken as sequences, as they always were. 64 bit values must fit
+ * in an int, rather than being cut short.
+ */
+typedef struct {
+    pg_buffer pg_view;
+    char *buf;
+    Py_ssize_t count;
+    Py_ssize_t itemsize;
+} _pg_rectarray;
+
+static int
+_pg_rectarray_format_ok(const char *fchar_p)
+{
+    switch (*fchar_p) {
+        case '@':
+        case '=':
+#if SDL_BYTEORDER == SDL_LIL_ENDIAN
+        case '<':
+#else
+        case '>':
+        case '!':
+#endif
+            ++fchar_p;
+            break;
+    }
+    switch (*fchar_p) {
+        case 'i':
+        case 'l':
+        case 'q':
+            return fchar_p[1] == '\0';
+    }
+    return 0;
+}
+
+/* Returns 1 and fills arr if obj is a packed rect array, 0 if obj should be
+   handled as a sequence of rect style objects, and -1 on error. */
+static int
+_pg_rectarray_get(PyObject *obj, _pg_rectarray *arr)
+{
+    Py_buffer *view_p = (Py_buffer *)&arr->pg_view;
+    Sint64 *p;
+    Py_ssize_t i;
+
+    if (PyList_Check(obj) || PyTuple_Check(obj) || pgRect_Check(obj)) {
+        return 0;
+    }
+#if PG_ENABLE_NEWBUF
+    if (!PyObject_CheckBuffer(obj) &&
+        !PyObject_HasAttrString(obj, "__array_struct__") &&
+        !PyObject_HasAttrString(obj, "__array_interface__")) {
+        return 0;
+    }
+#else
+    if (!PyObject_HasAttrString(obj, "__array_struct__") &&
+        !PyObject_HasAttrString(obj, "__array_interface__")) {
+        return 0;
+    }
+#endif
+
+    if (pgObject_GetBuffer(obj, &arr->pg_view,
+                           PyBUF_FORMAT | PyBUF_C_CONTIGUOUS)) {
+        /* Not an integer array, like an object array of Rects */
+        PyErr_Clear();
+        return 0;
+    }
+    if ((view_p->itemsize != 4 && view_p->itemsize != 8) ||
+        !_pg_rectarray_format_ok(view_p->format)) {
+        pgBuffer_Release(&arr->pg_view);
+        return 0;
+    }
+    if (view_p->ndim == 2 && view_p->shape[1] == 4) {
+        arr->count = view_p->shape[0];
+    }
+    else if (view_p->ndim == 1 && view_p->shape[0] % 4 == 0) {
+        arr->count = view_p->shape[0] / 4;
+    }
+    else {
+        /* like an (N, 2, 2) array of ((x, y), (w, h)) items */
+        pgBuffer_Release(&arr->pg_view);
+        return 0;
+    }
+    if (view_p->itemsize == 8) {
+        p = (Sint64 *)view_p->buf;
+        for (i = 0; i < 4 * arr->count; ++i) {
+            if (p[i] < INT_MIN || p[i] > INT_MAX) {
+                pgBuffer_Release(&arr->pg_view);
+                PyErr_SetString(PyExc_ValueError,
+                                "rect array values must fit in an int");
+                return -1;
+            }
+        }
+    }
+    arr->buf = (char *)view_p->buf;
+    arr->itemsize = view_p->itemsize;
+    return 1;
+}
+
+static void
+_pg_rectarray_item(_pg_rectarray *arr, Py_ssize_t i, GAME_Rect *r)
+{
+    if (arr->itemsize == 4) {
+        Sint32 *p = (Sint32 *)arr->buf + 4 * i;
+
+        r->x = p[0];
+        r->y = p[1];
+        r->w = p[2];
+        r->h = p[3];
+    }
+    else {
+        Sint64 *p = (Sint64 *)arr->buf + 4 * i;
+
+        r->x = (int)p[0];
+        r->y = (int)p[1];
+        r->w = (int)p[2];
+        r->h = (int)p[3];
+    }
+}
+
+/* Copy a packed rect array or a sequence of rect style objects into a new
+   array of rects, which must be freed with PyMem_Free(). Surface.fill_rects
+   reads its rects with this too, through the C api. */
+static GAME_Rect *
+_pg_rects_from_object(PyObject *obj, Py_ssize_t *count)
+{
+    _pg_rectarray arr;
+    GAME_Rect *rects, *argrect, temp;
+    PyObject *item;
+    Py_ssize_t i, size;
+
+    switch (_pg_rectarray_get(obj, &arr)) {
+        case -1:
+            return NULL;
+        case 1:
+            rects = PyMem_New(GAME_Rect, arr.count + 1);
+            if (!rects) {
+                pgBuffer_Release(&arr.pg_view);
+                PyErr_NoMemory();
+                return NULL;
+            }
+            for (i = 0; i < arr.count; ++i) {
+                _pg_rectarray_item(&arr, i, rects + i);
+            }
+            pgBuffer_Release(&arr.pg_view);
+            *count = arr.count;
+            return rects;
+    }
+
+    if (!PySequence_Check(obj) || (size = PySequence_Length(obj)) < 0) {
+        return (GAME_Rect *)RAISE(
+            PyExc_TypeError,
+            "Argument must be a sequence of rectstyle objects.");
+    }
+    rects = PyMem_New(GAME_Rect, size + 1);
+    if (!rects) {
+        PyErr_NoMemory();
+        return NULL;
+    }
+    for (i = 0; i < size; ++i) {
+        item = PySequence_GetItem(obj, i);
+        if (!item || !(argrect = pgRect_FromObject(item, &temp))) {
+            Py_XDECREF(item);
+            PyMem_Free(rects);
+            return (GAME_Rect *)RAISE(
+                PyExc_TypeError,
+                "Argument must be a sequence of rectstyle objects.");
+        }
+        rects[i] = *argrect;
+        Py_DECREF(item);
+    }
+    *count = size;
+    return rects;
+}
+
 static PyObject *
 pg_rect_normalize(pgRectObject *self, PyObject *args)
 {
@@ -472,11 +652,27 @@ pg_rect_collidelist(pgRectObject *self, PyObject *args)
     int loop, size;
     PyObject *list, *obj;
     PyObject *ret = NULL;
+    _pg_rectarray arr;
+    Py_ssize_t i;
 
     if (!PyArg_ParseTuple(args, "O", &list)) {
         return NULL;
     }
 
+    switch (_pg_rectarray_get(list, &arr)) {
+        case -1:
+            return NULL;
+        case 1:
+            for (i = 0; i < arr.count; ++i) {
+                _pg_rectarray_item(&arr, i, &temp);
+                if (_pg_do_rects_intersect(&self->r, &temp)) {
+                    break;
+                }
+            }
+            pgBuffer_Release(&arr.pg_view);
+            return PyInt_FromSsize_t(i == arr.count ? -1 : i);
+    }
+
     if (!PySequence_Check(list)) {
         return RAISE(PyExc_TypeError,
                      "Argument must be a sequence of rectstyle objects.");
@@ -512,11 +708,39 @@ pg_rect_collidelistall(pgRectObject *self, PyObject *args)
     int loop, size;
     PyObject *list, *obj;
     PyObject *ret = NULL;
+    _pg_rectarray arr;
+    Py_ssize_t i;
 
     if (!PyArg_ParseTuple(args, "O", &list)) {
         return NULL;
     }
 
+    switch (_pg_rectarray_get(list, &arr)) {
+        case -1:
+            return NULL;
+        case 1:
+            ret = PyList_New(0);
+            if (!ret) {
+                pgBuffer_Release(&arr.pg_view);
+                return NULL;
+            }
+            for (i = 0; i < arr.count; ++i) {
+                _pg_rectarray_item(&arr, i, &temp);
+                if (_pg_do_rects_intersect(&self->r, &temp)) {
+                    PyObject *num = PyInt_FromSsize_t(i);
+                    if (!num || PyList_Append(ret, num)) {
+                        Py_XDECREF(num);
+                        Py_DECREF(ret);
+                        pgBuffer_Release(&arr.pg_view);
+                        return NULL;
+                    }
+                    Py_DECREF(num);
+                }
+            }
+            pgBuffer_Release(&arr.pg_view);
+            return ret;
+    }
+
     if (!PySequence_Check(list)) {
         return RAISE(PyExc_TypeError,
                      "Argument must be a sequence of rectstyle objects.");
@@ -553,6 +777,172 @@ pg_rect_collidelistall(pgRectObject *self, PyObject *args)
     return ret;
 }
 
+/* x extent of a rect, for the sweep in collide_pairs */
+typedef struct {
+    Sint64 left;
+    Sint64 right;
+    Py_ssize_t index;
+} _pg_rect_span;
+
+static int
+_pg_rect_span_compare(const void *a, const void *b)
+{
+    const _pg_rect_span *sa = (const _pg_rect_span *)a;
+    const _pg_rect_span *sb = (const _pg_rect_span *)b;
+
+    if (sa->left != sb->left) {
+        return sa->left < sb->left ? -1 : 1;
+    }
+    return (sa->index > sb->index) - (sa->index < sb->index);
+}
+
+static int
+_pg_int_compare(const void *a, const void *b)
+{
+    return (*(const int *)a > *(const int *)b) -
+           (*(const int *)a < *(const int *)b);
+}
+
+static void
+_pg_rect_get_span(GAME_Rect *r, Py_ssize_t index, _pg_rect_span *span)
+{
+    Sint64 x1 = r->x;
+    Sint64 x2 = (Sint64)r->x + r->w;
+
+    span->left = x1 < x2 ? x1 : x2;
+    span->right = x1 < x2 ? x2 : x1;
+    span->index = index;
+}
+
+/* Find all intersecting (a, b) index pairs, sorted by a then b. Sweeps the
+   rects of b sorted by their left edge, so each rect of a is only tested
+   against the rects of b that overlap it horizontally. Does not need the
+   GIL. Returns the number of pairs, or -1 if out of memory. */
+static Py_ssize_t
+_pg_collide_pairs(GAME_Rect *rects_a, Py_ssize_t count_a, GAME_Rect *rects_b,
+                  Py_ssize_t count_b, int **pairs_p)
+{
+    _pg_rect_span *spans;
+    _pg_rect_span span_a;
+    int *hits, *pairs = NULL, *newpairs;
+    Py_ssize_t npairs = 0, maxpairs = 0;
+    Py_ssize_t i, j, lo, hi, nhits;
+    Sint64 maxwidth = 0;
+
+    spans = (_pg_rect_span *)malloc(sizeof(_pg_rect_span) * (count_b + 1));
+    hits = (int *)malloc(sizeof(int) * (count_b + 1));
+    if (!spans || !hits) {
+        free(spans);
+        free(hits);
+        return -1;
+    }
+    for (j = 0; j < count_b; ++j) {
+        _pg_rect_get_span(rects_b + j, j, spans + j);
+        if (spans[j].right - spans[j].left > maxwidth) {
+            maxwidth = spans[j].right - spans[j].left;
+        }
+    }
+    qsort(spans, count_b, sizeof(_pg_rect_span), _pg_rect_span_compare);
+
+    for (i = 0; i < count_a; ++i) {
+        _pg_rect_get_span(rects_a + i, i, &span_a);
+
+        /* first span of b which may reach the left edge of a */
+        lo = 0;
+        hi = count_b;
+        while (lo < hi) {
+            j = lo + (hi - lo) / 2;
+            if (spans[j].left < span_a.left - maxwidth) {
+                lo = j + 1;
+            }
+            else {
+                hi = j;
+            }
+        }
+
+        nhits = 0;
+        for (j = lo; j < count_b && spans[j].left <= span_a.right; ++j) {
+            if (_pg_do_rects_intersect(rects_a + i,
+                                       rects_b + spans[j].index)) {
+                hits[nhits++] = (int)spans[j].index;
+            }
+        }
+        if (!nhits) {
+            continue;
+        }
+        qsort(hits, nhits, sizeof(int), _pg_int_compare);
+
+        if (npairs + nhits > maxpairs) {
+            maxpairs = (npairs + nhits) * 2;
+            newpairs = (int *)realloc(pairs, sizeof(int) * 2 * maxpairs);
+            if (!newpairs) {
+                free(pairs);
+                free(spans);
+                free(hits);
+                return -1;
+            }
+            pairs = newpairs;
+        }
+        for (j = 0; j < nhits; ++j) {
+            pairs[2 * npairs] = (int)i;
+            pairs[2 * npairs + 1] = hits[j];
+            ++npairs;
+        }
+    }
+
+    free(spans);
+    free(hits);
+    *pairs_p = pairs;
+    return npairs;
+}
+
+static PyObject *
+pg_rect_collide_pairs(PyObject *self, PyObject *args)
+{
+    PyObject *obj_a, *obj_b;
+    PyObject *arraymod, *bytes, *ret;
+    GAME_Rect *rects_a, *rects_b;
+    Py_ssize_t count_a, count_b, npairs;
+    int *pairs = NULL;
+
+    if (!PyArg_ParseTuple(args, "OO", &obj_a, &obj_b)) {
+        return NULL;
+    }
+
+    if (!(rects_a = _pg_rects_from_object(obj_a, &count_a))) {
+        return NULL;
+    }
+    if (!(rects_b = _pg_rects_from_object(obj_b, &count_b))) {
+        PyMem_Free(rects_a);
+        return NULL;
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    npairs = _pg_collide_pairs(rects_a, count_a, rects_b, count_b, &pairs);
+    Py_END_ALLOW_THREADS;
+
+    PyMem_Free(rects_a);
+    PyMem_Free(rects_b);
+    if (npairs < 0) {
+        return PyErr_NoMemory();
+    }
+
+    bytes = Bytes_FromStringAndSize((char *)pairs, sizeof(int) * 2 * npairs);
+    free(pairs);
+    if (!bytes) {
+        return NULL;
+    }
+    arraymod = PyImport_ImportModule("array");
+    if (!arraymod) {
+        Py_DECREF(bytes);
+        return NULL;
+    }
+    ret = PyObject_CallMethod(arraymod, "array", "sO", "i", bytes);
+    Py_DECREF(arraymod);
+    Py_DECREF(bytes);
+    return ret;
+}
+
 static PyObject *
 pg_rect_collidedict(pgRectObject *self, PyObject *args)
 {
@@ -856,6 +1246,8 @@ static struct PyMethodDef pg_rect_methods[] = {
      DOC_RECTCOLLIDELIST},
     {"collidelistall", (PyCFunction)pg_rect_collidelistall, METH_VARARGS,
      DOC_RECTCOLLIDELISTALL},
+    {"collide_pairs", (PyCFunction)pg_rect_collide_pairs,
+     METH_VARARGS | METH_STATIC, DOC_RECTCOLLIDEPAIRS},
     {"collidedict", (PyCFunction)pg_rect_collidedict, METH_VARARGS,
      DOC_RECTCOLLIDEDICT},
     {"collidedictall", (PyCFunction)pg_rect_collidedictall, METH_VARARGS,
@@ -1721,6 +2113,789 @@ pg_rect_init(pgRectObject *self, PyObject *args, PyObject *kwds)
     return 0;
 }
 
+/*
+ * Region -- accumulates dirty rects and merges them for display.update()
+ *
+ * Rects are stored as they are added, and only merged when rects() is
+ * called. There are two merge policies. By default overlapping rects are
+ * replaced by their bounding box until no two rects overlap. Rects that
+ * do not overlap can be coalesced too, when their bounding box covers at
+ * most max_overhead times more area than the two rects themselves. In
+ * exact mode the union is instead split into non-overlapping horizontal
+ * bands, so no pixel outside of the added rects is covered.
+ */
+typedef struct {
+    PyObject_HEAD GAME_Rect *rects;
+    Py_ssize_t count;
+    Py_ssize_t capacity;
+    int merged;
+    int exact;
+    double max_overhead;
+} pgRegionObject;
+
+static PyTypeObject pgRegion_Type;
+
+/* x interval, for the exact merge */
+typedef struct {
+    int left;
+    int right;
+} _pg_region_span;
+
+static int
+_pg_region_top_compare(const void *a, const void *b)
+{
+    return (((const GAME_Rect *)a)->y > ((const GAME_Rect *)b)->y) -
+           (((const GAME_Rect *)a)->y < ((const GAME_Rect *)b)->y);
+}
+
+static int
+_pg_region_int_compare(const void *a, const void *b)
+{
+    return (*(const int *)a > *(const int *)b) -
+           (*(const int *)a < *(const int *)b);
+}
+
+static int
+_pg_region_grow(pgRegionObject *self, Py_ssize_t needed)
+{
+    GAME_Rect *rects;
+    Py_ssize_t capacity = self->capacity ? self->capacity : 16;
+
+    if (needed <= self->capacity) {
+        return 0;
+    }
+    while (capacity < needed) {
+        capacity *= 2;
+    }
+    rects = (GAME_Rect *)realloc(self->rects, sizeof(GAME_Rect) * capacity);
+    if (!rects) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    self->rects = rects;
+    self->capacity = capacity;
+    return 0;
+}
+
+/* Sort rects by their left edge. qsort() is slow here as it calls the
+   compare function through a pointer, and copies rects byte by byte. */
+static void
+_pg_region_sort_left(GAME_Rect *rects, Py_ssize_t count)
+{
+    GAME_Rect pivot, swap;
+    Py_ssize_t i, j;
+
+    while (count > 16) {
+        /* median of three as pivot */
+        i = count / 2;
+        if (rects[i].x < rects[0].x) {
+            swap = rects[i];
+            rects[i] = rects[0];
+            rects[0] = swap;
+        }
+        if (rects[count - 1].x < rects[0].x) {
+            swap = rects[count - 1];
+            rects[count - 1] = rects[0];
+            rects[0] = swap;
+        }
+        if (rects[count - 1].x < rects[i].x) {
+            swap = rects[count - 1];
+            rects[count - 1] = rects[i];
+            rects[i] = swap;
+        }
+        pivot = rects[i];
+        i = 0;
+        j = count - 1;
+        while (i <= j) {
+            while (rects[i].x < pivot.x) {
+                ++i;
+            }
+            while (rects[j].x > pivot.x) {
+                --j;
+            }
+            if (i <= j) {
+                swap = rects[i];
+                rects[i++] = rects[j];
+                rects[j--] = swap;
+            }
+        }
+        /* recurse into the smaller part, loop on the larger one */
+        if (j + 1 < count - i) {
+            _pg_region_sort_left(rects, j + 1);
+            rects += i;
+            count -= i;
+        }
+        else {
+            _pg_region_sort_left(rects + i, count - i);
+            count = j + 1;
+        }
+    }
+    for (i = 1; i < count; ++i) {
+        swap = rects[i];
+        for (j = i; j > 0 && rects[j - 1].x > swap.x; --j) {
+            rects[j] = rects[j - 1];
+        }
+        rects[j] = swap;
+    }
+}
+
+/* Should a and b be replaced by their bounding box u? */
+static int
+_pg_region_should_merge(GAME_Rect *a, GAME_Rect *b, GAME_Rect *u,
+                        double max_overhead)
+{
+    double area_a, area_b, area_u;
+
+    if (_pg_do_rects_intersect(a, b)) {
+        return 1;
+    }
+    area_a = (double)a->w * a->h;
+    area_b = (double)b->w * b->h;
+    area_u = (double)u->w * u->h;
+    return area_u - area_a - area_b <= max_overhead * (area_a + area_b);
+}
+
+/* Grow u to the bounding box of u and b. */
+static void
+_pg_region_union(GAME_Rect *u, const GAME_Rect *b)
+{
+    int right = MAX(u->x + u->w, b->x + b->w);
+    int bottom = MAX(u->y + u->h, b->y + b->h);
+
+    u->x = MIN(u->x, b->x);
+    u->y = MIN(u->y, b->y);
+    u->w = right - u->x;
+    u->h = bottom - u->y;
+}
+
+/* right edge of a box, for the heap of _pg_region_merge_overlaps */
+typedef struct {
+    int right;
+    Py_ssize_t box;
+} _pg_region_edge;
+
+static void
+_pg_region_heap_push(_pg_region_edge *heap, Py_ssize_t *size, int right,
+                     Py_ssize_t box)
+{
+    Py_ssize_t i = (*size)++, parent;
+
+    while (i > 0) {
+        parent = (i - 1) / 2;
+        if (heap[parent].right <= right) {
+            break;
+        }
+        heap[i] = heap[parent];
+        i = parent;
+    }
+    heap[i].right = right;
+    heap[i].box = box;
+}
+
+static void
+_pg_region_heap_pop(_pg_region_edge *heap, Py_ssize_t *size)
+{
+    _pg_region_edge last = heap[--*size];
+    Py_ssize_t i = 0, child, n = *size;
+
+    while ((child = 2 * i + 1) < n) {
+        if (child + 1 < n && heap[child + 1].right < heap[child].right) {
+            ++child;
+        }
+        if (last.right <= heap[child].right) {
+            break;
+        }
+        heap[i] = heap[child];
+        i = child;
+    }
+    heap[i] = last;
+}
+
+/* Index of the first of the active boxes, sorted by top edge and not
+   overlapping, whose bottom edge is below y. */
+static Py_ssize_t
+_pg_region_find_below(GAME_Rect *rects, Py_ssize_t *active, Py_ssize_t count,
+                      int y)
+{
+    Py_ssize_t lo = 0, hi = count, mid;
+
+    while (lo < hi) {
+        mid = lo + (hi - lo) / 2;
+        if (rects[active[mid]].y + rects[active[mid]].h > y) {
+            hi = mid;
+        }
+        else {
+            lo = mid + 1;
+        }
+    }
+    return lo;
+}
+
+/* Replace overlapping rects by their bounding box until none overlap.
+   The rects are swept by left edge. The boxes crossing the sweep line do
+   not overlap each other, so they are kept sorted by top edge, and the
+   boxes a rect overlaps are the run of them found by a binary search. The
+   rect and the run are replaced by their bounding box, which also takes in
+   the boxes next to the run it grew over. A heap of right edges drops the
+   boxes the sweep has passed. So a pass takes O(n log n) time, plus moving
+   the sorted boxes along in memory when one is inserted or dropped.
+   A grown box can reach back left over a box already dropped. Only then
+   is another pass made. Returns the new count, or -1 if out of memory. */
+static Py_ssize_t
+_pg_region_merge_overlaps(GAME_Rect *rects, Py_ssize_t count)
+{
+    GAME_Rect *a, *b, u;
+    Py_ssize_t *active;
+    _pg_region_edge *edges;
+    Py_ssize_t i, j, k, lo, hi, n, nactive, nedges;
+    int passed, again = 1;
+
+    active = (Py_ssize_t *)malloc(sizeof(Py_ssize_t) * (count + 1));
+    /* one edge for each box, and one for each merge */
+    edges = (_pg_region_edge *)malloc(sizeof(_pg_region_edge) *
+                                      (count * 2 + 1));
+    if (!active || !edges) {
+        free(active);
+        free(edges);
+        return -1;
+    }
+    while (again) {
+        again = 0;
+        _pg_region_sort_left(rects, count);
+        nactive = nedges = n = 0;
+        /* the rightmost edge of the boxes dropped */
+        passed = INT_MIN;
+        for (i = 0; i < count; ++i) {
+            /* boxes are only written before i, so this does not clobber */
+            rects[n] = rects[i];
+            a = rects + n;
+
+            /* drop the boxes left behind by the sweep */
+            while (nedges && edges[0].right <= a->x) {
+                k = edges[0].box;
+                b = rects + k;
+                /* skip swallowed boxes, and edges of boxes which grew */
+                if (b->w && b->x + b->w == edges[0].right) {
+                    j = _pg_region_find_below(rects, active, nactive, b->y);
+                    if (j < nactive && active[j] == k) {
+                        memmove(active + j, active + j + 1,
+                                sizeof(Py_ssize_t) * (nactive - j - 1));
+                        --nactive;
+                        passed = MAX(passed, edges[0].right);
+                    }
+                }
+                _pg_region_heap_pop(edges, &nedges);
+            }
+
+            /* every active box crosses the left edge of a, so a overlaps
+               those it shares rows with, and the bounding box those the
+               box shares rows with */
+            lo = hi = _pg_region_find_below(rects, active, nactive, a->y);
+            u = *a;
+            for (;;) {
+                if (hi < nactive && rects[active[hi]].y < u.y + u.h) {
+                    b = rects + active[hi++];
+                }
+                else if (lo > 0 &&
+                         rects[active[lo - 1]].y + rects[active[lo - 1]].h >
+                             u.y) {
+                    b = rects + active[--lo];
+                }
+                else {
+                    break;
+                }
+                _pg_region_union(&u, b);
+            }
+
+            if (lo == hi) {
+                memmove(active + lo + 1, active + lo,
+                        sizeof(Py_ssize_t) * (nactive - lo));
+                active[lo] = n;
+                ++nactive;
+                _pg_region_heap_push(edges, &nedges, a->x + a->w, n);
+                ++n;
+                continue;
+            }
+
+            /* the first box of the run becomes the bounding box */
+            k = active[lo];
+            for (j = lo + 1; j < hi; ++j) {
+                rects[active[j]].w = 0; /* swallowed */
+            }
+            memmove(active + lo + 1, active + hi,
+                    sizeof(Py_ssize_t) * (nactive - hi));
+            nactive -= hi - lo - 1;
+            rects[k] = u;
+            _pg_region_heap_push(edges, &nedges, u.x + u.w, k);
+            if (u.x < passed) {
+                again = 1;
+            }
+        }
+        for (i = k = 0; i < n; ++i) {
+            if (rects[i].w) {
+                rects[k++] = rects[i];
+            }
+        }
+        count = k;
+    }
+    free(active);
+    free(edges);
+    return count;
+}
+
+/* Replace rects by their bounding boxes when the boxes waste at most
+   max_overhead times the area of the rects, until no two boxes should be
+   merged. Each pass sweeps the rects sorted by left edge, keeping the
+   boxes that may still reach the next rects: a rect further than
+   max_overhead * (box.w + widest) from a box cannot be merged with it
+   without going over. A rect is merged with each of those boxes it should
+   be merged with, in one scan of them. Boxes the grown box passed over
+   in the scan are left to the next pass, which is made after any merge.
+   A pass takes O(n log n) time plus, for each rect, a scan of the boxes
+   within reach. Returns the new count, or -1 if out of memory. */
+static Py_ssize_t
+_pg_region_merge_nearby(GAME_Rect *rects, Py_ssize_t count,
+                        double max_overhead)
+{
+    GAME_Rect *a, *b, u;
+    Py_ssize_t *active;
+    Py_ssize_t i, j, k, n, nactive;
+    int widest, merged;
+    int changed = 1;
+
+    active = (Py_ssize_t *)malloc(sizeof(Py_ssize_t) * (count + 1));
+    if (!active) {
+        return -1;
+    }
+    while (changed) {
+        changed = 0;
+        _pg_region_sort_left(rects, count);
+        for (i = widest = 0; i < count; ++i) {
+            widest = MAX(widest, rects[i].w);
+        }
+        nactive = n = 0;
+        for (i = 0; i < count; ++i) {
+            /* boxes are only written before i, so this does not clobber */
+            rects[n] = rects[i];
+            a = rects + n;
+
+            /* forget the boxes left behind by the sweep */
+            for (j = k = 0; j < nactive; ++j) {
+                b = rects + active[j];
+                if (b->w && b->x + b->w + max_overhead * ((double)b->w +
+                                                          widest) >=
+                                a->x) {
+                    active[k++] = active[j];
+                }
+            }
+            nactive = k;
+
+            merged = 0;
+            for (j = 0; j < nactive; ++j) {
+                b = rects + active[j];
+                if (!b->w || b == a) {
+                    continue; /* swallowed, or the box being grown */
+                }
+                u = *a;
+                _pg_region_union(&u, b);
+                if (!_pg_region_should_merge(a, b, &u, max_overhead)) {
+                    continue;
+                }
+                if (merged) {
+                    b->w = 0; /* swallowed */
+                    b = a;
+                }
+                merged = 1;
+                changed = 1;
+                *b = u;
+                a = b;
+            }
+            if (!merged) {
+                active[nactive++] = n++;
+            }
+        }
+        for (i = k = 0; i < n; ++i) {
+            if (rects[i].w) {
+                rects[k++] = rects[i];
+            }
+        }
+        count = k;
+    }
+    free(active);
+    return count;
+}
+
+/* Split the union of rects into non-overlapping rects, one row of rects
+   per horizontal band between two consecutive top or bottom edges. Rects
+   of a band continuing one of the band above, with the same left and
+   right edges, are joined with it. The rects are swept by top edge,
+   keeping those crossing the band sorted by left edge: the rects starting
+   at a band are sorted and merged in, so the spans of the band are found
+   in one scan. This takes O(n log n) time, plus one scan of the rects
+   crossing each band. Returns the new rects, to be freed with free(), or
+   NULL if out of memory. */
+static GAME_Rect *
+_pg_region_merge_exact(GAME_Rect *rects, Py_ssize_t count,
+                       Py_ssize_t *count_p)
+{
+    GAME_Rect *out = NULL, *open = NULL, *newopen = NULL, *tmp;
+    _pg_region_span *spans = NULL;
+    int *ys = NULL;
+    Py_ssize_t *active = NULL, *merged = NULL, *swap;
+    Py_ssize_t nys, nactive = 0, nopen = 0, nnewopen, nspans, nout = 0;
+    Py_ssize_t maxout = count * 2 + 1;
+    Py_ssize_t i, j, k, m, next = 0;
+    int y0, y1;
+
+    ys = (int *)malloc(sizeof(int) * (count * 2 + 1));
+    active = (Py_ssize_t *)malloc(sizeof(Py_ssize_t) * (count + 1));
+    merged = (Py_ssize_t *)malloc(sizeof(Py_ssize_t) * (count + 1));
+    spans = (_pg_region_span *)malloc(sizeof(_pg_region_span) * (count + 1));
+    open = (GAME_Rect *)malloc(sizeof(GAME_Rect) * (count + 1));
+    newopen = (GAME_Rect *)malloc(sizeof(GAME_Rect) * (count + 1));
+    out = (GAME_Rect *)malloc(sizeof(GAME_Rect) * maxout);
+    if (!ys || !active || !merged || !spans || !open || !newopen || !out) {
+        goto fail;
+    }
+
+    qsort(rects, count, sizeof(GAME_Rect), _pg_region_top_compare);
+    for (i = 0; i < count; ++i) {
+        ys[2 * i] = rects[i].y;
+        ys[2 * i + 1] = rects[i].y + rects[i].h;
+    }
+    qsort(ys, count * 2, sizeof(int), _pg_region_int_compare);
+    for (i = nys = 0; i < count * 2; ++i) {
+        if (!nys || ys[i] != ys[nys - 1]) {
+            ys[nys++] = ys[i];
+        }
+    }
+
+    for (k = 0; k + 1 < nys; ++k) {
+        y0 = ys[k];
+        y1 = ys[k + 1];
+
+        /* drop the rects ending above this band */
+        for (i = j = 0; i < nactive; ++i) {
+            if (rects[active[i]].y + rects[active[i]].h > y0) {
+                active[j++] = active[i];
+            }
+        }
+        nactive = j;
+
+        /* merge in the rects starting at it, sorted by left edge */
+        for (m = next; m < count && rects[m].y <= y0; ++m) {
+        }
+        if (m > next) {
+            _pg_region_sort_left(rects + next, m - next);
+            i = 0;
+            j = next;
+            nspans = 0;
+            while (i < nactive || j < m) {
+                if (j == m ||
+                    (i < nactive && rects[active[i]].x <= rects[j].x)) {
+                    merged[nspans++] = active[i++];
+                }
+                else {
+                    merged[nspans++] = j++;
+                }
+            }
+            swap = active;
+            active = merged;
+            merged = swap;
+            nactive = nspans;
+            next = m;
+        }
+
+        /* their x extents, merged */
+        for (i = nspans = 0; i < nactive; ++i) {
+            if (nspans && rects[active[i]].x <= spans[nspans - 1].right) {
+                spans[nspans - 1].right =
+                    MAX(spans[nspans - 1].right,
+                        rects[active[i]].x + rects[active[i]].w);
+            }
+            else {
+                spans[nspans].left = rects[active[i]].x;
+                spans[nspans].right = rects[active[i]].x + rects[active[i]].w;
+                ++nspans;
+            }
+        }
+        /* extend the open rects matching a span, close the others */
+        i = j = nnewopen = 0;
+        while (i < nopen || j < nspans) {
+            if (j == nspans ||
+                (i < nopen && open[i].x < spans[j].left)) {
+                out[nout++] = open[i++];
+            }
+            else if (i == nopen || open[i].x > spans[j].left ||
+                     open[i].x + open[i].w != spans[j].right) {
+                if (i < nopen && open[i].x == spans[j].left) {
+                    out[nout++] = open[i++];
+                }
+                newopen[nnewopen].x = spans[j].left;
+                newopen[nnewopen].y = y0;
+                newopen[nnewopen].w = spans[j].right - spans[j].left;
+                newopen[nnewopen].h = y1 - y0;
+                ++nnewopen;
+                ++j;
+            }
+            else {
+                newopen[nnewopen] = open[i++];
+                newopen[nnewopen].h += y1 - y0;
+                ++nnewopen;
+                ++j;
+            }
+            if (nout + count + 1 > maxout) {
+                maxout *= 2;
+                tmp = (GAME_Rect *)realloc(out, sizeof(GAME_Rect) * maxout);
+                if (!tmp) {
+                    goto fail;
+                }
+                out = tmp;
+            }
+        }
+        tmp = open;
+        open = newopen;
+        newopen = tmp;
+        nopen = nnewopen;
+    }
+    for (i = 0; i < nopen; ++i) {
+        out[nout++] = open[i];
+    }
+
+    free(ys);
+    free(active);
+    free(merged);
+    free(spans);
+    free(open);
+    free(newopen);
+    *count_p = nout;
+    return out;
+
+fail:
+    free(ys);
+    free(active);
+    free(merged);
+    free(spans);
+    free(open);
+    free(newopen);
+    free(out);
+    return NULL;
+}
+
+static int
+_pg_region_merge(pgRegionObject *self)
+{
+    GAME_Rect *rects;
+    Py_ssize_t count;
+
+    if (self->merged) {
+        return 0;
+    }
+    if (self->exact) {
+        rects = _pg_region_merge_exact(self->rects, self->count, &count);
+        if (!rects) {
+            PyErr_NoMemory();
+            return -1;
+        }
+        free(self->rects);
+        self->rects = rects;
+        self->count = count;
+        self->capacity = count;
+    }
+    else {
+        if (self->max_overhead > 0.0) {
+            count = _pg_region_merge_nearby(self->rects, self->count,
+                                            self->max_overhead);
+        }
+        else {
+            count = _pg_region_merge_overlaps(self->rects, self->count);
+        }
+        if (count < 0) {
+            PyErr_NoMemory();
+            return -1;
+        }
+        self->count = count;
+    }
+    self->merged = 1;
+    return 0;
+}
+
+static PyObject *
+pg_region_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    pgRegionObject *self = (pgRegionObject *)type->tp_alloc(type, 0);
+
+    if (self) {
+        self->rects = NULL;
+        self->count = self->capacity = 0;
+        self->merged = 1;
+        self->exact = 0;
+        self->max_overhead = 0.0;
+    }
+    return (PyObject *)self;
+}
+
+static int
+pg_region_init(pgRegionObject *self, PyObject *args, PyObject *kwds)
+{
+    int exact = 0;
+    double max_overhead = 0.0;
+    static char *kwids[] = {"exact", "max_overhead", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|id", kwids, &exact,
+                                     &max_overhead)) {
+        return -1;
+    }
+    if (max_overhead < 0.0) {
+        PyErr_SetString(PyExc_ValueError, "max_overhead must be positive");
+        return -1;
+    }
+    self->exact = exact;
+    self->max_overhead = max_overhead;
+    return 0;
+}
+
+static void
+pg_region_dealloc(pgRegionObject *self)
+{
+    free(self->rects);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyObject *
+pg_region_add(pgRegionObject *self, PyObject *args)
+{
+    GAME_Rect *argrect, temp, r;
+
+    if (!(argrect = pgRect_FromObject(args, &temp))) {
+        return RAISE(PyExc_TypeError, "Argument must be rect style object");
+    }
+    r = *argrect;
+    if (r.w < 0) {
+        r.x += r.w;
+        r.w = -r.w;
+    }
+    if (r.h < 0) {
+        r.y += r.h;
+        r.h = -r.h;
+    }
+    /* nothing to repaint */
+    if (!r.w || !r.h) {
+        Py_RETURN_NONE;
+    }
+    if (_pg_region_grow(self, self->count + 1)) {
+        return NULL;
+    }
+    self->rects[self->count++] = r;
+    self->merged = 0;
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+pg_region_rects(pgRegionObject *self, PyObject *args)
+{
+    PyObject *list, *rect;
+    Py_ssize_t i;
+
+    if (_pg_region_merge(self)) {
+        return NULL;
+    }
+    list = PyList_New(self->count);
+    if (!list) {
+        return NULL;
+    }
+    for (i = 0; i < self->count; ++i) {
+        rect = pgRect_New4(self->rects[i].x, self->rects[i].y,
+                           self->rects[i].w, self->rects[i].h);
+        if (!rect) {
+            Py_DECREF(list);
+            return NULL;
+        }
+        PyList_SET_ITEM(list, i, rect);
+    }
+    return list;
+}
+
+static PyObject *
+pg_region_clear(pgRegionObject *self, PyObject *args)
+{
+    self->count = 0;
+    self->merged = 1;
+    Py_RETURN_NONE;
+}
+
+static Py_ssize_t
+pg_region_length(pgRegionObject *self)
+{
+    if (_pg_region_merge(self)) {
+        return -1;
+    }
+    return self->count;
+}
+
+static PyObject *
+pg_region_repr(pgRegionObject *self)
+{
+    return Text_FromFormat("<Region(%d rects, exact=%d)>", (int)self->count,
+                           self->exact);
+}
+
+static struct PyMethodDef pg_region_methods[] = {
+    {"add", (PyCFunction)pg_region_add, METH_VARARGS, DOC_REGIONADD},
+    {"rects", (PyCFunction)pg_region_rects, METH_NOARGS, DOC_REGIONRECTS},
+    {"clear", (PyCFunction)pg_region_clear, METH_NOARGS, DOC_REGIONCLEAR},
+    {NULL, NULL, 0, NULL}};
+
+static PySequenceMethods pg_region_as_sequence = {
+    (lenfunc)pg_region_length, /*length*/
+    NULL,                      /*concat*/
+    NULL,                      /*repeat*/
+    NULL,                      /*item*/
+    NULL,                      /*slice*/
+    NULL,                      /*ass_item*/
+    NULL,                      /*ass_slice*/
+};
+
+static PyTypeObject pgRegion_Type = {
+    TYPE_HEAD(NULL, 0) "pygame.Region", /*name*/
+    sizeof(pgRegionObject),             /*basicsize*/
+    0,                                  /*itemsize*/
+    /* methods */
+    (destructor)pg_region_dealloc, /*dealloc*/
+    (printfunc)NULL,               /*print*/
+    NULL,                          /*getattr*/
+    NULL,                          /*setattr*/
+    NULL,                          /*compare/reserved*/
+    (reprfunc)pg_region_repr,      /*repr*/
+    NULL,                          /*as_number*/
+    &pg_region_as_sequence,        /*as_sequence*/
+    NULL,                          /*as_mapping*/
+    (hashfunc)NULL,                /*hash*/
+    (ternaryfunc)NULL,             /*call*/
+    (reprfunc)NULL,                /*str*/
+
+    /* Space for future expansion */
+    0L, 0L, 0L, Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /* tp_flags */
+    DOC_PYGAMEREGION,                 /* Documentation string */
+    NULL,                             /* tp_traverse */
+    NULL,                             /* tp_clear */
+    NULL,                             /* tp_richcompare */
+    0,                                /* tp_weaklistoffset */
+    NULL,                             /* tp_iter */
+    NULL,                             /* tp_iternext */
+    pg_region_methods,                /* tp_methods */
+    NULL,                             /* tp_members */
+    NULL,                             /* tp_getset */
+    NULL,                             /* tp_base */
+    NULL,                             /* tp_dict */
+    NULL,                             /* tp_descr_get */
+    NULL,                             /* tp_descr_set */
+    0,                                /* tp_dictoffset */
+    (initproc)pg_region_init,         /* tp_init */
+    NULL,                             /* tp_alloc */
+    pg_region_new,                    /* tp_new */
+};
+
 static PyMethodDef _pg_module_methods[] = {{NULL, NULL, 0, NULL}};
 
 /*DOC*/ static char _pg_module_doc[] =
@@ -1756,6 +2931,9 @@ MODINIT_DEFINE(rect)
     if (PyType_Ready(&pgRect_Type) < 0) {
         MODINIT_ERROR;
     }
+    if (PyType_Ready(&pgRegion_Type) < 0) {
+        MODINIT_ERROR;
+    }
 
 #if PY3
     module = PyModule_Create(&_module);
@@ -1776,12 +2954,17 @@ MODINIT_DEFINE(rect)
         DECREF_MOD(module);
         MODINIT_ERROR;
     }
+    if (PyDict_SetItemString(dict, "Region", (PyObject *)&pgRegion_Type)) {
+        DECREF_MOD(module);
+        MODINIT_ERROR;
+    }
 
     /* export the c api */
     c_api[0] = &pgRect_Type;
     c_api[1] = pgRect_New;
     c_api[2] = pgRect_New4;
     c_api[3] = pgRect_FromObject;
+    c_api[4] = _pg_rects_from_object;
     apiobj = encapsulate_api(c_api, "rect");
     if (apiobj == NULL) {
         DECREF_MOD(module);
@@ -70,4 +70,22 @@ void filter_expand_X_SSE_gcc(Uint8 *srcpix, Uint8 *dstpix, int *xidx0, int *xmul
 
 #endif /* #if (defined(__GNUC__) && .....) */
 
+/* The AVX2 filters are only built for x86-64, where the MMX/SSE ones are not.
+ */
+#if (defined(__GNUC__) && defined(__x86_64__) &&                         \
+     (__GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 9))) ||         \
+    (defined(__clang__) && defined(__x86_64__)) ||                        \
+    (defined(_MSC_VER) && _MSC_VER >= 1700 && defined(_M_X64))
+#define SCALE_AVX2_SUPPORT
+
+void filter_shrink_X_AVX2(Uint8 *srcpix, Uint8 *dstpix, int height, int srcpitch, int dstpitch, int srcwidth, int dstwidth);
+
+void filter_shrink_Y_AVX2(Uint8 *srcpix, Uint8 *dstpix, int width, int srcpitch, int dstpitch, int srcheight, int dstheight);
+
+void filter_expand_X_AVX2(Uint8 *srcpix, Uint8 *dstpix, int height, int srcpitch, int dstpitch, int srcwidth, int dstwidth);
+
+void filter_expand_Y_AVX2(Uint8 *srcpix, Uint8 *dstpix, int width, int srcpitch, int dstpitch, int srcheight, int dstheight);
+
+#endif /* #if (defined(__GNUC__) && defined(__x86_64__) && .....) */
+
 #endif /* #if !defined(SCALE_HEADER) */
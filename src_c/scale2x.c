@@ -195,3 +195,95 @@ scale2x(SDL_Surface *src, SDL_Surface *dst)
         }
     }
 }
+
+/*
+  Scale3x, from the same page, makes each pixel into a 3x3 block by
+  looking at the 8 pixels around it:
+
+    A B C      E0 E1 E2
+    D E F  ->  E3 E4 E5
+    G H I      E6 E7 E8
+
+  Like scale2x this needs a destination surface three times as large as
+  the source, with the same format.
+*/
+
+#define SCALE3X_ROWS(type, READ, WRITE, bpp)                                 \
+    for (looph = 0; looph < height; ++looph) {                               \
+        Uint8 *above = srcpix + MAX(0, looph - 1) * srcpitch;                \
+        Uint8 *row = srcpix + looph * srcpitch;                              \
+        Uint8 *below = srcpix + MIN(height - 1, looph + 1) * srcpitch;       \
+        Uint8 *out = dstpix + looph * 3 * dstpitch;                          \
+        for (loopw = 0; loopw < width; ++loopw) {                            \
+            int left = MAX(0, loopw - 1) * bpp, mid = loopw * bpp,           \
+                right = MIN(width - 1, loopw + 1) * bpp;                     \
+            type A = READ(above + left), B = READ(above + mid),              \
+                 C = READ(above + right), D = READ(row + left),              \
+                 E = READ(row + mid), F = READ(row + right),                 \
+                 G = READ(below + left), H = READ(below + mid),              \
+                 I = READ(below + right);                                    \
+            type E0 = E, E1 = E, E2 = E, E3 = E, E5 = E, E6 = E, E7 = E,     \
+                 E8 = E;                                                     \
+            Uint8 *p = out + loopw * 3 * bpp;                                \
+            if (B != H && D != F) {                                          \
+                E0 = D == B ? D : E;                                         \
+                E1 = (D == B && E != C) || (B == F && E != A) ? B : E;       \
+                E2 = B == F ? F : E;                                         \
+                E3 = (D == B && E != G) || (D == H && E != A) ? D : E;       \
+                E5 = (B == F && E != I) || (H == F && E != C) ? F : E;       \
+                E6 = D == H ? D : E;                                         \
+                E7 = (D == H && E != I) || (H == F && E != G) ? H : E;       \
+                E8 = H == F ? F : E;                                         \
+            }                                                                \
+            WRITE(p, E0);                                                    \
+            WRITE(p + bpp, E1);                                              \
+            WRITE(p + 2 * bpp, E2);                                          \
+            p += dstpitch;                                                   \
+            WRITE(p, E3);                                                    \
+            WRITE(p + bpp, E);                                               \
+            WRITE(p + 2 * bpp, E5);                                          \
+            p += dstpitch;                                                   \
+            WRITE(p, E6);                                                    \
+            WRITE(p + bpp, E7);                                              \
+            WRITE(p + 2 * bpp, E8);                                          \
+        }                                                                    \
+    }
+
+#define READ8(x) (*(Uint8 *)(x))
+#define WRITE8(x, i) (*(Uint8 *)(x) = (i))
+#define READ16(x) (*(Uint16 *)(x))
+#define WRITE16(x, i) (*(Uint16 *)(x) = (i))
+#define WRITE24(x, i)                                                 \
+    ((x)[0] = (Uint8)((i) >> 16), (x)[1] = (Uint8)((i) >> 8),         \
+     (x)[2] = (Uint8)(i))
+#define READ32(x) (*(Uint32 *)(x))
+#define WRITE32(x, i) (*(Uint32 *)(x) = (i))
+
+void
+scale3x(SDL_Surface *src, SDL_Surface *dst)
+{
+    int looph, loopw;
+
+    Uint8 *srcpix = (Uint8 *)src->pixels;
+    Uint8 *dstpix = (Uint8 *)dst->pixels;
+
+    const int srcpitch = src->pitch;
+    const int dstpitch = dst->pitch;
+    const int width = src->w;
+    const int height = src->h;
+
+    switch (src->format->BytesPerPixel) {
+        case 1:
+            SCALE3X_ROWS(Uint8, READ8, WRITE8, 1)
+            break;
+        case 2:
+            SCALE3X_ROWS(Uint16, READ16, WRITE16, 2)
+            break;
+        case 3:
+            SCALE3X_ROWS(int, READINT24, WRITE24, 3)
+            break;
+        default: /*case 4:*/
+            SCALE3X_ROWS(Uint32, READ32, WRITE32, 4)
+            break;
+    }
+}
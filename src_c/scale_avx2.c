@@ -0,0 +1,390 @@
+/*
+  pygame - Python Game Library
+  Copyright (C) 2000-2001  Pete Shinners
+  Copyright (C) 2007  Rene Dudfield, Richard Goedeken
+
+  This library is free software; you can redistribute it and/or
+  modify it under the terms of the GNU Library General Public
+  License as published by the Free Software Foundation; either
+  version 2 of the License, or (at your option) any later version.
+
+  This library is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+  Library General Public License for more details.
+
+  You should have received a copy of the GNU Library General Public
+  License along with this library; if not, write to the Free
+  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+  Pete Shinners
+  pete@shinners.org
+*/
+
+/* AVX2 smoothscale routines
+ *
+ * These give exactly the same pixels as the filter_*_ONLYC functions in
+ * transform.c, so the backend can be picked on speed alone. The bilinear
+ * filters use
+ *
+ *     (a * (0x10000 - m) + b * m) >> 16  ==  a + ((b - a) * m >> 16)
+ *
+ * which fits in 16 bit lanes, and the area-averaging filters keep their
+ * running sums in 16 bits so they wrap like the Uint16 sums of the C code.
+ *
+ * This file should not depend on anything but the C standard library.
+ */
+
+#include <stdint.h>
+typedef uint8_t Uint8;   /* SDL convension */
+typedef uint16_t Uint16; /* SDL convension */
+typedef uint32_t Uint32; /* SDL convension */
+#include <stdlib.h>
+#include <string.h>
+#include "scale.h"
+
+#if defined(SCALE_AVX2_SUPPORT)
+#include <immintrin.h>
+
+#if defined(_MSC_VER)
+#define SCALE_TARGET_AVX2
+#else
+#define SCALE_TARGET_AVX2 __attribute__((target("avx2")))
+#endif
+
+/* a + ((b - a) * m >> 16) for the 16 bit lanes a and b, with the weight m
+ * from 0 to 0xffff in w. mulhi is signed, so the weights of 0x8000 and up
+ * come out 0x10000 too low, which the d & sign(w) term puts back.
+ */
+#define LERP_EPI16(a, b, w)                                                \
+    _mm256_add_epi16(                                                      \
+        _mm256_add_epi16(a, _mm256_mulhi_epi16(_mm256_sub_epi16(b, a), w)), \
+        _mm256_and_si256(_mm256_sub_epi16(b, a), _mm256_srai_epi16(w, 15)))
+
+/* (Uint8)(((acc + part) * recip) >> 16) for the 16 bit lanes acc and part,
+ * worked out in 32 bits like the C code, with the 16 results left in the
+ * 16 bit lanes of the same order.
+ */
+SCALE_TARGET_AVX2 static __m256i
+average_epi16(__m256i acc, __m256i part, __m256i recip, __m256i bytemask)
+{
+    __m256i lo, hi;
+
+    lo = _mm256_add_epi32(
+        _mm256_cvtepu16_epi32(_mm256_castsi256_si128(acc)),
+        _mm256_cvtepu16_epi32(_mm256_castsi256_si128(part)));
+    hi = _mm256_add_epi32(
+        _mm256_cvtepu16_epi32(_mm256_extracti128_si256(acc, 1)),
+        _mm256_cvtepu16_epi32(_mm256_extracti128_si256(part, 1)));
+    lo = _mm256_and_si256(_mm256_srli_epi32(_mm256_mullo_epi32(lo, recip), 16),
+                          bytemask);
+    hi = _mm256_and_si256(_mm256_srli_epi32(_mm256_mullo_epi32(hi, recip), 16),
+                          bytemask);
+    /* the pack works within each 128 bit half, the permute puts the four
+     * 64 bit quarters back in order */
+    return _mm256_permute4x64_epi64(_mm256_packus_epi32(lo, hi),
+                                    _MM_SHUFFLE(3, 1, 2, 0));
+}
+
+/* The first 16 values of the 16 bit lanes of v as bytes */
+SCALE_TARGET_AVX2 static __m128i
+pack_epi16(__m256i v)
+{
+    return _mm_packus_epi16(_mm256_castsi256_si128(v),
+                            _mm256_extracti128_si256(v, 1));
+}
+
+/* One pixel from each of four rows, a 16 bit lane for each channel */
+#define LOAD_PIXEL_X4(row, off)                                          \
+    _mm256_cvtepu8_epi16(_mm_set_epi32(*(const int *)((row)[3] + (off)), \
+                                       *(const int *)((row)[2] + (off)), \
+                                       *(const int *)((row)[1] + (off)), \
+                                       *(const int *)((row)[0] + (off))))
+
+/* This filter averages areas in the X-dimension, four rows at a time.
+ * Which source pixels go to which destination pixel, with what weights,
+ * does not change from row to row, so it is worked out once up front.
+ */
+SCALE_TARGET_AVX2 void
+filter_shrink_X_AVX2(Uint8 *srcpix, Uint8 *dstpix, int height, int srcpitch,
+                     int dstpitch, int srcwidth, int dstwidth)
+{
+    int xspace = 0x10000 * srcwidth / dstwidth; /* must be > 1 */
+    int xrecip = (int)(0x100000000LL / xspace);
+    int *whole, *xcount, *xfrac;
+    Uint8 *spare;
+    const Uint8 *src[4];
+    Uint8 *dst[4];
+    int count, x, y, i, k, n, xcounter;
+    __m256i recip = _mm256_set1_epi32(xrecip);
+    __m256i bytemask = _mm256_set1_epi32(0xff);
+
+    whole = (int *)malloc(dstwidth * 3 * sizeof(int));
+    spare = (Uint8 *)malloc(dstwidth * 4);
+    if (!whole || !spare) {
+        free(whole);
+        free(spare);
+        return;
+    }
+    xcount = whole + dstwidth;
+    xfrac = xcount + dstwidth;
+
+    /* the same steps as the C version takes along each row */
+    count = 0;
+    n = 0;
+    xcounter = xspace;
+    for (x = 0; x < srcwidth && count < dstwidth; x++) {
+        if (xcounter > 0x10000) {
+            n++;
+            xcounter -= 0x10000;
+        }
+        else {
+            whole[count] = n;
+            xcount[count] = xcounter;
+            xfrac[count] = 0x10000 - xcounter;
+            count++;
+            n = 0;
+            xcounter = xspace - (0x10000 - xcounter);
+        }
+    }
+
+    for (y = 0; y < height; y += 4) {
+        __m256i acc = _mm256_setzero_si256();
+        int off = 0;
+
+        for (k = 0; k < 4; k++) {
+            if (y + k < height) {
+                src[k] = srcpix + (y + k) * srcpitch;
+                dst[k] = dstpix + (y + k) * dstpitch;
+            }
+            else {
+                /* the rows past the end are thrown away */
+                src[k] = src[0];
+                dst[k] = spare;
+            }
+        }
+        for (x = 0; x < count; x++) {
+            __m256i pixel, part;
+
+            for (i = 0; i < whole[x]; i++, off += 4) {
+                acc = _mm256_add_epi16(acc, LOAD_PIXEL_X4(src, off));
+            }
+            pixel = LOAD_PIXEL_X4(src, off);
+            off += 4;
+            if (xcount[x] == 0x10000) {
+                part = pixel;
+            }
+            else {
+                part = _mm256_mulhi_epu16(
+                    pixel, _mm256_set1_epi16((short)xcount[x]));
+            }
+            part = _mm256_packus_epi16(
+                average_epi16(acc, part, recip, bytemask),
+                _mm256_setzero_si256());
+            /* rows 0 and 1 are in the first half, rows 2 and 3 the second */
+            *(Uint32 *)(dst[0] + x * 4) = _mm256_extract_epi32(part, 0);
+            *(Uint32 *)(dst[1] + x * 4) = _mm256_extract_epi32(part, 1);
+            *(Uint32 *)(dst[2] + x * 4) = _mm256_extract_epi32(part, 4);
+            *(Uint32 *)(dst[3] + x * 4) = _mm256_extract_epi32(part, 5);
+            acc = _mm256_mulhi_epu16(pixel,
+                                     _mm256_set1_epi16((short)xfrac[x]));
+        }
+    }
+
+    free(whole);
+    free(spare);
+}
+
+/* This filter averages areas in the Y-dimension, 16 channels at a time */
+SCALE_TARGET_AVX2 void
+filter_shrink_Y_AVX2(Uint8 *srcpix, Uint8 *dstpix, int width, int srcpitch,
+                     int dstpitch, int srcheight, int dstheight)
+{
+    Uint16 *templine;
+    int yspace = 0x10000 * srcheight / dstheight; /* must be > 1 */
+    int yrecip = (int)(0x100000000LL / yspace);
+    int ycounter = yspace;
+    int size = width * 4;
+    int y, x;
+    __m256i recip = _mm256_set1_epi32(yrecip);
+    __m256i bytemask = _mm256_set1_epi32(0xff);
+
+    /* allocate and clear a memory area for storing the accumulator line */
+    templine = (Uint16 *)calloc(size, sizeof(Uint16));
+    if (templine == NULL)
+        return;
+
+    for (y = 0; y < srcheight; y++) {
+        Uint8 *src = srcpix + y * srcpitch;
+
+        if (ycounter > 0x10000) {
+            for (x = 0; x + 16 <= size; x += 16) {
+                __m256i pixels = _mm256_cvtepu8_epi16(
+                    _mm_loadu_si128((const __m128i *)(src + x)));
+                __m256i *acc = (__m256i *)(templine + x);
+
+                _mm256_storeu_si256(
+                    acc, _mm256_add_epi16(_mm256_loadu_si256(acc), pixels));
+            }
+            for (; x < size; x++) {
+                templine[x] += src[x];
+            }
+            ycounter -= 0x10000;
+        }
+        else {
+            int yfrac = 0x10000 - ycounter;
+            __m256i count = _mm256_set1_epi16((short)ycounter);
+            __m256i frac = _mm256_set1_epi16((short)yfrac);
+
+            /* write out a destination line */
+            for (x = 0; x + 16 <= size; x += 16) {
+                __m256i pixels = _mm256_cvtepu8_epi16(
+                    _mm_loadu_si128((const __m128i *)(src + x)));
+                __m256i *acc = (__m256i *)(templine + x);
+                __m256i part = ycounter == 0x10000
+                                   ? pixels
+                                   : _mm256_mulhi_epu16(pixels, count);
+
+                _mm_storeu_si128(
+                    (__m128i *)(dstpix + x),
+                    pack_epi16(average_epi16(_mm256_loadu_si256(acc), part,
+                                             recip, bytemask)));
+                _mm256_storeu_si256(acc, _mm256_mulhi_epu16(pixels, frac));
+            }
+            for (; x < size; x++) {
+                Uint32 part = ((Uint32)src[x] * ycounter) >> 16;
+
+                dstpix[x] = (Uint8)((((Uint32)templine[x] + part) *
+                                     (Uint32)yrecip) >> 16);
+                templine[x] = (Uint16)(((Uint32)src[x] * yfrac) >> 16);
+            }
+            dstpix += dstpitch;
+            ycounter = yspace - yfrac;
+        }
+    }
+
+    /* free the temporary memory */
+    free(templine);
+}
+
+/* This filter does linear interpolation in the X-dimension, four pixels at
+ * a time. Each destination pixel needs two source pixels, which are next to
+ * each other, so one 8 byte load gets both.
+ */
+SCALE_TARGET_AVX2 void
+filter_expand_X_AVX2(Uint8 *srcpix, Uint8 *dstpix, int height, int srcpitch,
+                     int dstpitch, int srcwidth, int dstwidth)
+{
+    int *xidx0;
+    Uint16 *weights;
+    int x, y, c;
+    int fast = srcwidth > 1 ? dstwidth & ~3 : 0;
+    __m256i zero = _mm256_setzero_si256();
+
+    /* Allocate memory for factors */
+    xidx0 = (int *)malloc(dstwidth * sizeof(int));
+    weights = (Uint16 *)malloc(dstwidth * 4 * sizeof(Uint16));
+    if (xidx0 == NULL || weights == NULL) {
+        free(xidx0);
+        free(weights);
+        return;
+    }
+
+    /* Create multiplier factors and starting indices and put them in arrays */
+    for (x = 0; x < dstwidth; x++) {
+        int xmult1 = 0x10000 * ((x * (srcwidth - 1)) % dstwidth) / dstwidth;
+
+        xidx0[x] = x * (srcwidth - 1) / dstwidth * 4;
+        for (c = 0; c < 4; c++) {
+            weights[x * 4 + c] = (Uint16)xmult1;
+        }
+    }
+
+    /* Do the scaling in raster order so we don't trash the cache */
+    for (y = 0; y < height; y++) {
+        Uint8 *src = srcpix + y * srcpitch;
+        Uint8 *dst = dstpix + y * dstpitch;
+
+        for (x = 0; x < fast; x += 4) {
+            __m128i q01 = _mm_unpacklo_epi64(
+                _mm_loadl_epi64((const __m128i *)(src + xidx0[x])),
+                _mm_loadl_epi64((const __m128i *)(src + xidx0[x + 1])));
+            __m128i q23 = _mm_unpacklo_epi64(
+                _mm_loadl_epi64((const __m128i *)(src + xidx0[x + 2])),
+                _mm_loadl_epi64((const __m128i *)(src + xidx0[x + 3])));
+            /* the left pixels in the low halves, the right in the high */
+            __m256i pixels = _mm256_shuffle_epi32(
+                _mm256_inserti128_si256(_mm256_castsi128_si256(q01), q23, 1),
+                _MM_SHUFFLE(3, 1, 2, 0));
+            __m256i w = _mm256_loadu_si256((const __m256i *)(weights + x * 4));
+            __m256i out = LERP_EPI16(_mm256_unpacklo_epi8(pixels, zero),
+                                     _mm256_unpackhi_epi8(pixels, zero), w);
+
+            out = _mm256_packus_epi16(out, out);
+            _mm_storel_epi64((__m128i *)(dst + x * 4),
+                             _mm256_castsi256_si128(out));
+            _mm_storel_epi64((__m128i *)(dst + x * 4 + 8),
+                             _mm256_extracti128_si256(out, 1));
+        }
+        for (; x < dstwidth; x++) {
+            const Uint8 *left = src + xidx0[x];
+            int xmult1 = weights[x * 4];
+
+            for (c = 0; c < 4; c++) {
+                int a = left[c];
+
+                /* a one pixel wide source has nothing on the right */
+                dst[x * 4 + c] =
+                    xmult1 ? (Uint8)(a + (((left[c + 4] - a) * xmult1) >> 16))
+                           : (Uint8)a;
+            }
+        }
+    }
+
+    /* free memory */
+    free(xidx0);
+    free(weights);
+}
+
+/* This filter does linear interpolation in the Y-dimension, 32 channels at
+ * a time */
+SCALE_TARGET_AVX2 void
+filter_expand_Y_AVX2(Uint8 *srcpix, Uint8 *dstpix, int width, int srcpitch,
+                     int dstpitch, int srcheight, int dstheight)
+{
+    int size = width * 4;
+    int x, y;
+    __m256i zero = _mm256_setzero_si256();
+
+    for (y = 0; y < dstheight; y++) {
+        int yidx0 = y * (srcheight - 1) / dstheight;
+        int ymult1 = 0x10000 * ((y * (srcheight - 1)) % dstheight) / dstheight;
+        Uint8 *srcrow0 = srcpix + yidx0 * srcpitch;
+        Uint8 *srcrow1 = srcrow0 + srcpitch;
+        Uint8 *dst = dstpix + y * dstpitch;
+        __m256i w = _mm256_set1_epi16((short)ymult1);
+
+        if (ymult1 == 0) {
+            memcpy(dst, srcrow0, size);
+            continue;
+        }
+        for (x = 0; x + 32 <= size; x += 32) {
+            __m256i a = _mm256_loadu_si256((const __m256i *)(srcrow0 + x));
+            __m256i b = _mm256_loadu_si256((const __m256i *)(srcrow1 + x));
+            __m256i lo = LERP_EPI16(_mm256_unpacklo_epi8(a, zero),
+                                    _mm256_unpacklo_epi8(b, zero), w);
+            __m256i hi = LERP_EPI16(_mm256_unpackhi_epi8(a, zero),
+                                    _mm256_unpackhi_epi8(b, zero), w);
+
+            _mm256_storeu_si256((__m256i *)(dst + x),
+                                _mm256_packus_epi16(lo, hi));
+        }
+        for (; x < size; x++) {
+            int a = srcrow0[x];
+
+            dst[x] = (Uint8)(a + (((srcrow1[x] - a) * ymult1) >> 16));
+        }
+    }
+}
+
+#endif /* SCALE_AVX2_SUPPORT */
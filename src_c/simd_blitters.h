@@ -0,0 +1,134 @@
+/*
+  pygame - Python Game Library
+
+  This library is free software; you can redistribute it and/or
+  modify it under the terms of the GNU Library General Public
+  License as published by the Free Software Foundation; either
+  version 2 of the License, or (at your option) any later version.
+
+  This library is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+  Library General Public License for more details.
+
+  You should have received a copy of the GNU Library General Public
+  License along with this library; if not, write to the Free
+  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*/
+
+/* SSE2 and AVX2 versions of the alphablit.c blitters, for 32 bit
+ * surfaces with 8 bit channels. They give the same pixels as the
+ * generic C code, which picks one of them at run time.
+ */
+
+#if !defined(SIMD_BLITTERS_HEADER)
+#define SIMD_BLITTERS_HEADER
+
+#include "_surface.h"
+
+/* The structure passed to the low level blit functions */
+typedef struct
+{
+    int              width;
+    int              height;
+    Uint8           *s_pixels;
+    int              s_pxskip;
+    int              s_skip;
+    Uint8           *d_pixels;
+    int              d_pxskip;
+    int              d_skip;
+    SDL_PixelFormat *src;
+    SDL_PixelFormat *dst;
+#if IS_SDLv1
+    Uint32           src_flags;
+    Uint32           dst_flags;
+#else /* IS_SDLv2 */
+    Uint8            src_blanket_alpha;
+    int              src_has_colorkey;
+    Uint32           src_colorkey;
+    SDL_BlendMode    src_blend;
+    SDL_BlendMode    dst_blend;
+#endif /* IS_SDLv2 */
+} SDL_BlitInfo;
+
+/* A blend mode fill of a rect of 4 byte pixels with 8 bit channels, see
+ * surface_fill_blend(). Each pixel becomes
+ * (op(pixel, color) & op_mask) | (pixel & keep_mask) | set_bits
+ * where op is the blend done on each byte.
+ */
+typedef struct
+{
+    int              width;
+    int              height;
+    Uint8           *pixels;
+    int              skip;
+    int              op; /* PYGAME_BLEND_ADD, _SUB, _MULT, _MIN or _MAX */
+    Uint32           color;
+    Uint32           op_mask;
+    Uint32           keep_mask;
+    Uint32           set_bits;
+} SIMD_FillInfo;
+
+#define BLIT_BACKEND_AUTO -1
+#define BLIT_BACKEND_GENERIC 0
+#define BLIT_BACKEND_SSE2 1
+#define BLIT_BACKEND_AVX2 2
+
+/* The backend in use, one of the above but BLIT_BACKEND_AUTO */
+int
+pygame_BlitBackend(void);
+
+#if IS_SDLv2
+#if defined(__SSE2__) || defined(_M_X64) || \
+    (defined(_M_IX86_FP) && _M_IX86_FP >= 2)
+#define PG_ENABLE_SSE2 1
+#endif
+
+#if (defined(__GNUC__) && (defined(__x86_64__) || defined(__i386__)) && \
+     (__GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 9))) ||       \
+    (defined(__clang__) && (defined(__x86_64__) || defined(__i386__)))
+#define PG_ENABLE_AVX2 1
+#define PG_TARGET_AVX2 __attribute__((target("avx2")))
+#elif defined(_MSC_VER) && _MSC_VER >= 1700 && \
+    (defined(_M_X64) || defined(_M_IX86))
+#define PG_ENABLE_AVX2 1
+#define PG_TARGET_AVX2
+#endif
+#if defined(PG_ENABLE_AVX2) && !SDL_VERSION_ATLEAST(2, 0, 4)
+/* no SDL_HasAVX2() to check for it */
+#undef PG_ENABLE_AVX2
+#endif
+
+#if defined(PG_ENABLE_SSE2) || defined(PG_ENABLE_AVX2)
+#define PG_SIMD_BLITTERS 1
+#endif
+#endif /* IS_SDLv2 */
+
+#if defined(PG_ENABLE_SSE2)
+void
+alphablit_alpha_sse2(SDL_BlitInfo *info);
+void
+blit_blend_rgba_mul_sse2(SDL_BlitInfo *info);
+void
+blit_blend_rgb_add_sse2(SDL_BlitInfo *info, Uint32 and_mask, Uint32 or_mask);
+void
+blit_blend_premultiplied_sse2(SDL_BlitInfo *info);
+void
+fill_blend_sse2(SIMD_FillInfo *info);
+#endif /* PG_ENABLE_SSE2 */
+
+#if defined(PG_ENABLE_AVX2)
+void
+alphablit_alpha_avx2(SDL_BlitInfo *info);
+void
+blit_blend_rgba_mul_avx2(SDL_BlitInfo *info);
+void
+blit_blend_rgb_add_avx2(SDL_BlitInfo *info, Uint32 and_mask, Uint32 or_mask);
+void
+blit_blend_premultiplied_avx2(SDL_BlitInfo *info);
+void
+fill_blend_avx2(SIMD_FillInfo *info);
+#endif /* PG_ENABLE_AVX2 */
+
+#endif /* SIMD_BLITTERS_HEADER */
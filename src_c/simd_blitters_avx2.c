@@ -0,0 +1,274 @@
+/*
+  pygame - Python Game Library
+
+  This library is free software; you can redistribute it and/or
+  modify it under the terms of the GNU Library General Public
+  License as published by the Free Software Foundation; either
+  version 2 of the License, or (at your option) any later version.
+
+  This library is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+  Library General Public License for more details.
+
+  You should have received a copy of the GNU Library General Public
+  License along with this library; if not, write to the Free
+  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*/
+
+/* AVX2 alpha blitters, eight pixels at a time.
+ * These work like the ones in simd_blitters_sse2.c, on twice the pixels.
+ * The unpack and pack instructions work within each 128 bit half, which
+ * keeps the pixels in place as every step is per channel.
+ */
+#define NO_PYGAME_C_API
+#include "simd_blitters.h"
+
+#if defined(PG_ENABLE_AVX2)
+#include <immintrin.h>
+#include <string.h>
+
+/* Run BLEND, which reads pixels s and d and leaves its result in d, over
+ * every row of the blit. The one to seven pixels left at the end of a row
+ * go through a copy, so nothing past the row is read or written.
+ * An overlapping self blit may go right to left from the last pixel. Then
+ * _src and _dst point 28 bytes before it, at the first of the pixels
+ * being blended, and move back.
+ */
+#define RUN_BLIT_AVX2(info, BLEND)                                   \
+    do {                                                             \
+        int _height = (info)->height;                                \
+        int _rest = (info)->width & 7;                               \
+        int _back = (info)->s_pxskip < 0;                            \
+        int _step = _back ? -32 : 32;                                \
+        Uint8 *_src = (info)->s_pixels - (_back ? 28 : 0);           \
+        Uint8 *_dst = (info)->d_pixels - (_back ? 28 : 0);           \
+        Uint8 *_s, *_d;                                              \
+        Uint32 _sbuf[8] = {0, 0, 0, 0, 0, 0, 0, 0};                  \
+        Uint32 _dbuf[8] = {0, 0, 0, 0, 0, 0, 0, 0};                  \
+        int _n;                                                      \
+                                                                     \
+        while (_height--) {                                          \
+            for (_n = (info)->width >> 3; _n > 0; --_n) {            \
+                s = _mm256_loadu_si256((__m256i *)_src);             \
+                d = _mm256_loadu_si256((__m256i *)_dst);             \
+                BLEND;                                               \
+                _mm256_storeu_si256((__m256i *)_dst, d);             \
+                _src += _step;                                       \
+                _dst += _step;                                       \
+            }                                                        \
+            if (_rest) {                                             \
+                _s = _back ? _src + 32 - _rest * 4 : _src;           \
+                _d = _back ? _dst + 32 - _rest * 4 : _dst;           \
+                memcpy(_sbuf, _s, _rest * 4);                        \
+                memcpy(_dbuf, _d, _rest * 4);                        \
+                s = _mm256_loadu_si256((__m256i *)_sbuf);            \
+                d = _mm256_loadu_si256((__m256i *)_dbuf);            \
+                BLEND;                                               \
+                _mm256_storeu_si256((__m256i *)_dbuf, d);            \
+                memcpy(_d, _dbuf, _rest * 4);                        \
+                _src += _back ? -_rest * 4 : _rest * 4;              \
+                _dst += _back ? -_rest * 4 : _rest * 4;              \
+            }                                                        \
+            _src += (info)->s_skip;                                  \
+            _dst += (info)->d_skip;                                  \
+        }                                                            \
+    } while (0)
+
+/* The source alpha of each pixel in all four of its bytes */
+#define SPREAD_ALPHA_AVX2(a, s, ashift)                         \
+    a = _mm256_and_si256(_mm256_srl_epi32(s, ashift),           \
+                         _mm256_set1_epi32(0xFF));              \
+    a = _mm256_or_si256(a, _mm256_slli_epi32(a, 8));            \
+    a = _mm256_or_si256(a, _mm256_slli_epi32(a, 16))
+
+/* x / 255 for 0 <= x <= 255 * 255 */
+#define DIV255_AVX2(x)                                                 \
+    _mm256_srli_epi16(                                                 \
+        _mm256_add_epi16(_mm256_add_epi16(x, _mm256_set1_epi16(1)),    \
+                         _mm256_srli_epi16(x, 8)),                     \
+        8)
+
+/* Take the bytes under mask from a, the others from b */
+#define SELECT_AVX2(mask, a, b)                    \
+    _mm256_or_si256(_mm256_and_si256(mask, a),     \
+                    _mm256_andnot_si256(mask, b))
+
+/* ALPHA_BLEND, see alphablit_alpha_sse2() */
+PG_TARGET_AVX2 void
+alphablit_alpha_avx2(SDL_BlitInfo *info)
+{
+    __m256i s, d, a, lo, hi, res_lo, res_hi, prod, empty;
+    __m256i zero = _mm256_setzero_si256();
+    __m256i one = _mm256_set1_epi16(1);
+    __m256i c256 = _mm256_set1_epi16(256);
+    __m256i amask = _mm256_set1_epi32(info->dst->Amask);
+    __m256i amask_lo = _mm256_unpacklo_epi8(amask, amask);
+    __m256i amask_hi = _mm256_unpackhi_epi8(amask, amask);
+    __m128i ashift = _mm_cvtsi32_si128(info->src->Ashift);
+
+#define ALPHA_HALF_AVX2(res, UNPACK, half_amask)                         \
+    lo = UNPACK(s, zero);                                                \
+    hi = UNPACK(d, zero);                                                \
+    prod = UNPACK(a, zero);                                              \
+    res = _mm256_srli_epi16(                                             \
+        _mm256_add_epi16(                                                \
+            _mm256_mullo_epi16(lo, _mm256_add_epi16(prod, one)),         \
+            _mm256_mullo_epi16(hi, _mm256_sub_epi16(c256, prod))),       \
+        8);                                                              \
+    prod = _mm256_mullo_epi16(hi, prod);                                 \
+    lo = _mm256_sub_epi16(_mm256_add_epi16(lo, hi), DIV255_AVX2(prod));  \
+    res = SELECT_AVX2(half_amask, lo, res)
+
+    RUN_BLIT_AVX2(info, {
+        SPREAD_ALPHA_AVX2(a, s, ashift);
+        ALPHA_HALF_AVX2(res_lo, _mm256_unpacklo_epi8, amask_lo);
+        ALPHA_HALF_AVX2(res_hi, _mm256_unpackhi_epi8, amask_hi);
+        /* a transparent destination pixel is replaced */
+        empty = _mm256_cmpeq_epi32(_mm256_and_si256(d, amask), zero);
+        d = SELECT_AVX2(empty, s, _mm256_packus_epi16(res_lo, res_hi));
+    });
+
+#undef ALPHA_HALF_AVX2
+}
+
+/* BLEND_RGBA_MULT, all four channels */
+PG_TARGET_AVX2 void
+blit_blend_rgba_mul_avx2(SDL_BlitInfo *info)
+{
+    __m256i s, d, lo, hi;
+    __m256i zero = _mm256_setzero_si256();
+
+    RUN_BLIT_AVX2(info, {
+        lo = _mm256_mullo_epi16(_mm256_unpacklo_epi8(s, zero),
+                                _mm256_unpacklo_epi8(d, zero));
+        hi = _mm256_mullo_epi16(_mm256_unpackhi_epi8(s, zero),
+                                _mm256_unpackhi_epi8(d, zero));
+        d = _mm256_packus_epi16(_mm256_srli_epi16(lo, 8),
+                                _mm256_srli_epi16(hi, 8));
+    });
+}
+
+/* BLEND_ADD, see blit_blend_rgb_add_sse2() */
+PG_TARGET_AVX2 void
+blit_blend_rgb_add_avx2(SDL_BlitInfo *info, Uint32 and_mask, Uint32 or_mask)
+{
+    __m256i s, d;
+    __m256i rgb = _mm256_set1_epi32(info->src->Rmask | info->src->Gmask |
+                                    info->src->Bmask);
+    __m256i and_m = _mm256_set1_epi32(and_mask);
+    __m256i or_m = _mm256_set1_epi32(or_mask);
+
+    RUN_BLIT_AVX2(info, {
+        d = _mm256_adds_epu8(d, _mm256_and_si256(s, rgb));
+        d = _mm256_or_si256(_mm256_and_si256(d, and_m), or_m);
+    });
+}
+
+/* ALPHA_BLEND_PREMULTIPLIED */
+PG_TARGET_AVX2 void
+blit_blend_premultiplied_avx2(SDL_BlitInfo *info)
+{
+    __m256i s, d, a, lo, hi, sum, prod, res_lo, res_hi;
+    __m256i zero = _mm256_setzero_si256();
+    __m256i amask = _mm256_set1_epi32(info->dst->Amask);
+    __m256i amask_lo = _mm256_unpacklo_epi8(amask, amask);
+    __m256i amask_hi = _mm256_unpackhi_epi8(amask, amask);
+    __m128i ashift = _mm_cvtsi32_si128(info->src->Ashift);
+
+#define PREMUL_HALF_AVX2(res, UNPACK, half_amask)                     \
+    lo = UNPACK(s, zero);                                             \
+    hi = UNPACK(d, zero);                                             \
+    prod = _mm256_mullo_epi16(hi, UNPACK(a, zero));                   \
+    sum = _mm256_add_epi16(lo, hi);                                   \
+    res = SELECT_AVX2(half_amask,                                     \
+                      _mm256_sub_epi16(sum, DIV255_AVX2(prod)),       \
+                      _mm256_sub_epi16(sum, _mm256_srli_epi16(prod, 8)))
+
+    RUN_BLIT_AVX2(info, {
+        SPREAD_ALPHA_AVX2(a, s, ashift);
+        PREMUL_HALF_AVX2(res_lo, _mm256_unpacklo_epi8, amask_lo);
+        PREMUL_HALF_AVX2(res_hi, _mm256_unpackhi_epi8, amask_hi);
+        d = _mm256_packus_epi16(res_lo, res_hi);
+    });
+
+#undef PREMUL_HALF_AVX2
+}
+
+/* FILL_RESULT_SSE2() and RUN_FILL_SSE2() on eight pixels at a time */
+#define FILL_RESULT_AVX2(d, res)                                         \
+    d = _mm256_or_si256(_mm256_or_si256(_mm256_and_si256(res, op_mask),  \
+                                        _mm256_and_si256(d, keep_mask)), \
+                        set_bits)
+
+#define RUN_FILL_AVX2(info, OP)                                      \
+    do {                                                             \
+        int _height = (info)->height;                                \
+        int _rest = (info)->width & 7;                               \
+        Uint8 *_dst = (info)->pixels;                                \
+        Uint32 _dbuf[8] = {0, 0, 0, 0, 0, 0, 0, 0};                  \
+        int _n;                                                      \
+                                                                     \
+        while (_height--) {                                          \
+            for (_n = (info)->width >> 3; _n > 0; --_n) {            \
+                d = _mm256_loadu_si256((__m256i *)_dst);             \
+                OP;                                                  \
+                FILL_RESULT_AVX2(d, res);                            \
+                _mm256_storeu_si256((__m256i *)_dst, d);             \
+                _dst += 32;                                          \
+            }                                                        \
+            if (_rest) {                                             \
+                memcpy(_dbuf, _dst, _rest * 4);                      \
+                d = _mm256_loadu_si256((__m256i *)_dbuf);            \
+                OP;                                                  \
+                FILL_RESULT_AVX2(d, res);                            \
+                _mm256_storeu_si256((__m256i *)_dbuf, d);            \
+                memcpy(_dst, _dbuf, _rest * 4);                      \
+                _dst += _rest * 4;                                   \
+            }                                                        \
+            _dst += (info)->skip;                                    \
+        }                                                            \
+    } while (0)
+
+/* See fill_blend_sse2() */
+PG_TARGET_AVX2 void
+fill_blend_avx2(SIMD_FillInfo *info)
+{
+    __m256i d, res;
+    __m256i zero = _mm256_setzero_si256();
+    __m256i color = _mm256_set1_epi32(info->color);
+    __m256i color16 = _mm256_unpacklo_epi8(color, zero);
+    __m256i op_mask = _mm256_set1_epi32(info->op_mask);
+    __m256i keep_mask = _mm256_set1_epi32(info->keep_mask);
+    __m256i set_bits = _mm256_set1_epi32(info->set_bits);
+
+    switch (info->op) {
+        case PYGAME_BLEND_ADD:
+            RUN_FILL_AVX2(info, res = _mm256_adds_epu8(d, color));
+            break;
+        case PYGAME_BLEND_SUB:
+            RUN_FILL_AVX2(info, res = _mm256_subs_epu8(d, color));
+            break;
+        case PYGAME_BLEND_MULT:
+            RUN_FILL_AVX2(info, {
+                res = _mm256_packus_epi16(
+                    _mm256_srli_epi16(
+                        _mm256_mullo_epi16(_mm256_unpacklo_epi8(d, zero),
+                                           color16),
+                        8),
+                    _mm256_srli_epi16(
+                        _mm256_mullo_epi16(_mm256_unpackhi_epi8(d, zero),
+                                           color16),
+                        8));
+            });
+            break;
+        case PYGAME_BLEND_MIN:
+            RUN_FILL_AVX2(info, res = _mm256_min_epu8(d, color));
+            break;
+        case PYGAME_BLEND_MAX:
+            RUN_FILL_AVX2(info, res = _mm256_max_epu8(d, color));
+            break;
+    }
+}
+#endif /* PG_ENABLE_AVX2 */
@@ -0,0 +1,277 @@
+/*
+  pygame - Python Game Library
+
+  This library is free software; you can redistribute it and/or
+  modify it under the terms of the GNU Library General Public
+  License as published by the Free Software Foundation; either
+  version 2 of the License, or (at your option) any later version.
+
+  This library is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+  Library General Public License for more details.
+
+  You should have received a copy of the GNU Library General Public
+  License along with this library; if not, write to the Free
+  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*/
+
+/* SSE2 alpha blitters, four pixels at a time.
+ * alphablit.c only calls these for 4 byte pixels with 8 bit channels,
+ * laid out the same in both surfaces.
+ */
+#define NO_PYGAME_C_API
+#include "simd_blitters.h"
+
+#if defined(PG_ENABLE_SSE2)
+#include <emmintrin.h>
+#include <string.h>
+
+/* Run BLEND, which reads pixels s and d and leaves its result in d, over
+ * every row of the blit. The one to three pixels left at the end of a row
+ * go through a copy, so nothing past the row is read or written.
+ * An overlapping self blit may go right to left from the last pixel. Then
+ * _src and _dst point 12 bytes before it, at the first of the pixels
+ * being blended, and move back.
+ */
+#define RUN_BLIT_SSE2(info, BLEND)                                   \
+    do {                                                             \
+        int _height = (info)->height;                                \
+        int _rest = (info)->width & 3;                               \
+        int _back = (info)->s_pxskip < 0;                            \
+        int _step = _back ? -16 : 16;                                \
+        Uint8 *_src = (info)->s_pixels - (_back ? 12 : 0);           \
+        Uint8 *_dst = (info)->d_pixels - (_back ? 12 : 0);           \
+        Uint8 *_s, *_d;                                              \
+        Uint32 _sbuf[4] = {0, 0, 0, 0};                              \
+        Uint32 _dbuf[4] = {0, 0, 0, 0};                              \
+        int _n;                                                      \
+                                                                     \
+        while (_height--) {                                          \
+            for (_n = (info)->width >> 2; _n > 0; --_n) {            \
+                s = _mm_loadu_si128((__m128i *)_src);                \
+                d = _mm_loadu_si128((__m128i *)_dst);                \
+                BLEND;                                               \
+                _mm_storeu_si128((__m128i *)_dst, d);                \
+                _src += _step;                                       \
+                _dst += _step;                                       \
+            }                                                        \
+            if (_rest) {                                             \
+                _s = _back ? _src + 16 - _rest * 4 : _src;           \
+                _d = _back ? _dst + 16 - _rest * 4 : _dst;           \
+                memcpy(_sbuf, _s, _rest * 4);                        \
+                memcpy(_dbuf, _d, _rest * 4);                        \
+                s = _mm_loadu_si128((__m128i *)_sbuf);               \
+                d = _mm_loadu_si128((__m128i *)_dbuf);               \
+                BLEND;                                               \
+                _mm_storeu_si128((__m128i *)_dbuf, d);               \
+                memcpy(_d, _dbuf, _rest * 4);                        \
+                _src += _back ? -_rest * 4 : _rest * 4;              \
+                _dst += _back ? -_rest * 4 : _rest * 4;              \
+            }                                                        \
+            _src += (info)->s_skip;                                  \
+            _dst += (info)->d_skip;                                  \
+        }                                                            \
+    } while (0)
+
+/* The source alpha of each pixel in all four of its bytes */
+#define SPREAD_ALPHA_SSE2(a, s, ashift)                                \
+    a = _mm_and_si128(_mm_srl_epi32(s, ashift), _mm_set1_epi32(0xFF)); \
+    a = _mm_or_si128(a, _mm_slli_epi32(a, 8));                         \
+    a = _mm_or_si128(a, _mm_slli_epi32(a, 16))
+
+/* x / 255 for 0 <= x <= 255 * 255 */
+#define DIV255_SSE2(x)                                              \
+    _mm_srli_epi16(                                                 \
+        _mm_add_epi16(_mm_add_epi16(x, _mm_set1_epi16(1)),          \
+                      _mm_srli_epi16(x, 8)),                        \
+        8)
+
+/* Take the bytes under mask from a, the others from b */
+#define SELECT_SSE2(mask, a, b) \
+    _mm_or_si128(_mm_and_si128(mask, a), _mm_andnot_si128(mask, b))
+
+/* ALPHA_BLEND. The color is worked out as
+ * (sC * (sA + 1) + dC * (256 - sA)) >> 8, which is what
+ * ALPHA_BLEND_COMP gives, but never goes past 16 bits.
+ */
+void
+alphablit_alpha_sse2(SDL_BlitInfo *info)
+{
+    __m128i s, d, a, lo, hi, res_lo, res_hi, prod, empty;
+    __m128i zero = _mm_setzero_si128();
+    __m128i one = _mm_set1_epi16(1);
+    __m128i c256 = _mm_set1_epi16(256);
+    __m128i amask = _mm_set1_epi32(info->dst->Amask);
+    __m128i amask_lo = _mm_unpacklo_epi8(amask, amask);
+    __m128i amask_hi = _mm_unpackhi_epi8(amask, amask);
+    __m128i ashift = _mm_cvtsi32_si128(info->src->Ashift);
+
+#define ALPHA_HALF_SSE2(res, UNPACK, half_amask)                           \
+    lo = UNPACK(s, zero);                                                  \
+    hi = UNPACK(d, zero);                                                  \
+    prod = UNPACK(a, zero);                                                \
+    res = _mm_srli_epi16(                                                  \
+        _mm_add_epi16(_mm_mullo_epi16(lo, _mm_add_epi16(prod, one)),       \
+                      _mm_mullo_epi16(hi, _mm_sub_epi16(c256, prod))),     \
+        8);                                                                \
+    prod = _mm_mullo_epi16(hi, prod);                                      \
+    lo = _mm_sub_epi16(_mm_add_epi16(lo, hi), DIV255_SSE2(prod));          \
+    res = SELECT_SSE2(half_amask, lo, res)
+
+    RUN_BLIT_SSE2(info, {
+        SPREAD_ALPHA_SSE2(a, s, ashift);
+        ALPHA_HALF_SSE2(res_lo, _mm_unpacklo_epi8, amask_lo);
+        ALPHA_HALF_SSE2(res_hi, _mm_unpackhi_epi8, amask_hi);
+        /* a transparent destination pixel is replaced */
+        empty = _mm_cmpeq_epi32(_mm_and_si128(d, amask), zero);
+        d = SELECT_SSE2(empty, s, _mm_packus_epi16(res_lo, res_hi));
+    });
+
+#undef ALPHA_HALF_SSE2
+}
+
+/* BLEND_RGBA_MULT, all four channels */
+void
+blit_blend_rgba_mul_sse2(SDL_BlitInfo *info)
+{
+    __m128i s, d, lo, hi;
+    __m128i zero = _mm_setzero_si128();
+
+    RUN_BLIT_SSE2(info, {
+        lo = _mm_mullo_epi16(_mm_unpacklo_epi8(s, zero),
+                             _mm_unpacklo_epi8(d, zero));
+        hi = _mm_mullo_epi16(_mm_unpackhi_epi8(s, zero),
+                             _mm_unpackhi_epi8(d, zero));
+        d = _mm_packus_epi16(_mm_srli_epi16(lo, 8), _mm_srli_epi16(hi, 8));
+    });
+}
+
+/* BLEND_ADD. The result is masked with and_mask and or_mask, to give
+ * the destination alpha byte what the generic code would write there.
+ */
+void
+blit_blend_rgb_add_sse2(SDL_BlitInfo *info, Uint32 and_mask, Uint32 or_mask)
+{
+    __m128i s, d;
+    __m128i rgb = _mm_set1_epi32(info->src->Rmask | info->src->Gmask |
+                                 info->src->Bmask);
+    __m128i and_m = _mm_set1_epi32(and_mask);
+    __m128i or_m = _mm_set1_epi32(or_mask);
+
+    RUN_BLIT_SSE2(info, {
+        d = _mm_adds_epu8(d, _mm_and_si128(s, rgb));
+        d = _mm_or_si128(_mm_and_si128(d, and_m), or_m);
+    });
+}
+
+/* ALPHA_BLEND_PREMULTIPLIED */
+void
+blit_blend_premultiplied_sse2(SDL_BlitInfo *info)
+{
+    __m128i s, d, a, lo, hi, sum, prod, res_lo, res_hi;
+    __m128i zero = _mm_setzero_si128();
+    __m128i amask = _mm_set1_epi32(info->dst->Amask);
+    __m128i amask_lo = _mm_unpacklo_epi8(amask, amask);
+    __m128i amask_hi = _mm_unpackhi_epi8(amask, amask);
+    __m128i ashift = _mm_cvtsi32_si128(info->src->Ashift);
+
+#define PREMUL_HALF_SSE2(res, UNPACK, half_amask)                          \
+    lo = UNPACK(s, zero);                                                  \
+    hi = UNPACK(d, zero);                                                  \
+    prod = _mm_mullo_epi16(hi, UNPACK(a, zero));                           \
+    sum = _mm_add_epi16(lo, hi);                                           \
+    res = SELECT_SSE2(half_amask, _mm_sub_epi16(sum, DIV255_SSE2(prod)),   \
+                      _mm_sub_epi16(sum, _mm_srli_epi16(prod, 8)))
+
+    RUN_BLIT_SSE2(info, {
+        SPREAD_ALPHA_SSE2(a, s, ashift);
+        PREMUL_HALF_SSE2(res_lo, _mm_unpacklo_epi8, amask_lo);
+        PREMUL_HALF_SSE2(res_hi, _mm_unpackhi_epi8, amask_hi);
+        d = _mm_packus_epi16(res_lo, res_hi);
+    });
+
+#undef PREMUL_HALF_SSE2
+}
+
+/* Put the pixel bytes blended into res back into d, see SIMD_FillInfo */
+#define FILL_RESULT_SSE2(d, res)                                    \
+    d = _mm_or_si128(_mm_or_si128(_mm_and_si128(res, op_mask),      \
+                                  _mm_and_si128(d, keep_mask)),     \
+                     set_bits)
+
+/* Run OP, which reads the pixels d and leaves the blended ones in res,
+ * over every row of a fill. The one to three pixels left at the end of a
+ * row go through a copy, so nothing past the row is read or written.
+ */
+#define RUN_FILL_SSE2(info, OP)                                      \
+    do {                                                             \
+        int _height = (info)->height;                                \
+        int _rest = (info)->width & 3;                               \
+        Uint8 *_dst = (info)->pixels;                                \
+        Uint32 _dbuf[4] = {0, 0, 0, 0};                              \
+        int _n;                                                      \
+                                                                     \
+        while (_height--) {                                          \
+            for (_n = (info)->width >> 2; _n > 0; --_n) {            \
+                d = _mm_loadu_si128((__m128i *)_dst);                \
+                OP;                                                  \
+                FILL_RESULT_SSE2(d, res);                            \
+                _mm_storeu_si128((__m128i *)_dst, d);                \
+                _dst += 16;                                          \
+            }                                                        \
+            if (_rest) {                                             \
+                memcpy(_dbuf, _dst, _rest * 4);                      \
+                d = _mm_loadu_si128((__m128i *)_dbuf);               \
+                OP;                                                  \
+                FILL_RESULT_SSE2(d, res);                            \
+                _mm_storeu_si128((__m128i *)_dbuf, d);               \
+                memcpy(_dst, _dbuf, _rest * 4);                      \
+                _dst += _rest * 4;                                   \
+            }                                                        \
+            _dst += (info)->skip;                                    \
+        }                                                            \
+    } while (0)
+
+/* The blend mode fills of surface_fill.c. BLEND_MULT is
+ * (d * c) >> 8, like the BLEND_MULT macro.
+ */
+void
+fill_blend_sse2(SIMD_FillInfo *info)
+{
+    __m128i d, res;
+    __m128i zero = _mm_setzero_si128();
+    __m128i color = _mm_set1_epi32(info->color);
+    __m128i color16 = _mm_unpacklo_epi8(color, zero);
+    __m128i op_mask = _mm_set1_epi32(info->op_mask);
+    __m128i keep_mask = _mm_set1_epi32(info->keep_mask);
+    __m128i set_bits = _mm_set1_epi32(info->set_bits);
+
+    switch (info->op) {
+        case PYGAME_BLEND_ADD:
+            RUN_FILL_SSE2(info, res = _mm_adds_epu8(d, color));
+            break;
+        case PYGAME_BLEND_SUB:
+            RUN_FILL_SSE2(info, res = _mm_subs_epu8(d, color));
+            break;
+        case PYGAME_BLEND_MULT:
+            RUN_FILL_SSE2(info, {
+                res = _mm_packus_epi16(
+                    _mm_srli_epi16(
+                        _mm_mullo_epi16(_mm_unpacklo_epi8(d, zero), color16),
+                        8),
+                    _mm_srli_epi16(
+                        _mm_mullo_epi16(_mm_unpackhi_epi8(d, zero), color16),
+                        8));
+            });
+            break;
+        case PYGAME_BLEND_MIN:
+            RUN_FILL_SSE2(info, res = _mm_min_epu8(d, color));
+            break;
+        case PYGAME_BLEND_MAX:
+            RUN_FILL_SSE2(info, res = _mm_max_epu8(d, color));
+            break;
+    }
+}
+#endif /* PG_ENABLE_SSE2 */
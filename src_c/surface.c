@@ -144,8 +144,12 @@ surf_blit(PyObject *self, PyObject *args, PyObject *keywds);
 static PyObject *
 surf_blits(PyObject *self, PyObject *args, PyObject *keywds);
 static PyObject *
+surf_blit_sprites(PyObject *self, PyObject *args);
+static PyObject *
 surf_fill(PyObject *self, PyObject *args, PyObject *keywds);
 static PyObject *
+surf_fill_rects(PyObject *self, PyObject *args, PyObject *keywds);
+static PyObject *
 surf_scroll(PyObject *self, PyObject *args, PyObject *keywds);
 static PyObject *
 surf_get_abs_offset(PyObject *self, PyObject *args);
@@ -191,6 +195,8 @@ static PyObject *
 surf_get_bounding_rect(PyObject *self, PyObject *args, PyObject *kwargs);
 static PyObject *
 surf_get_pixels_address(PyObject *self, PyObject *closure);
+static PyObject *
+surf_get_pixels_version(PyObject *self, PyObject *closure);
 static int
 _view_kind(PyObject *obj, void *view_kind_vptr);
 static int
@@ -258,9 +264,25 @@ pg_map_rgba(SDL_Surface *surf, Uint8 r, Uint8 g, Uint8 b, Uint8 a)
 #define pg_map_rgba(surf, r, g, b, a) SDL_MapRGBA((surf)->format, (r), (g), (b), (a))
 #endif /* IS_SDLv1 || SDL_VERSION_ATLEAST(2, 0, 10) */
 
+/* Bump the pixel version of a Surface and of the Surfaces it was cut
+   from, as a subsurface shares their pixels. */
+static void
+surf_touch(PyObject *surfobj)
+{
+    struct pgSubSurface_Data *data;
+
+    pgSurface_Touch(surfobj);
+    while ((data = ((pgSurfaceObject *)surfobj)->subsurface) != NULL) {
+        surfobj = data->owner;
+        pgSurface_Touch(surfobj);
+    }
+}
+
 static PyGetSetDef surface_getsets[] = {
     {"_pixels_address", (getter)surf_get_pixels_address, NULL,
      "pixel buffer address (readonly)", NULL},
+    {"_pixels_version", (getter)surf_get_pixels_version, NULL,
+     "changes whenever the pixels may have (readonly)", NULL},
     {NULL, NULL, NULL, NULL, NULL}};
 
 static struct PyMethodDef surface_methods[] = {
@@ -309,10 +331,14 @@ static struct PyMethodDef surface_methods[] = {
 
     {"fill", (PyCFunction)surf_fill, METH_VARARGS | METH_KEYWORDS,
      DOC_SURFACEFILL},
+    {"fill_rects", (PyCFunction)surf_fill_rects, METH_VARARGS | METH_KEYWORDS,
+     DOC_SURFACEFILLRECTS},
     {"blit", (PyCFunction)surf_blit, METH_VARARGS | METH_KEYWORDS,
      DOC_SURFACEBLIT},
     {"blits", (PyCFunction)surf_blits, METH_VARARGS | METH_KEYWORDS,
      DOC_SURFACEBLITS},
+    {"_blit_sprites", surf_blit_sprites, METH_VARARGS,
+     "blit the sprites of a sprite group, for pygame.sprite"},
 
     {"scroll", (PyCFunction)surf_scroll, METH_VARARGS | METH_KEYWORDS,
      DOC_SURFACESCROLL},
@@ -462,6 +488,7 @@ surface_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
         self->weakreflist = NULL;
         self->dependency = NULL;
         self->locklist = NULL;
+        self->version = 0;
     }
     return (PyObject *)self;
 }
@@ -1290,6 +1317,7 @@ surf_set_palette(PyObject *self, PyObject *args)
 #endif /* IS_SDLv2 */
     }
 
+    surf_touch(self);
 #if IS_SDLv1
     SDL_SetColors(surf, colors, 0, len);
     free(colors);
@@ -1340,6 +1368,7 @@ surf_set_palette_at(PyObject *self, PyObject *args)
         return RAISE(pgExc_SDLError,
                      "cannot set palette without pygame.display initialized");
 
+    surf_touch(self);
 #if IS_SDLv1
     color.r = rgba[0];
     color.g = rgba[1];
@@ -1411,6 +1440,7 @@ surf_set_colorkey(PyObject *self, PyObject *args)
         flags |= SDL_SRCCOLORKEY;
 #endif /* IS_SDLv1 */
 
+    surf_touch(self);
     pgSurface_Prep(self);
 #if IS_SDLv1
     result = SDL_SetColorKey(surf, flags, color);
@@ -1533,6 +1563,7 @@ surf_set_alpha(PyObject *self, PyObject *args)
     else
         alpha = (Uint8)alphaval;
 
+    surf_touch(self);
     pgSurface_Prep(self);
 #if IS_SDLv1
     result = SDL_SetAlpha(surf, flags, alpha);
@@ -2006,6 +2037,64 @@ surf_get_clip(PyObject *self, PyObject *args)
     return pgRect_New(&surf->clip_rect);
 }
 
+/* Gets the color for fill() and fill_rects(), as a mapped color or an
+   int. Returns 0 with an exception set if it is not a color. */
+static int
+_pg_fill_color(SDL_Surface *surf, PyObject *rgba_obj, Uint32 *color)
+{
+    Uint8 rgba[4];
+
+    if (PyInt_Check(rgba_obj))
+        *color = (Uint32)PyInt_AsLong(rgba_obj);
+    else if (PyLong_Check(rgba_obj))
+        *color = (Uint32)PyLong_AsUnsignedLong(rgba_obj);
+    else if (pg_RGBAFromColorObj(rgba_obj, rgba))
+        *color = pg_map_rgba(surf, rgba[0], rgba[1], rgba[2], rgba[3]);
+    else {
+        PyErr_SetString(PyExc_TypeError, "invalid color argument");
+        return 0;
+    }
+    return 1;
+}
+
+/* Clips a rect for fill() and fill_rects() to the surface. Returns 0 if
+   there is nothing to fill, with sdlrect set to an empty rect. */
+static int
+_pg_clip_fill_rect(SDL_Surface *surf, GAME_Rect *rect, SDL_Rect *sdlrect)
+{
+    if (rect->w < 0 || rect->h < 0 || rect->x > surf->w || rect->y > surf->h) {
+        sdlrect->x = sdlrect->y = 0;
+        sdlrect->w = sdlrect->h = 0;
+        return 0;
+    }
+
+    sdlrect->x = rect->x;
+    sdlrect->y = rect->y;
+    sdlrect->w = rect->w;
+    sdlrect->h = rect->h;
+
+    // clip the rect to be within the surface.
+    if (sdlrect->x + sdlrect->w <= 0 || sdlrect->y + sdlrect->h <= 0) {
+        sdlrect->w = 0;
+        sdlrect->h = 0;
+    }
+
+    if (sdlrect->x < 0) {
+        sdlrect->x = 0;
+    }
+    if (sdlrect->y < 0) {
+        sdlrect->y = 0;
+    }
+
+    if (sdlrect->x + sdlrect->w > surf->w) {
+        sdlrect->w = sdlrect->w + (surf->w - (sdlrect->x + sdlrect->w));
+    }
+    if (sdlrect->y + sdlrect->h > surf->h) {
+        sdlrect->h = sdlrect->h + (surf->h - (sdlrect->y + sdlrect->h));
+    }
+    return 1;
+}
+
 static PyObject *
 surf_fill(PyObject *self, PyObject *args, PyObject *keywds)
 {
@@ -2015,7 +2104,6 @@ surf_fill(PyObject *self, PyObject *args, PyObject *keywds)
     Uint32 color;
     int result;
     PyObject *rgba_obj;
-    Uint8 rgba[4];
     SDL_Rect sdlrect;
     int blendargs = 0;
 
@@ -2031,14 +2119,8 @@ surf_fill(PyObject *self, PyObject *args, PyObject *keywds)
         return RAISE(pgExc_SDLError, "Cannot call on OPENGL Surfaces");
 #endif /* IS_SDLv1 */
 
-    if (PyInt_Check(rgba_obj))
-        color = (Uint32)PyInt_AsLong(rgba_obj);
-    else if (PyLong_Check(rgba_obj))
-        color = (Uint32)PyLong_AsUnsignedLong(rgba_obj);
-    else if (pg_RGBAFromColorObj(rgba_obj, rgba))
-        color = pg_map_rgba(surf, rgba[0], rgba[1], rgba[2], rgba[3]);
-    else
-        return RAISE(PyExc_TypeError, "invalid color argument");
+    if (!_pg_fill_color(surf, rgba_obj, &color))
+        return NULL;
 
     if (!r || r == Py_None) {
         rect = &temp;
@@ -2055,39 +2137,11 @@ surf_fill(PyObject *self, PyObject *args, PyObject *keywds)
         rect = &temp;
     }
 
-    if (rect->w < 0 || rect->h < 0 || rect->x > surf->w || rect->y > surf->h) {
-        sdlrect.x = sdlrect.y = 0;
-        sdlrect.w = sdlrect.h = 0;
-    }
-    else {
-        sdlrect.x = rect->x;
-        sdlrect.y = rect->y;
-        sdlrect.w = rect->w;
-        sdlrect.h = rect->h;
-
-        // clip the rect to be within the surface.
-        if (sdlrect.x + sdlrect.w <= 0 || sdlrect.y + sdlrect.h <= 0) {
-            sdlrect.w = 0;
-            sdlrect.h = 0;
-        }
-
-        if (sdlrect.x < 0) {
-            sdlrect.x = 0;
-        }
-        if (sdlrect.y < 0) {
-            sdlrect.y = 0;
-        }
-
-        if (sdlrect.x + sdlrect.w > surf->w) {
-            sdlrect.w = sdlrect.w + (surf->w - (sdlrect.x + sdlrect.w));
-        }
-        if (sdlrect.y + sdlrect.h > surf->h) {
-            sdlrect.h = sdlrect.h + (surf->h - (sdlrect.y + sdlrect.h));
-        }
-
+    if (_pg_clip_fill_rect(surf, rect, &sdlrect)) {
         /* printf("%d, %d, %d, %d\n", sdlrect.x, sdlrect.y, sdlrect.w,
          * sdlrect.h); */
 
+        surf_touch(self);
         if (blendargs != 0) {
             /*
             printf ("Using blendargs: %d\n", blendargs);
@@ -2105,6 +2159,88 @@ surf_fill(PyObject *self, PyObject *args, PyObject *keywds)
     return pgRect_New(&sdlrect);
 }
 
+/* Fill many rects in one call, locking the surface once. The rects are a
+   sequence of rect style objects, or a packed rect array as taken by
+   Rect.collidelist, read by pgRect_RectsFromObject. */
+static PyObject *
+surf_fill_rects(PyObject *self, PyObject *args, PyObject *keywds)
+{
+    SDL_Surface *surf = pgSurface_AsSurface(self);
+    GAME_Rect *argrects;
+    PyObject *rgba_obj, *rectsobj;
+    SDL_Rect *rects;
+    Py_ssize_t i, count, n = 0;
+    Uint32 color;
+    int result = 0;
+    int blendargs = 0;
+
+    static char *kwids[] = {"color", "rects", "special_flags", NULL};
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "OO|i", kwids, &rgba_obj,
+                                     &rectsobj, &blendargs))
+        return NULL;
+    if (!surf)
+        return RAISE(pgExc_SDLError, "display Surface quit");
+
+#if IS_SDLv1
+    if (surf->flags & SDL_OPENGL)
+        return RAISE(pgExc_SDLError, "Cannot call on OPENGL Surfaces");
+#endif /* IS_SDLv1 */
+
+    if (!_pg_fill_color(surf, rgba_obj, &color))
+        return NULL;
+
+    /* the same packed rect arrays and rect sequences as Rect.collidelist */
+    argrects = pgRect_RectsFromObject(rectsobj, &count);
+    if (!argrects) {
+        return NULL;
+    }
+    rects = PyMem_New(SDL_Rect, count ? count : 1);
+    if (!rects) {
+        PyMem_Free(argrects);
+        return PyErr_NoMemory();
+    }
+    for (i = 0; i < count; ++i) {
+        if (_pg_clip_fill_rect(surf, argrects + i, rects + n) &&
+            rects[n].w > 0 && rects[n].h > 0) {
+            ++n;
+        }
+    }
+    PyMem_Free(argrects);
+
+    if (n > INT_MAX) {
+        PyMem_Free(rects);
+        return RAISE(PyExc_ValueError, "too many rects");
+    }
+
+    if (n) {
+        surf_touch(self);
+        if (blendargs != 0) {
+            Py_BEGIN_ALLOW_THREADS;
+            result = surface_fill_blend_rects(surf, rects, (int)n, color,
+                                              blendargs);
+            Py_END_ALLOW_THREADS;
+        }
+        else {
+            pgSurface_Prep(self);
+            Py_BEGIN_ALLOW_THREADS;
+#if IS_SDLv1
+            for (i = 0; i < n && result != -1; ++i) {
+                result = SDL_FillRect(surf, rects + i, color);
+            }
+#else  /* IS_SDLv2 */
+            result = SDL_FillRects(surf, rects, (int)n, color);
+#endif /* IS_SDLv2 */
+            Py_END_ALLOW_THREADS;
+            pgSurface_Unprep(self);
+        }
+    }
+    PyMem_Free(rects);
+
+    if (result == -1)
+        return RAISE(pgExc_SDLError, SDL_GetError());
+    Py_RETURN_NONE;
+}
+
 static PyObject *
 surf_blit(PyObject *self, PyObject *args, PyObject *keywds)
 {
@@ -2183,32 +2319,548 @@ surf_blit(PyObject *self, PyObject *args, PyObject *keywds)
 #define BLITS_ERR_INVALID_RECT_STYLE 6
 #define BLITS_ERR_MUST_ASSIGN_NUMERIC 7
 #define BLITS_ERR_BLIT_FAIL 8
+#define BLITS_ERR_INVALID_THREADS 9
+
+/* Read one (source, dest[, area[, special_flags]]) item of a blits()
+ * sequence. On success *srcobject is set to a new reference to the source
+ * Surface and 0 is returned, otherwise one of the BLITS_ERR_ numbers.
+ */
+static int
+_surf_blits_item(SDL_Surface *dest, PyObject *item, PyObject **srcobject,
+                 SDL_Rect *dest_rect, SDL_Rect *sdlsrc_rect, int *the_args)
+{
+    SDL_Surface *src;
+    GAME_Rect *src_rect, temp;
+    PyObject *argpos = NULL, *argrect = NULL, *special_flags = NULL;
+    int dx, dy, sx, sy;
+    int itemlength;
+    int bliterrornum = 0;
+
+    *srcobject = NULL;
+    *the_args = 0;
+    if (!PySequence_Check(item)) {
+        return BLITS_ERR_SEQUENCE_REQUIRED;
+    }
+    itemlength = PySequence_Length(item);
+    if (itemlength > 4 || itemlength < 2) {
+        return BLITS_ERR_SEQUENCE_REQUIRED;
+    }
+
+    /* (Surface, dest) */
+    *srcobject = PySequence_GetItem(item, 0);
+    argpos = PySequence_GetItem(item, 1);
+    if (itemlength >= 3) {
+        /* (Surface, dest, area) */
+        argrect = PySequence_GetItem(item, 2);
+    }
+    if (itemlength == 4) {
+        /* (Surface, dest, area, special_flags) */
+        special_flags = PySequence_GetItem(item, 3);
+    }
+
+    src = pgSurface_AsSurface(*srcobject);
+    if (!dest) {
+        bliterrornum = BLITS_ERR_DISPLAY_SURF_QUIT;
+        goto itemerror;
+    }
+    if (!src) {
+        bliterrornum = BLITS_ERR_SEQUENCE_SURF;
+        goto itemerror;
+    }
+
+#if IS_SDLv1
+    if (dest->flags & SDL_OPENGL &&
+        !(dest->flags & (SDL_OPENGLBLIT & ~SDL_OPENGL))) {
+        bliterrornum = BLITS_ERR_NO_OPENGL_SURF;
+        goto itemerror;
+    }
+#endif /* IS_SDLv1 */
+
+    if ((src_rect = pgRect_FromObject(argpos, &temp))) {
+        dx = src_rect->x;
+        dy = src_rect->y;
+    }
+    else if (pg_TwoIntsFromObj(argpos, &sx, &sy)) {
+        dx = sx;
+        dy = sy;
+    }
+    else {
+        bliterrornum = BLITS_ERR_INVALID_DESTINATION;
+        goto itemerror;
+    }
+    if (argrect && argrect != Py_None) {
+        if (!(src_rect = pgRect_FromObject(argrect, &temp))) {
+            bliterrornum = BLITS_ERR_INVALID_RECT_STYLE;
+            goto itemerror;
+        }
+    }
+    else {
+        temp.x = temp.y = 0;
+        temp.w = src->w;
+        temp.h = src->h;
+        src_rect = &temp;
+    }
+
+    dest_rect->x = (short)dx;
+    dest_rect->y = (short)dy;
+    dest_rect->w = (unsigned short)src_rect->w;
+    dest_rect->h = (unsigned short)src_rect->h;
+    sdlsrc_rect->x = (short)src_rect->x;
+    sdlsrc_rect->y = (short)src_rect->y;
+    sdlsrc_rect->w = (unsigned short)src_rect->w;
+    sdlsrc_rect->h = (unsigned short)src_rect->h;
+
+    if (special_flags) {
+        if (!pg_IntFromObj(special_flags, the_args)) {
+            bliterrornum = BLITS_ERR_MUST_ASSIGN_NUMERIC;
+            goto itemerror;
+        }
+    }
+
+    Py_DECREF(argpos);
+    Py_XDECREF(argrect);
+    Py_XDECREF(special_flags);
+    return 0;
+
+itemerror:
+    Py_XDECREF(*srcobject);
+    *srcobject = NULL;
+    Py_XDECREF(argpos);
+    Py_XDECREF(argrect);
+    Py_XDECREF(special_flags);
+    return bliterrornum;
+}
+
+/* One blit of a threaded blits() call, read while holding the GIL. */
+typedef struct {
+    int src_index; /* into the list of distinct sources */
+    int the_args;
+    SDL_Rect dest_rect;
+    SDL_Rect src_rect;
+    SDL_Rect clipped; /* the area changed, for threaded blits */
+} _pg_blits_job;
+
+#if IS_SDLv2
+/* The part of the destination one thread draws to. dest and sources are
+ * Surface headers owned by the band, sharing pixels with the real ones, as
+ * SDL keeps per surface state (the blit map and lock count) in them.
+ * sources is indexed like the list of distinct sources, with NULL for
+ * those not drawn in the band.
+ */
+typedef struct {
+    SDL_Surface *dest;
+    SDL_Surface **sources;
+    _pg_blits_job *jobs;
+    Py_ssize_t njobs;
+    int top;
+    int bottom;
+    int result;
+    char error[256];
+} _pg_blits_band;
+
+/* Clip a blit the way SDL_UpperBlit() and pygame_Blit() do, leaving
+ * in dstrect the area they would report as changed, or a zero size.
+ */
+static void
+_surf_blits_clip(SDL_Surface *src, SDL_Rect *srcrect, SDL_Surface *dst,
+                 SDL_Rect *dstrect)
+{
+    SDL_Rect *clip = &dst->clip_rect;
+    int srcx = srcrect->x, srcy = srcrect->y;
+    int w = srcrect->w, h = srcrect->h;
+    int dx, dy;
+
+    if (srcx < 0) {
+        w += srcx;
+        dstrect->x -= srcx;
+        srcx = 0;
+    }
+    if (src->w - srcx < w)
+        w = src->w - srcx;
+    if (srcy < 0) {
+        h += srcy;
+        dstrect->y -= srcy;
+        srcy = 0;
+    }
+    if (src->h - srcy < h)
+        h = src->h - srcy;
+
+    dx = clip->x - dstrect->x;
+    if (dx > 0) {
+        w -= dx;
+        dstrect->x += dx;
+    }
+    dx = dstrect->x + w - clip->x - clip->w;
+    if (dx > 0)
+        w -= dx;
+    dy = clip->y - dstrect->y;
+    if (dy > 0) {
+        h -= dy;
+        dstrect->y += dy;
+    }
+    dy = dstrect->y + h - clip->y - clip->h;
+    if (dy > 0)
+        h -= dy;
+
+    if (w > 0 && h > 0) {
+        dstrect->w = w;
+        dstrect->h = h;
+    }
+    else {
+        dstrect->w = dstrect->h = 0;
+    }
+}
+
+/* A new Surface sharing the pixels and blit settings of surf. */
+static SDL_Surface *
+_surf_blits_header(SDL_Surface *surf, Uint8 *pixels, int h)
+{
+    SDL_PixelFormat *fmt = surf->format;
+    SDL_Surface *header;
+    SDL_BlendMode mode;
+    Uint32 key;
+    Uint8 r, g, b, a;
+
+    header = SDL_CreateRGBSurfaceFrom(pixels, surf->w, h, fmt->BitsPerPixel,
+                                      surf->pitch, fmt->Rmask, fmt->Gmask,
+                                      fmt->Bmask, fmt->Amask);
+    if (!header)
+        return NULL;
+    if (fmt->palette && SDL_SetSurfacePalette(header, fmt->palette) != 0)
+        goto fail;
+    if (SDL_GetColorKey(surf, &key) == 0 &&
+        SDL_SetColorKey(header, SDL_TRUE, key) != 0)
+        goto fail;
+    if (SDL_GetSurfaceAlphaMod(surf, &a) != 0 ||
+        SDL_SetSurfaceAlphaMod(header, a) != 0)
+        goto fail;
+    if (SDL_GetSurfaceColorMod(surf, &r, &g, &b) != 0 ||
+        SDL_SetSurfaceColorMod(header, r, g, b) != 0)
+        goto fail;
+    if (SDL_GetSurfaceBlendMode(surf, &mode) != 0 ||
+        SDL_SetSurfaceBlendMode(header, mode) != 0)
+        goto fail;
+    return header;
+
+fail:
+    SDL_FreeSurface(header);
+    return NULL;
+}
+
+/* Does the job draw anything in the band? */
+#define _PG_BLITS_IN_BAND(band, job)                         \
+    ((job)->clipped.w != 0 && (job)->clipped.y < (band)->bottom && \
+     (job)->clipped.y + (job)->clipped.h > (band)->top)
+
+static int SDLCALL
+_surf_blits_band(void *data)
+{
+    _pg_blits_band *band = (_pg_blits_band *)data;
+    _pg_blits_job *job;
+    SDL_Surface *src;
+    SDL_Rect dest_rect, src_rect;
+    Py_ssize_t i;
+    int result = 0;
+
+    for (i = 0; i < band->njobs && result == 0; ++i) {
+        job = band->jobs + i;
+        if (!_PG_BLITS_IN_BAND(band, job))
+            continue;
+        src = band->sources[job->src_index];
+        src_rect = job->src_rect;
+        dest_rect = job->dest_rect;
+        dest_rect.y -= band->top;
+        if (job->the_args != 0)
+            result = pygame_Blit(src, &src_rect, band->dest, &dest_rect,
+                                 job->the_args);
+        else
+            result = SDL_BlitSurface(src, &src_rect, band->dest, &dest_rect);
+    }
+    if (result != 0) {
+        strncpy(band->error, SDL_GetError(), sizeof(band->error) - 1);
+        band->error[sizeof(band->error) - 1] = '\0';
+    }
+    band->result = result;
+    return result;
+}
+
+/* Can the blits be run on copies of the Surface headers in other threads?
+ * Anything pgSurface_Blit() treats specially is left to it.
+ */
+static int
+_surf_blits_can_thread(PyObject *self, PyObject *sources)
+{
+    SDL_Surface *dest = pgSurface_AsSurface(self);
+    SDL_Surface *src;
+    Uint8 *dest_end, *src_end;
+    Uint8 alpha;
+    Py_ssize_t i;
+
+    if (((pgSurfaceObject *)self)->subsurface || dest->locked ||
+        SDL_MUSTLOCK(dest))
+        return 0;
+    dest_end = (Uint8 *)dest->pixels + dest->pitch * dest->h;
+    for (i = 0; i < PyList_GET_SIZE(sources); ++i) {
+        src = pgSurface_AsSurface(PyList_GET_ITEM(sources, i));
+        if (src->locked || SDL_MUSTLOCK(src))
+            return 0;
+        /* a blit within the same pixels */
+        src_end = (Uint8 *)src->pixels + src->pitch * src->h;
+        if ((Uint8 *)src->pixels < dest_end &&
+            (Uint8 *)dest->pixels < src_end)
+            return 0;
+        /* converted before blitting to 8 bit */
+        if (dest->format->BytesPerPixel == 1 &&
+            (SDL_ISPIXELFORMAT_ALPHA(src->format->format) ||
+             (SDL_GetSurfaceAlphaMod(src, &alpha) == 0 && alpha != 255)))
+            return 0;
+    }
+    return 1;
+}
+
+/* Unlock the first n of the sources, and the destination. */
+static void
+_surf_blits_unlock(PyObject *self, PyObject *sources, Py_ssize_t n)
+{
+    while (n > 0)
+        pgSurface_Unlock(PyList_GET_ITEM(sources, --n));
+    pgSurface_Unlock(self);
+}
+
+/* Blit the jobs in horizontal bands of the destination, one band per
+ * thread, without the GIL. The destination and the sources stay locked
+ * while the threads run, as for any other access to the pixels without
+ * the GIL. Returns -1 with an exception set on failure.
+ */
+static int
+_surf_blits_threaded(PyObject *self, PyObject *sources, _pg_blits_job *jobs,
+                     Py_ssize_t njobs, int nthreads)
+{
+    SDL_Surface *dest = pgSurface_AsSurface(self);
+    Py_ssize_t nsources = PyList_GET_SIZE(sources);
+    _pg_blits_band *bands;
+    SDL_Thread **threads;
+    SDL_Surface **headers;
+    SDL_Rect clip;
+    Py_ssize_t i, j;
+    int t, top, result = 0;
+    char error[256];
+
+    bands = PyMem_New(_pg_blits_band, nthreads);
+    threads = PyMem_New(SDL_Thread *, nthreads);
+    /* the source headers of every band, in one block */
+    headers = PyMem_New(SDL_Surface *, nthreads * (nsources ? nsources : 1));
+    if (!bands || !threads || !headers) {
+        PyMem_Free(bands);
+        PyMem_Free(threads);
+        PyMem_Free(headers);
+        PyErr_NoMemory();
+        return -1;
+    }
+    memset(bands, 0, sizeof(_pg_blits_band) * nthreads);
+    memset(threads, 0, sizeof(SDL_Thread *) * nthreads);
+    memset(headers, 0,
+           sizeof(SDL_Surface *) * nthreads * (nsources ? nsources : 1));
+
+    if (!pgSurface_Lock(self)) {
+        i = -1;
+        goto lockerror;
+    }
+    for (i = 0; i < nsources; ++i) {
+        if (!pgSurface_Lock(PyList_GET_ITEM(sources, i)))
+            goto lockerror;
+    }
+
+    for (t = 0, top = 0; t < nthreads; ++t) {
+        bands[t].sources = headers + t * nsources;
+        bands[t].jobs = jobs;
+        bands[t].njobs = njobs;
+        bands[t].top = top;
+        bands[t].bottom = top = dest->h * (t + 1) / nthreads;
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    for (t = 0; t < nthreads && result == 0; ++t) {
+        _pg_blits_band *band = bands + t;
+
+        band->dest = _surf_blits_header(
+            dest, (Uint8 *)dest->pixels + dest->pitch * band->top,
+            band->bottom - band->top);
+        if (!band->dest) {
+            result = -1;
+            break;
+        }
+        clip = dest->clip_rect;
+        clip.y -= band->top;
+        SDL_SetClipRect(band->dest, &clip);
+        /* only the sources drawn in this band need a header for it */
+        for (j = 0; j < njobs; ++j) {
+            int index = jobs[j].src_index;
+            SDL_Surface *src;
+
+            if (band->sources[index] || !_PG_BLITS_IN_BAND(band, jobs + j))
+                continue;
+            src = ((pgSurfaceObject *)PyList_GET_ITEM(sources, index))->surf;
+            band->sources[index] =
+                _surf_blits_header(src, src->pixels, src->h);
+            if (!band->sources[index]) {
+                result = -1;
+                break;
+            }
+        }
+    }
+    if (result != 0) {
+        strncpy(error, SDL_GetError(), sizeof(error) - 1);
+        error[sizeof(error) - 1] = '\0';
+    }
+    else {
+        for (t = 1; t < nthreads; ++t) {
+            threads[t] =
+                SDL_CreateThread(_surf_blits_band, "pgblits", bands + t);
+            if (!threads[t]) {
+                /* this thread draws the band itself */
+                _surf_blits_band(bands + t);
+            }
+        }
+        _surf_blits_band(bands);
+        for (t = 1; t < nthreads; ++t) {
+            if (threads[t])
+                SDL_WaitThread(threads[t], NULL);
+        }
+        for (t = 0; t < nthreads; ++t) {
+            if (bands[t].result != 0) {
+                result = bands[t].result;
+                memcpy(error, bands[t].error, sizeof(error));
+                break;
+            }
+        }
+    }
+
+    for (t = 0; t < nthreads; ++t) {
+        for (i = 0; i < nsources; ++i)
+            SDL_FreeSurface(bands[t].sources[i]);
+        SDL_FreeSurface(bands[t].dest);
+    }
+    Py_END_ALLOW_THREADS;
+
+    _surf_blits_unlock(self, sources, nsources);
+    PyMem_Free(bands);
+    PyMem_Free(threads);
+    PyMem_Free(headers);
+    if (result == -1) {
+        RAISE(pgExc_SDLError, error);
+        return -1;
+    }
+    if (result == -2) {
+        RAISE(pgExc_SDLError, "Surface was lost");
+        return -1;
+    }
+    return 0;
+
+lockerror:
+    if (i >= 0)
+        _surf_blits_unlock(self, sources, i);
+    PyMem_Free(bands);
+    PyMem_Free(threads);
+    PyMem_Free(headers);
+    if (!PyErr_Occurred())
+        RAISE(pgExc_SDLError, "error locking surface");
+    return -1;
+}
+#endif /* IS_SDLv2 */
+
+/* Blit jobs gathered by surf_blits() for threads, in the calling thread
+ * when the blits cannot be split. Returns -1 on failure.
+ */
+static int
+_surf_blits_jobs(PyObject *self, PyObject *sources, _pg_blits_job *jobs,
+                 Py_ssize_t njobs, int nthreads)
+{
+    PyObject *srcobject;
+    Py_ssize_t i;
+
+#if IS_SDLv2
+    SDL_Surface *dest = pgSurface_AsSurface(self);
+
+    if (njobs > 0 && nthreads > dest->h)
+        nthreads = dest->h;
+    if (njobs > 0 && nthreads > 1 && _surf_blits_can_thread(self, sources)) {
+        SDL_Surface *src;
+        SDL_Rect src_rect;
+
+        surf_touch(self);
+        for (i = 0; i < njobs; ++i) {
+            src = pgSurface_AsSurface(
+                PyList_GET_ITEM(sources, jobs[i].src_index));
+            jobs[i].clipped = jobs[i].dest_rect;
+            _surf_blits_clip(src, &jobs[i].src_rect, dest, &jobs[i].clipped);
+            if (jobs[i].clipped.w == 0) {
+                /* Nothing is drawn. Where SDL reports the empty rect
+                   depends on its version, so let it say. */
+                jobs[i].clipped = jobs[i].dest_rect;
+                src_rect = jobs[i].src_rect;
+                if (jobs[i].the_args != 0)
+                    pygame_Blit(src, &src_rect, dest, &jobs[i].clipped,
+                                jobs[i].the_args);
+                else
+                    SDL_BlitSurface(src, &src_rect, dest, &jobs[i].clipped);
+            }
+        }
+        if (_surf_blits_threaded(self, sources, jobs, njobs, nthreads))
+            return -1;
+        for (i = 0; i < njobs; ++i)
+            jobs[i].dest_rect = jobs[i].clipped;
+        return 0;
+    }
+#endif /* IS_SDLv2 */
+
+    for (i = 0; i < njobs; ++i) {
+        srcobject = PyList_GET_ITEM(sources, jobs[i].src_index);
+        if (pgSurface_Blit(self, srcobject, &jobs[i].dest_rect,
+                           &jobs[i].src_rect, jobs[i].the_args))
+            return -1;
+    }
+    return 0;
+}
 
 static PyObject *
 surf_blits(PyObject *self, PyObject *args, PyObject *keywds)
 {
-    SDL_Surface *src, *dest = pgSurface_AsSurface(self);
-    GAME_Rect *src_rect, temp;
-    PyObject *srcobject = NULL, *argpos = NULL, *argrect = NULL;
-    int dx, dy, result;
+    SDL_Surface *dest = pgSurface_AsSurface(self);
+    PyObject *srcobject = NULL;
+    int result;
     SDL_Rect dest_rect, sdlsrc_rect;
-    int sx, sy;
     int the_args = 0;
 
     PyObject *blitsequence = NULL;
     PyObject *iterator = NULL;
     PyObject *item = NULL;
-    PyObject *special_flags = NULL;
     PyObject *ret = NULL;
     PyObject *retrect = NULL;
-    int itemlength;
+    PyObject *sources = NULL;
+    PyObject *source_index = NULL;
+    PyObject *index;
+    _pg_blits_job *jobs = NULL, *newjobs;
+    Py_ssize_t njobs = 0, maxjobs = 0, i;
     int doreturn = 1;
+    int threads = 1;
     int bliterrornum = 0;
-    static char *kwids[] = {"blit_sequence", "doreturn", NULL};
-    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O|i", kwids, &blitsequence,
-                                     &doreturn))
+    static char *kwids[] = {"blit_sequence", "doreturn", "threads", NULL};
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O|ii", kwids,
+                                     &blitsequence, &doreturn, &threads))
         return NULL;
 
+    if (threads < 0) {
+        bliterrornum = BLITS_ERR_INVALID_THREADS;
+        goto bliterror;
+    }
+#if IS_SDLv2
+    if (threads == 0)
+        threads = SDL_GetCPUCount();
+#else  /* IS_SDLv1 */
+    threads = 1;
+#endif /* IS_SDLv1 */
+
     if (doreturn) {
         ret = PyList_New(0);
         if (!ret)
@@ -2218,110 +2870,66 @@ surf_blits(PyObject *self, PyObject *args, PyObject *keywds)
         bliterrornum = BLITS_ERR_SEQUENCE_REQUIRED;
         goto bliterror;
     }
+    if (threads > 1) {
+        /* the whole sequence is read before blitting */
+        sources = PyList_New(0);
+        source_index = PyDict_New();
+        if (!sources || !source_index)
+            goto bliterror;
+    }
     iterator = PyObject_GetIter(blitsequence);
     if (!iterator) {
-        return NULL;
+        goto bliterror;
     }
 
     while ((item = PyIter_Next(iterator))) {
-        if (PySequence_Check(item)) {
-            itemlength = PySequence_Length(item);
-            if (itemlength > 4 || itemlength < 2) {
-                bliterrornum = BLITS_ERR_SEQUENCE_REQUIRED;
-                goto bliterror;
-            }
-        }
-        else {
-            bliterrornum = BLITS_ERR_SEQUENCE_REQUIRED;
-            goto bliterror;
-        }
-        bliterrornum = 0;
-        srcobject = NULL;
-        argpos = NULL;
-        argrect = NULL;
-        special_flags = NULL;
-        the_args = 0;
-        if (itemlength >= 2) {
-            /* (Surface, dest) */
-            srcobject = PySequence_GetItem(item, 0);
-            argpos = PySequence_GetItem(item, 1);
-        }
-        if (itemlength >= 3) {
-            /* (Surface, dest, area) */
-            argrect = PySequence_GetItem(item, 2);
-        }
-        if (itemlength == 4) {
-            /* (Surface, dest, area, special_flags) */
-            special_flags = PySequence_GetItem(item, 3);
-        }
+        bliterrornum = _surf_blits_item(dest, item, &srcobject, &dest_rect,
+                                        &sdlsrc_rect, &the_args);
         Py_DECREF(item);
-
-        src = pgSurface_AsSurface(srcobject);
-        if (!dest) {
-            bliterrornum = BLITS_ERR_DISPLAY_SURF_QUIT;
-            goto bliterror;
-        }
-        if (!src) {
-            bliterrornum = BLITS_ERR_SEQUENCE_SURF;
+        item = NULL;
+        if (bliterrornum) {
             goto bliterror;
         }
 
-#if IS_SDLv1
-        if (dest->flags & SDL_OPENGL &&
-            !(dest->flags & (SDL_OPENGLBLIT & ~SDL_OPENGL))) {
-            bliterrornum = BLITS_ERR_NO_OPENGL_SURF;
-            goto bliterror;
-        }
-#endif /* IS_SDLv1 */
-
-        if ((src_rect = pgRect_FromObject(argpos, &temp))) {
-            dx = src_rect->x;
-            dy = src_rect->y;
-        }
-        else if (pg_TwoIntsFromObj(argpos, &sx, &sy)) {
-            dx = sx;
-            dy = sy;
-        }
-        else {
-            bliterrornum = BLITS_ERR_INVALID_DESTINATION;
-            goto bliterror;
-        }
-        if (argrect && argrect != Py_None) {
-            if (!(src_rect = pgRect_FromObject(argrect, &temp))) {
-                bliterrornum = BLITS_ERR_INVALID_RECT_STYLE;
-                goto bliterror;
+        if (sources) {
+            if (njobs == maxjobs) {
+                maxjobs = maxjobs ? maxjobs * 2 : 64;
+                newjobs = jobs;
+                PyMem_Resize(newjobs, _pg_blits_job, maxjobs);
+                if (!newjobs) {
+                    PyErr_NoMemory();
+                    goto bliterror;
+                }
+                jobs = newjobs;
             }
-        }
-        else {
-            temp.x = temp.y = 0;
-            temp.w = src->w;
-            temp.h = src->h;
-            src_rect = &temp;
-        }
-
-        dest_rect.x = (short)dx;
-        dest_rect.y = (short)dy;
-        dest_rect.w = (unsigned short)src_rect->w;
-        dest_rect.h = (unsigned short)src_rect->h;
-        sdlsrc_rect.x = (short)src_rect->x;
-        sdlsrc_rect.y = (short)src_rect->y;
-        sdlsrc_rect.w = (unsigned short)src_rect->w;
-        sdlsrc_rect.h = (unsigned short)src_rect->h;
-
-        if (special_flags) {
-            if (!pg_IntFromObj(special_flags, &the_args)) {
-                bliterrornum = BLITS_ERR_MUST_ASSIGN_NUMERIC;
-                goto bliterror;
+            index = PyDict_GetItem(source_index, srcobject);
+            if (index) {
+                jobs[njobs].src_index = (int)PyInt_AsLong(index);
+            }
+            else {
+                jobs[njobs].src_index = (int)PyList_GET_SIZE(sources);
+                index = PyInt_FromLong(jobs[njobs].src_index);
+                if (!index ||
+                    PyDict_SetItem(source_index, srcobject, index) ||
+                    PyList_Append(sources, srcobject)) {
+                    Py_XDECREF(index);
+                    goto bliterror;
+                }
+                Py_DECREF(index);
             }
+            jobs[njobs].the_args = the_args;
+            jobs[njobs].dest_rect = dest_rect;
+            jobs[njobs].src_rect = sdlsrc_rect;
+            ++njobs;
+            Py_DECREF(srcobject);
+            srcobject = NULL;
+            continue;
         }
 
-        Py_DECREF(srcobject);
-        Py_DECREF(argpos);
-        Py_XDECREF(argrect);
-        Py_XDECREF(special_flags);
-
         result = pgSurface_Blit(self, srcobject, &dest_rect, &sdlsrc_rect,
                                 the_args);
+        Py_DECREF(srcobject);
+        srcobject = NULL;
         if (result != 0) {
             bliterrornum = BLITS_ERR_BLIT_FAIL;
             goto bliterror;
@@ -2336,10 +2944,29 @@ surf_blits(PyObject *self, PyObject *args, PyObject *keywds)
     }
 
     Py_DECREF(iterator);
+    iterator = NULL;
     if (PyErr_Occurred()) {
         goto bliterror;
     }
 
+    if (sources) {
+        if (_surf_blits_jobs(self, sources, jobs, njobs, threads)) {
+            bliterrornum = BLITS_ERR_BLIT_FAIL;
+            goto bliterror;
+        }
+        for (i = 0; doreturn && i < njobs; ++i) {
+            retrect = pgRect_New(&jobs[i].dest_rect);
+            if (!retrect || PyList_Append(ret, retrect)) {
+                Py_XDECREF(retrect);
+                goto bliterror;
+            }
+            Py_DECREF(retrect);
+        }
+        PyMem_Free(jobs);
+        Py_DECREF(sources);
+        Py_DECREF(source_index);
+    }
+
     if (doreturn) {
         return ret;
     }
@@ -2349,11 +2976,12 @@ surf_blits(PyObject *self, PyObject *args, PyObject *keywds)
 
 bliterror:
     Py_XDECREF(srcobject);
-    Py_XDECREF(argpos);
-    Py_XDECREF(argrect);
-    Py_XDECREF(special_flags);
     Py_XDECREF(iterator);
     Py_XDECREF(item);
+    Py_XDECREF(ret);
+    Py_XDECREF(sources);
+    Py_XDECREF(source_index);
+    PyMem_Free(jobs);
 
     switch (bliterrornum) {
         case BLITS_ERR_SEQUENCE_REQUIRED:
@@ -2377,10 +3005,278 @@ bliterror:
             return RAISE(PyExc_TypeError, "Must assign numeric values");
         case BLITS_ERR_BLIT_FAIL:
             return RAISE(PyExc_TypeError, "Blit failed");
+        case BLITS_ERR_INVALID_THREADS:
+            return RAISE(PyExc_ValueError, "threads must not be negative");
+    }
+    if (PyErr_Occurred()) {
+        return NULL;
     }
     return RAISE(PyExc_TypeError, "Unknown error");
 }
 
+/* Sprite positions further off than this, infinite ones too, are clamped
+   to it, so they fit in the ints of a rect, with room for its size. */
+#define PG_SPRITE_POS_LIMIT 1073741824.0 /* 2 ** 30 */
+
+/* Round a sprite position down to an int, for surf_blit_sprites. Returns 0
+   if it is NaN. */
+static int
+_pg_sprite_pos(double pos, int *val)
+{
+    int v;
+
+    if (Py_IS_NAN(pos)) {
+        return 0;
+    }
+    if (pos < -PG_SPRITE_POS_LIMIT) {
+        pos = -PG_SPRITE_POS_LIMIT;
+    }
+    else if (pos > PG_SPRITE_POS_LIMIT) {
+        pos = PG_SPRITE_POS_LIMIT;
+    }
+    /* round down, so sprites move smoothly across 0 */
+    v = (int)pos;
+    if (v > pos) {
+        --v;
+    }
+    *val = v;
+    return 1;
+}
+
+/* attribute names looked up for each sprite by surf_blit_sprites */
+static PyObject *_pg_str_image = NULL;
+static PyObject *_pg_str_rect = NULL;
+
+/* Blit every sprite of a sprite group, for the draw() methods of
+   pygame.sprite. Each sprite is drawn at its rect and the rect returned by
+   the blit is stored as spritedict[sprite]. If dirty is given, its add()
+   method is called with the previous rect of the sprite, when it is not
+   empty, and the new one. If dirty is a list, the rects are appended to it
+   the way RenderUpdates.draw() always did: the union of the previous and
+   new rects if they overlap, or else the new rect and then the previous
+   one. If positions is given, it is a buffer of doubles
+   holding an x, y pair for each sprite, in order. Each pair is rounded down
+   and written to the sprite rect before it is drawn, for
+   pygame.sprite.ParticleGroup. Positions must not be NaN, and are clamped
+   to PG_SPRITE_POS_LIMIT. */
+static PyObject *
+surf_blit_sprites(PyObject *self, PyObject *args)
+{
+    SDL_Surface *src, *dest = pgSurface_AsSurface(self);
+    GAME_Rect *rect, temp, *old, oldtemp;
+    SDL_Rect dest_rect, sdlsrc_rect;
+    PyObject *sprites, *spritedict, *dirty = Py_None, *positions = Py_None;
+    PyObject *iterator = NULL, *sprite = NULL, *image = NULL;
+    PyObject *argpos = NULL, *newrect = NULL, *oldrect, *result;
+    PyObject *dirty_add = NULL;
+    Py_buffer view;
+    double *pos = NULL;
+    Py_ssize_t npos = 0, i = 0;
+    int dx, dy, truth;
+
+    if (!PyArg_ParseTuple(args, "OO!|OO", &sprites, &PyDict_Type, &spritedict,
+                          &dirty, &positions)) {
+        return NULL;
+    }
+    if (!dest) {
+        return RAISE(pgExc_SDLError, "display Surface quit");
+    }
+    if (positions != Py_None) {
+        if (PyObject_GetBuffer(positions, &view,
+                               PyBUF_FORMAT | PyBUF_C_CONTIGUOUS)) {
+            return NULL;
+        }
+        if (view.itemsize != sizeof(double) || !view.format ||
+            strcmp(view.format, "d")) {
+            PyBuffer_Release(&view);
+            return RAISE(PyExc_TypeError, "positions must hold doubles");
+        }
+        pos = (double *)view.buf;
+        npos = view.len / (Py_ssize_t)sizeof(double);
+    }
+    if (!_pg_str_image) {
+#if PY3
+        _pg_str_image = PyUnicode_InternFromString("image");
+        _pg_str_rect = PyUnicode_InternFromString("rect");
+#else /* PY2 */
+        _pg_str_image = PyString_InternFromString("image");
+        _pg_str_rect = PyString_InternFromString("rect");
+#endif /* PY2 */
+        if (!_pg_str_image || !_pg_str_rect) {
+            Py_CLEAR(_pg_str_image);
+            Py_CLEAR(_pg_str_rect);
+            return NULL;
+        }
+    }
+    if (dirty != Py_None && !PyList_Check(dirty)) {
+        dirty_add = PyObject_GetAttrString(dirty, "add");
+        if (!dirty_add) {
+            goto error;
+        }
+    }
+    iterator = PyObject_GetIter(sprites);
+    if (!iterator) {
+        goto error;
+    }
+
+    while ((sprite = PyIter_Next(iterator))) {
+        image = PyObject_GetAttr(sprite, _pg_str_image);
+        if (!image) {
+            goto error;
+        }
+        argpos = PyObject_GetAttr(sprite, _pg_str_rect);
+        if (!argpos) {
+            goto error;
+        }
+        if (!pgSurface_Check(image)) {
+            PyErr_SetString(PyExc_TypeError,
+                            "sprite image must be a Surface");
+            goto error;
+        }
+        src = pgSurface_AsSurface(image);
+        if (!src) {
+            PyErr_SetString(pgExc_SDLError, "display Surface quit");
+            goto error;
+        }
+        if (positions != Py_None) {
+            if (2 * i + 1 >= npos) {
+                PyErr_SetString(PyExc_ValueError,
+                                "not enough positions for the sprites");
+                goto error;
+            }
+            if (!pgRect_Check(argpos)) {
+                PyErr_SetString(PyExc_TypeError,
+                                "sprite rect must be a Rect");
+                goto error;
+            }
+            if (!_pg_sprite_pos(pos[2 * i], &dx) ||
+                !_pg_sprite_pos(pos[2 * i + 1], &dy)) {
+                PyErr_SetString(PyExc_ValueError,
+                                "sprite positions must not be NaN");
+                goto error;
+            }
+            pgRect_AsRect(argpos).x = dx;
+            pgRect_AsRect(argpos).y = dy;
+            ++i;
+        }
+        else if ((rect = pgRect_FromObject(argpos, &temp))) {
+            dx = rect->x;
+            dy = rect->y;
+        }
+        else if (!pg_TwoIntsFromObj(argpos, &dx, &dy)) {
+            PyErr_SetString(PyExc_TypeError,
+                            "invalid destination position for blit");
+            goto error;
+        }
+
+        dest_rect.x = (short)dx;
+        dest_rect.y = (short)dy;
+        dest_rect.w = (unsigned short)src->w;
+        dest_rect.h = (unsigned short)src->h;
+        sdlsrc_rect.x = sdlsrc_rect.y = 0;
+        sdlsrc_rect.w = (unsigned short)src->w;
+        sdlsrc_rect.h = (unsigned short)src->h;
+        if (pgSurface_Blit(self, image, &dest_rect, &sdlsrc_rect, 0)) {
+            goto error;
+        }
+        Py_CLEAR(image);
+        Py_CLEAR(argpos);
+
+        newrect = pgRect_New(&dest_rect);
+        if (!newrect) {
+            goto error;
+        }
+        if (dirty_add) {
+            /* borrowed */
+            oldrect = PyDict_GetItem(spritedict, sprite);
+            if (oldrect && PyObject_IsTrue(oldrect)) {
+                result = PyObject_CallFunctionObjArgs(dirty_add, oldrect,
+                                                      NULL);
+                if (!result) {
+                    goto error;
+                }
+                Py_DECREF(result);
+            }
+            result = PyObject_CallFunctionObjArgs(dirty_add, newrect, NULL);
+            if (!result) {
+                goto error;
+            }
+            Py_DECREF(result);
+        }
+        else if (dirty != Py_None) {
+            /* borrowed */
+            oldrect = PyDict_GetItem(spritedict, sprite);
+            old = NULL;
+            if (oldrect) {
+                truth = PyObject_IsTrue(oldrect);
+                if (truth < 0) {
+                    goto error;
+                }
+                if (truth && !(old = pgRect_FromObject(oldrect, &oldtemp))) {
+                    PyErr_SetString(PyExc_TypeError,
+                                    "sprite rects must be rect style objects");
+                    goto error;
+                }
+            }
+            if (old && old->x < dest_rect.x + dest_rect.w &&
+                old->y < dest_rect.y + dest_rect.h &&
+                old->x + old->w > dest_rect.x &&
+                old->y + old->h > dest_rect.y) {
+                dx = old->x < dest_rect.x ? old->x : dest_rect.x;
+                dy = old->y < dest_rect.y ? old->y : dest_rect.y;
+                result = pgRect_New4(
+                    dx, dy,
+                    (old->x + old->w > dest_rect.x + dest_rect.w
+                         ? old->x + old->w
+                         : dest_rect.x + dest_rect.w) -
+                        dx,
+                    (old->y + old->h > dest_rect.y + dest_rect.h
+                         ? old->y + old->h
+                         : dest_rect.y + dest_rect.h) -
+                        dy);
+                if (!result) {
+                    goto error;
+                }
+                truth = PyList_Append(dirty, result);
+                Py_DECREF(result);
+                if (truth) {
+                    goto error;
+                }
+            }
+            else if (PyList_Append(dirty, newrect) ||
+                     (old && PyList_Append(dirty, oldrect))) {
+                goto error;
+            }
+        }
+        if (PyDict_SetItem(spritedict, sprite, newrect)) {
+            goto error;
+        }
+        Py_CLEAR(newrect);
+        Py_CLEAR(sprite);
+    }
+    Py_DECREF(iterator);
+    Py_XDECREF(dirty_add);
+    if (positions != Py_None) {
+        PyBuffer_Release(&view);
+    }
+    if (PyErr_Occurred()) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+
+error:
+    if (positions != Py_None) {
+        PyBuffer_Release(&view);
+    }
+    Py_XDECREF(iterator);
+    Py_XDECREF(sprite);
+    Py_XDECREF(image);
+    Py_XDECREF(argpos);
+    Py_XDECREF(newrect);
+    Py_XDECREF(dirty_add);
+    return NULL;
+}
+
 static PyObject *
 surf_scroll(PyObject *self, PyObject *args, PyObject *keywds)
 {
@@ -3752,6 +4648,28 @@ surf_get_pixels_address(PyObject *self, PyObject *closure)
 #endif
 }
 
+/* The version is bumped when the Surface is locked, blitted to, filled or
+   has its colorkey, alpha or palette changed, so a cache of something
+   computed from the pixels can tell when it is out of date. While the
+   Surface stays locked, the pixels can change at any time, so every read
+   gives a new version.
+   Changes to a subsurface bump the Surfaces it was cut from as well, and
+   a subsurface reads the version of the Surface which owns the pixels,
+   so a change to either one is seen through both. */
+static PyObject *
+surf_get_pixels_version(PyObject *self, PyObject *closure)
+{
+    pgSurfaceObject *surf = (pgSurfaceObject *)self;
+
+    while (surf->subsurface) {
+        surf = (pgSurfaceObject *)surf->subsurface->owner;
+    }
+    if (surf->locklist && PyList_Size(surf->locklist) > 0) {
+        pgSurface_Touch(surf);
+    }
+    return PyLong_FromUnsignedLong(surf->version);
+}
+
 static void
 surface_move(Uint8 *src, Uint8 *dst, int h, int span, int srcpitch,
              int dstpitch)
@@ -3873,6 +4791,8 @@ pgSurface_Blit(PyObject *dstobj, PyObject *srcobj, SDL_Rect *dstrect,
     Uint32 key;
 #endif /* IS_SDLv2 */
 
+    surf_touch(dstobj);
+
     /* passthrough blits to the real surface */
     if (((pgSurfaceObject *)dstobj)->subsurface) {
         PyObject *owner;
@@ -4049,7 +4969,43 @@ pgSurface_Blit(PyObject *dstobj, PyObject *srcobj, SDL_Rect *dstrect,
     return result != 0;
 }
 
-static PyMethodDef _surface_methods[] = {{NULL, NULL, 0, NULL}};
+static PyObject *
+surf_get_blit_backend(PyObject *self, PyObject *args)
+{
+    return Text_FromUTF8(pygame_GetBlitBackend());
+}
+
+static PyObject *
+surf_set_blit_backend(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    char *keywords[] = {"type", NULL};
+    const char *type;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s:_set_blit_backend",
+                                     keywords, &type)) {
+        return NULL;
+    }
+
+    switch (pygame_SetBlitBackend(type)) {
+        case -1:
+            return PyErr_Format(PyExc_ValueError, "Unknown backend type %s",
+                                type);
+        case -2:
+            return PyErr_Format(PyExc_ValueError,
+                                "%s not supported on this machine", type);
+    }
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef _surface_methods[] = {
+    {"_get_blit_backend", surf_get_blit_backend, METH_NOARGS,
+     "_get_blit_backend() -> str\n"
+     "the SIMD blitters in use: 'GENERIC', 'SSE2' or 'AVX2'"},
+    {"_set_blit_backend", (PyCFunction)surf_set_blit_backend,
+     METH_VARARGS | METH_KEYWORDS,
+     "_set_blit_backend(type) -> None\n"
+     "use the 'GENERIC', 'SSE2' or 'AVX2' blitters, for testing"},
+    {NULL, NULL, 0, NULL}};
 
 MODINIT_DEFINE(surface)
 {
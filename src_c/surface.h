@@ -369,6 +369,10 @@ int
 surface_fill_blend (SDL_Surface *surface, SDL_Rect *rect, Uint32 color,
                     int blendargs);
 
+int
+surface_fill_blend_rects (SDL_Surface *surface, SDL_Rect *rects, int count,
+                          Uint32 color, int blendargs);
+
 void
 surface_respect_clip_rect (SDL_Surface *surface, SDL_Rect *rect);
 
@@ -380,4 +384,10 @@ int
 pygame_Blit (SDL_Surface * src, SDL_Rect * srcrect,
              SDL_Surface * dst, SDL_Rect * dstrect, int the_args);
 
+const char *
+pygame_GetBlitBackend (void);
+
+int
+pygame_SetBlitBackend (const char *type);
+
 #endif /* SURFACE_H */
@@ -19,11 +19,12 @@
 
 #define NO_PYGAME_C_API
 #include "_surface.h"
+#include "simd_blitters.h"
 
 /*
  * Changes SDL_Rect to respect any clipping rect defined on the surface.
  * Necessary when modifying surface->pixels directly instead of through an
- * SDL interface.
+ * SDL interface. A rect outside the clipping rect is made empty.
  */
 void
 surface_respect_clip_rect(SDL_Surface *surface, SDL_Rect *rect)
@@ -44,7 +45,7 @@ surface_respect_clip_rect(SDL_Surface *surface, SDL_Rect *rect)
     else if ((B->x >= A->x) && (B->x < (A->x + A->w)))
         x = B->x;
     else
-        return;
+        goto empty;
 
     /* Right */
     if (((A->x + A->w) > B->x) && ((A->x + A->w) <= (B->x + B->w)))
@@ -52,7 +53,7 @@ surface_respect_clip_rect(SDL_Surface *surface, SDL_Rect *rect)
     else if (((B->x + B->w) > A->x) && ((B->x + B->w) <= (A->x + A->w)))
         w = (B->x + B->w) - x;
     else
-        return;
+        goto empty;
 
     /* Top */
     if ((A->y >= B->y) && (A->y < (B->y + B->h)))
@@ -60,7 +61,7 @@ surface_respect_clip_rect(SDL_Surface *surface, SDL_Rect *rect)
     else if ((B->y >= A->y) && (B->y < (A->y + A->h)))
         y = B->y;
     else
-        return;
+        goto empty;
 
     /* Bottom */
     if (((A->y + A->h) > B->y) && ((A->y + A->h) <= (B->y + B->h)))
@@ -68,12 +69,17 @@ surface_respect_clip_rect(SDL_Surface *surface, SDL_Rect *rect)
     else if (((B->y + B->h) > A->y) && ((B->y + B->h) <= (A->y + A->h)))
         h = (B->y + B->h) - y;
     else
-        return;
+        goto empty;
 
     rect->x = x;
     rect->y = y;
     rect->w = w;
     rect->h = h;
+    return;
+
+empty:
+    /* no overlap, so nothing is left to fill */
+    rect->w = rect->h = 0;
 }
 
 static int
@@ -928,21 +934,116 @@ surface_fill_blend_rgba_max(SDL_Surface *surface, SDL_Rect *rect, Uint32 color)
     return result;
 }
 
-int
-surface_fill_blend(SDL_Surface *surface, SDL_Rect *rect, Uint32 color,
-                   int blendargs)
+#if defined(PG_SIMD_BLITTERS)
+/* Does the fill with the SIMD blitter backend in use, for 4 byte pixels
+ * with 8 bit channels. The pixels come out the same as from the fills
+ * above. Returns 0, or -1 if the fill is left to them.
+ */
+static int
+surface_fill_blend_simd(SDL_Surface *surface, SDL_Rect *rect, Uint32 color,
+                        int blendargs)
+{
+    SDL_PixelFormat *fmt = surface->format;
+    Uint32 rgb = fmt->Rmask | fmt->Gmask | fmt->Bmask;
+    SIMD_FillInfo info;
+    int backend = pygame_BlitBackend();
+    int rgba = 0;
+    int ppa;
+    SDL_BlendMode mode;
+
+    if (backend == BLIT_BACKEND_GENERIC || fmt->BytesPerPixel != 4 ||
+        fmt->Rmask != (Uint32)0xFF << fmt->Rshift ||
+        fmt->Gmask != (Uint32)0xFF << fmt->Gshift ||
+        fmt->Bmask != (Uint32)0xFF << fmt->Bshift ||
+        (fmt->Amask && fmt->Amask != (Uint32)0xFF << fmt->Ashift)) {
+        return -1;
+    }
+
+    switch (blendargs) {
+        case PYGAME_BLEND_RGBA_ADD:
+            rgba = 1;
+            /* fallthrough */
+        case PYGAME_BLEND_ADD:
+            info.op = PYGAME_BLEND_ADD;
+            break;
+        case PYGAME_BLEND_RGBA_SUB:
+            rgba = 1;
+            /* fallthrough */
+        case PYGAME_BLEND_SUB:
+            info.op = PYGAME_BLEND_SUB;
+            break;
+        case PYGAME_BLEND_RGBA_MULT:
+            rgba = 1;
+            /* fallthrough */
+        case PYGAME_BLEND_MULT:
+            info.op = PYGAME_BLEND_MULT;
+            break;
+        case PYGAME_BLEND_RGBA_MIN:
+            rgba = 1;
+            /* fallthrough */
+        case PYGAME_BLEND_MIN:
+            info.op = PYGAME_BLEND_MIN;
+            break;
+        case PYGAME_BLEND_RGBA_MAX:
+            rgba = 1;
+            /* fallthrough */
+        case PYGAME_BLEND_MAX:
+            info.op = PYGAME_BLEND_MAX;
+            break;
+        default:
+            return -1;
+    }
+
+    SDL_GetSurfaceBlendMode(surface, &mode);
+    ppa = (fmt->Amask && mode != SDL_BLENDMODE_NONE);
+
+    /* Without per pixel alpha the RGBA fills are the RGB ones, which set
+       the alpha to 255, and clear the unused byte if there is no alpha. */
+    info.color = color;
+    info.op_mask = (ppa && rgba) ? rgb | fmt->Amask : rgb;
+    info.keep_mask = (ppa && !rgba) ? fmt->Amask : 0;
+    info.set_bits = ppa ? 0 : fmt->Amask;
+    info.width = rect->w;
+    info.height = rect->h;
+    info.pixels = (Uint8 *)surface->pixels + rect->y * surface->pitch +
+                  rect->x * 4;
+    info.skip = surface->pitch - rect->w * 4;
+
+#if defined(PG_ENABLE_AVX2)
+    if (backend == BLIT_BACKEND_AVX2) {
+        fill_blend_avx2(&info);
+        return 0;
+    }
+#endif /* PG_ENABLE_AVX2 */
+#if defined(PG_ENABLE_SSE2)
+    if (backend == BLIT_BACKEND_SSE2) {
+        fill_blend_sse2(&info);
+        return 0;
+    }
+#endif /* PG_ENABLE_SSE2 */
+    return -1;
+}
+#endif /* PG_SIMD_BLITTERS */
+
+/* Fills one rect of a locked surface */
+static int
+surface_fill_blend_rect(SDL_Surface *surface, SDL_Rect *rect, Uint32 color,
+                        int blendargs)
 {
     int result = -1;
-    int locked = 0;
 
     surface_respect_clip_rect(surface, rect);
 
-    /* Lock the surface, if needed */
-    if (SDL_MUSTLOCK(surface)) {
-        if (SDL_LockSurface(surface) < 0)
-            return -1;
-        locked = 1;
+    /* the fills below always do at least one pixel of each row */
+    if (rect->w <= 0 || rect->h <= 0) {
+        return 0;
+    }
+
+#if defined(PG_SIMD_BLITTERS)
+    if (surface_fill_blend_simd(surface, rect, color, blendargs) == 0) {
+        return 0;
     }
+#endif /* PG_SIMD_BLITTERS */
 
     switch (blendargs) {
         case PYGAME_BLEND_ADD: {
@@ -992,6 +1093,37 @@ surface_fill_blend(SDL_Surface *surface, SDL_Rect *rect, Uint32 color,
             break;
         }
     }
+    return result;
+}
+
+int
+surface_fill_blend(SDL_Surface *surface, SDL_Rect *rect, Uint32 color,
+                   int blendargs)
+{
+    return surface_fill_blend_rects(surface, rect, 1, color, blendargs);
+}
+
+/* Fills a list of rects, locking the surface once. Each rect is clipped
+ * to the clip rect of the surface in place.
+ */
+int
+surface_fill_blend_rects(SDL_Surface *surface, SDL_Rect *rects, int count,
+                         Uint32 color, int blendargs)
+{
+    int result = 0;
+    int locked = 0;
+    int i;
+
+    /* Lock the surface, if needed */
+    if (SDL_MUSTLOCK(surface)) {
+        if (SDL_LockSurface(surface) < 0)
+            return -1;
+        locked = 1;
+    }
+
+    for (i = 0; i < count && result == 0; ++i) {
+        result = surface_fill_blend_rect(surface, rects + i, color, blendargs);
+    }
 
     if (locked) {
         SDL_UnlockSurface(surface);
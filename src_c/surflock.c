@@ -81,6 +81,8 @@ pgSurface_LockBy(PyObject *surfobj, PyObject *lockobj)
     PyObject *ref;
     pgSurfaceObject *surf = (pgSurfaceObject *)surfobj;
 
+    /* the pixels may be changed while it is locked */
+    pgSurface_Touch(surfobj);
     if (surf->locklist == NULL) {
         surf->locklist = PyList_New(0);
         if (surf->locklist == NULL) {
@@ -35,6 +35,13 @@
 
 #include "scale.h"
 
+/* SSE2 is part of every x86-64 CPU, so it needs no check at run time */
+#if defined(__SSE2__) || defined(_M_X64) || \
+    (defined(_M_IX86_FP) && _M_IX86_FP >= 2)
+#include <emmintrin.h>
+#define TRANSFORM_SSE2
+#endif
+
 typedef void (*SMOOTHSCALE_FILTER_P)(Uint8 *, Uint8 *, int, int, int, int,
                                      int);
 struct _module_state {
@@ -45,7 +52,13 @@ struct _module_state {
     SMOOTHSCALE_FILTER_P filter_expand_Y;
 };
 
-#if defined(SCALE_MMX_SUPPORT)
+#if defined(SCALE_AVX2_SUPPORT) && \
+    (!IS_SDLv2 || !SDL_VERSION_ATLEAST(2, 0, 4))
+/* no SDL_HasAVX2() to check for it */
+#undef SCALE_AVX2_SUPPORT
+#endif
+
+#if defined(SCALE_MMX_SUPPORT) || defined(SCALE_AVX2_SUPPORT)
 
 #include <SDL_cpuinfo.h>
 
@@ -56,7 +69,7 @@ static struct _module_state _state = {0, 0, 0, 0, 0};
 #define GETSTATE(m) PY2_GETSTATE(_state)
 #endif
 
-#else /* if defined(SCALE_MMX_SUPPORT) */
+#else /* if defined(SCALE_MMX_SUPPORT) || defined(SCALE_AVX2_SUPPORT) */
 
 static void
 filter_shrink_X_ONLYC(Uint8 *, Uint8 *, int, int, int, int, int);
@@ -73,10 +86,12 @@ static struct _module_state _state = {
 #define GETSTATE(m) PY2_GETSTATE(_state)
 #define smoothscale_init(st)
 
-#endif /* if defined(SCALE_MMX_SUPPORT) */
+#endif /* if defined(SCALE_MMX_SUPPORT) || defined(SCALE_AVX2_SUPPORT) */
 
 void
 scale2x(SDL_Surface *src, SDL_Surface *dst);
+void
+scale3x(SDL_Surface *src, SDL_Surface *dst);
 extern SDL_Surface *
 rotozoomSurface(SDL_Surface *src, double angle, double zoom, int smooth);
 
@@ -201,6 +216,26 @@ newsurf_fromsurf(SDL_Surface *surf, int width, int height)
     return newsurf;
 }
 
+/* Lock the surface written to. A given destination surface is locked
+   through its object, so its pixels version changes, a new one directly. */
+static void
+lock_dest_surface(PyObject *destobj, SDL_Surface *newsurf)
+{
+    if (destobj)
+        pgSurface_Lock(destobj);
+    else
+        SDL_LockSurface(newsurf);
+}
+
+static void
+unlock_dest_surface(PyObject *destobj, SDL_Surface *newsurf)
+{
+    if (destobj)
+        pgSurface_Unlock(destobj);
+    else
+        SDL_UnlockSurface(newsurf);
+}
+
 static SDL_Surface *
 rotate90(SDL_Surface *src, int angle)
 {
@@ -528,18 +563,91 @@ stretch(SDL_Surface *src, SDL_Surface *dst)
     }
 }
 
+/* Scales up by whole numbers, which stretch() would do the same way. Each
+ * source pixel is copied xscale times into the first row of its block, and
+ * that row is then copied to the yscale - 1 rows below it.
+ */
+static void
+scale_integer(SDL_Surface *src, SDL_Surface *dst, int xscale, int yscale)
+{
+    int bpp = src->format->BytesPerPixel;
+    int width = src->w, rowbytes = dst->w * bpp, run = xscale * bpp;
+    int looph, loopw, i;
+    Uint8 *srcrow, *dstrow;
+
+    for (looph = 0; looph < src->h; ++looph) {
+        srcrow = (Uint8 *)src->pixels + looph * src->pitch;
+        dstrow = (Uint8 *)dst->pixels + looph * yscale * dst->pitch;
+        loopw = 0;
+
+        if (xscale == 1) {
+            memmove(dstrow, srcrow, rowbytes);
+            loopw = width;
+        }
+#if defined(TRANSFORM_SSE2)
+        else if (bpp != 3) {
+            /* fill 16 bytes at a time with copies of the pixel. The last
+               store may spill into the next pixels, which come after, so
+               only stop when it would go past the end of the row. */
+            int stores = (run + 15) / 16;
+
+            for (; loopw * run + stores * 16 <= rowbytes; ++loopw) {
+                __m128i copies;
+                Uint8 *out = dstrow + loopw * run;
+
+                if (bpp == 1)
+                    copies = _mm_set1_epi8((char)srcrow[loopw]);
+                else if (bpp == 2)
+                    copies = _mm_set1_epi16((short)((Uint16 *)srcrow)[loopw]);
+                else
+                    copies = _mm_set1_epi32((int)((Uint32 *)srcrow)[loopw]);
+                for (i = 0; i < stores; ++i)
+                    _mm_storeu_si128((__m128i *)(out + i * 16), copies);
+            }
+        }
+#endif /* TRANSFORM_SSE2 */
+
+        switch (bpp) {
+            case 1:
+                for (; loopw < width; ++loopw)
+                    memset(dstrow + loopw * run, srcrow[loopw], xscale);
+                break;
+            case 2:
+                for (; loopw < width; ++loopw) {
+                    Uint16 *out = (Uint16 *)dstrow + loopw * xscale;
+                    for (i = 0; i < xscale; ++i)
+                        out[i] = ((Uint16 *)srcrow)[loopw];
+                }
+                break;
+            case 3:
+                for (; loopw < width; ++loopw) {
+                    Uint8 *out = dstrow + loopw * run;
+                    for (i = 0; i < xscale; ++i, out += 3) {
+                        out[0] = srcrow[loopw * 3];
+                        out[1] = srcrow[loopw * 3 + 1];
+                        out[2] = srcrow[loopw * 3 + 2];
+                    }
+                }
+                break;
+            default: /*case 4:*/
+                for (; loopw < width; ++loopw) {
+                    Uint32 *out = (Uint32 *)dstrow + loopw * xscale;
+                    for (i = 0; i < xscale; ++i)
+                        out[i] = ((Uint32 *)srcrow)[loopw];
+                }
+                break;
+        }
+
+        for (i = 1; i < yscale; ++i)
+            memcpy(dstrow + i * dst->pitch, dstrow, rowbytes);
+    }
+}
+
+/* Scales surfobj to width x height, into surfobj2 if it is not NULL. */
 static PyObject *
-surf_scale(PyObject *self, PyObject *arg)
+scale_to(PyObject *surfobj, PyObject *surfobj2, int width, int height)
 {
-    PyObject *surfobj, *surfobj2;
     SDL_Surface *surf, *newsurf;
-    int width, height;
-    surfobj2 = NULL;
-
-    /*get all the arguments*/
-    if (!PyArg_ParseTuple(arg, "O!(ii)|O!", &pgSurface_Type, &surfobj, &width,
-                          &height, &pgSurface_Type, &surfobj2))
-        return NULL;
 
     if (width < 0 || height < 0)
         return RAISE(PyExc_ValueError, "Cannot scale to negative size");
@@ -565,15 +673,19 @@ surf_scale(PyObject *self, PyObject *arg)
                      "Source and destination surfaces need the same format.");
 
     if ((width && height) && (surf->w && surf->h)) {
-        SDL_LockSurface(newsurf);
+        lock_dest_surface(surfobj2, newsurf);
         pgSurface_Lock(surfobj);
 
         Py_BEGIN_ALLOW_THREADS;
-        stretch(surf, newsurf);
+        if (width % surf->w == 0 && height % surf->h == 0 &&
+            newsurf->pixels != surf->pixels)
+            scale_integer(surf, newsurf, width / surf->w, height / surf->h);
+        else
+            stretch(surf, newsurf);
         Py_END_ALLOW_THREADS;
 
         pgSurface_Unlock(surfobj);
-        SDL_UnlockSurface(newsurf);
+        unlock_dest_surface(surfobj2, newsurf);
     }
 
     if (surfobj2) {
@@ -584,6 +696,48 @@ surf_scale(PyObject *self, PyObject *arg)
         return pgSurface_New(newsurf);
 }
 
+static PyObject *
+surf_scale(PyObject *self, PyObject *arg)
+{
+    PyObject *surfobj, *surfobj2;
+    int width, height;
+    surfobj2 = NULL;
+
+    /*get all the arguments*/
+    if (!PyArg_ParseTuple(arg, "O!(ii)|O!", &pgSurface_Type, &surfobj, &width,
+                          &height, &pgSurface_Type, &surfobj2))
+        return NULL;
+
+    return scale_to(surfobj, surfobj2, width, height);
+}
+
+static PyObject *
+surf_scale_by(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    PyObject *surfobj, *factorobj, *surfobj2 = NULL;
+    SDL_Surface *surf;
+    float xfactor, yfactor;
+    static char *kwlist[] = {"surface", "factor", "dest_surface", 0};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!O|O!", kwlist,
+                                     &pgSurface_Type, &surfobj, &factorobj,
+                                     &pgSurface_Type, &surfobj2))
+        return NULL;
+
+    if (pg_FloatFromObj(factorobj, &xfactor))
+        yfactor = xfactor;
+    else if (!pg_TwoFloatsFromObj(factorobj, &xfactor, &yfactor))
+        return RAISE(PyExc_TypeError,
+                     "factor must be a number or a pair of numbers");
+
+    if (xfactor < 0 || yfactor < 0)
+        return RAISE(PyExc_ValueError, "Cannot scale to negative size");
+
+    surf = pgSurface_AsSurface(surfobj);
+    return scale_to(surfobj, surfobj2, (int)(surf->w * (double)xfactor),
+                    (int)(surf->h * (double)yfactor));
+}
+
 static PyObject *
 surf_scale2x(PyObject *self, PyObject *arg)
 {
@@ -623,15 +777,73 @@ surf_scale2x(PyObject *self, PyObject *arg)
         return RAISE(PyExc_ValueError,
                      "Source and destination surfaces need the same format.");
 
-    SDL_LockSurface(newsurf);
-    SDL_LockSurface(surf);
+    lock_dest_surface(surfobj2, newsurf);
+    pgSurface_Lock(surfobj);
 
     Py_BEGIN_ALLOW_THREADS;
     scale2x(surf, newsurf);
     Py_END_ALLOW_THREADS;
 
-    SDL_UnlockSurface(surf);
-    SDL_UnlockSurface(newsurf);
+    pgSurface_Unlock(surfobj);
+    unlock_dest_surface(surfobj2, newsurf);
+
+    if (surfobj2) {
+        Py_INCREF(surfobj2);
+        return surfobj2;
+    }
+    else
+        return pgSurface_New(newsurf);
+}
+
+static PyObject *
+surf_scale3x(PyObject *self, PyObject *arg)
+{
+    PyObject *surfobj, *surfobj2;
+    SDL_Surface *surf;
+    SDL_Surface *newsurf;
+    surfobj2 = NULL;
+
+    /*get all the arguments*/
+    if (!PyArg_ParseTuple(arg, "O!|O!", &pgSurface_Type, &surfobj,
+                          &pgSurface_Type, &surfobj2))
+        return NULL;
+
+    surf = pgSurface_AsSurface(surfobj);
+
+    /* if the second surface is not there, then make a new one. */
+
+    if (!surfobj2) {
+        newsurf = newsurf_fromsurf(surf, surf->w * 3, surf->h * 3);
+
+        if (!newsurf)
+            return NULL;
+    }
+    else {
+        /* only a given surface is checked, so a new one is never left
+           behind by an error */
+        newsurf = pgSurface_AsSurface(surfobj2);
+
+        /* check to see if the size is three times as big. */
+        if (newsurf->w != (surf->w * 3) || newsurf->h != (surf->h * 3))
+            return RAISE(PyExc_ValueError,
+                         "Destination surface not 3x bigger.");
+
+        /* check to see if the format of the surface is the same. */
+        if (surf->format->BytesPerPixel != newsurf->format->BytesPerPixel)
+            return RAISE(
+                PyExc_ValueError,
+                "Source and destination surfaces need the same format.");
+    }
+
+    lock_dest_surface(surfobj2, newsurf);
+    pgSurface_Lock(surfobj);
+
+    Py_BEGIN_ALLOW_THREADS;
+    scale3x(surf, newsurf);
+    Py_END_ALLOW_THREADS;
+
+    pgSurface_Unlock(surfobj);
+    unlock_dest_surface(surfobj2, newsurf);
 
     if (surfobj2) {
         Py_INCREF(surfobj2);
@@ -729,7 +941,7 @@ surf_rotate(PyObject *self, PyObject *arg)
         bgcolor &= ~surf->format->Amask;
     }
 
-    SDL_LockSurface(newsurf);
+    lock_dest_surface(NULL, newsurf);
     pgSurface_Lock(surfobj);
 
     Py_BEGIN_ALLOW_THREADS;
@@ -737,7 +949,7 @@ surf_rotate(PyObject *self, PyObject *arg)
     Py_END_ALLOW_THREADS;
 
     pgSurface_Unlock(surfobj);
-    SDL_UnlockSurface(newsurf);
+    unlock_dest_surface(NULL, newsurf);
 
     return pgSurface_New(newsurf);
 }
@@ -766,7 +978,7 @@ surf_flip(PyObject *self, PyObject *arg)
     srcpitch = surf->pitch;
     dstpitch = newsurf->pitch;
 
-    SDL_LockSurface(newsurf);
+    lock_dest_surface(NULL, newsurf);
     pgSurface_Lock(surfobj);
 
     srcpix = (Uint8 *)surf->pixels;
@@ -891,7 +1103,7 @@ surf_flip(PyObject *self, PyObject *arg)
     Py_END_ALLOW_THREADS;
 
     pgSurface_Unlock(surfobj);
-    SDL_UnlockSurface(newsurf);
+    unlock_dest_surface(NULL, newsurf);
     return pgSurface_New(newsurf);
 }
 
@@ -1212,6 +1424,7 @@ static void
 filter_expand_Y_ONLYC(Uint8 *srcpix, Uint8 *dstpix, int width, int srcpitch,
                       int dstpitch, int srcheight, int dstheight)
 {
+    int dstdiff = dstpitch - (width * 4);
     int x, y;
 
     for (y = 0; y < dstheight; y++) {
@@ -1230,14 +1443,26 @@ filter_expand_Y_ONLYC(Uint8 *srcpix, Uint8 *dstpix, int width, int srcpitch,
             *dstpix++ =
                 (Uint8)(((*srcrow0++ * ymult0) + (*srcrow1++ * ymult1)) >> 16);
         }
+        dstpix += dstdiff;
     }
 }
 
-#if defined(SCALE_MMX_SUPPORT)
+#if defined(SCALE_MMX_SUPPORT) || defined(SCALE_AVX2_SUPPORT)
 static void
 smoothscale_init(struct _module_state *st)
 {
     if (st->filter_shrink_X == 0) {
+#if defined(SCALE_AVX2_SUPPORT)
+        if (SDL_HasAVX2()) {
+            st->filter_type = "AVX2";
+            st->filter_shrink_X = filter_shrink_X_AVX2;
+            st->filter_shrink_Y = filter_shrink_Y_AVX2;
+            st->filter_expand_X = filter_expand_X_AVX2;
+            st->filter_expand_Y = filter_expand_Y_AVX2;
+        }
+        else
+#endif /* defined(SCALE_AVX2_SUPPORT) */
+#if defined(SCALE_MMX_SUPPORT)
         if (SDL_HasSSE()) {
             st->filter_type = "SSE";
             st->filter_shrink_X = filter_shrink_X_SSE;
@@ -1252,7 +1477,9 @@ smoothscale_init(struct _module_state *st)
             st->filter_expand_X = filter_expand_X_MMX;
             st->filter_expand_Y = filter_expand_Y_MMX;
         }
-        else {
+        else
+#endif /* defined(SCALE_MMX_SUPPORT) */
+        {
             st->filter_type = "GENERIC";
             st->filter_shrink_X = filter_shrink_X_ONLYC;
             st->filter_shrink_Y = filter_shrink_Y_ONLYC;
@@ -1303,8 +1530,122 @@ convert_32_24(Uint8 *srcpix, int srcpitch, Uint8 *dstpix, int dstpitch,
     }
 }
 
+/* A band of rows, or of columns, for one smoothscale filter call */
+typedef struct {
+    SMOOTHSCALE_FILTER_P filter;
+    Uint8 *srcpix;
+    Uint8 *dstpix;
+    int size; /* rows for the X filters, columns for the Y filters */
+    int srcpitch;
+    int dstpitch;
+    int srclen;
+    int dstlen;
+} smoothscale_band;
+
+static int
+smoothscale_run_band(void *data)
+{
+    smoothscale_band *band = (smoothscale_band *)data;
+
+    band->filter(band->srcpix, band->dstpix, band->size, band->srcpitch,
+                 band->dstpitch, band->srclen, band->dstlen);
+    return 0;
+}
+
+/* Runs a smoothscale filter over size rows, or columns, split into up to
+ * nbands bands which are filtered at the same time.
+ *
+ *     srcstep, dststep - the bytes from one row, or column, to the next
+ *     align - the start of each band is a multiple of this many rows, or
+ *             columns, so no two threads write to the same cache line
+ *
+ * The filters only ever read the rows (columns) they write, so the result
+ * is the same for any number of bands.
+ */
+static void
+smoothscale_filter_bands(SMOOTHSCALE_FILTER_P filter, Uint8 *srcpix,
+                         Uint8 *dstpix, int size, int srcpitch, int dstpitch,
+                         int srclen, int dstlen, int srcstep, int dststep,
+                         int align, int nbands)
+{
+    smoothscale_band *band;
+#if IS_SDLv2
+    SDL_Thread **threads;
+#endif /* IS_SDLv2 */
+    int k, start, end;
+
+    nbands = MIN(nbands, (size + align - 1) / align);
+    if (nbands <= 1) {
+        filter(srcpix, dstpix, size, srcpitch, dstpitch, srclen, dstlen);
+        return;
+    }
+
+    band = (smoothscale_band *)malloc(sizeof(smoothscale_band) * nbands);
+#if IS_SDLv2
+    threads = (SDL_Thread **)calloc(nbands, sizeof(SDL_Thread *));
+    if (!band || !threads) {
+        free(band);
+        free(threads);
+        filter(srcpix, dstpix, size, srcpitch, dstpitch, srclen, dstlen);
+        return;
+    }
+#else  /* IS_SDLv1 */
+    if (!band) {
+        filter(srcpix, dstpix, size, srcpitch, dstpitch, srclen, dstlen);
+        return;
+    }
+#endif /* IS_SDLv1 */
+
+    for (k = 0; k < nbands; ++k) {
+        start = (int)((long long)size * k / nbands) / align * align;
+        end = k + 1 < nbands
+                  ? (int)((long long)size * (k + 1) / nbands) / align * align
+                  : size;
+        band[k].filter = filter;
+        band[k].srcpix = srcpix + start * srcstep;
+        band[k].dstpix = dstpix + start * dststep;
+        band[k].size = end - start;
+        band[k].srcpitch = srcpitch;
+        band[k].dstpitch = dstpitch;
+        band[k].srclen = srclen;
+        band[k].dstlen = dstlen;
+    }
+
+#if IS_SDLv2
+    for (k = 1; k < nbands; ++k) {
+        if (band[k].size > 0) {
+            threads[k] = SDL_CreateThread(smoothscale_run_band,
+                                          "pgsmoothscale", band + k);
+            if (!threads[k]) {
+                /* this thread filters the band itself */
+                smoothscale_run_band(band + k);
+            }
+        }
+    }
+    if (band[0].size > 0) {
+        smoothscale_run_band(band);
+    }
+    for (k = 1; k < nbands; ++k) {
+        if (threads[k]) {
+            SDL_WaitThread(threads[k], NULL);
+        }
+    }
+    free(threads);
+#else  /* IS_SDLv1 */
+    for (k = 0; k < nbands; ++k) {
+        if (band[k].size > 0) {
+            smoothscale_run_band(band + k);
+        }
+    }
+#endif /* IS_SDLv1 */
+    free(band);
+}
+
+/* nbands is how many bands each pass is split into, see
+ * smoothscale_filter_bands */
 static void
-scalesmooth(SDL_Surface *src, SDL_Surface *dst, struct _module_state *st)
+scalesmooth(SDL_Surface *src, SDL_Surface *dst, struct _module_state *st,
+            int nbands)
 {
     Uint8 *srcpix = (Uint8 *)src->pixels;
     Uint8 *dstpix = (Uint8 *)dst->pixels;
@@ -1357,43 +1698,51 @@ scalesmooth(SDL_Surface *src, SDL_Surface *dst, struct _module_state *st)
         }
     }
 
-    /* Start the filter by doing X-scaling */
+    /* Start the filter by doing X-scaling, in bands of rows */
     if (dstwidth < srcwidth) /* shrink */
     {
         if (srcheight != dstheight)
-            st->filter_shrink_X(srcpix, temppix, srcheight, srcpitch,
-                                temppitch, srcwidth, dstwidth);
+            smoothscale_filter_bands(st->filter_shrink_X, srcpix, temppix,
+                                     srcheight, srcpitch, temppitch, srcwidth,
+                                     dstwidth, srcpitch, temppitch, 4, nbands);
         else
-            st->filter_shrink_X(srcpix, dstpix, srcheight, srcpitch, dstpitch,
-                                srcwidth, dstwidth);
+            smoothscale_filter_bands(st->filter_shrink_X, srcpix, dstpix,
+                                     srcheight, srcpitch, dstpitch, srcwidth,
+                                     dstwidth, srcpitch, dstpitch, 4, nbands);
     }
     else if (dstwidth > srcwidth) /* expand */
     {
         if (srcheight != dstheight)
-            st->filter_expand_X(srcpix, temppix, srcheight, srcpitch,
-                                temppitch, srcwidth, dstwidth);
+            smoothscale_filter_bands(st->filter_expand_X, srcpix, temppix,
+                                     srcheight, srcpitch, temppitch, srcwidth,
+                                     dstwidth, srcpitch, temppitch, 4, nbands);
         else
-            st->filter_expand_X(srcpix, dstpix, srcheight, srcpitch, dstpitch,
-                                srcwidth, dstwidth);
+            smoothscale_filter_bands(st->filter_expand_X, srcpix, dstpix,
+                                     srcheight, srcpitch, dstpitch, srcwidth,
+                                     dstwidth, srcpitch, dstpitch, 4, nbands);
     }
-    /* Now do the Y scale */
+    /* Now do the Y scale, in bands of columns */
     if (dstheight < srcheight) /* shrink */
     {
         if (srcwidth != dstwidth)
-            st->filter_shrink_Y(temppix, dstpix, tempwidth, temppitch,
-                                dstpitch, srcheight, dstheight);
+            smoothscale_filter_bands(st->filter_shrink_Y, temppix, dstpix,
+                                     tempwidth, temppitch, dstpitch, srcheight,
+                                     dstheight, 4, 4, 16, nbands);
         else
-            st->filter_shrink_Y(srcpix, dstpix, srcwidth, srcpitch, dstpitch,
-                                srcheight, dstheight);
+            smoothscale_filter_bands(st->filter_shrink_Y, srcpix, dstpix,
+                                     srcwidth, srcpitch, dstpitch, srcheight,
+                                     dstheight, 4, 4, 16, nbands);
     }
     else if (dstheight > srcheight) /* expand */
     {
         if (srcwidth != dstwidth)
-            st->filter_expand_Y(temppix, dstpix, tempwidth, temppitch,
-                                dstpitch, srcheight, dstheight);
+            smoothscale_filter_bands(st->filter_expand_Y, temppix, dstpix,
+                                     tempwidth, temppitch, dstpitch, srcheight,
+                                     dstheight, 4, 4, 16, nbands);
         else
-            st->filter_expand_Y(srcpix, dstpix, srcwidth, srcpitch, dstpitch,
-                                srcheight, dstheight);
+            smoothscale_filter_bands(st->filter_expand_Y, srcpix, dstpix,
+                                     srcwidth, srcpitch, dstpitch, srcheight,
+                                     dstheight, 4, 4, 16, nbands);
     }
 
     /* Convert back to 24-bit if necessary */
@@ -1411,20 +1760,33 @@ scalesmooth(SDL_Surface *src, SDL_Surface *dst, struct _module_state *st)
 }
 
 static PyObject *
-surf_scalesmooth(PyObject *self, PyObject *arg)
+surf_scalesmooth(PyObject *self, PyObject *arg, PyObject *kwds)
 {
     PyObject *surfobj, *surfobj2;
     SDL_Surface *surf, *newsurf;
     int width, height, bpp;
+    int threads = 1;
+    static char *keywords[] = {"surface", "size", "dest_surface", "threads",
+                               NULL};
     surfobj2 = NULL;
 
     /*get all the arguments*/
-    if (!PyArg_ParseTuple(arg, "O!(ii)|O!", &pgSurface_Type, &surfobj, &width,
-                          &height, &pgSurface_Type, &surfobj2))
+    if (!PyArg_ParseTupleAndKeywords(arg, kwds, "O!(ii)|O!i", keywords,
+                                     &pgSurface_Type, &surfobj, &width,
+                                     &height, &pgSurface_Type, &surfobj2,
+                                     &threads))
         return NULL;
 
     if (width < 0 || height < 0)
         return RAISE(PyExc_ValueError, "Cannot scale to negative size");
+    if (threads < 0)
+        return RAISE(PyExc_ValueError, "threads must not be negative");
+#if IS_SDLv2
+    if (threads == 0)
+        threads = SDL_GetCPUCount();
+#else  /* IS_SDLv1 */
+    threads = 1;
+#endif /* IS_SDLv1 */
 
     surf = pgSurface_AsSurface(surfobj);
 
@@ -1452,7 +1814,7 @@ surf_scalesmooth(PyObject *self, PyObject *arg)
             "SDL Error: destination surface pitch not 4-byte aligned.");
 
     if (width && height) {
-        SDL_LockSurface(newsurf);
+        lock_dest_surface(surfobj2, newsurf);
         pgSurface_Lock(surfobj);
         Py_BEGIN_ALLOW_THREADS;
 
@@ -1465,12 +1827,12 @@ surf_scalesmooth(PyObject *self, PyObject *arg)
             }
         }
         else {
-            scalesmooth(surf, newsurf, GETSTATE(self));
+            scalesmooth(surf, newsurf, GETSTATE(self), threads);
         }
         Py_END_ALLOW_THREADS;
 
         pgSurface_Unlock(surfobj);
-        SDL_UnlockSurface(newsurf);
+        unlock_dest_surface(surfobj2, newsurf);
     }
 
     if (surfobj2) {
@@ -1490,7 +1852,9 @@ surf_get_smoothscale_backend(PyObject *self, PyObject *args)
 static PyObject *
 surf_set_smoothscale_backend(PyObject *self, PyObject *args, PyObject *kwds)
 {
+#if defined(SCALE_MMX_SUPPORT) || defined(SCALE_AVX2_SUPPORT)
     struct _module_state *st = GETSTATE(self);
+#endif
     char *keywords[] = {"type", NULL};
     const char *type;
 
@@ -1499,51 +1863,50 @@ surf_set_smoothscale_backend(PyObject *self, PyObject *args, PyObject *kwds)
         return NULL;
     }
 
-#if defined(SCALE_MMX_SUPPORT)
     if (strcmp(type, "GENERIC") == 0) {
+#if defined(SCALE_MMX_SUPPORT) || defined(SCALE_AVX2_SUPPORT)
         st->filter_type = "GENERIC";
         st->filter_shrink_X = filter_shrink_X_ONLYC;
         st->filter_shrink_Y = filter_shrink_Y_ONLYC;
         st->filter_expand_X = filter_expand_X_ONLYC;
         st->filter_expand_Y = filter_expand_Y_ONLYC;
+#endif
+        Py_RETURN_NONE;
     }
-    else if (strcmp(type, "MMX") == 0) {
-        if (!SDL_HasMMX()) {
-            return RAISE(PyExc_ValueError,
-                         "MMX not supported on this machine");
-        }
+#if defined(SCALE_MMX_SUPPORT)
+    if (strcmp(type, "MMX") == 0 && SDL_HasMMX()) {
         st->filter_type = "MMX";
         st->filter_shrink_X = filter_shrink_X_MMX;
         st->filter_shrink_Y = filter_shrink_Y_MMX;
         st->filter_expand_X = filter_expand_X_MMX;
         st->filter_expand_Y = filter_expand_Y_MMX;
+        Py_RETURN_NONE;
     }
-    else if (strcmp(type, "SSE") == 0) {
-        if (!SDL_HasSSE()) {
-            return RAISE(PyExc_ValueError,
-                         "SSE not supported on this machine");
-        }
+    if (strcmp(type, "SSE") == 0 && SDL_HasSSE()) {
         st->filter_type = "SSE";
         st->filter_shrink_X = filter_shrink_X_SSE;
         st->filter_shrink_Y = filter_shrink_Y_SSE;
         st->filter_expand_X = filter_expand_X_SSE;
         st->filter_expand_Y = filter_expand_Y_SSE;
+        Py_RETURN_NONE;
     }
-    else {
-        return PyErr_Format(PyExc_ValueError, "Unknown backend type %s", type);
+#endif /* defined(SCALE_MMX_SUPPORT) */
+#if defined(SCALE_AVX2_SUPPORT)
+    if (strcmp(type, "AVX2") == 0 && SDL_HasAVX2()) {
+        st->filter_type = "AVX2";
+        st->filter_shrink_X = filter_shrink_X_AVX2;
+        st->filter_shrink_Y = filter_shrink_Y_AVX2;
+        st->filter_expand_X = filter_expand_X_AVX2;
+        st->filter_expand_Y = filter_expand_Y_AVX2;
+        Py_RETURN_NONE;
     }
-    Py_RETURN_NONE;
-#else  /* Not an x86 processor */
-    if (strcmp(type, "GENERIC") != 0) {
-        if (strcmp(st->filter_type, "MMX") == 0 ||
-            strcmp(st->filter_type, "SSE") == 0) {
-            return PyErr_Format(PyExc_ValueError,
-                                "%s not supported on this machine", type);
-        }
-        return PyErr_Format(PyExc_ValueError, "Unknown backend type %s", type);
+#endif /* defined(SCALE_AVX2_SUPPORT) */
+    if (strcmp(type, "MMX") == 0 || strcmp(type, "SSE") == 0 ||
+        strcmp(type, "AVX2") == 0) {
+        return PyErr_Format(PyExc_ValueError,
+                            "%s not supported on this machine", type);
     }
-    Py_RETURN_NONE;
-#endif /* defined(SCALE_MMX_SUPPORT) */
+    return PyErr_Format(PyExc_ValueError, "Unknown backend type %s", type);
 }
 
 /* _get_color_move_pixels is for iterating over pixels in a Surface.
@@ -1619,86 +1982,246 @@ _set_at_pixels(int x, int y, Uint8 *pixels, SDL_PixelFormat *format,
     }
 }
 
+/* Pixel readers turn rows of pixels into RGBX bytes, giving the same colors
+ * as SDL_GetRGB, with a kernel for each kind of pixel format.
+ */
+#define PIXEL_READ_GENERIC 0  /* SDL_GetRGB for every pixel */
+#define PIXEL_READ_TABLE 1    /* 8 bit pixels, a color for each value */
+#define PIXEL_READ_CHANNELS 2 /* 16 bit pixels, a table for each channel */
+#define PIXEL_READ_BYTES 3    /* 24 and 32 bit pixels, a byte per channel */
+
+typedef struct {
+    SDL_PixelFormat *format;
+    int kind;
+    int offsets[3]; /* the byte of each channel, for PIXEL_READ_BYTES */
+    Uint8 table[256][4];
+    Uint8 channels[3][256];
+} pixel_reader;
+
+static void
+pixel_reader_init(pixel_reader *reader, SDL_PixelFormat *format)
+{
+    Uint32 masks[3];
+    Uint8 shifts[3], rgb[3];
+    int bpp = format->BytesPerPixel;
+    Uint32 c, i;
+
+    reader->format = format;
+    reader->kind = PIXEL_READ_GENERIC;
+    if (bpp == 1) {
+        for (i = 0; i < 256; i++) {
+            SDL_GetRGB(i, format, reader->table[i], reader->table[i] + 1,
+                       reader->table[i] + 2);
+            reader->table[i][3] = 0;
+        }
+        reader->kind = PIXEL_READ_TABLE;
+        return;
+    }
+
+    masks[0] = format->Rmask;
+    masks[1] = format->Gmask;
+    masks[2] = format->Bmask;
+    shifts[0] = format->Rshift;
+    shifts[1] = format->Gshift;
+    shifts[2] = format->Bshift;
+    for (c = 0; c < 3; c++) {
+        if (!masks[c] || (masks[c] >> shifts[c]) > 0xFF)
+            return;
+    }
+
+    if (bpp == 2) {
+        for (c = 0; c < 3; c++) {
+            for (i = 0; i <= masks[c] >> shifts[c]; i++) {
+                SDL_GetRGB(i << shifts[c], format, rgb, rgb + 1, rgb + 2);
+                reader->channels[c][i] = rgb[c];
+            }
+        }
+        reader->kind = PIXEL_READ_CHANNELS;
+        return;
+    }
+
+    for (c = 0; c < 3; c++) {
+        if ((masks[c] >> shifts[c]) != 0xFF || shifts[c] % 8)
+            return;
+#if SDL_BYTEORDER == SDL_LIL_ENDIAN
+        reader->offsets[c] = shifts[c] >> 3;
+#else
+        reader->offsets[c] = bpp - 1 - (shifts[c] >> 3);
+#endif
+    }
+    reader->kind = PIXEL_READ_BYTES;
+}
+
+static void
+pixel_reader_row(const pixel_reader *reader, Uint8 *pixels, int width,
+                 Uint8 *rgbx)
+{
+    SDL_PixelFormat *format = reader->format;
+    Uint8 bpp = format->BytesPerPixel;
+    Uint32 color;
+    int x;
+
+    switch (reader->kind) {
+        case PIXEL_READ_TABLE:
+            for (x = 0; x < width; x++, rgbx += 4) {
+                memcpy(rgbx, reader->table[pixels[x]], 4);
+            }
+            break;
+        case PIXEL_READ_CHANNELS:
+            for (x = 0; x < width; x++, rgbx += 4) {
+                color = ((Uint16 *)pixels)[x];
+                rgbx[0] = reader->channels[0][(color & format->Rmask) >>
+                                              format->Rshift];
+                rgbx[1] = reader->channels[1][(color & format->Gmask) >>
+                                              format->Gshift];
+                rgbx[2] = reader->channels[2][(color & format->Bmask) >>
+                                              format->Bshift];
+                rgbx[3] = 0;
+            }
+            break;
+        case PIXEL_READ_BYTES:
+            {
+                int r = reader->offsets[0], g = reader->offsets[1],
+                    b = reader->offsets[2];
+
+                for (x = 0; x < width; x++, rgbx += 4, pixels += bpp) {
+                    rgbx[0] = pixels[r];
+                    rgbx[1] = pixels[g];
+                    rgbx[2] = pixels[b];
+                    rgbx[3] = 0;
+                }
+            }
+            break;
+        default: /* PIXEL_READ_GENERIC */
+            for (x = 0; x < width; x++, rgbx += 4) {
+                pixels = _get_color_move_pixels(bpp, pixels, &color);
+                SDL_GetRGB(color, format, rgbx, rgbx + 1, rgbx + 2);
+                rgbx[3] = 0;
+            }
+            break;
+    }
+}
+
+/* Marks the pixels in a row of RGBX bytes which are within the threshold of
+ * the pixels in another row, or of one color when step is 0.
+ * Returns how many are within the threshold.
+ */
+static int
+threshold_row(const Uint8 *rgbx, const Uint8 *search, int step,
+              const Uint8 *threshold, int width, Uint8 *within)
+{
+    int x = 0, count = 0;
+
+#if defined(TRANSFORM_SSE2)
+    Uint32 word;
+    __m128i limit, color, zero = _mm_setzero_si128();
+
+    memcpy(&word, threshold, 4);
+    limit = _mm_set1_epi32((int)word);
+    memcpy(&word, search, 4);
+    color = _mm_set1_epi32((int)word);
+    for (; x + 4 <= width; x += 4) {
+        __m128i a = _mm_loadu_si128((const __m128i *)(rgbx + x * 4));
+        __m128i b =
+            step ? _mm_loadu_si128((const __m128i *)(search + x * step))
+                 : color;
+        __m128i diff =
+            _mm_or_si128(_mm_subs_epu8(a, b), _mm_subs_epu8(b, a));
+        int i, bits = _mm_movemask_epi8(
+                   _mm_cmpeq_epi8(_mm_subs_epu8(diff, limit), zero));
+
+        /* a pixel is within when all four of its bytes are */
+        for (i = 0; i < 4; i++, bits >>= 4) {
+            within[x + i] = (bits & 0xF) == 0xF;
+            count += within[x + i];
+        }
+    }
+#endif /* TRANSFORM_SSE2 */
+    for (; x < width; x++) {
+        const Uint8 *a = rgbx + x * 4, *b = search + x * step;
+
+        within[x] = (abs((int)a[0] - (int)b[0]) <= threshold[0] &&
+                     abs((int)a[1] - (int)b[1]) <= threshold[1] &&
+                     abs((int)a[2] - (int)b[2]) <= threshold[2]);
+        count += within[x];
+    }
+    return count;
+}
+
+/* Returns the number of pixels within the threshold, or -1 if out of memory.
+ */
 static int
 get_threshold(SDL_Surface *dest_surf, SDL_Surface *surf,
               Uint32 color_search_color, Uint32 color_threshold,
               Uint32 color_set_color, int set_behavior,
               SDL_Surface *search_surf, int inverse_set)
 {
-    int x, y, similar;
-    Uint8 *pixels, *destpixels = NULL, *pixels2 = NULL;
-    SDL_PixelFormat *format, *destformat = NULL;
-    Uint32 the_color, the_color2, dest_set_color;
-    Uint8 search_color_r, search_color_g, search_color_b;
-    Uint8 surf_r, surf_g, surf_b;
-    Uint8 threshold_r, threshold_g, threshold_b;
-    Uint8 search_surf_r, search_surf_g, search_surf_b;
-
-    int within_threshold;
-
-    similar = 0;
-    pixels = (Uint8 *)surf->pixels;
-    format = surf->format;
+    pixel_reader reader, search_reader;
+    Uint8 *pixels, *pixels2 = NULL, *destpixels = NULL;
+    Uint8 *rows, *surf_rgbx, *search_rgbx, *within;
+    Uint8 search_color[4], threshold[4];
+    Uint8 bpp = surf->format->BytesPerPixel, bpp2 = 0;
+    Uint32 dest_set_color = color_set_color;
+    int x, y, width = surf->w, similar = 0;
+
+    rows = (Uint8 *)malloc((size_t)width * 9 + 1);
+    if (!rows)
+        return -1;
+    surf_rgbx = rows;
+    search_rgbx = rows + (size_t)width * 4;
+    within = rows + (size_t)width * 8;
 
-    if (set_behavior) {
-        destpixels = (Uint8 *)dest_surf->pixels;
-        destformat = dest_surf->format;
-    }
+    pixel_reader_init(&reader, surf->format);
     if (search_surf) {
-        pixels2 = (Uint8 *)search_surf->pixels;
+        pixel_reader_init(&search_reader, search_surf->format);
+        bpp2 = search_surf->format->BytesPerPixel;
     }
+    if (set_behavior)
+        destpixels = (Uint8 *)dest_surf->pixels;
 
-    SDL_GetRGB(color_search_color, format, &search_color_r, &search_color_g,
-               &search_color_b);
-    SDL_GetRGB(color_threshold, format, &threshold_r, &threshold_g,
-               &threshold_b);
+    SDL_GetRGB(color_search_color, surf->format, search_color,
+               search_color + 1, search_color + 2);
+    search_color[3] = 0;
+    SDL_GetRGB(color_threshold, surf->format, threshold, threshold + 1,
+               threshold + 2);
+    threshold[3] = 255;
 
+    inverse_set = inverse_set != 0;
     for (y = 0; y < surf->h; y++) {
         pixels = (Uint8 *)surf->pixels + y * surf->pitch;
-        if (search_surf)
+        pixel_reader_row(&reader, pixels, width, surf_rgbx);
+        if (search_surf) {
+            /* search_surf is within threshold of surf */
             pixels2 = (Uint8 *)search_surf->pixels + y * search_surf->pitch;
+            pixel_reader_row(&search_reader, pixels2, width, search_rgbx);
+            similar += threshold_row(surf_rgbx, search_rgbx, 4, threshold,
+                                     width, within);
+        }
+        else {
+            /* search_color is within threshold of surf */
+            similar += threshold_row(surf_rgbx, search_color, 0, threshold,
+                                     width, within);
+        }
 
-        for (x = 0; x < surf->w; x++) {
-            pixels = _get_color_move_pixels(surf->format->BytesPerPixel,
-                                            pixels, &the_color);
-            SDL_GetRGB(the_color, surf->format, &surf_r, &surf_g, &surf_b);
-
-            if (search_surf) {
-                /* Get search_surf.color */
-                pixels2 = _get_color_move_pixels(
-                    search_surf->format->BytesPerPixel, pixels2, &the_color2);
-                SDL_GetRGB(the_color2, search_surf->format, &search_surf_r,
-                           &search_surf_g, &search_surf_b);
-
-                /* search_surf(the_color2) is within threshold of
-                 * surf(the_color) */
-                within_threshold =
-                    ((abs((int)search_surf_r - (int)surf_r) <= threshold_r) &&
-                     (abs((int)search_surf_g - (int)surf_g) <= threshold_g) &&
-                     (abs((int)search_surf_b - (int)surf_b) <= threshold_b));
-                dest_set_color =
-                    ((set_behavior == 2) ? the_color2 : color_set_color);
-            }
-            else {
-                /* search_color within threshold of surf.the_color */
-                // printf("rgb: %i,%i,%i\n", surf_r, surf_g, surf_b);
-                within_threshold =
-                    ((abs((int)search_color_r - (int)surf_r) <= threshold_r) &&
-                     (abs((int)search_color_g - (int)surf_g) <= threshold_g) &&
-                     (abs((int)search_color_b - (int)surf_b) <= threshold_b));
-                dest_set_color =
-                    ((set_behavior == 2) ? the_color : color_set_color);
-            }
-
-            if (within_threshold)
-                similar++;
-            if (set_behavior && ((within_threshold && inverse_set) ||
-                                 (!within_threshold && !inverse_set))) {
-                _set_at_pixels(x, y, destpixels, dest_surf->format,
-                               dest_surf->pitch, dest_set_color);
+        if (!set_behavior)
+            continue;
+        /* the whole row has been read, so dest_surf may be either surface */
+        for (x = 0; x < width; x++) {
+            if (within[x] != inverse_set)
+                continue;
+            if (set_behavior == 2) {
+                if (search_surf)
+                    _get_color_move_pixels(bpp2, pixels2 + x * bpp2,
+                                           &dest_set_color);
+                else
+                    _get_color_move_pixels(bpp, pixels + x * bpp,
+                                           &dest_set_color);
             }
+            _set_at_pixels(x, y, destpixels, dest_surf->format,
+                           dest_surf->pitch, dest_set_color);
         }
     }
+    free(rows);
     return similar;
 }
 
@@ -1890,6 +2413,8 @@ surf_threshold(PyObject *self, PyObject *args, PyObject *kwds)
     if (search_surf)
         pgSurface_Unlock(search_surf_obj);
 
+    if (num_threshold_pixels < 0)
+        return PyErr_NoMemory();
     return PyInt_FromLong(num_threshold_pixels);
 }
 
@@ -2215,15 +2740,15 @@ surf_laplacian(PyObject *self, PyObject *arg)
         return RAISE(PyExc_ValueError,
                      "Source and destination surfaces need the same format.");
 
-    SDL_LockSurface(newsurf);
-    SDL_LockSurface(surf);
+    lock_dest_surface(surfobj2, newsurf);
+    pgSurface_Lock(surfobj);
 
     Py_BEGIN_ALLOW_THREADS;
     laplacian(surf, newsurf);
     Py_END_ALLOW_THREADS;
 
-    SDL_UnlockSurface(surf);
-    SDL_UnlockSurface(newsurf);
+    pgSurface_Unlock(surfobj);
+    unlock_dest_surface(surfobj2, newsurf);
 
     if (surfobj2) {
         Py_INCREF(surfobj2);
@@ -2233,6 +2758,979 @@ surf_laplacian(PyObject *self, PyObject *arg)
         return pgSurface_New(newsurf);
 }
 
+/* Blurs and convolution
+ *
+ * These work on the bytes of 24 and 32 bit surfaces, treating every channel,
+ * alpha included, the same way. Kernels are turned into whole number weights
+ * and a shift, and each byte becomes
+ *
+ *     clamp((sum of weight * byte + rounding) >> shift, 0, 255)
+ *
+ * which the SSE2 code works out exactly like the C code, 16 bytes at a time.
+ * Filters are run in bands of rows, on a thread for each band.
+ */
+#define FILTER_MAX_SHIFT 23
+#define FILTER_MAX_RADIUS 65535
+
+/* a box blur sum of n bytes, times (1 << 24) / n, back to a byte */
+#define BOX_SCALE(sum, mul) \
+    ((Uint8)MIN(255, ((Uint64)(sum) * (mul) + 0x800000) >> 24))
+
+typedef struct _filter_job filter_job;
+typedef void (*FILTER_PASS_P)(filter_job *, int, int);
+
+struct _filter_job {
+    FILTER_PASS_P pass;
+    Uint8 *src;
+    int srcpitch;
+    Uint8 *dst;
+    int dstpitch;
+    int width; /* in pixels, the same for the source and destination */
+    int height;
+    int bpp;
+    int repeat; /* repeat the edge pixels, or use zeros past them */
+    Sint16 *weights;
+    int taps;   /* the number of weights across, or down for columns */
+    int rows;   /* the number of weights down for a 2D kernel */
+    int shift;
+    int radius; /* for a box blur */
+    int failed; /* set on a memory allocation failure */
+};
+
+typedef struct {
+    filter_job *job;
+    int y0;
+    int y1;
+} filter_band;
+
+/* Gets the number of threads to use from a threads argument.
+ * Returns -1 with an exception set if threads is invalid.
+ */
+static int
+filter_thread_count(int threads)
+{
+    if (threads < 0) {
+        RAISE(PyExc_ValueError, "threads must not be negative");
+        return -1;
+    }
+#if IS_SDLv2
+    if (threads == 0)
+        threads = SDL_GetCPUCount();
+#else  /* IS_SDLv1 */
+    threads = 1;
+#endif /* IS_SDLv1 */
+    return MAX(threads, 1);
+}
+
+/* Turns the kernel values into weights, with the biggest shift that keeps
+ * the weights in 16 bits and the sums in 32 bits. With normalize, for
+ * values which add up to 1, the weights add up to exactly 1 << shift.
+ * Returns the shift, or -1 if the values are too big.
+ */
+static int
+filter_weights(const double *kernel, int n, Sint16 *weights, int normalize)
+{
+    double most = 0.0, total = 0.0, scale = 1.0;
+    int k, shift, sum = 0, top = 0;
+
+    for (k = 0; k < n; k++) {
+        if (fabs(kernel[k]) > most) {
+            most = fabs(kernel[k]);
+            top = k;
+        }
+        total += fabs(kernel[k]);
+    }
+    for (shift = FILTER_MAX_SHIFT; shift >= 0; shift--) {
+        scale = (double)(1 << shift);
+        if (most * scale + n <= 32767.0 &&
+            (total * scale + n) * 255.0 + scale < 2147483647.0) {
+            break;
+        }
+    }
+    if (shift < 0) {
+        return -1;
+    }
+    for (k = 0; k < n; k++) {
+        weights[k] = (Sint16)floor(kernel[k] * scale + 0.5);
+        sum += weights[k];
+    }
+    if (normalize) {
+        weights[top] += (1 << shift) - sum;
+    }
+    return shift;
+}
+
+/* Copies a row of pixels into line, after left pixels and before right
+ * pixels which repeat the edge pixels, or are zero.
+ */
+static void
+filter_pad_line(const Uint8 *row, Uint8 *line, int width, int bpp, int left,
+                int right, int repeat)
+{
+    Uint8 *end = line + (left + width) * bpp;
+    int x;
+
+    memcpy(line + left * bpp, row, width * bpp);
+    for (x = 0; x < left; x++) {
+        if (repeat)
+            memcpy(line + x * bpp, row, bpp);
+        else
+            memset(line + x * bpp, 0, bpp);
+    }
+    for (x = 0; x < right; x++) {
+        if (repeat)
+            memcpy(end + x * bpp, row + (width - 1) * bpp, bpp);
+        else
+            memset(end + x * bpp, 0, bpp);
+    }
+}
+
+/* out[i] = clamp((sum of weights[k] * taps[k][i] + rounding) >> shift)
+ * for the n bytes of out */
+static void
+filter_span(Uint8 **taps, int ntaps, const Sint16 *weights, int shift,
+            Uint8 *out, int n)
+{
+    int round = shift ? 1 << (shift - 1) : 0;
+    int i = 0, k, acc;
+#if defined(TRANSFORM_SSE2)
+    __m128i zero = _mm_setzero_si128();
+    __m128i vround = _mm_set1_epi32(round);
+    __m128i vshift = _mm_cvtsi32_si128(shift);
+
+    for (; i + 16 <= n; i += 16) {
+        __m128i acc0 = vround, acc1 = vround, acc2 = vround, acc3 = vround;
+
+        /* two taps at a time, their bytes side by side for madd */
+        for (k = 0; k < ntaps; k += 2) {
+            __m128i a = _mm_loadu_si128((const __m128i *)(taps[k] + i));
+            __m128i b = zero, w, alo, ahi, blo, bhi;
+
+            if (k + 1 < ntaps) {
+                b = _mm_loadu_si128((const __m128i *)(taps[k + 1] + i));
+                w = _mm_set1_epi32((int)((Uint16)weights[k] |
+                                         ((Uint32)(Uint16)weights[k + 1]
+                                          << 16)));
+            }
+            else {
+                w = _mm_set1_epi32((int)(Uint16)weights[k]);
+            }
+            alo = _mm_unpacklo_epi8(a, zero);
+            ahi = _mm_unpackhi_epi8(a, zero);
+            blo = _mm_unpacklo_epi8(b, zero);
+            bhi = _mm_unpackhi_epi8(b, zero);
+            acc0 = _mm_add_epi32(
+                acc0, _mm_madd_epi16(_mm_unpacklo_epi16(alo, blo), w));
+            acc1 = _mm_add_epi32(
+                acc1, _mm_madd_epi16(_mm_unpackhi_epi16(alo, blo), w));
+            acc2 = _mm_add_epi32(
+                acc2, _mm_madd_epi16(_mm_unpacklo_epi16(ahi, bhi), w));
+            acc3 = _mm_add_epi32(
+                acc3, _mm_madd_epi16(_mm_unpackhi_epi16(ahi, bhi), w));
+        }
+        /* the saturating packs clamp to 0 - 255 */
+        acc0 = _mm_packs_epi32(_mm_sra_epi32(acc0, vshift),
+                               _mm_sra_epi32(acc1, vshift));
+        acc2 = _mm_packs_epi32(_mm_sra_epi32(acc2, vshift),
+                               _mm_sra_epi32(acc3, vshift));
+        _mm_storeu_si128((__m128i *)(out + i), _mm_packus_epi16(acc0, acc2));
+    }
+#endif /* TRANSFORM_SSE2 */
+    for (; i < n; i++) {
+        acc = round;
+        for (k = 0; k < ntaps; k++) {
+            acc += weights[k] * taps[k][i];
+        }
+        acc >>= shift;
+        out[i] = (Uint8)(acc < 0 ? 0 : (acc > 255 ? 255 : acc));
+    }
+}
+
+/* Gets source row y of a job, past the edges the edge row or zeros */
+static Uint8 *
+filter_source_row(filter_job *job, int y, Uint8 *zeros)
+{
+    if (y < 0 || y >= job->height) {
+        if (!job->repeat)
+            return zeros;
+        y = y < 0 ? 0 : job->height - 1;
+    }
+    return job->src + y * job->srcpitch;
+}
+
+/* Filters rows y0 to y1 across, with the weights centered on each pixel */
+static void
+filter_rows(filter_job *job, int y0, int y1)
+{
+    int bpp = job->bpp;
+    int left = job->taps / 2;
+    Uint8 *line, **taps;
+    int y, k;
+
+    line = (Uint8 *)malloc((job->width + job->taps - 1) * bpp);
+    taps = (Uint8 **)malloc(job->taps * sizeof(Uint8 *));
+    if (!line || !taps) {
+        free(line);
+        free(taps);
+        job->failed = 1;
+        return;
+    }
+    for (k = 0; k < job->taps; k++) {
+        taps[k] = line + k * bpp;
+    }
+    for (y = y0; y < y1; y++) {
+        filter_pad_line(job->src + y * job->srcpitch, line, job->width, bpp,
+                        left, job->taps - 1 - left, job->repeat);
+        filter_span(taps, job->taps, job->weights, job->shift,
+                    job->dst + y * job->dstpitch, job->width * bpp);
+    }
+    free(line);
+    free(taps);
+}
+
+/* Filters rows y0 to y1 down, with the weights centered on each pixel */
+static void
+filter_columns(filter_job *job, int y0, int y1)
+{
+    int size = job->width * job->bpp;
+    int top = job->taps / 2;
+    Uint8 *zeros, **taps;
+    int y, k;
+
+    zeros = (Uint8 *)calloc(size, 1);
+    taps = (Uint8 **)malloc(job->taps * sizeof(Uint8 *));
+    if (!zeros || !taps) {
+        free(zeros);
+        free(taps);
+        job->failed = 1;
+        return;
+    }
+    for (y = y0; y < y1; y++) {
+        for (k = 0; k < job->taps; k++) {
+            taps[k] = filter_source_row(job, y + k - top, zeros);
+        }
+        filter_span(taps, job->taps, job->weights, job->shift,
+                    job->dst + y * job->dstpitch, size);
+    }
+    free(zeros);
+    free(taps);
+}
+
+/* Filters rows y0 to y1 with a 2D kernel. The source is padded all round,
+ * so the kernel never goes past its edges.
+ */
+static void
+filter_2d(filter_job *job, int y0, int y1)
+{
+    int bpp = job->bpp;
+    Uint8 **taps;
+    int y, kx, ky;
+
+    taps = (Uint8 **)malloc(job->rows * job->taps * sizeof(Uint8 *));
+    if (!taps) {
+        job->failed = 1;
+        return;
+    }
+    for (y = y0; y < y1; y++) {
+        for (ky = 0; ky < job->rows; ky++) {
+            for (kx = 0; kx < job->taps; kx++) {
+                taps[ky * job->taps + kx] =
+                    job->src + (y + ky) * job->srcpitch + kx * bpp;
+            }
+        }
+        filter_span(taps, job->rows * job->taps, job->weights, job->shift,
+                    job->dst + y * job->dstpitch, job->width * bpp);
+    }
+    free(taps);
+}
+
+#if defined(TRANSFORM_SSE2)
+/* BOX_SCALE for four 32 bit lanes */
+static PG_INLINE __m128i
+box_scale_sse2(__m128i sum, __m128i mul, __m128i round)
+{
+    __m128i even = _mm_srli_epi64(
+        _mm_add_epi64(_mm_mul_epu32(sum, mul), round), 24);
+    __m128i odd = _mm_srli_epi64(
+        _mm_add_epi64(_mm_mul_epu32(_mm_srli_epi64(sum, 32), mul), round),
+        24);
+
+    return _mm_or_si128(even, _mm_slli_epi64(odd, 32));
+}
+
+/* the four bytes at p as 32 bit lanes */
+#define BOX_LOAD_PIXEL(p, zero)                                             \
+    _mm_unpacklo_epi16(                                                     \
+        _mm_unpacklo_epi8(_mm_cvtsi32_si128(*(const int *)(p)), zero), zero)
+#endif /* TRANSFORM_SSE2 */
+
+/* Box blurs rows y0 to y1 across, keeping a running sum of the bytes under
+ * the box for each channel */
+static void
+box_rows(filter_job *job, int y0, int y1)
+{
+    int bpp = job->bpp;
+    int n = job->radius * 2 + 1;
+    Uint32 mul = (0x1000000 + n / 2) / n;
+    Uint8 *line, *out;
+    Uint32 sum;
+    int x, y, c, k;
+
+    line = (Uint8 *)malloc((job->width + n - 1) * bpp);
+    if (!line) {
+        job->failed = 1;
+        return;
+    }
+    for (y = y0; y < y1; y++) {
+        filter_pad_line(job->src + y * job->srcpitch, line, job->width, bpp,
+                        job->radius, job->radius, job->repeat);
+        out = job->dst + y * job->dstpitch;
+#if defined(TRANSFORM_SSE2)
+        if (bpp == 4) {
+            __m128i zero = _mm_setzero_si128();
+            __m128i vmul = _mm_set1_epi32((int)mul);
+            __m128i round = _mm_set_epi32(0, 0x800000, 0, 0x800000);
+            __m128i vsum = zero, pixel;
+
+            for (k = 0; k < n; k++) {
+                vsum = _mm_add_epi32(vsum, BOX_LOAD_PIXEL(line + k * 4, zero));
+            }
+            for (x = 0; x < job->width; x++) {
+                pixel = box_scale_sse2(vsum, vmul, round);
+                pixel = _mm_packs_epi32(pixel, pixel);
+                *(Uint32 *)(out + x * 4) =
+                    (Uint32)_mm_cvtsi128_si32(_mm_packus_epi16(pixel, pixel));
+                if (x + 1 < job->width) {
+                    vsum = _mm_add_epi32(
+                        _mm_sub_epi32(vsum,
+                                      BOX_LOAD_PIXEL(line + x * 4, zero)),
+                        BOX_LOAD_PIXEL(line + (x + n) * 4, zero));
+                }
+            }
+            continue;
+        }
+#endif /* TRANSFORM_SSE2 */
+        for (c = 0; c < bpp; c++) {
+            sum = 0;
+            for (k = 0; k < n; k++) {
+                sum += line[k * bpp + c];
+            }
+            for (x = 0; x < job->width; x++) {
+                out[x * bpp + c] = BOX_SCALE(sum, mul);
+                if (x + 1 < job->width) {
+                    sum = sum + line[(x + n) * bpp + c] - line[x * bpp + c];
+                }
+            }
+        }
+    }
+    free(line);
+}
+
+/* Box blurs rows y0 to y1 down, keeping a running sum of the bytes under
+ * the box for each byte of a row */
+static void
+box_columns(filter_job *job, int y0, int y1)
+{
+    int size = job->width * job->bpp;
+    int n = job->radius * 2 + 1;
+    Uint32 mul = (0x1000000 + n / 2) / n;
+    Uint32 *sums;
+    Uint8 *zeros, *out, *add, *sub;
+    int i, y, k;
+
+    sums = (Uint32 *)calloc(size, sizeof(Uint32));
+    zeros = (Uint8 *)calloc(size, 1);
+    if (!sums || !zeros) {
+        free(sums);
+        free(zeros);
+        job->failed = 1;
+        return;
+    }
+    for (k = -job->radius; k <= job->radius; k++) {
+        add = filter_source_row(job, y0 + k, zeros);
+        for (i = 0; i < size; i++) {
+            sums[i] += add[i];
+        }
+    }
+    for (y = y0; y < y1; y++) {
+        int more = y + 1 < y1;
+
+        out = job->dst + y * job->dstpitch;
+        add = filter_source_row(job, y + job->radius + 1, zeros);
+        sub = filter_source_row(job, y - job->radius, zeros);
+        i = 0;
+#if defined(TRANSFORM_SSE2)
+        {
+            __m128i zero = _mm_setzero_si128();
+            __m128i vmul = _mm_set1_epi32((int)mul);
+            __m128i round = _mm_set_epi32(0, 0x800000, 0, 0x800000);
+
+            for (; i + 16 <= size; i += 16) {
+                __m128i *s = (__m128i *)(sums + i);
+                __m128i s0 = _mm_loadu_si128(s);
+                __m128i s1 = _mm_loadu_si128(s + 1);
+                __m128i s2 = _mm_loadu_si128(s + 2);
+                __m128i s3 = _mm_loadu_si128(s + 3);
+                __m128i a, b, lo, hi;
+
+                a = _mm_packs_epi32(box_scale_sse2(s0, vmul, round),
+                                    box_scale_sse2(s1, vmul, round));
+                b = _mm_packs_epi32(box_scale_sse2(s2, vmul, round),
+                                    box_scale_sse2(s3, vmul, round));
+                _mm_storeu_si128((__m128i *)(out + i),
+                                 _mm_packus_epi16(a, b));
+                if (!more)
+                    continue;
+                a = _mm_loadu_si128((const __m128i *)(add + i));
+                b = _mm_loadu_si128((const __m128i *)(sub + i));
+                lo = _mm_sub_epi16(_mm_unpacklo_epi8(a, zero),
+                                   _mm_unpacklo_epi8(b, zero));
+                hi = _mm_sub_epi16(_mm_unpackhi_epi8(a, zero),
+                                   _mm_unpackhi_epi8(b, zero));
+                /* sign extend the differences to 32 bits */
+                _mm_storeu_si128(
+                    s, _mm_add_epi32(s0, _mm_srai_epi32(
+                                             _mm_unpacklo_epi16(lo, lo), 16)));
+                _mm_storeu_si128(
+                    s + 1,
+                    _mm_add_epi32(
+                        s1, _mm_srai_epi32(_mm_unpackhi_epi16(lo, lo), 16)));
+                _mm_storeu_si128(
+                    s + 2,
+                    _mm_add_epi32(
+                        s2, _mm_srai_epi32(_mm_unpacklo_epi16(hi, hi), 16)));
+                _mm_storeu_si128(
+                    s + 3,
+                    _mm_add_epi32(
+                        s3, _mm_srai_epi32(_mm_unpackhi_epi16(hi, hi), 16)));
+            }
+        }
+#endif /* TRANSFORM_SSE2 */
+        for (; i < size; i++) {
+            out[i] = BOX_SCALE(sums[i], mul);
+            if (more) {
+                sums[i] = sums[i] + add[i] - sub[i];
+            }
+        }
+    }
+    free(sums);
+    free(zeros);
+}
+
+static int
+filter_run_band(void *data)
+{
+    filter_band *band = (filter_band *)data;
+
+    band->job->pass(band->job, band->y0, band->y1);
+    return 0;
+}
+
+/* Runs a filter pass over the rows of a job, split into up to nbands bands
+ * which are filtered at the same time.
+ * Returns 0, or -1 on a memory allocation failure.
+ */
+static int
+filter_bands(filter_job *job, int nbands)
+{
+    filter_band *band;
+#if IS_SDLv2
+    SDL_Thread **threads;
+#endif /* IS_SDLv2 */
+    int k;
+
+    nbands = MIN(nbands, job->height);
+    if (nbands <= 1) {
+        job->pass(job, 0, job->height);
+        return job->failed ? -1 : 0;
+    }
+
+    band = (filter_band *)malloc(sizeof(filter_band) * nbands);
+    if (!band) {
+        return -1;
+    }
+    for (k = 0; k < nbands; ++k) {
+        band[k].job = job;
+        band[k].y0 = job->height * k / nbands;
+        band[k].y1 = job->height * (k + 1) / nbands;
+    }
+
+#if IS_SDLv2
+    threads = (SDL_Thread **)calloc(nbands, sizeof(SDL_Thread *));
+    if (!threads) {
+        free(band);
+        return -1;
+    }
+    for (k = 1; k < nbands; ++k) {
+        threads[k] = SDL_CreateThread(filter_run_band, "pgfilter", band + k);
+        if (!threads[k]) {
+            /* this thread filters the band itself */
+            filter_run_band(band + k);
+        }
+    }
+    filter_run_band(band);
+    for (k = 1; k < nbands; ++k) {
+        if (threads[k]) {
+            SDL_WaitThread(threads[k], NULL);
+        }
+    }
+    free(threads);
+#else  /* IS_SDLv1 */
+    for (k = 0; k < nbands; ++k) {
+        filter_run_band(band + k);
+    }
+#endif /* IS_SDLv1 */
+    free(band);
+    return job->failed ? -1 : 0;
+}
+
+static void
+filter_job_init(filter_job *job, FILTER_PASS_P pass, SDL_Surface *surf,
+                int repeat)
+{
+    memset(job, 0, sizeof(filter_job));
+    job->pass = pass;
+    job->width = surf->w;
+    job->height = surf->h;
+    job->bpp = surf->format->BytesPerPixel;
+    job->repeat = repeat;
+}
+
+/* Runs the first pass from src into a buffer, then the second pass from
+ * the buffer into dst, which may be src.
+ * Returns 0, or -1 on a memory allocation failure.
+ */
+static int
+filter_two_passes(SDL_Surface *src, SDL_Surface *dst, filter_job *first,
+                  filter_job *second, int nbands)
+{
+    int size = src->w * src->format->BytesPerPixel;
+    Uint8 *temp;
+    int result;
+
+    temp = (Uint8 *)malloc((size_t)size * src->h);
+    if (!temp) {
+        return -1;
+    }
+    first->src = (Uint8 *)src->pixels;
+    first->srcpitch = src->pitch;
+    first->dst = temp;
+    first->dstpitch = size;
+    second->src = temp;
+    second->srcpitch = size;
+    second->dst = (Uint8 *)dst->pixels;
+    second->dstpitch = dst->pitch;
+    result = filter_bands(first, nbands);
+    if (result == 0) {
+        result = filter_bands(second, nbands);
+    }
+    free(temp);
+    return result;
+}
+
+/* Filters src into dst, which may be src, with a 2D kernel of job->rows
+ * by job->taps weights.
+ * Returns 0, or -1 on a memory allocation failure.
+ */
+static int
+filter_surface_2d(SDL_Surface *src, SDL_Surface *dst, filter_job *job,
+                  int nbands)
+{
+    int bpp = src->format->BytesPerPixel;
+    int left = job->taps / 2, top = job->rows / 2;
+    int pitch = (src->w + job->taps - 1) * bpp;
+    int height = src->h + job->rows - 1;
+    Uint8 *padded, *row;
+    int y, result;
+
+    padded = (Uint8 *)malloc((size_t)pitch * height);
+    if (!padded) {
+        return -1;
+    }
+    for (y = 0; y < height; y++) {
+        row = padded + y * pitch;
+        if (!job->repeat && (y < top || y - top >= src->h)) {
+            memset(row, 0, pitch);
+            continue;
+        }
+        filter_pad_line((Uint8 *)src->pixels +
+                            MIN(MAX(y - top, 0), src->h - 1) * src->pitch,
+                        row, src->w, bpp, left, job->taps - 1 - left,
+                        job->repeat);
+    }
+    job->src = padded;
+    job->srcpitch = pitch;
+    job->dst = (Uint8 *)dst->pixels;
+    job->dstpitch = dst->pitch;
+    result = filter_bands(job, nbands);
+    free(padded);
+    return result;
+}
+
+/* Splits a 2D kernel into a column of weights times a row of weights, for
+ * a pass across and then a pass down. The first pass is rounded to bytes,
+ * so this is only done for kernels with no negative values, or no positive
+ * ones, adding up to no more than 1, which keeps the rounding error in the
+ * second pass under 1.
+ * Returns 1 if the kernel was split, else 0.
+ */
+static int
+filter_split_kernel(const double *kernel, int rows, int cols, double *down,
+                    double *across)
+{
+    double most = 0.0, total = 0.0, pivot, sum = 0.0;
+    int px = 0, py = 0, x, y, negative = 0, positive = 0;
+
+    for (y = 0; y < rows; y++) {
+        for (x = 0; x < cols; x++) {
+            double value = kernel[y * cols + x];
+
+            if (fabs(value) > most) {
+                most = fabs(value);
+                px = x;
+                py = y;
+            }
+            total += fabs(value);
+            negative |= value < 0.0;
+            positive |= value > 0.0;
+        }
+    }
+    if (most == 0.0 || (negative && positive) || total > 1.0 + 1e-9) {
+        return 0;
+    }
+    pivot = kernel[py * cols + px];
+    for (y = 0; y < rows; y++) {
+        down[y] = kernel[y * cols + px];
+    }
+    for (x = 0; x < cols; x++) {
+        across[x] = kernel[py * cols + x] / pivot;
+        sum += across[x];
+    }
+    for (y = 0; y < rows; y++) {
+        for (x = 0; x < cols; x++) {
+            if (fabs(kernel[y * cols + x] - down[y] * across[x]) >
+                most * 1e-9) {
+                return 0;
+            }
+        }
+    }
+    /* the weights across are not negative, make them add up to 1 */
+    for (x = 0; x < cols; x++) {
+        across[x] /= sum;
+    }
+    for (y = 0; y < rows; y++) {
+        down[y] *= sum;
+    }
+    return 1;
+}
+
+/* Gets the destination surface of a filter, a new one if destobj is NULL.
+ * Returns NULL with an exception set on failure.
+ */
+static SDL_Surface *
+filter_dest_surface(SDL_Surface *surf, PyObject *destobj)
+{
+    SDL_Surface *newsurf;
+    int bpp = surf->format->BytesPerPixel;
+
+    if (bpp < 3 || bpp > 4) {
+        return (SDL_Surface *)RAISE(
+            PyExc_ValueError,
+            "Only 24-bit or 32-bit surfaces can be filtered");
+    }
+    if (!destobj) {
+        return newsurf_fromsurf(surf, surf->w, surf->h);
+    }
+    newsurf = pgSurface_AsSurface(destobj);
+    if (newsurf->w != surf->w || newsurf->h != surf->h) {
+        return (SDL_Surface *)RAISE(PyExc_ValueError,
+                                    "Destination surface not the same size.");
+    }
+    if (newsurf->format->BytesPerPixel != bpp ||
+        newsurf->format->Rmask != surf->format->Rmask ||
+        newsurf->format->Gmask != surf->format->Gmask ||
+        newsurf->format->Bmask != surf->format->Bmask ||
+        newsurf->format->Amask != surf->format->Amask) {
+        return (SDL_Surface *)RAISE(
+            PyExc_ValueError,
+            "Source and destination surfaces need the same format.");
+    }
+    return newsurf;
+}
+
+/* Hands back the destination of a filter, or frees a new destination
+ * surface and raises MemoryError if the filter failed.
+ */
+static PyObject *
+filter_result(PyObject *destobj, SDL_Surface *newsurf, int result)
+{
+    if (result != 0) {
+        if (!destobj) {
+            SDL_FreeSurface(newsurf);
+        }
+        return PyErr_NoMemory();
+    }
+    if (destobj) {
+        Py_INCREF(destobj);
+        return destobj;
+    }
+    return pgSurface_New(newsurf);
+}
+
+static PyObject *
+surf_blur(PyObject *args, PyObject *kwds, int gaussian)
+{
+    PyObject *surfobj, *destobj = NULL;
+    SDL_Surface *surf, *newsurf;
+    filter_job across, down;
+    Sint16 *weights = NULL;
+    double *kernel;
+    int radius, repeat = 1, threads = 1;
+    int k, result = 0;
+    static char *keywords[] = {"surface",      "radius", "repeat_edge_pixels",
+                               "dest_surface", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!i|iO!i", keywords,
+                                     &pgSurface_Type, &surfobj, &radius,
+                                     &repeat, &pgSurface_Type, &destobj,
+                                     &threads))
+        return NULL;
+
+    if (radius < 0 || radius > FILTER_MAX_RADIUS)
+        return RAISE(PyExc_ValueError, "radius must be from 0 to 65535");
+    threads = filter_thread_count(threads);
+    if (threads < 0)
+        return NULL;
+
+    surf = pgSurface_AsSurface(surfobj);
+    newsurf = filter_dest_surface(surf, destobj);
+    if (!newsurf)
+        return NULL;
+    if (surf->w == 0 || surf->h == 0) {
+        /* no pixels, and no edge pixels to repeat */
+        return filter_result(destobj, newsurf, 0);
+    }
+
+    filter_job_init(&across, gaussian ? filter_rows : box_rows, surf, repeat);
+    filter_job_init(&down, gaussian ? filter_columns : box_columns, surf,
+                    repeat);
+    across.radius = down.radius = radius;
+    if (gaussian && radius > 0) {
+        /* a normal curve cut off at two standard deviations */
+        double sigma = radius / 2.0, sum = 0.0;
+        int n = radius * 2 + 1;
+
+        kernel = (double *)malloc(n * sizeof(double));
+        weights = (Sint16 *)malloc(n * sizeof(Sint16));
+        if (!kernel || !weights) {
+            free(kernel);
+            free(weights);
+            return filter_result(destobj, newsurf, -1);
+        }
+        for (k = 0; k < n; k++) {
+            kernel[k] = exp(-(k - radius) * (k - radius) /
+                            (2.0 * sigma * sigma));
+            sum += kernel[k];
+        }
+        for (k = 0; k < n; k++) {
+            kernel[k] /= sum;
+        }
+        across.shift = down.shift = filter_weights(kernel, n, weights, 1);
+        across.weights = down.weights = weights;
+        across.taps = down.taps = n;
+        free(kernel);
+        if (across.shift < 0) {
+            /* too many taps for the weights to add up in 16 bits */
+            free(weights);
+            if (!destobj)
+                SDL_FreeSurface(newsurf);
+            return RAISE(PyExc_ValueError,
+                         "radius is too big for a gaussian blur");
+        }
+    }
+
+    pgSurface_Lock(surfobj);
+    lock_dest_surface(destobj, newsurf);
+    Py_BEGIN_ALLOW_THREADS;
+    if (radius == 0) {
+        if (newsurf->pixels != surf->pixels) {
+            for (k = 0; k < surf->h; k++) {
+                memcpy((Uint8 *)newsurf->pixels + k * newsurf->pitch,
+                       (Uint8 *)surf->pixels + k * surf->pitch,
+                       surf->w * surf->format->BytesPerPixel);
+            }
+        }
+    }
+    else {
+        result = filter_two_passes(surf, newsurf, &across, &down, threads);
+    }
+    Py_END_ALLOW_THREADS;
+    unlock_dest_surface(destobj, newsurf);
+    pgSurface_Unlock(surfobj);
+
+    free(weights);
+    return filter_result(destobj, newsurf, result);
+}
+
+static PyObject *
+surf_box_blur(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    return surf_blur(args, kwds, 0);
+}
+
+static PyObject *
+surf_gaussian_blur(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    return surf_blur(args, kwds, 1);
+}
+
+/* Gets a 2D kernel of rows by cols values from a sequence of rows.
+ * Returns NULL with an exception set on failure.
+ */
+static double *
+filter_kernel_from_obj(PyObject *obj, int *rows, int *cols)
+{
+    PyObject *seq, *row = NULL;
+    double *kernel = NULL;
+    Py_ssize_t y, x, nrows, ncols = 0;
+
+    seq = PySequence_Fast(obj, "kernel must be a sequence of rows");
+    if (!seq)
+        return NULL;
+    nrows = PySequence_Fast_GET_SIZE(seq);
+    for (y = 0; y < nrows; y++) {
+        row = PySequence_Fast(PySequence_Fast_GET_ITEM(seq, y),
+                              "kernel rows must be sequences of numbers");
+        if (!row)
+            goto fail;
+        if (y == 0) {
+            ncols = PySequence_Fast_GET_SIZE(row);
+            if (ncols == 0 || nrows * ncols > 0x10000) {
+                RAISE(PyExc_ValueError,
+                      "kernel must have from 1 to 65536 values");
+                goto fail;
+            }
+            kernel = (double *)malloc(nrows * ncols * sizeof(double));
+            if (!kernel) {
+                PyErr_NoMemory();
+                goto fail;
+            }
+        }
+        else if (PySequence_Fast_GET_SIZE(row) != ncols) {
+            RAISE(PyExc_ValueError, "kernel rows must all be the same length");
+            goto fail;
+        }
+        for (x = 0; x < ncols; x++) {
+            kernel[y * ncols + x] =
+                PyFloat_AsDouble(PySequence_Fast_GET_ITEM(row, x));
+            if (kernel[y * ncols + x] == -1.0 && PyErr_Occurred())
+                goto fail;
+        }
+        Py_DECREF(row);
+        row = NULL;
+    }
+    Py_DECREF(seq);
+    if (!kernel) {
+        return (double *)RAISE(PyExc_ValueError,
+                               "kernel must have from 1 to 65536 values");
+    }
+    *rows = (int)nrows;
+    *cols = (int)ncols;
+    return kernel;
+
+fail:
+    Py_XDECREF(row);
+    Py_DECREF(seq);
+    free(kernel);
+    return NULL;
+}
+
+static PyObject *
+surf_convolve(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    PyObject *surfobj, *kernelobj, *destobj = NULL;
+    SDL_Surface *surf, *newsurf;
+    filter_job across, down;
+    double *kernel, *factors;
+    Sint16 *weights;
+    int rows, cols, separable, repeat = 1, threads = 1;
+    int result;
+    static char *keywords[] = {"surface",      "kernel",  "repeat_edge_pixels",
+                               "dest_surface", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!O|iO!i", keywords,
+                                     &pgSurface_Type, &surfobj, &kernelobj,
+                                     &repeat, &pgSurface_Type, &destobj,
+                                     &threads))
+        return NULL;
+
+    threads = filter_thread_count(threads);
+    if (threads < 0)
+        return NULL;
+    surf = pgSurface_AsSurface(surfobj);
+    kernel = filter_kernel_from_obj(kernelobj, &rows, &cols);
+    if (!kernel)
+        return NULL;
+    factors = (double *)malloc((rows + cols) * sizeof(double));
+    weights = (Sint16 *)malloc((rows * cols + rows + cols) * sizeof(Sint16));
+    if (!factors || !weights) {
+        free(kernel);
+        free(factors);
+        free(weights);
+        return PyErr_NoMemory();
+    }
+
+    filter_job_init(&across, filter_rows, surf, repeat);
+    filter_job_init(&down, filter_columns, surf, repeat);
+    separable =
+        filter_split_kernel(kernel, rows, cols, factors, factors + rows);
+    if (separable) {
+        down.weights = weights;
+        down.taps = rows;
+        down.shift = filter_weights(factors, rows, down.weights, 0);
+        across.weights = weights + rows;
+        across.taps = cols;
+        across.shift = filter_weights(factors + rows, cols, across.weights, 1);
+    }
+    else {
+        across.pass = filter_2d;
+        across.weights = weights;
+        across.taps = cols;
+        across.rows = rows;
+        across.shift = filter_weights(kernel, rows * cols, weights, 0);
+    }
+    free(kernel);
+    free(factors);
+    if (across.shift < 0 || down.shift < 0) {
+        free(weights);
+        return RAISE(PyExc_ValueError, "kernel values are too big");
+    }
+
+    newsurf = filter_dest_surface(surf, destobj);
+    if (!newsurf) {
+        free(weights);
+        return NULL;
+    }
+    if (surf->w == 0 || surf->h == 0) {
+        free(weights);
+        return filter_result(destobj, newsurf, 0);
+    }
+
+    pgSurface_Lock(surfobj);
+    lock_dest_surface(destobj, newsurf);
+    Py_BEGIN_ALLOW_THREADS;
+    if (separable)
+        result = filter_two_passes(surf, newsurf, &across, &down, threads);
+    else
+        result = filter_surface_2d(surf, newsurf, &across, threads);
+    Py_END_ALLOW_THREADS;
+    unlock_dest_surface(destobj, newsurf);
+    pgSurface_Unlock(surfobj);
+
+    free(weights);
+    return filter_result(destobj, newsurf, result);
+}
+
 int
 average_surfaces(SDL_Surface **surfaces, int num_surfaces,
                  SDL_Surface *destsurf, int palette_colors)
@@ -2540,13 +4038,13 @@ surf_average_surfaces(PyObject *self, PyObject *arg)
     if (!an_error) {
         /* Process images, get average surface. */
 
-        SDL_LockSurface(newsurf);
+        lock_dest_surface(surfobj2, newsurf);
 
         Py_BEGIN_ALLOW_THREADS;
         average_surfaces(surfaces, size, newsurf, palette_colors);
         Py_END_ALLOW_THREADS;
 
-        SDL_UnlockSurface(newsurf);
+        unlock_dest_surface(surfobj2, newsurf);
 
         if (surfobj2) {
             Py_INCREF(surfobj2);
@@ -2574,6 +4072,82 @@ surf_average_surfaces(PyObject *self, PyObject *arg)
     return ret;
 }
 
+/* Gets the byte of each pixel which holds the channel of mask, or -1 if the
+ * channel is not a whole byte.
+ */
+static int
+_average_byte_offset(Uint32 mask, Uint8 shift, int bpp)
+{
+    if ((mask >> shift) != 0xFF || shift % 8)
+        return -1;
+#if SDL_BYTEORDER == SDL_LIL_ENDIAN
+    return shift >> 3;
+#else
+    return bpp - 1 - (shift >> 3);
+#endif
+}
+
+/* Adds up each byte of the 24 or 32 bit pixels in an area, in totals[bpp].
+ */
+static void
+_average_sum_bytes(SDL_Surface *surf, int x, int y, int width, int height,
+                   Uint64 *totals)
+{
+    int bpp = surf->format->BytesPerPixel;
+    int row, col, i;
+
+    for (i = 0; i < bpp; i++)
+        totals[i] = 0;
+    for (row = y; row < y + height; row++) {
+        Uint8 *pixels = (Uint8 *)surf->pixels + row * surf->pitch + x * bpp;
+        Uint32 sums[4] = {0, 0, 0, 0};
+
+        col = 0;
+#if defined(TRANSFORM_SSE2)
+        if (bpp == 4) {
+            /* sum each byte of 4 pixels at a time, with a mask for the byte
+               and a sum of absolute differences against 0 */
+            __m128i sums[4], masks[4], zero = _mm_setzero_si128();
+
+            for (i = 0; i < 4; i++) {
+                sums[i] = zero;
+                masks[i] = _mm_set1_epi32(0xFF << (i * 8));
+            }
+            for (; col + 4 <= width; col += 4, pixels += 16) {
+                __m128i four = _mm_loadu_si128((const __m128i *)pixels);
+
+                for (i = 0; i < 4; i++) {
+                    sums[i] = _mm_add_epi64(
+                        sums[i],
+                        _mm_sad_epu8(_mm_and_si128(four, masks[i]), zero));
+                }
+            }
+            for (i = 0; i < 4; i++) {
+                Uint64 halves[2];
+
+                _mm_storeu_si128((__m128i *)halves, sums[i]);
+                totals[i] += halves[0] + halves[1];
+            }
+        }
+#endif /* TRANSFORM_SSE2 */
+        if (bpp == 3) {
+            for (; col < width; col++, pixels += 3) {
+                sums[0] += pixels[0];
+                sums[1] += pixels[1];
+                sums[2] += pixels[2];
+            }
+        }
+        for (; col < width; col++, pixels += 4) {
+            sums[0] += pixels[0];
+            sums[1] += pixels[1];
+            sums[2] += pixels[2];
+            sums[3] += pixels[3];
+        }
+        for (i = 0; i < bpp; i++)
+            totals[i] += sums[i];
+    }
+}
+
 /* VS 2015 crashes when compiling this function, turning off optimisations to
  try to fix it */
 #if defined(_MSC_VER) && (_MSC_VER == 1900)
@@ -2585,14 +4159,18 @@ average_color(SDL_Surface *surf, int x, int y, int width, int height, Uint8 *r,
               Uint8 *g, Uint8 *b, Uint8 *a)
 {
     Uint32 color, rmask, gmask, bmask, amask;
-    Uint8 *pixels, *pix;
-    unsigned int rtot, gtot, btot, atot, size, rshift, gshift, bshift, ashift;
+    Uint8 *pixels;
+    Uint64 rtot, gtot, btot, atot, size;
+    unsigned int rshift, gshift, bshift, ashift;
     unsigned int rloss, gloss, bloss, aloss;
-    int row, col, width_and_x, height_and_y;
+    int row, col, width_and_x, height_and_y, i;
+    int offsets[4];
+    Uint8 bpp;
 
     SDL_PixelFormat *format;
 
     format = surf->format;
+    bpp = format->BytesPerPixel;
     rmask = format->Rmask;
     gmask = format->Gmask;
     bmask = format->Bmask;
@@ -2608,89 +4186,121 @@ average_color(SDL_Surface *surf, int x, int y, int width, int height, Uint8 *r,
     rtot = gtot = btot = atot = 0;
 
     /* make sure the area specified is within the Surface */
-    if ((x + width) > surf->w)
-        width = surf->w - x;
-    if ((y + height) > surf->h)
-        height = surf->h - y;
     if (x < 0) {
-        width -= (-x);
+        width += x;
         x = 0;
     }
     if (y < 0) {
-        height -= (-y);
+        height += y;
         y = 0;
     }
+    if (width > surf->w - x)
+        width = surf->w - x;
+    if (height > surf->h - y)
+        height = surf->h - y;
+    if (width <= 0 || height <= 0) {
+        *r = *g = *b = *a = 0;
+        return;
+    }
 
-    size = width * height;
+    size = (Uint64)width * height;
     width_and_x = width + x;
     height_and_y = height + y;
 
-    switch (format->BytesPerPixel) {
+    switch (bpp) {
         case 1:
             {
-                Uint8 color8;
+                /* count each value, then add up the colors of the values.
+                   Counting in four tables keeps runs of one value fast. */
+                Uint64 counts[4][256], count;
+                Uint8 rgba[4];
+
+                memset(counts, 0, sizeof(counts));
                 for (row = y; row < height_and_y; row++) {
                     pixels = (Uint8 *)surf->pixels + row * surf->pitch + x;
-                    for (col = x; col < width_and_x; col++) {
-                        color8 = *(Uint8 *)pixels;
-                        rtot += ((color8 & rmask) >> rshift) << rloss;
-                        gtot += ((color8 & gmask) >> gshift) << gloss;
-                        btot += ((color8 & bmask) >> bshift) << bloss;
-                        atot += ((color8 & amask) >> ashift) << aloss;
-                        pixels++;
+                    for (col = 0; col + 4 <= width; col += 4, pixels += 4) {
+                        counts[0][pixels[0]]++;
+                        counts[1][pixels[1]]++;
+                        counts[2][pixels[2]]++;
+                        counts[3][pixels[3]]++;
                     }
+                    for (; col < width; col++)
+                        counts[0][*pixels++]++;
+                }
+                for (i = 0; i < 256; i++) {
+                    count = counts[0][i] + counts[1][i] + counts[2][i] +
+                            counts[3][i];
+                    if (!count)
+                        continue;
+                    if (format->palette) {
+                        SDL_GetRGBA(i, format, rgba, rgba + 1, rgba + 2,
+                                    rgba + 3);
+                    }
+                    else {
+                        rgba[0] = ((i & rmask) >> rshift) << rloss;
+                        rgba[1] = ((i & gmask) >> gshift) << gloss;
+                        rgba[2] = ((i & bmask) >> bshift) << bloss;
+                        rgba[3] = ((i & amask) >> ashift) << aloss;
+                    }
+                    rtot += count * rgba[0];
+                    gtot += count * rgba[1];
+                    btot += count * rgba[2];
+                    atot += count * rgba[3];
                 }
             }
             break;
         case 2:
             for (row = y; row < height_and_y; row++) {
+                Uint32 rsum = 0, gsum = 0, bsum = 0, asum = 0;
+
                 pixels = (Uint8 *)surf->pixels + row * surf->pitch + x * 2;
                 for (col = x; col < width_and_x; col++) {
                     color = (Uint32) * ((Uint16 *)pixels);
-                    rtot += ((color & rmask) >> rshift) << rloss;
-                    gtot += ((color & gmask) >> gshift) << gloss;
-                    btot += ((color & bmask) >> bshift) << bloss;
-                    atot += ((color & amask) >> ashift) << aloss;
+                    rsum += ((color & rmask) >> rshift) << rloss;
+                    gsum += ((color & gmask) >> gshift) << gloss;
+                    bsum += ((color & bmask) >> bshift) << bloss;
+                    asum += ((color & amask) >> ashift) << aloss;
                     pixels += 2;
                 }
+                rtot += rsum;
+                gtot += gsum;
+                btot += bsum;
+                atot += asum;
             }
             break;
-        case 3:
-            for (row = y; row < height_and_y; row++) {
-                pixels = (Uint8 *)surf->pixels + row * surf->pitch + x * 3;
-                for (col = x; col < width_and_x; col++) {
-                    pix = pixels;
-#if SDL_BYTEORDER == SDL_LIL_ENDIAN
-                    color = (pix[0]) + (pix[1] << 8) + (pix[2] << 16);
-#else
-                    color = (pix[2]) + (pix[1] << 8) + (pix[0] << 16);
-#endif
-                    rtot += ((color & rmask) >> rshift) << rloss;
-                    gtot += ((color & gmask) >> gshift) << gloss;
-                    btot += ((color & bmask) >> bshift) << bloss;
-                    atot += ((color & amask) >> ashift) << aloss;
-                    pixels += 3;
-                }
+        default: /* case 3 and 4: */
+            offsets[0] = _average_byte_offset(rmask, rshift, bpp);
+            offsets[1] = _average_byte_offset(gmask, gshift, bpp);
+            offsets[2] = _average_byte_offset(bmask, bshift, bpp);
+            offsets[3] = amask ? _average_byte_offset(amask, ashift, bpp) : 0;
+            if (offsets[0] >= 0 && offsets[1] >= 0 && offsets[2] >= 0 &&
+                offsets[3] >= 0) {
+                /* every channel is a byte, so add up the bytes */
+                Uint64 totals[4];
+
+                _average_sum_bytes(surf, x, y, width, height, totals);
+                rtot = totals[offsets[0]];
+                gtot = totals[offsets[1]];
+                btot = totals[offsets[2]];
+                atot = amask ? totals[offsets[3]] : 0;
+                break;
             }
-            break;
-        default: /* case 4: */
             for (row = y; row < height_and_y; row++) {
-                pixels = (Uint8 *)surf->pixels + row * surf->pitch + x * 4;
+                pixels = (Uint8 *)surf->pixels + row * surf->pitch + x * bpp;
                 for (col = x; col < width_and_x; col++) {
-                    color = *(Uint32 *)pixels;
+                    pixels = _get_color_move_pixels(bpp, pixels, &color);
                     rtot += ((color & rmask) >> rshift) << rloss;
                     gtot += ((color & gmask) >> gshift) << gloss;
                     btot += ((color & bmask) >> bshift) << bloss;
                     atot += ((color & amask) >> ashift) << aloss;
-                    pixels += 4;
                 }
             }
             break;
     }
-    *r = rtot / size;
-    *g = gtot / size;
-    *b = btot / size;
-    *a = atot / size;
+    *r = (Uint8)(rtot / size);
+    *g = (Uint8)(gtot / size);
+    *b = (Uint8)(btot / size);
+    *a = (Uint8)(atot / size);
 }
 
 /* Optimisation was only disabled for one function - see above */
@@ -2699,41 +4309,107 @@ average_color(SDL_Surface *surf, int x, int y, int width, int height, Uint8 *r,
 #endif
 
 static PyObject *
-surf_average_color(PyObject *self, PyObject *arg)
+surf_average_color(PyObject *self, PyObject *args, PyObject *kwds)
 {
-    PyObject *surfobj, *rectobj = NULL;
+    PyObject *surfobj, *rectobj = NULL, *rectsobj = NULL, *seq, *ret;
     SDL_Surface *surf;
-    GAME_Rect *rect, temp;
-    Uint8 r, g, b, a;
-    int x, y, w, h;
-
-    if (!PyArg_ParseTuple(arg, "O!|O", &pgSurface_Type, &surfobj, &rectobj))
+    GAME_Rect *rect, *rects, temp;
+    Uint8 *colors;
+    Py_ssize_t count, i;
+    static char *kwlist[] = {"surface", "rect", "rects", 0};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!|OO", kwlist,
+                                     &pgSurface_Type, &surfobj, &rectobj,
+                                     &rectsobj))
         return NULL;
 
     surf = pgSurface_AsSurface(surfobj);
-    pgSurface_Lock(surfobj);
 
-    if (!rectobj) {
-        x = 0;
-        y = 0;
-        w = surf->w;
-        h = surf->h;
+    if (rectsobj && rectsobj != Py_None) {
+        if (rectobj && rectobj != Py_None)
+            return RAISE(PyExc_TypeError,
+                         "if rects is used, rect should be None");
+        seq = PySequence_Fast(rectsobj, "rects must be a sequence of rects");
+        if (!seq)
+            return NULL;
+        count = PySequence_Fast_GET_SIZE(seq);
     }
     else {
-        if (!(rect = pgRect_FromObject(rectobj, &temp)))
+        seq = NULL;
+        count = 1;
+    }
+
+    rects = PyMem_New(GAME_Rect, count);
+    colors = PyMem_New(Uint8, count * 4);
+    if (!rects || !colors) {
+        Py_XDECREF(seq);
+        PyMem_Free(rects);
+        PyMem_Free(colors);
+        return PyErr_NoMemory();
+    }
+
+    if (seq) {
+        for (i = 0; i < count; i++) {
+            rect = pgRect_FromObject(PySequence_Fast_GET_ITEM(seq, i),
+                                     rects + i);
+            if (!rect) {
+                Py_DECREF(seq);
+                PyMem_Free(rects);
+                PyMem_Free(colors);
+                return RAISE(PyExc_TypeError,
+                             "rects must be a sequence of rects");
+            }
+            rects[i] = *rect;
+        }
+        Py_DECREF(seq);
+    }
+    else if (rectobj && rectobj != Py_None) {
+        if (!(rect = pgRect_FromObject(rectobj, &temp))) {
+            PyMem_Free(rects);
+            PyMem_Free(colors);
             return RAISE(PyExc_TypeError, "Rect argument is invalid");
-        x = rect->x;
-        y = rect->y;
-        w = rect->w;
-        h = rect->h;
+        }
+        rects[0] = *rect;
+    }
+    else {
+        rects[0].x = 0;
+        rects[0].y = 0;
+        rects[0].w = surf->w;
+        rects[0].h = surf->h;
     }
 
+    pgSurface_Lock(surfobj);
     Py_BEGIN_ALLOW_THREADS;
-    average_color(surf, x, y, w, h, &r, &g, &b, &a);
+    for (i = 0; i < count; i++) {
+        average_color(surf, rects[i].x, rects[i].y, rects[i].w, rects[i].h,
+                      colors + i * 4, colors + i * 4 + 1, colors + i * 4 + 2,
+                      colors + i * 4 + 3);
+    }
     Py_END_ALLOW_THREADS;
-
     pgSurface_Unlock(surfobj);
-    return Py_BuildValue("(bbbb)", r, g, b, a);
+    PyMem_Free(rects);
+
+    if (!seq) {
+        ret = Py_BuildValue("(bbbb)", colors[0], colors[1], colors[2],
+                            colors[3]);
+        PyMem_Free(colors);
+        return ret;
+    }
+
+    ret = PyList_New(count);
+    for (i = 0; ret && i < count; i++) {
+        PyObject *color = Py_BuildValue("(bbbb)", colors[i * 4],
+                                        colors[i * 4 + 1], colors[i * 4 + 2],
+                                        colors[i * 4 + 3]);
+        if (!color) {
+            Py_DECREF(ret);
+            ret = NULL;
+            break;
+        }
+        PyList_SET_ITEM(ret, i, color);
+    }
+    PyMem_Free(colors);
+    return ret;
 }
 
 static PyMethodDef _transform_methods[] = {
@@ -2742,9 +4418,12 @@ static PyMethodDef _transform_methods[] = {
     {"flip", surf_flip, METH_VARARGS, DOC_PYGAMETRANSFORMFLIP},
     {"rotozoom", surf_rotozoom, METH_VARARGS, DOC_PYGAMETRANSFORMROTOZOOM},
     {"chop", surf_chop, METH_VARARGS, DOC_PYGAMETRANSFORMCHOP},
+    {"scale_by", (PyCFunction)surf_scale_by, METH_VARARGS | METH_KEYWORDS,
+     DOC_PYGAMETRANSFORMSCALEBY},
     {"scale2x", surf_scale2x, METH_VARARGS, DOC_PYGAMETRANSFORMSCALE2X},
-    {"smoothscale", surf_scalesmooth, METH_VARARGS,
-     DOC_PYGAMETRANSFORMSMOOTHSCALE},
+    {"scale3x", surf_scale3x, METH_VARARGS, DOC_PYGAMETRANSFORMSCALE3X},
+    {"smoothscale", (PyCFunction)surf_scalesmooth,
+     METH_VARARGS | METH_KEYWORDS, DOC_PYGAMETRANSFORMSMOOTHSCALE},
     {"get_smoothscale_backend", surf_get_smoothscale_backend,
      METH_NOARGS, DOC_PYGAMETRANSFORMGETSMOOTHSCALEBACKEND},
     {"set_smoothscale_backend", (PyCFunction)surf_set_smoothscale_backend,
@@ -2752,9 +4431,16 @@ static PyMethodDef _transform_methods[] = {
     {"threshold", (PyCFunction)surf_threshold, METH_VARARGS | METH_KEYWORDS,
      DOC_PYGAMETRANSFORMTHRESHOLD},
     {"laplacian", surf_laplacian, METH_VARARGS, DOC_PYGAMETRANSFORMTHRESHOLD},
+    {"box_blur", (PyCFunction)surf_box_blur, METH_VARARGS | METH_KEYWORDS,
+     DOC_PYGAMETRANSFORMBOXBLUR},
+    {"gaussian_blur", (PyCFunction)surf_gaussian_blur,
+     METH_VARARGS | METH_KEYWORDS, DOC_PYGAMETRANSFORMGAUSSIANBLUR},
+    {"convolve", (PyCFunction)surf_convolve, METH_VARARGS | METH_KEYWORDS,
+     DOC_PYGAMETRANSFORMCONVOLVE},
     {"average_surfaces", surf_average_surfaces, METH_VARARGS,
      DOC_PYGAMETRANSFORMAVERAGESURFACES},
-    {"average_color", surf_average_color, METH_VARARGS,
+    {"average_color", (PyCFunction)surf_average_color,
+     METH_VARARGS | METH_KEYWORDS,
      DOC_PYGAMETRANSFORMAVERAGECOLOR},
 
     {NULL, NULL, 0, NULL}};
@@ -84,6 +84,7 @@ class MissingModule:
     _NOT_IMPLEMENTED_ = True
 
     def __init__(self, name, urgent=0):
+        import sys
         self.name = name
         exc_type, exc_msg = sys.exc_info()[:2]
         self.info = str(exc_msg)
@@ -120,7 +121,7 @@ class MissingModule:
 from pygame.base import *
 from pygame.constants import *
 from pygame.version import *
-from pygame.rect import Rect
+from pygame.rect import Rect, Region
 from pygame.compat import PY_MAJOR_VERSION
 from pygame.rwobject import encode_string, encode_file_path
 import pygame.surflock
@@ -136,67 +137,113 @@ __version__ = ver
 
 # next, the "standard" modules
 # we still allow them to be missing for stripped down pygame distributions
+_standard_modules = ['cursors', 'display', 'draw', 'event', 'image',
+                     'joystick', 'key', 'mouse', 'sprite', 'threads',
+                     'pixelcopy']
 if get_sdl_version() < (2, 0, 0):
     # cdrom only available for SDL 1.2.X
-    try:
-        import pygame.cdrom
-    except (ImportError, IOError):
-        cdrom = MissingModule("cdrom", urgent=1)
-
-try:
-    import pygame.cursors
-except (ImportError, IOError):
-    cursors = MissingModule("cursors", urgent=1)
-
-try:
-    import pygame.display
-except (ImportError, IOError):
-    display = MissingModule("display", urgent=1)
-
-try:
-    import pygame.draw
-except (ImportError, IOError):
-    draw = MissingModule("draw", urgent=1)
+    _standard_modules.insert(0, 'cdrom')
 
-try:
-    import pygame.event
-except (ImportError, IOError):
-    event = MissingModule("event", urgent=1)
+# and the "optional" pygame modules, which only warn when they are used
+_optional_modules = ['mixer', 'movie', 'scrap', 'surfarray', 'sndarray',
+                     'fastevent']
 
-try:
-    import pygame.image
-except (ImportError, IOError):
-    image = MissingModule("image", urgent=1)
 
-try:
-    import pygame.joystick
-except (ImportError, IOError):
-    joystick = MissingModule("joystick", urgent=1)
+def _import_submodule(name, urgent, missing=MissingModule):
+    """import pygame.name, or put a MissingModule in its place"""
+    import importlib
+    import os
+    import sys
 
-try:
-    import pygame.key
-except (ImportError, IOError):
-    key = MissingModule("key", urgent=1)
-
-try:
-    import pygame.mouse
-except (ImportError, IOError):
-    mouse = MissingModule("mouse", urgent=1)
-
-try:
-    import pygame.sprite
-except (ImportError, IOError):
-    sprite = MissingModule("sprite", urgent=1)
-
-try:
-    import pygame.threads
-except (ImportError, IOError):
-    threads = MissingModule("threads", urgent=1)
+    if name == 'sprite' and 'PYGAME_CYTHON_SPRITE' in os.environ:
+        # the Cython sprite module is opt in, like ftfont for font
+        try:
+            sys.modules['pygame.sprite'] = importlib.import_module(
+                'pygame._sprite')
+        except (ImportError, IOError):
+            pass
+    elif name == 'mixer':
+        # try and load pygame.mixer_music before mixer, for py2app...
+        try:
+            importlib.import_module('pygame.mixer_music')
+        except (ImportError, IOError):
+            pass
 
-try:
-    import pygame.pixelcopy
-except (ImportError, IOError):
-    pixelcopy = MissingModule("pixelcopy", urgent=1)
+    try:
+        module = importlib.import_module('pygame.' + name)
+    except (ImportError, IOError):
+        module = missing(name, urgent=urgent)
+    globals()[name] = module
+    return module
+
+
+# PYGAME_LAZY_IMPORT leaves the standard and optional modules to be
+# imported the first time they are used, as pygame.display and so on, which
+# makes "import pygame" much quicker. This needs module __getattr__ from
+# python 3.7, older pythons import everything as usual.
+_lazy_modules = {}
+if 'PYGAME_LAZY_IMPORT' in os.environ and sys.version_info >= (3, 7):
+    from importlib.machinery import PathFinder as _PathFinder
+
+    for _name in _standard_modules + ['time']:
+        _lazy_modules[_name] = 1
+    for _name in _optional_modules:
+        _lazy_modules[_name] = 0
+
+    class _InitLoader(object):
+        """runs a module, then starts it if pygame.init() was called"""
+
+        def __init__(self, loader):
+            self.loader = loader
+
+        def __getattr__(self, name):
+            return getattr(self.loader, name)
+
+        def create_module(self, spec):
+            return self.loader.create_module(spec)
+
+        def exec_module(self, module):
+            self.loader.exec_module(module)
+            # pygame.init() has only started the modules imported before
+            # it, and get_init() says whether it was called since quit()
+            init = module.__dict__.get('__PYGAMEinit__')
+            if init is not None and get_init():
+                try:
+                    init()
+                except error:
+                    pass
+
+    class _LazyFinder(object):
+        """finds the lazy modules, for every way they can be imported:
+        pygame.name, import pygame.name, or from another module"""
+
+        @staticmethod
+        def find_spec(fullname, path, target=None):
+            package, _, name = fullname.partition('.')
+            if package != 'pygame' or name not in _lazy_modules:
+                return None
+            spec = _PathFinder.find_spec(fullname, path)
+            if spec is not None and spec.loader is not None:
+                spec.loader = _InitLoader(spec.loader)
+            return spec
+
+    sys.meta_path.insert(0, _LazyFinder)
+
+    def __getattr__(name):
+        try:
+            urgent = _lazy_modules[name]
+        except KeyError:
+            raise AttributeError("module 'pygame' has no attribute '%s'"
+                                 % name)
+        module = _import_submodule(name, urgent)
+        _lazy_modules.pop(name, None)
+        return module
+
+    def __dir__():
+        return sorted(set(globals()) | set(_lazy_modules))
+else:
+    for _name in _standard_modules:
+        _import_submodule(_name, 1)
 
 
 def warn_unwanted_files():
@@ -275,17 +322,19 @@ try:
 except (ImportError, IOError):
     Overlay = lambda: Missing_Function
 
-try:
-    import pygame.time
-except (ImportError, IOError):
-    time = MissingModule("time", urgent=1)
+if 'time' not in _lazy_modules:
+    _import_submodule('time', 1)
 
 try:
     import pygame.transform
+    import pygame.rotationcache
+    pygame.transform.RotationCache = pygame.rotationcache.RotationCache
+    pygame.transform.rotation_atlas = pygame.rotationcache.rotation_atlas
 except (ImportError, IOError):
     transform = MissingModule("transform", urgent=1)
 
 # lastly, the "optional" pygame modules
+# font is always imported, since SysFont and friends are added to it
 if 'PYGAME_FREETYPE' in os.environ:
     try:
         import pygame.ftfont as font
@@ -298,60 +347,28 @@ try:
     pygame.font.SysFont = pygame.sysfont.SysFont
     pygame.font.get_fonts = pygame.sysfont.get_fonts
     pygame.font.match_font = pygame.sysfont.match_font
+    pygame.font.update_font_index = pygame.sysfont.update_font_index
 except (ImportError, IOError):
     font = MissingModule("font", urgent=0)
 
-# try and load pygame.mixer_music before mixer, for py2app...
-try:
-    import pygame.mixer_music
-    #del pygame.mixer_music
-    #print ("NOTE2: failed importing pygame.mixer_music in lib/__init__.py")
-except (ImportError, IOError):
-    pass
-
-try:
-    import pygame.mixer
-except (ImportError, IOError):
-    mixer = MissingModule("mixer", urgent=0)
-
-try:
-    import pygame.movie
-except (ImportError, IOError):
-    movie = MissingModule("movie", urgent=0)
+for _name in _optional_modules:
+    if _name not in _lazy_modules:
+        _import_submodule(_name, 0)
 
 # try:
 #     import pygame.movieext
 # except (ImportError,IOError):
 #     movieext=MissingModule("movieext", urgent=0)
 
-try:
-    import pygame.scrap
-except (ImportError, IOError):
-    scrap = MissingModule("scrap", urgent=0)
-
-try:
-    import pygame.surfarray
-except (ImportError, IOError):
-    surfarray = MissingModule("surfarray", urgent=0)
-
-try:
-    import pygame.sndarray
-except (ImportError, IOError):
-    sndarray = MissingModule("sndarray", urgent=0)
-
-try:
-    import pygame.fastevent
-except (ImportError, IOError):
-    fastevent = MissingModule("fastevent", urgent=0)
-
 # there's also a couple "internal" modules not needed
 # by users, but putting them here helps "dependency finder"
 # programs get everything they need (like py2exe)
-try:
-    import pygame.imageext
-    del pygame.imageext
-except (ImportError, IOError):
-    pass
+if not _lazy_modules:
+    try:
+        import pygame.imageext
+        del pygame.imageext
+    except (ImportError, IOError):
+        pass
 
 
 def packager_imports():
@@ -363,6 +380,27 @@ def packager_imports():
     import pygame.bufferproxy
     import pygame.colordict
     import pygame._view
+    import pygame.cdrom
+    import pygame.cursors
+    import pygame.display
+    import pygame.draw
+    import pygame.event
+    import pygame.image
+    import pygame.joystick
+    import pygame.key
+    import pygame.mouse
+    import pygame.sprite
+    import pygame._sprite
+    import pygame.threads
+    import pygame.pixelcopy
+    import pygame.time
+    import pygame.mixer_music
+    import pygame.mixer
+    import pygame.movie
+    import pygame.scrap
+    import pygame.surfarray
+    import pygame.sndarray
+    import pygame.fastevent
 
 # make Rects pickleable
 if PY_MAJOR_VERSION >= 3:
@@ -402,3 +440,4 @@ if 'PYGAME_HIDE_SUPPORT_PROMPT' not in os.environ:
 
 # cleanup namespace
 del pygame, os, sys, surflock, MissingModule, copy_reg, PY_MAJOR_VERSION
+del _standard_modules, _optional_modules, _name
@@ -43,3 +43,133 @@ def SysFont(name, size, bold=0, italic=0, constructor=None):
             return font
 
     return _SysFont(name, size, bold, italic, constructor)
+
+
+class TextAtlas(object):
+    """TextAtlas(font, size=(1024, 1024)) -> TextAtlas
+
+    keeps rendered strings on one surface, to draw many labels at once.
+    """
+
+    def __init__(self, font, size=(1024, 1024)):
+        import pygame.surface
+        from pygame.constants import SRCALPHA
+
+        self.font = font
+        self.surface = pygame.surface.Surface(size, SRCALPHA, 32)
+        self.hits = 0
+        self.misses = 0
+        # (text, fgcolor, style, rotation, size, font settings)
+        #   -> (area, offset)
+        self._entries = {}
+        # the shelf strings are being put on: its top, height and free x
+        self._shelf = [0, 0, 0]
+        # counts clear() calls, which make earlier areas invalid
+        self._generation = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """clear() -> None
+        forget every string, and empty the atlas surface
+        """
+        self._entries.clear()
+        self._shelf = [0, 0, 0]
+        self._generation += 1
+        self.surface.fill((0, 0, 0, 0))
+
+    def _place(self, w, h):
+        """the top left of a free w by h area, or None if the atlas is full"""
+        width, height = self.surface.get_size()
+        top, shelf_h, x = self._shelf
+        if x + w > width:
+            top, shelf_h, x = top + shelf_h, 0, 0
+        if top + h > height or w > width:
+            return None
+        self._shelf = [top, max(shelf_h, h), x + w]
+        return x, top
+
+    def _font_state(self):
+        """the font color, and the font settings rendered strings depend on"""
+        font = self.font
+        return (tuple(font.fgcolor),
+                (font.antialiased, font.kerning, font.pad, font.strength,
+                 font.origin, font.vertical, font.underline_adjustment,
+                 font.style, font.size))
+
+    def get(self, text, fgcolor=None, style=STYLE_DEFAULT, rotation=0,
+            size=0):
+        """get(text, fgcolor=None, style=STYLE_DEFAULT, rotation=0, size=0) -> (Rect, (x, y))
+        the area of the atlas surface holding a string, and its offset
+        """
+        return self._get(text, fgcolor, style, rotation, size,
+                         self._font_state())
+
+    def _get(self, text, fgcolor, style, rotation, size, font_state):
+        from pygame.color import Color
+        from pygame.constants import BLEND_RGBA_ADD
+        from pygame.rect import Rect
+
+        if fgcolor is None:
+            fgcolor = font_state[0]
+        else:
+            fgcolor = tuple(Color(fgcolor))
+        key = (text, fgcolor, style, rotation, size, font_state[1])
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        image, rect = self.font.render(text, fgcolor, None, style, rotation,
+                                       size)
+        w, h = image.get_size()
+        topleft = self._place(w, h)
+        if topleft is None:
+            # start again with an empty atlas
+            self.clear()
+            topleft = self._place(w, h)
+            if topleft is None:
+                raise ValueError("text is too large for the atlas")
+        # adding to the cleared atlas copies the pixels, alpha and all
+        self.surface.blit(image, topleft, None, BLEND_RGBA_ADD)
+        if self.font.origin:
+            offset = (rect.x, -rect.y)
+        else:
+            offset = (0, 0)
+        entry = (Rect(topleft, (w, h)), offset)
+        self._entries[key] = entry
+        return entry
+
+    def render_to_many(self, surf, items, style=STYLE_DEFAULT, rotation=0,
+                       size=0):
+        """render_to_many(surf, items, style=STYLE_DEFAULT, rotation=0, size=0) -> [Rect, ...]
+        draw (dest, text, fgcolor) items with one Surface.blits call
+        """
+        # they may have to be gone through twice, below
+        items = list(items)
+        get = self._get
+        font_state = self._font_state()
+        atlas = self.surface
+        generation = self._generation
+        blits = []
+        for item in items:
+            dest = item[0]
+            area, offset = get(item[1], item[2] if len(item) > 2 else None,
+                               style, rotation, size, font_state)
+            blits.append((atlas, (dest[0] + offset[0], dest[1] + offset[1]),
+                          area))
+        if self._generation == generation:
+            return surf.blits(blits)
+
+        # the atlas filled up and was cleared, so the areas found before
+        # that are gone. Draw each string as soon as it is found instead.
+        rects = []
+        for item in items:
+            dest = item[0]
+            area, offset = get(item[1], item[2] if len(item) > 2 else None,
+                               style, rotation, size, font_state)
+            rects.append(surf.blit(atlas, (dest[0] + offset[0],
+                                           dest[1] + offset[1]), area))
+        return rects
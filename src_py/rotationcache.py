@@ -0,0 +1,219 @@
+# coding: ascii
+# pygame - Python Game Library
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Library General Public
+# License as published by the Free Software Foundation; either
+# version 2 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Library General Public License for more details.
+#
+# You should have received a copy of the GNU Library General Public
+# License along with this library; if not, write to the Free
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+"""rotationcache, used in the transform module to reuse rotated surfaces"""
+
+import math
+import weakref
+from collections import OrderedDict
+
+import pygame.transform
+from pygame.surface import Surface
+from pygame.constants import SRCALPHA, BLEND_RGBA_ADD
+
+
+def _fingerprint(surface):
+    """a value which changes when the surface pixels or settings change"""
+    # the pixel version is bumped by anything that may write the pixels,
+    # so this does not read them
+    return (surface._pixels_version, surface.get_size(),
+            surface.get_colorkey(), surface.get_alpha())
+
+
+class RotationCache(object):
+    """RotationCache(max_bytes=16777216, angle_step=1.0, check_source=True) -> RotationCache
+
+    keeps the results of transform.rotate and transform.rotozoom for reuse.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024, angle_step=1.0,
+                 check_source=True):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        if not 0 < angle_step <= 360:
+            # NaN too
+            raise ValueError("angle_step must be above 0 and at most 360")
+        self.max_bytes = max_bytes
+        self.angle_step = angle_step
+        self.check_source = check_source
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes = 0
+        # (id(surface), angle index, scale) -> (result, bytes)
+        self._entries = OrderedDict()
+        # id(surface) -> [weakref to surface, set of keys, fingerprint]
+        self._sources = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _steps(self, angle):
+        """the angle as a whole number of angle_steps, from 0 to one turn"""
+        turn = int(round(360.0 / self.angle_step))
+        return int(round(angle / self.angle_step)) % turn
+
+    def _forget_source(self, ident):
+        source = self._sources.pop(ident, None)
+        if source is not None:
+            for key in source[1]:
+                self._drop(key)
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def _source(self, surface):
+        """the record of a surface, started afresh for a new surface"""
+        ident = id(surface)
+        source = self._sources.get(ident)
+        if source is None or source[0]() is not surface:
+            # a surface which has gone may have left its id behind
+            self._forget_source(ident)
+            this = weakref.proxy(self)
+
+            def gone(ref, ident=ident):
+                try:
+                    if this._sources[ident][0] is ref:
+                        this._forget_source(ident)
+                except (ReferenceError, KeyError):
+                    pass
+
+            source = [weakref.ref(surface, gone), set(), None]
+            self._sources[ident] = source
+        return source
+
+    def _lookup(self, surface, angle, scale, transform):
+        source = self._source(surface)
+        keys = source[1]
+        if self.check_source:
+            fingerprint = _fingerprint(surface)
+            if fingerprint != source[2]:
+                # the source changed since the results were made
+                for key in keys:
+                    self._drop(key)
+                self.invalidations += len(keys)
+                keys.clear()
+                source[2] = fingerprint
+
+        key = (id(surface), self._steps(angle), scale)
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            # put it back at the most recently used end
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        result = transform(key[1] * self.angle_step)
+        if self.check_source:
+            # the transform only reads the source, but its lock bumps the
+            # version, so the other results are still good
+            source[2] = _fingerprint(surface)
+        size = result.get_pitch() * result.get_height()
+        if size > self.max_bytes:
+            return result
+        while self.bytes + size > self.max_bytes:
+            old_key, old_entry = self._entries.popitem(last=False)
+            self.bytes -= old_entry[1]
+            self._sources[old_key[0]][1].discard(old_key)
+            self.evictions += 1
+        self._entries[key] = (result, size)
+        keys.add(key)
+        self.bytes += size
+        return result
+
+    def rotate(self, surface, angle):
+        """rotate(Surface, angle) -> Surface
+        rotate an image, reusing an earlier result for the same angle
+        """
+        return self._lookup(surface, angle, None,
+                            lambda a: pygame.transform.rotate(surface, a))
+
+    def rotozoom(self, surface, angle, scale):
+        """rotozoom(Surface, angle, scale) -> Surface
+        filtered scale and rotation, reusing an earlier result
+        """
+        return self._lookup(surface, angle, float(scale),
+                            lambda a: pygame.transform.rotozoom(surface, a,
+                                                                scale))
+
+    def invalidate(self, surface=None):
+        """invalidate(Surface=None) -> None
+        forget the results for a surface, or for every surface
+        """
+        if surface is None:
+            self._entries.clear()
+            self._sources.clear()
+            self.bytes = 0
+        else:
+            self._forget_source(id(surface))
+
+    def get_stats(self):
+        """get_stats() -> dict
+        get the hit, miss and size counts of the cache
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries), 'bytes': self.bytes,
+                'max_bytes': self.max_bytes}
+
+
+def rotation_atlas(surface, count, scale=1.0, columns=None):
+    """rotation_atlas(Surface, count, scale=1.0, columns=None) -> (Surface, rects)
+
+    draws the surface at count evenly spaced angles into one surface.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    if columns is None:
+        columns = int(math.ceil(math.sqrt(count)))
+    elif columns < 1:
+        raise ValueError("columns must be at least 1")
+    rows = (count + columns - 1) // columns
+
+    if scale == 1.0:
+        images = [pygame.transform.rotate(surface, i * 360.0 / count)
+                  for i in range(count)]
+    else:
+        images = [pygame.transform.rotozoom(surface, i * 360.0 / count, scale)
+                  for i in range(count)]
+    cell_w = max(image.get_width() for image in images)
+    cell_h = max(image.get_height() for image in images)
+
+    first = images[0]
+    flags = first.get_flags() & SRCALPHA
+    atlas = Surface((cell_w * columns, cell_h * rows), flags, first)
+    colorkey = first.get_colorkey()
+    if colorkey is not None:
+        atlas.fill(colorkey)
+        atlas.set_colorkey(colorkey)
+
+    rects = []
+    for i, image in enumerate(images):
+        rect = image.get_rect()
+        rect.center = ((i % columns) * cell_w + cell_w // 2,
+                       (i // columns) * cell_h + cell_h // 2)
+        if flags:
+            # adding to the cleared atlas copies the pixels, alpha and all
+            atlas.blit(image, rect, None, BLEND_RGBA_ADD)
+        else:
+            atlas.blit(image, rect)
+        rects.append(rect)
+    return atlas, rects
@@ -87,9 +87,13 @@ Sprites are not thread safe, so lock them yourself if using threads.
 ## specialized cases.
 
 import pygame
-from pygame import Rect
+from pygame import Rect, Region
+from pygame.compat import PY_MAJOR_VERSION
 from pygame.time import get_ticks
-from operator import truth
+from array import array
+from itertools import repeat
+from operator import add, mul, truth
+from weakref import WeakKeyDictionary
 
 # Python 3 does not have the callable function, but an equivalent can be made
 # with the hasattr function.
@@ -282,6 +286,212 @@ class DirtySprite(Sprite):
             (self.__class__.__name__, len(self.groups()))
 
 
+# positions further off, infinite ones too, are clamped, so they fit in
+# the ints of a rect
+_POSITION_LIMIT = 2.0 ** 30
+
+
+def _set_rect_positions(sprites, positions):
+    """move each sprite rect to an x, y pair of the flat positions sequence"""
+    limit = _POSITION_LIMIT
+    # // rounds down, so sprites move smoothly across 0. NaN raises
+    # ValueError.
+    for i, spr in enumerate(sprites):
+        x = min(max(positions[2 * i], -limit), limit)
+        y = min(max(positions[2 * i + 1], -limit), limit)
+        spr.rect.topleft = (int(x // 1), int(y // 1))
+
+
+def _blit_sprites(surface, sprites, spritedict, dirty=None, positions=None):
+    """blit sprites at their rects, storing the blitted rects in spritedict
+
+    If dirty is not None, its add() method is called with the previous rect
+    of each sprite, unless it is empty, and with the new rect. If dirty is a
+    list, the union of the two rects is appended to it instead when they
+    overlap, or else the new rect and then the previous one.
+
+    If positions is not None, it is a flat buffer of doubles with an x, y
+    pair for each sprite. The rects are moved there, rounded down, first.
+
+    pygame Surfaces do this in a single call, unless a subclass overrides
+    blit().
+
+    """
+    if type(surface).blit is pygame.Surface.blit:
+        surface._blit_sprites(sprites, spritedict, dirty, positions)
+        return
+
+    if positions is not None:
+        _set_rect_positions(sprites, positions)
+    surface_blit = surface.blit
+    if dirty is None:
+        for spr in sprites:
+            spritedict[spr] = surface_blit(spr.image, spr.rect)
+        return
+
+    if isinstance(dirty, list):
+        dirty_append = dirty.append
+        for spr in sprites:
+            rec = spritedict[spr]
+            newrect = surface_blit(spr.image, spr.rect)
+            if rec and newrect.colliderect(rec):
+                dirty_append(newrect.union(rec))
+            else:
+                dirty_append(newrect)
+                if rec:
+                    dirty_append(rec)
+            spritedict[spr] = newrect
+        return
+
+    dirty_add = dirty.add
+    for spr in sprites:
+        rec = spritedict[spr]
+        newrect = surface_blit(spr.image, spr.rect)
+        if rec:
+            dirty_add(rec)
+        dirty_add(newrect)
+        spritedict[spr] = newrect
+
+
+# Counts the Group.update() calls, any of which may move the rect of any
+# sprite, so a spatial index checks all of its rects once after one.
+_update_count = 0
+
+def _sprites_updated():
+    """note that a group moved its sprites in update()"""
+    global _update_count
+    _update_count += 1
+
+
+class _SpatialHash(object):
+    """uniform grid of sprite rects used as a collision broadphase
+
+    Each sprite is stored in every cell its rect overlaps. A query returns
+    the sprites sharing a cell with the given rect, in the order the group
+    iterates over them, so callers still test the real rects themselves.
+
+    Sprites are ordered by layer, then by when they were added, which is
+    the order of LayeredUpdates, so the index can be kept up to date as
+    sprites join, leave and change layer. layers maps the sprites to their
+    layer, if they have one.
+
+    The rect each sprite was indexed with is kept. refresh() puts the
+    sprites marked with mark() in their new cells, or every sprite whose
+    rect changed after a Group.update(), so a query does not look at the
+    rects of sprites which have not moved.
+
+    """
+
+    def __init__(self, sprites, cell_size, layers=None):
+        self.cell_size = cell_size
+        self.order = {}
+        self.keys = {}
+        self.rects = {}
+        self.cells = {}
+        self.count = 0
+        self.dirty = set()
+        self.update_count = _update_count
+        add = self.add
+        if layers is None:
+            for spr in sprites:
+                add(spr)
+        else:
+            for spr in sprites:
+                add(spr, layers[spr])
+
+    def add(self, sprite, layer=0):
+        """index a sprite, after the others of its layer"""
+        self.order[sprite] = (layer, self.count)
+        self.count += 1
+        self._insert(sprite, sprite.rect)
+
+    def _insert(self, sprite, rect):
+        cells = self.cells
+        self.rects[sprite] = tuple(rect)
+        keys = self.keys[sprite] = list(self._cell_keys(rect))
+        for key in keys:
+            try:
+                cells[key].append(sprite)
+            except KeyError:
+                cells[key] = [sprite]
+
+    def _remove(self, sprite):
+        del self.rects[sprite]
+        cells = self.cells
+        for key in self.keys.pop(sprite):
+            bucket = cells[key]
+            bucket.remove(sprite)
+            if not bucket:
+                del cells[key]
+
+    def mark(self, sprite):
+        """note that the rect of a sprite may have moved"""
+        if sprite in self.order:
+            self.dirty.add(sprite)
+
+    def mark_all(self):
+        """note that any of the rects may have moved"""
+        self.update_count = None
+
+    def refresh(self):
+        """move the sprites which may have moved to their new cells"""
+        if self.update_count != _update_count:
+            self.update_count = _update_count
+            moved = list(self.rects)
+            self.dirty.clear()
+        elif self.dirty:
+            moved = self.dirty
+            self.dirty = set()
+        else:
+            return
+        rects = self.rects
+        for spr in moved:
+            new_rect = spr.rect
+            if new_rect == rects[spr]:
+                continue
+            keys = list(self._cell_keys(new_rect))
+            if keys == self.keys[spr]:
+                # still in the same cells
+                rects[spr] = tuple(new_rect)
+            else:
+                self._remove(spr)
+                self._insert(spr, new_rect)
+
+    def _cell_keys(self, rect):
+        cell_size = self.cell_size
+        x, y, w, h = rect
+        # rects with negative sizes still collide, so cover both edges
+        if w < 0:
+            x, w = x + w, -w
+        if h < 0:
+            y, h = y + h, -h
+        columns = range(int(x // cell_size), int((x + w) // cell_size) + 1)
+        for cy in range(int(y // cell_size), int((y + h) // cell_size) + 1):
+            for cx in columns:
+                yield cx, cy
+
+    def discard(self, sprite):
+        """forget a sprite that left the group"""
+        if sprite not in self.order:
+            return
+        del self.order[sprite]
+        self.dirty.discard(sprite)
+        self._remove(sprite)
+
+    def query(self, rect):
+        """return the sprites that may collide with rect, in group order"""
+        cells = self.cells
+        found = {}
+        for key in self._cell_keys(rect):
+            try:
+                bucket = cells[key]
+            except KeyError:
+                continue
+            for spr in bucket:
+                found[spr] = True
+        return sorted(found, key=self.order.__getitem__)
+
+
 class AbstractGroup(object):
     """base class for containers of sprites
 
@@ -297,6 +507,10 @@ class AbstractGroup(object):
     # dummy val to identify sprite groups, and avoid infinite recursion
     _spritegroup = True
 
+    # collision broadphase, see set_spatial_index()
+    _spatial_cell_size = None
+    _spatial_hash = None
+
     def __init__(self):
         self.spritedict = {}
         self.lostsprites = []
@@ -316,12 +530,15 @@ class AbstractGroup(object):
 
     def add_internal(self, sprite):
         self.spritedict[sprite] = 0
+        self._spatial_add(sprite)
 
     def remove_internal(self, sprite):
         r = self.spritedict[sprite]
         if r:
             self.lostsprites.append(r)
         del self.spritedict[sprite]
+        if self._spatial_hash is not None:
+            self._spatial_hash.discard(sprite)
 
     def has_internal(self, sprite):
         return sprite in self.spritedict
@@ -461,6 +678,7 @@ class AbstractGroup(object):
         """
         for s in self.sprites():
             s.update(*args)
+        _sprites_updated()
 
     def draw(self, surface):
         """draw all sprites onto the surface
@@ -470,10 +688,7 @@ class AbstractGroup(object):
         Draws all of the member sprites onto the given surface.
 
         """
-        sprites = self.sprites()
-        surface_blit = surface.blit
-        for spr in sprites:
-            self.spritedict[spr] = surface_blit(spr.image, spr.rect)
+        _blit_sprites(surface, self.sprites(), self.spritedict)
         self.lostsprites = []
 
     def clear(self, surface, bgd):
@@ -513,6 +728,71 @@ class AbstractGroup(object):
             self.remove_internal(s)
             s.remove_internal(self)
 
+    def set_spatial_index(self, cell_size=64):
+        """index the sprites in a uniform grid to speed up collisions
+
+        Group.set_spatial_index(cell_size=64): return None
+
+        When an index is set, spritecollide(), groupcollide() and
+        spritecollideany() only compare a sprite against the members of
+        this group sharing a grid cell with it, instead of every member.
+        This only applies when no collided callback is given, or when it is
+        collide_rect. LayeredUpdates.get_sprites_at() and
+        get_sprites_in_rect() use the index too. Pass None to remove the
+        index.
+
+        The index is built lazily from each Sprite.rect and kept up to date
+        as sprites are added, removed or change layer. After an update() of
+        any group, the sprites whose rect changed are put in their new cells
+        the next time the index is used. Call reindex() after moving a
+        sprite some other way.
+
+        """
+        if cell_size is not None and cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self._spatial_cell_size = cell_size
+        self._spatial_hash = None
+
+    def reindex(self, *sprites):
+        """tell the spatial index that sprites have moved
+
+        Group.reindex(*sprites): return None
+
+        Puts the given sprites in the cells of their current rect the next
+        time the spatial index is used. With no sprites, every sprite is
+        checked. Only needed for sprites moved outside of an update() call.
+
+        """
+        spatial_hash = self._spatial_hash
+        if spatial_hash is None:
+            return
+        if sprites:
+            for spr in sprites:
+                spatial_hash.mark(spr)
+        else:
+            spatial_hash.mark_all()
+
+    def _get_spatial_hash(self):
+        """return the up to date spatial index, or None if there is none"""
+        if self._spatial_cell_size is None:
+            return None
+        if self._spatial_hash is None:
+            self._spatial_hash = _SpatialHash(self.sprites(),
+                                              self._spatial_cell_size)
+        else:
+            self._spatial_hash.refresh()
+        return self._spatial_hash
+
+    def _spatial_add(self, sprite, layer=0):
+        """add a new member to the spatial index, if there is one"""
+        if self._spatial_hash is None:
+            return
+        if getattr(sprite, 'rect', None) is None:
+            # probably not set up yet, so index it when it is needed
+            self._spatial_hash = None
+        else:
+            self._spatial_hash.add(sprite, layer)
+
     def __nonzero__(self):
         return truth(self.sprites())
 
@@ -564,24 +844,28 @@ class RenderUpdates(Group):
     method that tracks the changed areas of the screen.
 
     """
-    def draw(self, surface):
-       spritedict = self.spritedict
-       surface_blit = surface.blit
+    def draw(self, surface, merge=False):
+       """draw all sprites onto the surface
+
+       RenderUpdates.draw(surface, merge=False): return Rect_list
+
+       Returns the changed areas: for each sprite the union of its old and
+       new rects if they overlap, or else both, after the rects of removed
+       sprites. With merge=True overlapping areas are merged with a
+       pygame.Region instead, so no two of the returned rects overlap.
+
+       """
+       if merge:
+           dirty = Region()
+           dirty_add = dirty.add
+           for r in self.lostsprites:
+               dirty_add(r)
+           self.lostsprites = []
+           _blit_sprites(surface, self.sprites(), self.spritedict, dirty)
+           return dirty.rects()
        dirty = self.lostsprites
        self.lostsprites = []
-       dirty_append = dirty.append
-       for s in self.sprites():
-           r = spritedict[s]
-           newrect = surface_blit(s.image, s.rect)
-           if r:
-               if newrect.colliderect(r):
-                   dirty_append(newrect.union(r))
-               else:
-                   dirty_append(newrect)
-                   dirty_append(r)
-           else:
-               dirty_append(newrect)
-           spritedict[s] = newrect
+       _blit_sprites(surface, self.sprites(), self.spritedict, dirty)
        return dirty
 
 class OrderedUpdates(RenderUpdates):
@@ -611,6 +895,239 @@ class OrderedUpdates(RenderUpdates):
         self._spritelist.remove(sprite)
 
 
+class ParticleGroup(Group):
+    """Group class that moves its Sprites in bulk
+
+    pygame.sprite.ParticleGroup(*sprites, use_numpy=None): return ParticleGroup
+
+    The position and velocity of each Sprite are kept in contiguous arrays
+    of floats. ParticleGroup.update() adds the velocities to the positions
+    in a single step, instead of calling Sprite.update() on every member,
+    and the rects are only moved to the new positions when they are next
+    needed, which for draw() happens in the same C loop as the blits.
+
+    A Sprite starts at the topleft of its rect, and with the velocity of its
+    'velocity' attribute, if it has one. After moving a rect by hand, call
+    set_position() so the group does not move it back.
+
+    The arrays are NumPy arrays when NumPy can be imported, and array.array
+    otherwise. Pass use_numpy=False to always use array.array, or True to
+    require NumPy. The bulk move needs NumPy: with array.array, update()
+    still adds the values one at a time and is hundreds of times slower for
+    large groups.
+
+    """
+    def __init__(self, *sprites, **kwargs):
+        use_numpy = kwargs.get('use_numpy', None)
+        numpy = None
+        if use_numpy is not False:
+            try:
+                import numpy
+            except ImportError:
+                if use_numpy:
+                    raise
+        self._numpy = numpy
+        self._particles = []
+        self._index = {}
+        if numpy is None:
+            self._pos = array('d')
+            self._vel = array('d')
+        else:
+            self._pos = numpy.zeros((16, 2))
+            self._vel = numpy.zeros((16, 2))
+        self._stale = False
+        Group.__init__(self, *sprites)
+
+    def _get_pair(self, values, i):
+        if self._numpy is None:
+            return values[2 * i], values[2 * i + 1]
+        return float(values[i, 0]), float(values[i, 1])
+
+    def _set_pair(self, values, i, pair):
+        x, y = pair
+        if self._numpy is None:
+            values[2 * i] = x
+            values[2 * i + 1] = y
+        else:
+            values[i] = x, y
+
+    def _flat(self, values):
+        if self._numpy is None:
+            return values
+        return values[:len(self._particles)].ravel()
+
+    def _sync_rects(self):
+        if self._stale:
+            _set_rect_positions(self._particles, self._flat(self._pos))
+            self._stale = False
+
+    def sprites(self):
+        self._sync_rects()
+        return list(self._particles)
+
+    def add_internal(self, sprite):
+        Group.add_internal(self, sprite)
+        i = len(self._particles)
+        self._particles.append(sprite)
+        self._index[sprite] = i
+        x, y = sprite.rect.topleft
+        vx, vy = getattr(sprite, 'velocity', (0.0, 0.0))
+        if self._numpy is None:
+            self._pos.extend((x, y))
+            self._vel.extend((vx, vy))
+            return
+        if i == len(self._pos):
+            # grow both arrays by doubling
+            self._pos = self._numpy.concatenate((self._pos,
+                                                 self._numpy.zeros_like(
+                                                     self._pos)))
+            self._vel = self._numpy.concatenate((self._vel,
+                                                 self._numpy.zeros_like(
+                                                     self._vel)))
+        self._pos[i] = x, y
+        self._vel[i] = vx, vy
+
+    def remove_internal(self, sprite):
+        Group.remove_internal(self, sprite)
+        i = self._index.pop(sprite)
+        if self._stale:
+            # the group stops moving the rect, so leave it where it got to
+            x, y = self._get_pair(self._pos, i)
+            sprite.rect.topleft = (int(x // 1), int(y // 1))
+        # move the last particle into the hole
+        last = self._particles.pop()
+        n = len(self._particles)
+        if last is not sprite:
+            self._particles[i] = last
+            self._index[last] = i
+        if self._numpy is None:
+            if last is not sprite:
+                self._pos[2 * i:2 * i + 2] = self._pos[-2:]
+                self._vel[2 * i:2 * i + 2] = self._vel[-2:]
+            del self._pos[-2:]
+            del self._vel[-2:]
+        elif last is not sprite:
+            self._pos[i] = self._pos[n]
+            self._vel[i] = self._vel[n]
+
+    def copy(self):
+        group = self.__class__(self.sprites(),
+                               use_numpy=self._numpy is not None)
+        for spr in self._particles:
+            group.set_position(spr, self.get_position(spr))
+            group.set_velocity(spr, self.get_velocity(spr))
+        return group
+
+    def update(self, dt=1.0):
+        """move every sprite by its velocity
+
+        ParticleGroup.update(dt=1.0): return None
+
+        Adds dt times its velocity to the position of every member sprite.
+        Sprite.update() is not called.
+
+        """
+        if self._numpy is None:
+            # slice assignment keeps the array returned by positions
+            pos = self._pos
+            vel = self._vel
+            if dt != 1:
+                vel = map(mul, vel, repeat(dt))
+            pos[:] = array('d', map(add, pos, vel))
+        else:
+            n = len(self._particles)
+            if dt == 1:
+                self._pos[:n] += self._vel[:n]
+            else:
+                self._pos[:n] += self._vel[:n] * dt
+        self._stale = True
+        _sprites_updated()
+
+    def _get_spatial_hash(self):
+        # the index looks at the rects, which are only moved when needed
+        self._sync_rects()
+        return Group._get_spatial_hash(self)
+
+    def draw(self, surface):
+        """draw all sprites onto the surface
+
+        ParticleGroup.draw(surface): return None
+
+        Moves the rects to the positions, if they changed since the last
+        draw, and draws all of the member sprites onto the given surface.
+
+        """
+        positions = None
+        if self._stale:
+            if self._numpy is None and PY_MAJOR_VERSION < 3:
+                # array.array has no buffer interface on Python 2
+                self._sync_rects()
+            else:
+                positions = self._flat(self._pos)
+                self._stale = False
+        _blit_sprites(surface, list(self._particles), self.spritedict,
+                      None, positions)
+        self.lostsprites = []
+
+    def get_position(self, sprite):
+        """get the position of a sprite
+
+        ParticleGroup.get_position(sprite): return (x, y)
+
+        """
+        return self._get_pair(self._pos, self._index[sprite])
+
+    def set_position(self, sprite, pos):
+        """move a sprite
+
+        ParticleGroup.set_position(sprite, (x, y)): return None
+
+        Moves the sprite and its rect to pos.
+
+        """
+        self._set_pair(self._pos, self._index[sprite], pos)
+        _set_rect_positions((sprite,), pos)
+        self.reindex(sprite)
+
+    def get_velocity(self, sprite):
+        """get the velocity of a sprite
+
+        ParticleGroup.get_velocity(sprite): return (vx, vy)
+
+        """
+        return self._get_pair(self._vel, self._index[sprite])
+
+    def set_velocity(self, sprite, velocity):
+        """change the velocity of a sprite
+
+        ParticleGroup.set_velocity(sprite, (vx, vy)): return None
+
+        """
+        self._set_pair(self._vel, self._index[sprite], velocity)
+
+    @property
+    def positions(self):
+        """the positions of the sprites, in the order of sprites()
+
+        With NumPy this is a view of shape (len(group), 2), otherwise an
+        array.array of x, y pairs. Changes to it move the sprites, so the
+        rects are moved to it again when they are next needed. Adding
+        sprites may replace the array.
+
+        """
+        self._stale = True
+        self.reindex()
+        if self._numpy is None:
+            return self._pos
+        return self._pos[:len(self._particles)]
+
+    @property
+    def velocities(self):
+        """the velocities of the sprites, laid out like positions"""
+        if self._numpy is None:
+            return self._vel
+        return self._vel[:len(self._particles)]
+
 class LayeredUpdates(AbstractGroup):
     """LayeredUpdates Group handles layers, which are drawn like OrderedUpdates
 
@@ -678,6 +1195,7 @@ class LayeredUpdates(AbstractGroup):
         while mid < leng and sprites_layers[sprites[mid]] <= layer:
             mid += 1
         sprites.insert(mid, sprite)
+        self._spatial_add(sprite, layer)
 
     def add(self, *sprites, **kwargs):
         """add a sprite or sequence of sprites to a group
@@ -741,6 +1259,8 @@ class LayeredUpdates(AbstractGroup):
 
         del self.spritedict[sprite]
         del self._spritelayers[sprite]
+        if self._spatial_hash is not None:
+            self._spatial_hash.discard(sprite)
 
     def sprites(self):
         """return a ordered list of sprites (first back, last top).
@@ -750,30 +1270,38 @@ class LayeredUpdates(AbstractGroup):
         """
         return list(self._spritelist)
 
-    def draw(self, surface):
+    def _get_spatial_hash(self):
+        if self._spatial_cell_size is None:
+            return None
+        if self._spatial_hash is None:
+            self._spatial_hash = _SpatialHash(self._spritelist,
+                                              self._spatial_cell_size,
+                                              self._spritelayers)
+        else:
+            self._spatial_hash.refresh()
+        return self._spatial_hash
+
+    def draw(self, surface, merge=False):
         """draw all sprites in the right order onto the passed surface
 
-        LayeredUpdates.draw(surface): return Rect_list
+        LayeredUpdates.draw(surface, merge=False): return Rect_list
+
+        Returns the changed areas like RenderUpdates.draw(), which merges
+        them too with merge=True.
 
         """
-        spritedict = self.spritedict
-        surface_blit = surface.blit
+        if merge:
+            dirty = Region()
+            dirty_add = dirty.add
+            for rec in self.lostsprites:
+                dirty_add(rec)
+            self.lostsprites = []
+            # the initial rect is empty, so it is not added to dirty
+            _blit_sprites(surface, self.sprites(), self.spritedict, dirty)
+            return dirty.rects()
         dirty = self.lostsprites
         self.lostsprites = []
-        dirty_append = dirty.append
-        init_rect = self._init_rect
-        for spr in self.sprites():
-            rec = spritedict[spr]
-            newrect = surface_blit(spr.image, spr.rect)
-            if rec is init_rect:
-                dirty_append(newrect)
-            else:
-                if newrect.colliderect(rec):
-                    dirty_append(newrect.union(rec))
-                else:
-                    dirty_append(newrect)
-                    dirty_append(rec)
-            spritedict[spr] = newrect
+        _blit_sprites(surface, self.sprites(), self.spritedict, dirty)
         return dirty
 
     def get_sprites_at(self, pos):
@@ -784,8 +1312,25 @@ class LayeredUpdates(AbstractGroup):
         Bottom sprites are listed first; the top ones are listed last.
 
         """
-        _sprites = self._spritelist
-        rect = Rect(pos, (0, 0))
+        return self.get_sprites_in_rect(Rect(pos, (0, 0)))
+
+    def get_sprites_in_rect(self, rect):
+        """return a list with all sprites colliding with a rect
+
+        LayeredUpdates.get_sprites_in_rect(rect): return colliding_sprites
+
+        Bottom sprites are listed first; the top ones are listed last. With
+        a spatial index, see set_spatial_index(), only the sprites near the
+        rect are tested. Sprites moved outside of an update() call are only
+        found at their new place after reindex().
+
+        """
+        rect = Rect(rect)
+        spatial_hash = self._get_spatial_hash()
+        if spatial_hash is None:
+            _sprites = self._spritelist
+        else:
+            _sprites = spatial_hash.query(rect)
         colliding_idx = rect.collidelistall(_sprites)
         colliding = [_sprites[i] for i in colliding_idx]
         return colliding
@@ -855,6 +1400,11 @@ class LayeredUpdates(AbstractGroup):
         # add layer info
         sprites_layers[sprite] = new_layer
 
+        # move it to the end of its new layer in the index too
+        if self._spatial_hash is not None:
+            self._spatial_hash.discard(sprite)
+            self._spatial_add(sprite, new_layer)
+
     def get_layer_of_sprite(self, sprite):
         """return the layer that sprite is currently in
 
@@ -995,6 +1545,7 @@ class LayeredDirty(LayeredUpdates):
         self._time_threshold = 1000.0 / 80.0 # 1000.0 / fps
 
         self._bgd = None
+        self._region = Region()
         for key, val in kwargs.items():
             if key in ['_use_update', '_time_threshold', '_default_layer']:
                 if hasattr(self, key):
@@ -1040,8 +1591,7 @@ class LayeredDirty(LayeredUpdates):
         _surf = surface
         _sprites = self._spritelist
         _old_rect = self.spritedict
-        _update = self.lostsprites
-        _update_append = _update.append
+        _update = None
         _ret = None
         _surf_blit = _surf.blit
         _rect = Rect
@@ -1056,7 +1606,11 @@ class LayeredDirty(LayeredUpdates):
         start_time = get_ticks()
         if self._use_update: # dirty rects mode
             # 1. find dirty area on screen and put the rects into _update
-            # still not happy with that part
+            # the region merges overlapping rects with a sort and sweep
+            _region = self._region
+            _region_add = _region.add
+            for rec in self.lostsprites:
+                _region_add(rec)
             for spr in _sprites:
                 if 0 < spr.dirty:
                     # chose the right rect
@@ -1065,28 +1619,12 @@ class LayeredDirty(LayeredUpdates):
                                             spr.source_rect.size)
                     else:
                         _union_rect = _rect(spr.rect)
-
-                    _union_rect_collidelist = _union_rect.collidelist
-                    _union_rect_union_ip = _union_rect.union_ip
-                    i = _union_rect_collidelist(_update)
-                    while -1 < i:
-                        _union_rect_union_ip(_update[i])
-                        del _update[i]
-                        i = _union_rect_collidelist(_update)
-                    _update_append(_union_rect.clip(_clip))
+                    _region_add(_union_rect.clip(_clip))
 
                     if _old_rect[spr] is not init_rect:
-                        _union_rect = _rect(_old_rect[spr])
-                        _union_rect_collidelist = _union_rect.collidelist
-                        _union_rect_union_ip = _union_rect.union_ip
-                        i = _union_rect_collidelist(_update)
-                        while -1 < i:
-                            _union_rect_union_ip(_update[i])
-                            del _update[i]
-                            i = _union_rect_collidelist(_update)
-                        _update_append(_union_rect.clip(_clip))
-            # can it be done better? because that is an O(n**2) algorithm in
-            # worst case
+                        _region_add(_old_rect[spr].clip(_clip))
+            _update = _region.rects()
+            _region.clear()
 
             # clear using background
             if _bgd is not None:
@@ -1130,7 +1668,7 @@ class LayeredDirty(LayeredUpdates):
                                                     spr.blendmode)
                     if spr.dirty == 1:
                         spr.dirty = 0
-            _ret = list(_update)
+            _ret = _update
         else: # flip, full screen mode
             if _bgd is not None:
                 _surf_blit(_bgd, (0, 0))
@@ -1155,7 +1693,7 @@ class LayeredDirty(LayeredUpdates):
 ##        print "               check: using dirty rects:", self._use_update
 
         # emtpy dirty rects list
-        _update[:] = []
+        self.lostsprites[:] = []
 
         # -------
         # restore original clip
@@ -1262,6 +1800,7 @@ class GroupSingle(AbstractGroup):
             self.__sprite.remove_internal(self)
             self.remove_internal(self.__sprite)
         self.__sprite = sprite
+        self._spatial_hash = None
 
     def __nonzero__(self):
         return self.__sprite is not None
@@ -1282,6 +1821,7 @@ class GroupSingle(AbstractGroup):
     def remove_internal(self, sprite):
         if sprite is self.__sprite:
             self.__sprite = None
+            self._spatial_hash = None
         if sprite in self.spritedict:
             AbstractGroup.remove_internal(self, sprite)
 
@@ -1474,20 +2014,73 @@ def collide_mask(left, right):
     as a collided callback function to the *collide functions. Sprites must
     have a "rect" and an optional "mask" attribute.
 
+    Masks created from images are cached until the image is changed, so
+    sprites sharing an image share its mask.
+
     New in pygame 1.8.0
 
     """
     xoffset = right.rect[0] - left.rect[0]
     yoffset = right.rect[1] - left.rect[1]
+    # getattr is much faster than catching the AttributeError
+    leftmask = getattr(left, 'mask', None)
+    if leftmask is None:
+        leftmask = _image_mask(left.image)
+    rightmask = getattr(right, 'mask', None)
+    if rightmask is None:
+        rightmask = _image_mask(right.image)
+    return leftmask.overlap(rightmask, (xoffset, yoffset))
+
+# the masks collide_mask made from sprite images, with the pixel version of
+# the image they were made from
+_image_masks = WeakKeyDictionary()
+
+def _image_mask(image):
+    """return the mask of an image, from the cache if it is unchanged"""
     try:
-        leftmask = left.mask
-    except AttributeError:
-        leftmask = from_surface(left.image)
+        mask, version = _image_masks[image]
+    except KeyError:
+        pass
+    except TypeError:
+        # cannot be weakly referenced, so not a Surface
+        return from_surface(image)
+    else:
+        if version == image._pixels_version:
+            return mask
+    mask = from_surface(image)
+    # from_surface locks the image, so take the version after it
+    _image_masks[image] = mask, image._pixels_version
+    return mask
+
+def _spatial_index(group, collided):
+    """return the up to date spatial index of group, or None
+
+    None means the group has no spatial index, or the collided callback
+    can report collisions outside of the sprite rects.
+
+    """
+    if collided is not None and collided is not collide_rect:
+        return None
     try:
-        rightmask = right.mask
+        return group._get_spatial_hash()
     except AttributeError:
-        rightmask = from_surface(right.image)
-    return leftmask.overlap(rightmask, (xoffset, yoffset))
+        return None
+
+def _spatial_candidates(sprite, group, collided):
+    """return the group members that may touch sprite, or None"""
+    spatial_hash = _spatial_index(group, collided)
+    if spatial_hash is None:
+        return None
+    return spatial_hash.query(sprite.rect)
+
+def _collide_candidates(sprite, candidates, dokill):
+    """the spritecollide() result for the candidates of a spatial index"""
+    spritecollide = sprite.rect.colliderect
+    crashed = [s for s in candidates if spritecollide(s.rect)]
+    if dokill:
+        for s in crashed:
+            s.kill()
+    return crashed
 
 def spritecollide(sprite, group, dokill, collided=None):
     """find Sprites in a Group that intersect another Sprite
@@ -1508,7 +2101,14 @@ def spritecollide(sprite, group, dokill, collided=None):
     sprites must have a "rect" value, which is a rectangle of the sprite area,
     which will be used to calculate the collision.
 
+    If the group has a spatial index (see Group.set_spatial_index), only the
+    sprites sharing a grid cell with the given sprite are tested.
+
     """
+    candidates = _spatial_candidates(sprite, group, collided)
+    if candidates is not None:
+        return _collide_candidates(sprite, candidates, dokill)
+
     if dokill:
 
         crashed = []
@@ -1552,9 +2152,17 @@ def groupcollide(groupa, groupb, dokilla, dokillb, collided=None):
     sprites must have a "rect" value, which is a rectangle of the sprite area
     that will be used to calculate the collision.
 
+    Giving groupb a spatial index (see Group.set_spatial_index) avoids testing
+    every pair of sprites when there are many of them.
+
     """
     crashed = {}
     SC = spritecollide
+    spatial_hash = _spatial_index(groupb, collided)
+    if spatial_hash is not None:
+        # the index is brought up to date once, not for every sprite
+        def SC(s, groupb, dokillb, collided):
+            return _collide_candidates(s, spatial_hash.query(s.rect), dokillb)
     if dokilla:
         for s in groupa.sprites():
             c = SC(s, groupb, dokillb, collided)
@@ -1586,8 +2194,18 @@ def spritecollideany(sprite, group, collided=None):
     sprites must have a "rect" value, which is a rectangle of the sprite area,
     which will be used to calculate the collision.
 
+    If the group has a spatial index (see Group.set_spatial_index), only the
+    sprites sharing a grid cell with the given sprite are tested.
 
     """
+    candidates = _spatial_candidates(sprite, group, collided)
+    if candidates is not None:
+        spritecollide = sprite.rect.colliderect
+        for s in candidates:
+            if spritecollide(s.rect):
+                return s
+        return None
+
     if collided:
         for s in group:
             if collided(sprite, s):
@@ -22,8 +22,10 @@
 
 import os
 import sys
+import json
+from collections import OrderedDict
 from pygame.compat import xrange_, PY_MAJOR_VERSION
-from os.path import basename, dirname, exists, join, splitext
+from os.path import basename, dirname, exists, isdir, join, splitext
 import xml.etree.ElementTree as ET
 
 
@@ -31,6 +33,13 @@ OpenType_extensions = frozenset(('.ttf', '.ttc', '.otf'))
 Sysfonts = {}
 Sysalias = {}
 
+# the fonts made by SysFont(..., cache=True), most recently used last
+Fontcache = OrderedDict()
+FONTCACHE_SIZE = 64
+
+# the version of the font index file, see _font_index
+FONT_INDEX_VERSION = 1
+
 # Python 3 compatibility
 if PY_MAJOR_VERSION >= 3:
     def toascii(raw):
@@ -196,49 +205,259 @@ def initsysfonts_darwin():
     return fonts
 
 
-# read the fonts on unix
-def initsysfonts_unix(path="fc-list"):
-    """use the fc-list from fontconfig to get a list of fonts"""
-    fonts = {}
-
+def _run_fc(args, shell=False):
+    """get the output of a fontconfig tool, or None if it fails"""
     try:
         # note, we capture stderr so if fc-list isn't there to stop stderr
         # printing.
-        flout, flerr = subprocess.Popen('%s : file family style' % path, shell=True,
-                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                        close_fds=True).communicate()
+        proc = subprocess.Popen(args, shell=shell, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, close_fds=True)
+        flout, flerr = proc.communicate()
     except Exception:
-        return fonts
+        return None
+    if proc.returncode:
+        return None
+    return toascii(flout)
+
+
+def _font_records(entries):
+    """get [filename, family, style] for each font in fc-list output"""
+    records = []
+    for line in entries.split('\n'):
+        try:
+            filename, family, style = line.split(':', 2)
+        except ValueError:
+            continue
+        if splitext(filename)[1].lower() in OpenType_extensions:
+            records.append([filename, family, style])
+    return records
 
-    entries = toascii(flout)
+
+def _font_dirs():
+    """the directories fontconfig usually finds fonts and its setup in"""
+    home = os.path.expanduser('~')
+    data_home = (os.environ.get('XDG_DATA_HOME') or
+                 join(home, '.local', 'share'))
+    return ['/usr/share/fonts', '/usr/local/share/fonts',
+            '/usr/X11R6/lib/X11/fonts', '/Library/Fonts',
+            '/System/Library/Fonts', join(home, 'Library', 'Fonts'),
+            join(data_home, 'fonts'), join(home, '.fonts'),
+            '/etc/fonts', '/etc/fonts/conf.d']
+
+
+def _mtime(path):
     try:
-        for line in entries.split('\n'):
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _walk_dirs(top, dirs):
+    """add the modification time of top and every directory below it"""
+    dirs[top] = _mtime(top)
+    if dirs[top] is not None:
+        for root, subdirs, files in os.walk(top):
+            for subdir in subdirs:
+                path = join(root, subdir)
+                dirs[path] = _mtime(path)
+
+
+def _font_index_path():
+    """where the font index is kept, or None if there is nowhere"""
+    cache_home = os.environ.get('XDG_CACHE_HOME')
+    if not cache_home:
+        home = os.path.expanduser('~')
+        if home == '~':
+            return None
+        cache_home = join(home, '.cache')
+    return join(cache_home, 'pygame', 'sysfont.json')
+
+
+def _read_font_index(path, fc_list):
+    try:
+        with open(path) as index_file:
+            index = json.load(index_file)
+        if (index['version'] != FONT_INDEX_VERSION or
+                index['fc_list'] != fc_list):
+            return None
+        index['dirs'], index['fonts']
+    except Exception:
+        return None
+    return index
 
+
+def _write_font_index(path, index):
+    """write the index, returning False if that can not be done"""
+    temp = '%s.%d' % (path, os.getpid())
+    try:
+        if not isdir(dirname(path)):
+            os.makedirs(dirname(path))
+        with open(temp, 'w') as index_file:
+            json.dump(index, index_file)
+        os.rename(temp, path)
+    except (IOError, OSError):
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def _full_font_index(fc_list):
+    """run fc-list, and note the directories the fonts are in"""
+    entries = _run_fc('%s : file family style' % fc_list, shell=True)
+    if entries is None:
+        return None
+    records = _font_records(entries)
+    dirs = {}
+    for top in _font_dirs():
+        _walk_dirs(top, dirs)
+    for record in records:
+        path = dirname(record[0])
+        if path not in dirs:
+            dirs[path] = _mtime(path)
+    return {'version': FONT_INDEX_VERSION, 'fc_list': fc_list,
+            'dirs': dirs, 'fonts': records}
+
+
+def _refresh_font_index(index):
+    """update an index for the directories which have changed.
+
+    Fonts in new files are read with fc-scan. Returns None when the whole
+    index has to be made again, and index itself if nothing changed.
+    """
+    dirs = index['dirs']
+    changed = [path for path in dirs if _mtime(path) != dirs[path]]
+    if not changed:
+        return index
+    if '/etc/fonts' in changed or '/etc/fonts/conf.d' in changed:
+        # the fontconfig setup changed, so anything may have
+        return None
+
+    # changed directories are read again, with all the directories below
+    prefixes = tuple(join(path, '') for path in changed)
+    changed = set(changed)
+    new_dirs = dict((path, mtime) for path, mtime in dirs.items()
+                    if path not in changed and not path.startswith(prefixes))
+    for path in changed:
+        _walk_dirs(path, new_dirs)
+
+    records = []
+    known = set()
+    for record in index['fonts']:
+        path = dirname(record[0])
+        if path in changed or path.startswith(prefixes):
+            if not exists(record[0]):
+                continue
+        records.append(record)
+        known.add(record[0])
+
+    new_files = []
+    for path in new_dirs:
+        if path in changed or path.startswith(prefixes):
             try:
-                filename, family, style = line.split(':', 2)
-                if splitext(filename)[1].lower() in OpenType_extensions:
-                    bold = 'Bold' in style
-                    italic = 'Italic' in style
-                    oblique = 'Oblique' in style
-                    for name in family.strip().split(','):
-                        if name:
-                            break
-                    else:
-                        name = splitext(basename(filename))[0]
-
-                    _addfont(
-                        _simplename(name), bold, italic or oblique, filename, fonts)
-
-            except Exception:
-                # try the next one.
-                pass
+                names = os.listdir(path)
+            except OSError:
+                continue
+            for name in names:
+                filename = join(path, name)
+                if (splitext(name)[1].lower() in OpenType_extensions and
+                        filename not in known):
+                    new_files.append(filename)
+
+    if new_files:
+        fc_scan = join(dirname(index['fc_list']), 'fc-scan')
+        entries = _run_fc([fc_scan, '--format',
+                           '%{file}: %{family}:%{style}\n'] + new_files)
+        if entries is None:
+            return None
+        records.extend(_font_records(entries))
+
+    return {'version': FONT_INDEX_VERSION, 'fc_list': index['fc_list'],
+            'dirs': new_dirs, 'fonts': records}
+
+
+def _font_index(fc_list, rebuild=False):
+    """get the fonts fc-list finds, keeping them in an index file.
+
+    The index notes the modification times of the font directories, so only
+    the fonts in directories which have changed are read again.
+    Returns the index and the path it was saved to, or None if not saved.
+    """
+    path = _font_index_path()
+    index = None
+    if path and not rebuild:
+        index = _read_font_index(path, fc_list)
+    if index is not None:
+        fresh = _refresh_font_index(index)
+        if fresh is index:
+            return index, path
+        index = fresh
+    if index is None:
+        index = _full_font_index(fc_list)
+        if index is None:
+            # without fc-list there are no fonts to keep
+            return {'fonts': []}, None
+    if not path or not _write_font_index(path, index):
+        path = None
+    return index, path
+
 
+# read the fonts on unix
+def initsysfonts_unix(path="fc-list"):
+    """use the fc-list from fontconfig to get a list of fonts"""
+    fonts = {}
+
+    try:
+        records = _font_index(path)[0]['fonts']
     except Exception:
-        pass
+        return fonts
+
+    for filename, family, style in records:
+        try:
+            bold = 'Bold' in style
+            italic = 'Italic' in style
+            oblique = 'Oblique' in style
+            for name in family.strip().split(','):
+                if name:
+                    break
+            else:
+                name = splitext(basename(filename))[0]
+
+            _addfont(
+                _simplename(name), bold, italic or oblique, filename, fonts)
+
+        except Exception:
+            # try the next one.
+            pass
 
     return fonts
 
 
+def update_font_index(rebuild=False):
+    """pygame.font.update_font_index(rebuild=False) -> path
+       read the system fonts again, and save them for next time
+
+       Brings the saved index of system fonts up to date, and returns
+       the file it is kept in, or None if it could not be saved. Only
+       fonts found with fontconfig are kept in an index.
+    """
+    Sysfonts.clear()
+    Sysalias.clear()
+    Fontcache.clear()
+    path = None
+    if sys.platform == 'darwin':
+        for fc_list in ('/usr/X11/bin/fc-list', '/usr/X11R6/bin/fc-list'):
+            if exists(fc_list):
+                path = _font_index(fc_list, rebuild)[1]
+                break
+    elif sys.platform != 'win32':
+        path = _font_index('fc-list', rebuild)[1]
+    initsysfonts()
+    return path
+
+
 def create_aliases():
     """map common fonts that are absent from the system to similar fonts that are installed in the system"""
     alias_groups = (
@@ -293,8 +512,9 @@ def font_constructor(fontpath, size, bold, italic):
 
 # the exported functions
 
-def SysFont(name, size, bold=False, italic=False, constructor=None):
-    """pygame.font.SysFont(name, size, bold=False, italic=False, constructor=None) -> Font
+def SysFont(name, size, bold=False, italic=False, constructor=None,
+            cache=False):
+    """pygame.font.SysFont(name, size, bold=False, italic=False, constructor=None, cache=False) -> Font
        create a pygame Font from system font resources
 
        This will search the system fonts for the given font
@@ -314,7 +534,22 @@ def SysFont(name, size, bold=False, italic=False, constructor=None):
        if optional contructor is provided, it must be a function with
        signature constructor(fontpath, size, bold, italic) which returns
        a Font instance. If None, a pygame.font.Font object is created.
+
+       if cache is True, the same Font object is returned for the same
+       arguments each time, so it should not be changed. The cache is
+       emptied by pygame.font.quit().
     """
+    if cache:
+        key = (name, size, bool(bold), bool(italic), constructor)
+        try:
+            font = Fontcache.pop(key)
+        except KeyError:
+            font = SysFont(name, size, bold, italic, constructor)
+        Fontcache[key] = font
+        while len(Fontcache) > FONTCACHE_SIZE:
+            Fontcache.popitem(last=False)
+        return font
+
     if constructor is None:
         constructor = font_constructor
 
@@ -12,10 +12,17 @@ __author__ = "Rene Dudfield"
 __version__ = "0.3.0"
 __license__ = 'Python license'
 
-import traceback, sys
+import traceback, sys, os, json
 
 from pygame.compat import geterror
 
+try:
+    from concurrent.futures import Future, Executor as _FuturesExecutor
+except ImportError:
+    # python 2 without the futures backport.
+    Future = None
+    _FuturesExecutor = object
+
 if sys.version_info[0] == 3:
     from queue import Queue
     from queue import Empty
@@ -28,6 +35,7 @@ else:
     from Queue import Empty
     
 import threading
+import time
 Thread = threading.Thread
 
 STOP = object()
@@ -47,12 +55,20 @@ _use_workers = 0
 #    So it should only test the best number of workers +2
 MAX_WORKERS_TO_TEST = 64
 
+# the process pool used by pmap, and the number of processes in it.
+_pool = None
+_pool_workers = 0
+
 
 
-def init(number_of_workers = 0):
+def init(number_of_workers = 0, retune = False):
     """ Does a little test to see if threading is worth it.
           Sets up a global worker queue if it's worth it.
 
+        The number of workers found is saved, so the test is only done
+          again for a different machine, python or pygame.  Pass
+          retune=True to do the test again anyway.
+
         Calling init() is not required, but is generally better to do.
     """
     global _wq, _use_workers
@@ -60,7 +76,7 @@ def init(number_of_workers = 0):
     if number_of_workers:
         _use_workers = number_of_workers
     else:
-        _use_workers = benchmark_workers()
+        _use_workers = tuned_workers(retune)
 
     # if it is best to use zero workers, then use that.
     _wq = WorkerQueue(_use_workers)
@@ -71,10 +87,72 @@ def init(number_of_workers = 0):
 def quit():
     """ cleans up everything.
     """
-    global _wq, _use_workers
-    _wq.stop()
+    global _wq, _use_workers, _pool, _pool_workers
+    if _wq:
+        _wq.stop()
     _wq = None
     _use_workers = False
+    if _pool:
+        _pool.terminate()
+        _pool.join()
+    _pool = None
+    _pool_workers = 0
+
+
+def _cpu_count():
+    import multiprocessing
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+def _tuning_path():
+    """ where the tuned numbers of workers are kept, or None.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME')
+    if not cache_home:
+        home = os.path.expanduser('~')
+        if home == '~':
+            return None
+        cache_home = os.path.join(home, '.cache')
+    return os.path.join(cache_home, 'pygame', 'threads.json')
+
+
+def tuned_workers(retune = False):
+    """ the number of workers benchmark_workers finds best on this machine.
+        The result is saved, and used again for the same number of
+          cpus, python and pygame version, unless retune is True.
+    """
+    import pygame.version
+
+    key = '%d cpus, python %d.%d, pygame %s' % (
+        (_cpu_count(),) + tuple(sys.version_info[:2]) +
+        (pygame.version.ver,))
+    path = _tuning_path()
+    tuned = {}
+    if path:
+        try:
+            with open(path) as tuned_file:
+                tuned = json.load(tuned_file)
+            if not retune:
+                return int(tuned[key])
+        except Exception:
+            pass
+
+    tuned = tuned if isinstance(tuned, dict) else {}
+    tuned[key] = benchmark_workers()
+    if path:
+        temp = '%s.%d' % (path, os.getpid())
+        try:
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(temp, 'w') as tuned_file:
+                json.dump(tuned, tuned_file)
+            os.rename(temp, path)
+        except (IOError, OSError):
+            pass
+    return tuned[key]
 
 
 def benchmark_workers(a_bench_func = None, the_data = None):
@@ -235,7 +313,48 @@ class FuncResult:
                 self.errback(self.exception)
 
 
-def tmap(f, seq_args, num_workers = 20, worker_queue = None, wait = True, stop_on_error = True):
+class _ChunkResults(object):
+    """ Runs a sequence in chunks, keeping the results in order.
+         Each chunk is one task on the WorkerQueue, and only the first
+         exception of each chunk is kept.
+    """
+    def __init__(self, f, seq_args, chunksize):
+        self.f = f
+        self.seq_args = seq_args
+        self.results = [None] * len(seq_args)
+        self.exceptions = []
+        self.chunks = [(start, min(start + chunksize, len(seq_args)))
+                       for start in range(0, len(seq_args), chunksize)]
+        self.remaining = len(self.chunks)
+        self.done = threading.Condition()
+
+    def __call__(self, start, end):
+        f, seq_args, results = self.f, self.seq_args, self.results
+        try:
+            for i in range(start, end):
+                try:
+                    results[i] = f(seq_args[i])
+                except Exception:
+                    self.exceptions.append((i, geterror()))
+        finally:
+            with self.done:
+                self.remaining -= 1
+                if not self.remaining:
+                    self.done.notify_all()
+
+    def wait(self):
+        with self.done:
+            while self.remaining:
+                self.done.wait()
+
+    def first_exception(self):
+        if self.exceptions:
+            return min(self.exceptions, key=lambda x: x[0])[1]
+        return None
+
+
+def tmap(f, seq_args, num_workers = 20, worker_queue = None, wait = True,
+         stop_on_error = True, chunksize = None):
     """ like map, but uses a thread pool to execute.
         num_workers - the number of worker threads that will be used.  If pool
                         is passed in, then the num_workers arg is ignored.
@@ -243,7 +362,10 @@ def tmap(f, seq_args, num_workers = 20, worker_queue = None, wait = True, stop_o
         wait - True means that the results are returned when everything is finished.
                False means that we return the [worker_queue, results] right away instead. 
                results, is returned as a list of FuncResult instances.
-        stop_on_error - 
+        stop_on_error - raise the first exception, like map.  Otherwise the
+                          results of calls that raised are None.
+        chunksize - how many of seq_args each task works on, when waiting.
+                      By default, there are about four tasks per worker.
     """
 
     if worker_queue:
@@ -263,48 +385,226 @@ def tmap(f, seq_args, num_workers = 20, worker_queue = None, wait = True, stop_o
     if len(wq.pool) == 0:
         return map(f, seq_args)
 
-    #print ("queue size:%s" % wq.queue.qsize())
-
-
-    #TODO: divide the data (seq_args) into even chunks and 
-    #       then pass each thread a map(f, equal_part(seq_args))
-    #      That way there should be less locking, and overhead.
-
-
-
-    results = []
-    for sa in seq_args:
-        results.append(FuncResult(f))
-        wq.do(results[-1], sa)
-
-
-    #wq.stop()
-
-    if wait:
-        #print ("wait")
-        wq.wait()
-        #print ("after wait")
-        #print ("queue size:%s" % wq.queue.qsize())
-        if wq.queue.qsize():
-            raise Exception("buggy threadmap")
-        # if we created a worker queue, we need to stop it.
-        if not worker_queue and not _wq:
-            #print ("stoping")
-            wq.stop()
-            if wq.queue.qsize():
-                um = wq.queue.get()
-                if not um is STOP:
-                    raise Exception("buggy threadmap")
-        
-        
-        # see if there were any errors.  If so raise the first one.  This matches map behaviour.
-        # TODO: the traceback doesn't show up nicely.
-        # NOTE: TODO: we might want to return the results anyway?  This should be an option.
-        if stop_on_error:
-            error_ones = list(filter(lambda x:x.exception, results))
-            if error_ones:
-                raise error_ones[0].exception
-        
-        return map(lambda x:x.result, results)
-    else:
+    if not wait:
+        results = []
+        for sa in seq_args:
+            results.append(FuncResult(f))
+            wq.do(results[-1], sa)
         return [wq, results]
+
+    # each worker takes a chunk of seq_args, rather than a task for each one.
+    # That way there is less locking, and overhead.
+    seq_args = list(seq_args)
+    if chunksize is None:
+        chunksize = -(-len(seq_args) // (len(wq.pool) * 4))
+    elif chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    chunked = _ChunkResults(f, seq_args, max(chunksize, 1))
+    for start, end in chunked.chunks:
+        wq.do(chunked, start, end)
+    chunked.wait()
+
+    # if we created a worker queue, we need to stop it.
+    if not worker_queue and not _wq:
+        wq.stop()
+
+    # see if there were any errors.  If so raise the first one.  This matches map behaviour.
+    if stop_on_error:
+        exception = chunked.first_exception()
+        if exception is not None:
+            raise exception
+
+    return chunked.results
+
+
+def map_tiles(func, surface, tile_size, dest = None, num_workers = 20,
+              worker_queue = None):
+    """ like tmap, but over non overlapping tiles of a Surface.
+        func(tile) is called with a subsurface of surface for each tile.
+          If it returns a Surface, that is copied to dest where the tile
+          was, alpha and all.  If it returns None, nothing is copied, so
+          func can draw on the tile itself.
+        tile_size - the (width, height) of the tiles, or one number for
+                      square tiles.  Tiles on the right and bottom edges
+                      may be smaller.
+        dest - the Surface the results are copied to.  By default, a new
+                 Surface like surface.
+        num_workers, worker_queue - as for tmap.
+        Returns dest.
+
+        Only functions which release the GIL, like most of pygame.transform
+          and pygame.draw, run at the same time.
+    """
+    import pygame
+    from pygame.constants import SRCALPHA, BLEND_RGBA_ADD
+
+    try:
+        tile_w, tile_h = tile_size
+    except TypeError:
+        tile_w = tile_h = tile_size
+    tile_w, tile_h = int(tile_w), int(tile_h)
+    if tile_w < 1 or tile_h < 1:
+        raise ValueError("tile_size must be at least 1")
+
+    w, h = surface.get_size()
+    if dest is None:
+        dest = pygame.Surface((w, h), surface.get_flags() & SRCALPHA, surface)
+        colorkey = surface.get_colorkey()
+        if colorkey is not None:
+            dest.fill(colorkey)
+            dest.set_colorkey(colorkey)
+    elif dest.get_size() != (w, h):
+        raise ValueError("dest must be the same size as surface")
+
+    # subsurfaces are made here, as they need the GIL anyway.
+    tiles = []
+    for y in range(0, h, tile_h):
+        for x in range(0, w, tile_w):
+            rect = pygame.Rect(x, y, min(tile_w, w - x), min(tile_h, h - y))
+            tiles.append((surface.subsurface(rect), dest.subsurface(rect)))
+
+    def do_tile(tiles):
+        tile, dest_tile = tiles
+        result = func(tile)
+        if result is not None:
+            if result.get_flags() & SRCALPHA:
+                # adding to the cleared tile copies the pixels, alpha and all
+                dest_tile.fill((0, 0, 0, 0))
+                dest_tile.blit(result, (0, 0), None, BLEND_RGBA_ADD)
+            else:
+                dest_tile.blit(result, (0, 0))
+
+    # list, as tmap gives a lazy map when there are no workers.
+    list(tmap(do_tile, tiles, num_workers, worker_queue, chunksize = 1))
+    return dest
+
+
+def _run_chunk(f, chunk):
+    return [f(*args) for args in chunk]
+
+
+class Executor(_FuturesExecutor):
+    """ A concurrent.futures Executor which runs calls on a WorkerQueue.
+
+        max_workers - the number of threads, when a new WorkerQueue is made.
+                        By default, the number init() found or the number of
+                        cpus.
+        worker_queue - a WorkerQueue to use, rather than making one.  It is
+                        not stopped by shutdown().  If init() was called,
+                        its queue is used by default, unless init() found
+                        no workers were best.
+    """
+    def __init__(self, max_workers = None, worker_queue = None):
+        if Future is None:
+            raise NotImplementedError("Executor needs concurrent.futures")
+        self._own_queue = False
+        if (worker_queue is None and max_workers is None and _wq and
+                _wq.pool):
+            # a queue with no threads would never run the calls
+            worker_queue = _wq
+        if worker_queue is None:
+            if max_workers is None:
+                max_workers = _use_workers or _cpu_count()
+            if max_workers < 1:
+                raise ValueError("max_workers must be at least 1")
+            worker_queue = WorkerQueue(max_workers)
+            self._own_queue = True
+        self._wq = worker_queue
+        self._shutdown = False
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """ puts fn(*args, **kwargs) on the queue, returning a Future.
+        """
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future = Future()
+            self._wq.do(self._run, future, fn, args, kwargs)
+            return future
+
+    @staticmethod
+    def _run(future, fn, args, kwargs):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            future.set_exception(geterror())
+        else:
+            future.set_result(result)
+
+    def map(self, fn, *iterables, **kwargs):
+        """ like map, but the calls run on the queue, chunksize at a time.
+            map(fn, *iterables, timeout=None, chunksize=1) -> iterator
+        """
+        timeout = kwargs.pop('timeout', None)
+        chunksize = kwargs.pop('chunksize', 1)
+        if kwargs:
+            raise TypeError("unexpected keyword arguments: %s" %
+                            ', '.join(kwargs))
+        if chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+
+        args = list(zip(*iterables))
+        futures = [self.submit(_run_chunk, fn, args[i:i + chunksize])
+                   for i in range(0, len(args), chunksize)]
+        end_time = None if timeout is None else time.time() + timeout
+
+        def results():
+            try:
+                for future in futures:
+                    if end_time is None:
+                        chunk = future.result()
+                    else:
+                        chunk = future.result(end_time - time.time())
+                    for result in chunk:
+                        yield result
+            finally:
+                for future in futures:
+                    future.cancel()
+        return results()
+
+    def shutdown(self, wait = True):
+        """ no more calls can be submitted.  Stops the WorkerQueue if it
+              was made by the Executor.
+        """
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+        if self._own_queue:
+            if wait:
+                self._wq.stop()
+            else:
+                self._wq.queue.put(STOP)
+
+
+def pmap(f, seq_args, num_workers = 0, chunksize = None):
+    """ like map, but uses a pool of processes.
+        For pure python code, which threads can not run at the same time.
+        f and seq_args must be picklable, so f can not be a lambda.
+        num_workers - the number of processes, 0 for the number of cpus.
+                        The pool is kept for the next call, until quit().
+        chunksize - how many of seq_args are sent to a process at once.
+                      By default, there are about four chunks per process.
+    """
+    global _pool, _pool_workers
+    import multiprocessing
+
+    if num_workers < 0:
+        raise ValueError("num_workers must not be negative")
+    num_workers = num_workers or _cpu_count()
+    if _pool is None or _pool_workers != num_workers:
+        if _pool is not None:
+            _pool.terminate()
+            _pool.join()
+        _pool = multiprocessing.Pool(num_workers)
+        _pool_workers = num_workers
+
+    seq_args = list(seq_args)
+    if chunksize is None:
+        chunksize = max(-(-len(seq_args) // (num_workers * 4)), 1)
+    elif chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    return _pool.map(f, seq_args, chunksize)
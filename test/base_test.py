@@ -626,6 +626,56 @@ class BaseModuleTest(unittest.TestCase):
 
         self.assertFalse(pygame.get_init())
 
+    @unittest.skipIf(sys.version_info < (3, 7), 'needs module __getattr__')
+    def test_lazy_import(self):
+        """ see if PYGAME_LAZY_IMPORT leaves modules until they are used.
+        """
+        import os
+        import subprocess
+
+        code = '\n'.join([
+            "import sys, pygame",
+            "print('pygame.sprite' in sys.modules)",
+            "print(pygame.sprite.Group is not None)",
+            "print('pygame.sprite' in sys.modules)",
+            "print('sprite' in dir(pygame))",
+            "from pygame import time",
+            "print(time is pygame.time)",
+            "print(hasattr(pygame, 'no_such_module'))",
+        ])
+        env = dict(os.environ, PYGAME_LAZY_IMPORT='1',
+                   PYGAME_HIDE_SUPPORT_PROMPT='1')
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         env=env)
+        self.assertEqual(output.decode('ascii').split(),
+                         ['False', 'True', 'True', 'True', 'True', 'False'])
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'needs module __getattr__')
+    def test_lazy_import__after_init(self):
+        """ see if modules imported lazily after init() are initialized.
+        """
+        import os
+        import subprocess
+
+        code = '\n'.join([
+            "import sys, pygame",
+            "pygame.init()",
+            "print('pygame.mixer' in sys.modules)",
+            "import pygame.mixer",
+            "print(bool(pygame.mixer.get_init()))",
+            "from pygame import joystick",
+            "print(bool(joystick.get_init()))",
+            "pygame.quit()",
+            "import pygame.display",
+            "print(bool(pygame.display.get_init()))",
+        ])
+        env = dict(os.environ, PYGAME_LAZY_IMPORT='1',
+                   PYGAME_HIDE_SUPPORT_PROMPT='1', SDL_AUDIODRIVER='dummy')
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         env=env)
+        self.assertEqual(output.decode('ascii').split(),
+                         ['False', 'True', 'True', 'False'])
+
     def todo_test_segfault(self):
 
         # __doc__ (as of 2008-08-02) for pygame.base.segfault:
@@ -153,6 +153,130 @@ class BlitTest( unittest.TestCase ):
         dst = pygame.Surface((100, 10), SRCALPHA, 32)
         self.assertRaises(TypeError, dst.blits, [(pygame.Surface((10, 10), SRCALPHA, 32), None)])
 
+    def make_threads_blit_list(self):
+        """Overlapping and clipped blits of sources with different settings.
+        """
+        keyed = pygame.Surface((30, 20))
+        keyed.fill((255, 0, 0))
+        keyed.fill((0, 0, 0), (5, 5, 10, 10))
+        keyed.set_colorkey((0, 0, 0))
+        faded = pygame.Surface((15, 40), 0, 24)
+        faded.fill((0, 255, 0))
+        faded.set_alpha(100)
+        per_pixel = pygame.Surface((25, 25), SRCALPHA, 32)
+        per_pixel.fill((0, 0, 255, 128))
+        per_pixel.fill((255, 255, 0, 30), (0, 0, 10, 25))
+
+        blit_list = []
+        for i in range(60):
+            dest = (i * 7 % 110 - 20, i * 13 % 90 - 20)
+            blit_list.append((keyed, dest))
+            blit_list.append((faded, dest, (0, i % 30, 15, 20)))
+            blit_list.append((per_pixel, dest, None, BLEND_RGBA_ADD * (i % 2)))
+        return blit_list
+
+    def test_blits_threads(self):
+        """Threaded blits draw and return the same as serial ones."""
+        blit_list = self.make_threads_blit_list()
+        for flags, depth in ((SRCALPHA, 32), (0, 32), (0, 24), (0, 16)):
+            for clip in (None, (7, 13, 60, 51)):
+                expected = pygame.Surface((100, 80), flags, depth)
+                expected.fill((20, 40, 60, 80))
+                expected.set_clip(clip)
+                dst = expected.copy()
+                dst.set_clip(clip)
+
+                expected_rects = expected.blits(blit_list)
+
+                for threads in (0, 3, 1000):
+                    dst.fill((20, 40, 60, 80))
+                    rects = dst.blits(blit_list, threads=threads)
+
+                    self.assertEqual(rects, expected_rects)
+                    self.assertEqual(pygame.image.tostring(dst, 'RGBA'),
+                                     pygame.image.tostring(expected, 'RGBA'))
+
+    def test_blits_threads__subsurface(self):
+        """Blits a thread cannot take are still done."""
+        blit_list = self.make_threads_blit_list()
+        expected = pygame.Surface((100, 80), SRCALPHA, 32)
+        expected.subsurface((10, 10, 50, 50)).blits(blit_list)
+        dst = pygame.Surface((100, 80), SRCALPHA, 32)
+
+        rects = dst.subsurface((10, 10, 50, 50)).blits(blit_list, threads=4)
+
+        self.assertEqual(len(rects), len(blit_list))
+        self.assertEqual(pygame.image.tostring(dst, 'RGBA'),
+                         pygame.image.tostring(expected, 'RGBA'))
+
+    def test_blits_threads__locks(self):
+        """The surfaces are locked while drawn, and unlocked after."""
+        sheet = pygame.Surface((40, 20), SRCALPHA, 32)
+        sheet.fill((255, 0, 0, 255), (0, 0, 20, 20))
+        sheet.fill((0, 255, 0, 128), (20, 0, 20, 20))
+        images = [sheet.subsurface((0, 0, 20, 20)),
+                  sheet.subsurface((20, 0, 20, 20))]
+        blit_list = [(images[i % 2], (i * 9 % 90, i * 5 % 70))
+                     for i in range(40)]
+        expected = pygame.Surface((100, 80), SRCALPHA, 32)
+        expected.blits(blit_list)
+        dst = pygame.Surface((100, 80), SRCALPHA, 32)
+        version = dst._pixels_version
+
+        dst.blits(blit_list, threads=4)
+
+        self.assertEqual(pygame.image.tostring(dst, 'RGBA'),
+                         pygame.image.tostring(expected, 'RGBA'))
+        self.assertNotEqual(dst._pixels_version, version)
+        for surf in [dst, sheet] + images:
+            self.assertFalse(surf.get_locked())
+            self.assertEqual(surf.get_locks(), ())
+
+    def test_blits_threads__negative(self):
+        dst = pygame.Surface((100, 10), SRCALPHA, 32)
+        self.assertRaises(ValueError, dst.blits, [], threads=-1)
+
+    def blend_pixels(self, depth_masks, backend):
+        """The pixels of blits of each blend flag, done with backend."""
+        pygame.surface._set_blit_backend(backend)
+        pixels = []
+        for flags in (BLEND_RGBA_MULT, BLEND_ADD, BLEND_PREMULTIPLIED, 0):
+            for width in range(1, 18):
+                src = pygame.Surface((width, 3), SRCALPHA, *depth_masks)
+                dst = pygame.Surface((20, 5), SRCALPHA, *depth_masks)
+                for x in range(width):
+                    src.set_at((x, 0), (x * 15, 255, 100, x * 15))
+                    src.set_at((x, 1), (200, x * 15, 0, 128))
+                    src.set_at((x, 2), (0, 250, x * 15, 255 - x * 15))
+                for x in range(20):
+                    for y in range(5):
+                        dst.set_at((x, y), (x * 13, y * 50, 120, x * 13))
+                dst.blit(src, (1, 1), None, flags)
+                # an overlapping self blit, done right to left
+                dst.blit(dst, (2, 1), (0, 0, width, 3), flags)
+                pixels.append(pygame.image.tostring(dst, 'RGBA'))
+        return pixels
+
+    def test_blit_backends(self):
+        """The SIMD blitters give the same pixels as the generic one."""
+        original_backend = pygame.surface._get_blit_backend()
+        try:
+            for depth_masks in ((32,),
+                                (32, (0xFF, 0xFF00, 0xFF0000, 0xFF000000)),
+                                (32, (0xFF000000, 0xFF0000, 0xFF00, 0xFF))):
+                expected = self.blend_pixels(depth_masks, 'GENERIC')
+                for backend in ('SSE2', 'AVX2'):
+                    try:
+                        pixels = self.blend_pixels(depth_masks, backend)
+                    except ValueError:
+                        # not on this machine
+                        continue
+                    self.assertEqual(pixels, expected)
+        finally:
+            pygame.surface._set_blit_backend(original_backend)
+
+        self.assertRaises(ValueError, pygame.surface._set_blit_backend, 'MMX')
+
 
 
 if __name__ == '__main__':
@@ -642,6 +642,105 @@ class FreeTypeFontTest(unittest.TestCase):
         self.assertRaises(ValueError, font.render_to, surf, (0, 0),
                           'foobar', color, None, style=97, size=24)
 
+    def test_freetype_Font_render_to_many(self):
+        font = ft.Font(self._sans_path, 24)
+        items = [((10, 10), 'FoobarBaz', pygame.Color('red')),
+                 ((40, 60), 'FoobarBaz', pygame.Color('blue'),
+                  pygame.Color('white')),
+                 ((5, 120), 'Spam', (0, 255, 0)),
+                 ((200, 20), None),
+                 ((300, 300), '')]
+        expected = pygame.Surface((400, 400), 0, 32)
+        surf = expected.copy()
+
+        rects = [font.render_to(expected, *item) for item in items]
+        result = font.render_to_many(surf, items)
+        self.assertEqual(result, rects)
+        self.assertEqual(pygame.image.tostring(surf, 'RGB'),
+                         pygame.image.tostring(expected, 'RGB'))
+        self.assertEqual(font.render_to_many(surf, []), [])
+
+        # the keyword arguments apply to every item
+        rects = [font.render_to(expected, *item, size=12,
+                                style=ft.STYLE_STRONG)
+                 for item in items]
+        self.assertEqual(font.render_to_many(surf, items, size=12,
+                                             style=ft.STYLE_STRONG), rects)
+        self.assertEqual(pygame.image.tostring(surf, 'RGB'),
+                         pygame.image.tostring(expected, 'RGB'))
+
+        self.assertRaises(TypeError, font.render_to_many,
+                          "not a surface", items)
+        self.assertRaises(TypeError, font.render_to_many, surf, 42)
+        self.assertRaises(TypeError, font.render_to_many, surf, [(0, 0)])
+        self.assertRaises(TypeError, font.render_to_many, surf,
+                          [[(0, 0), 'text']])
+        self.assertRaises(TypeError, font.render_to_many, surf,
+                          [((0, 'a'), 'text')])
+        self.assertRaises(TypeError, font.render_to_many, surf,
+                          [((0, 0), 'text', 'not a color')])
+
+    def test_freetype_TextAtlas(self):
+        font = ft.Font(self._sans_path, 24)
+        background = (0, 0, 80)
+        expected = pygame.Surface((400, 200), 0, 32)
+        expected.fill(background)
+        surf = expected.copy()
+        items = [((10, 10), 'FoobarBaz', (255, 0, 0)),
+                 ((20, 60), 'Spam', (0, 255, 0)),
+                 ((30, 110), 'FoobarBaz', (255, 0, 0))]
+        for item in items:
+            font.render_to(expected, *item)
+
+        atlas = ft.TextAtlas(font)
+        rects = atlas.render_to_many(surf, items)
+        self.assertEqual(len(rects), 3)
+        self.assertEqual((atlas.hits, atlas.misses), (1, 2))
+        self.assertEqual(len(atlas), 2)
+
+        # blending through the atlas surface rounds a little differently
+        for x in range(400):
+            for y in range(200):
+                got = surf.get_at((x, y))
+                wanted = expected.get_at((x, y))
+                for i in range(3):
+                    self.assertAlmostEqual(got[i], wanted[i], delta=2)
+
+        area, offset = atlas.get('Spam', (0, 255, 0))
+        self.assertEqual(atlas.hits, 2)
+        self.assertEqual(offset, (0, 0))
+        self.assertEqual(area.size, font.get_rect('Spam').size)
+        atlas.get('Spam', pygame.Color(0, 255, 0))
+        self.assertEqual(atlas.hits, 3)
+
+        # the font settings are part of the key
+        atlas.get('Spam')
+        font.antialiased = False
+        atlas.get('Spam')
+        font.antialiased = True
+        font.fgcolor = (0, 255, 0)
+        self.assertEqual(atlas.get('Spam'), atlas.get('Spam', (0, 255, 0)))
+        self.assertEqual(len(atlas), 4)
+
+        # items can be an iterator, even when it has to be drawn twice
+        small = ft.TextAtlas(font, (160, 40))
+        many = [((0, i * 10), 'FoobarBaz %d' % i) for i in range(10)]
+        self.assertEqual(len(small.render_to_many(surf, iter(many))), 10)
+
+        atlas.clear()
+        self.assertEqual(len(atlas), 0)
+        font.origin = True
+        area, offset = atlas.get('Spam')
+        rect = font.get_rect('Spam')
+        self.assertEqual(offset, (rect.x, -rect.y))
+
+        # a full atlas is cleared, and still draws every string
+        small = ft.TextAtlas(font, (160, 40))
+        many = [((0, i * 10), 'FoobarBaz %d' % i) for i in range(10)]
+        self.assertEqual(len(small.render_to_many(surf, many)), 10)
+        self.assertTrue(len(small) < 10)
+        self.assertRaises(ValueError, small.get, 'FoobarBaz' * 10)
+
     def test_freetype_Font_render(self):
 
         font = self._TEST_FONTS['sans']
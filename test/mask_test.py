@@ -1,5 +1,7 @@
 from collections import OrderedDict
+import math
 import random
+import struct
 import unittest
 import sys
 
@@ -841,6 +843,89 @@ class MaskTypeTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             overlap_mask = mask1.overlap_mask(mask2, offset)
 
+    def test_overlap__wide_masks(self):
+        """Ensure the overlap methods agree on masks many words wide and
+        tall, at offsets on and off the word boundaries."""
+        random.seed(11)
+        mask1 = random_mask((200, 45))
+        mask2 = random_mask((150, 37))
+        mask2.invert()
+
+        for offset in ((0, 0), (64, 3), (-64, -3), (37, 8), (-37, -8),
+                       (130, -20), (-100, 30), (199, 44), (-149, -36)):
+            overlap_mask = mask1.overlap_mask(mask2, offset)
+            expected_count = 0
+
+            for x in range(200):
+                for y in range(45):
+                    bit = mask1.get_at((x, y))
+                    x2, y2 = x - offset[0], y - offset[1]
+                    if 0 <= x2 < 150 and 0 <= y2 < 37:
+                        bit = bit and mask2.get_at((x2, y2))
+                    else:
+                        bit = 0
+                    expected_count += bit
+                    self.assertEqual(overlap_mask.get_at((x, y)), bit,
+                                     (offset, x, y))
+
+            self.assertEqual(mask1.overlap_area(mask2, offset),
+                             expected_count, offset)
+            overlap_pos = mask1.overlap(mask2, offset)
+            self.assertEqual(overlap_pos is not None, expected_count > 0)
+            if overlap_pos is not None:
+                self.assertEqual(overlap_mask.get_at(overlap_pos), 1)
+
+    def test_overlap_batch(self):
+        """Ensure overlap_batch gives the masks overlap() would find."""
+        random.seed(7)
+        mask = random_mask((90, 70))
+        others = [random_mask((random.randint(1, 80), random.randint(1, 80)))
+                  for _ in range(10)]
+        others.append(pygame.mask.Mask((20, 20)))
+        masks, offsets = [], []
+        for x in range(-100, 110, 23):
+            for y in range(-90, 80, 19):
+                masks.append(others[(x + y) % len(others)])
+                offsets.append((x, y))
+        expected_points = [(i, mask.overlap(m, o)) for i, (m, o)
+                           in enumerate(zip(masks, offsets))
+                           if mask.overlap(m, o) is not None]
+
+        hits = mask.overlap_batch(masks, offsets)
+        points = mask.overlap_batch(tuple(masks), tuple(offsets), points=True)
+
+        self.assertTrue(0 < len(hits) < len(masks))
+        self.assertEqual(hits, [i for i, _ in expected_points])
+        self.assertEqual(points, expected_points)
+
+    def test_overlap_batch__empty(self):
+        """Ensure overlap_batch handles empty sequences and masks."""
+        mask = pygame.mask.Mask((10, 10), fill=True)
+
+        self.assertEqual(mask.overlap_batch([], []), [])
+        self.assertEqual(mask.overlap_batch([pygame.mask.Mask((0, 5)),
+                                             pygame.mask.Mask((5, 5))],
+                                            [(0, 0), (2, 2)]), [])
+        self.assertEqual(mask.overlap_batch([pygame.mask.Mask((3, 3),
+                                                              fill=True)],
+                                            [[9, 9]], points=True),
+                         [(0, (9, 9))])
+
+    def test_overlap_batch__invalid_args(self):
+        """Ensure overlap_batch handles invalid arguments correctly."""
+        mask = pygame.mask.Mask((10, 10))
+        other = pygame.mask.Mask((10, 10))
+
+        with self.assertRaises(ValueError):
+            mask.overlap_batch([other, other], [(0, 0)])
+        with self.assertRaises(TypeError):
+            mask.overlap_batch([other, pygame.Surface((10, 10))],
+                               [(0, 0), (1, 1)])
+        with self.assertRaises(TypeError):
+            mask.overlap_batch([other], ['(0, 0)'])
+        with self.assertRaises(TypeError):
+            mask.overlap_batch(other, (0, 0))
+
     def test_mask_access( self ):
         """ do the set_at, and get_at parts work correctly?
         """
@@ -1757,6 +1842,147 @@ class MaskTypeTest(unittest.TestCase):
         for mask in comps:
             self.assertIsInstance(mask, pygame.mask.Mask)
 
+    def test_connected_components__min(self):
+        """Ensures the min arg counts all the bits of a component."""
+        #  |01234
+        # -+-----
+        # 0|10101
+        # 1|10010
+        # 2|01110
+        mask = pygame.mask.Mask((5, 3))
+        for pt in ((0, 0), (2, 0), (4, 0), (0, 1), (3, 1), (1, 2), (2, 2),
+                   (3, 2)):
+            mask.set_at(pt)
+
+        for min_count in range(9):
+            comps = mask.connected_components(min_count)
+
+            self.assertEqual(len(comps), 1, 'min={}'.format(min_count))
+            self._assertMaskEqual(comps[0], mask)
+
+        self.assertListEqual(mask.connected_components(9), [])
+
+    def test_connected_components__width_1(self):
+        """Ensures connected_components works on masks 1 bit wide."""
+        mask = pygame.mask.Mask((1, 20))
+        for y in range(0, 20, 2):
+            mask.set_at((0, y))
+
+        comps = mask.connected_components()
+
+        self.assertEqual(len(comps), 10)
+        for y, comp in enumerate(comps):
+            self.assertEqual(comp.count(), 1)
+            self.assertEqual(comp.get_at((0, y * 2)), 1)
+
+        comps = pygame.mask.Mask((1, 20), fill=True).connected_components()
+
+        self.assertEqual(len(comps), 1)
+        self.assertEqual(comps[0].count(), 20)
+
+    def test_connected_components__threads(self):
+        """Ensures connected_components gives the same components with any
+        number of threads."""
+        random.seed(12)
+
+        for size in ((1, 1), (1, 17), (17, 1), (31, 40), (70, 9)):
+            mask = random_mask(size)
+            expected_comps = mask.connected_components()
+
+            for threads in (0, 2, 3, 7, 50):
+                for min_count in (0, 3):
+                    msg = 'size={}, threads={}, min={}'.format(
+                        size, threads, min_count)
+                    comps = mask.connected_components(min_count,
+                                                      threads=threads)
+                    expected = [comp for comp in expected_comps
+                                if comp.count() >= min_count]
+
+                    self.assertEqual(len(comps), len(expected), msg)
+                    for comp, expected_comp in zip(comps, expected):
+                        self._assertMaskEqual(comp, expected_comp, msg)
+
+    def test_connected_components__compact(self):
+        """Ensures connected_components(compact=True) labels the components
+        and gives their stats."""
+        #  |012345
+        # -+------
+        # 0|110001
+        # 1|100010
+        # 2|000000
+        # 3|011100
+        width, height = size = (6, 4)
+        mask = pygame.mask.Mask(size)
+        for pt in ((0, 0), (1, 0), (0, 1), (5, 0), (4, 1), (1, 3), (2, 3),
+                   (3, 3)):
+            mask.set_at(pt)
+        expected_labels = [[1, 1, 0, 0, 0, 2],
+                           [1, 0, 0, 0, 2, 0],
+                           [0, 0, 0, 0, 0, 0],
+                           [0, 3, 3, 3, 0, 0]]
+        expected_stats = [(3, pygame.Rect(0, 0, 2, 2), (0, 0)),
+                          (2, pygame.Rect(4, 0, 2, 2), (4, 0)),
+                          (3, pygame.Rect(1, 3, 3, 1), (2, 3))]
+
+        for threads in (1, 2, 4):
+            labels, stats = mask.connected_components(threads=threads,
+                                                      compact=True)
+            values = struct.unpack('={}I'.format(width * height), labels.raw)
+            interface = labels.__array_interface__
+
+            self.assertIsInstance(labels, pygame.BufferProxy)
+            self.assertEqual(interface['shape'], size)
+            self.assertEqual(interface['strides'], (4, 4 * width))
+            self.assertTrue(interface['data'][1])
+            self.assertEqual(
+                [list(values[y * width:(y + 1) * width])
+                 for y in range(height)], expected_labels)
+            self.assertListEqual(stats, expected_stats)
+
+        labels, stats = mask.connected_components(3, compact=True)
+        values = struct.unpack('={}I'.format(width * height), labels.raw)
+
+        self.assertEqual(values.count(1), 3)
+        self.assertEqual(values.count(2), 3)
+        self.assertEqual(values.count(0), width * height - 6)
+        self.assertListEqual(stats, [expected_stats[0], expected_stats[2]])
+
+    def test_connected_components__compact_matches_masks(self):
+        """Ensures the compact labels match the component masks."""
+        random.seed(13)
+        size = width, height = (37, 23)
+        mask = random_mask(size)
+        comps = mask.connected_components(2)
+
+        labels, stats = mask.connected_components(2, compact=True)
+        values = struct.unpack('={}I'.format(width * height), labels.raw)
+
+        self.assertEqual(len(stats), len(comps))
+        for label, (comp, stat) in enumerate(zip(comps, stats), 1):
+            self.assertEqual(stat, (comp.count(), comp.get_bounding_rects()[0],
+                                    comp.centroid()))
+            for y in range(height):
+                for x in range(width):
+                    self.assertEqual(values[y * width + x] == label,
+                                     comp.get_at((x, y)) == 1)
+
+    def test_connected_components__compact_empty(self):
+        """Ensures compact connected_components works with no components."""
+        for size in ((0, 0), (0, 4), (4, 0), (4, 3)):
+            labels, stats = pygame.mask.Mask(size).connected_components(
+                compact=True)
+
+            self.assertEqual(labels.__array_interface__['shape'], size)
+            self.assertEqual(labels.raw, b'\x00' * (4 * size[0] * size[1]))
+            self.assertListEqual(stats, [])
+
+    def test_connected_components__invalid_threads(self):
+        """Ensures connected_components handles negative threads."""
+        mask = pygame.mask.Mask((5, 5), fill=True)
+
+        with self.assertRaises(ValueError):
+            mask.connected_components(threads=-1)
+
     def test_get_bounding_rects(self):
         """Ensures get_bounding_rects works correctly."""
         # Create masks with different set point groups. Each group of
@@ -1851,6 +2077,408 @@ class MaskTypeTest(unittest.TestCase):
             self.assertListEqual(sorted(mask.get_bounding_rects(), key=tuple),
                                  expected_rects, 'size={}'.format(size))
 
+    def _distance_field_values(self, mask, limit=32):
+        """Returns the distance field of the mask as a list of rows."""
+        width, height = mask.get_size()
+        values = struct.unpack('={}f'.format(width * height),
+                               mask.distance_field(limit).raw)
+        return [list(values[y * width:(y + 1) * width])
+                for y in range(height)]
+
+    def _expected_distance_field(self, mask, limit):
+        """Works out the distance field of the mask the slow way."""
+        width, height = mask.get_size()
+        points = ([], [])
+        for y in range(height):
+            for x in range(width):
+                points[mask.get_at((x, y))].append((x, y))
+        rows = []
+        for y in range(height):
+            row = []
+            for x in range(width):
+                bit = mask.get_at((x, y))
+                dist = min([math.hypot(x - px, y - py)
+                            for px, py in points[1 - bit]] + [limit])
+                row.append(-dist if bit else dist)
+            rows.append(row)
+        return rows
+
+    def _assertDistanceFieldEqual(self, mask, limit, msg=None):
+        expected = self._expected_distance_field(mask, limit)
+        for row, expected_row in zip(
+                self._distance_field_values(mask, limit), expected):
+            for value, expected_value in zip(row, expected_row):
+                self.assertAlmostEqual(value, expected_value, places=4,
+                                       msg=msg)
+
+    def test_distance_field(self):
+        """Ensures distance_field gives the signed distances."""
+        #  |01234
+        # -+-----
+        # 0|00000
+        # 1|01110
+        # 2|01110
+        # 3|00000
+        mask = pygame.mask.Mask((5, 4))
+        mask.draw(pygame.mask.Mask((3, 2), fill=True), (1, 1))
+        root2 = math.sqrt(2)
+        expected = [[root2, 1, 1, 1, root2],
+                    [1, -1, -1, -1, 1],
+                    [1, -1, -1, -1, 1],
+                    [root2, 1, 1, 1, root2]]
+
+        field = mask.distance_field()
+        values = self._distance_field_values(mask)
+
+        self.assertIsInstance(field, pygame.BufferProxy)
+        self.assertEqual(field.__array_interface__['shape'], (5, 4))
+        self.assertEqual(field.__array_interface__['strides'], (4, 20))
+        for row, expected_row in zip(values, expected):
+            for value, expected_value in zip(row, expected_row):
+                self.assertAlmostEqual(value, expected_value, places=5)
+
+    def test_distance_field__limit(self):
+        """Ensures distance_field clamps the distances to the limit."""
+        random.seed(21)
+
+        for limit in (1, 2, 5):
+            mask = pygame.mask.Mask((17, 13))
+            for i in range(12):
+                mask.set_at((random.randrange(17), random.randrange(13)))
+
+            self._assertDistanceFieldEqual(mask, limit, 'limit={}'.format(
+                limit))
+
+        for size in ((9, 7), (0, 5), (5, 0)):
+            for fill in (False, True):
+                mask = pygame.mask.Mask(size, fill=fill)
+
+                self._assertDistanceFieldEqual(mask, 4, 'size={}'.format(size))
+
+    def test_distance_field__changes(self):
+        """Ensures the distance field follows changes to the mask."""
+        random.seed(22)
+        size = width, height = (40, 30)
+        limit = 6
+        mask = random_mask(size)
+        other = pygame.mask.Mask((5, 4), fill=True)
+        mask.distance_field(limit)
+
+        for method, args in (('draw', (other, (3, 4))),
+                             ('erase', (other, (20, 10))),
+                             ('draw', (other, (-2, 27))),
+                             ('erase', (other, (38, -1))),
+                             ('set_at', ((30, 20), 0)),
+                             ('set_at', ((12, 25), 1)),
+                             ('invert', ()),
+                             ('clear', ()),
+                             ('fill', ())):
+            getattr(mask, method)(*args)
+
+            self._assertDistanceFieldEqual(mask, limit, method)
+
+        output = pygame.mask.Mask(size)
+        output.distance_field(limit)
+        mask.convolve(other, output, (5, 5))
+
+        self._assertDistanceFieldEqual(output, limit, 'convolve')
+
+    def test_distance_field__init_again(self):
+        """Ensures the distance field follows a mask made again by
+        __init__."""
+        limit = 4
+        mask = pygame.mask.Mask((12, 8))
+        mask.distance_field(limit)
+
+        for size, fill in (((12, 8), True), ((8, 12), False),
+                           ((8, 12), True), ((3, 5), False)):
+            mask.__init__(size, fill=fill)
+
+            self.assertEqual(mask.get_size(), size)
+            self._assertDistanceFieldEqual(mask, limit, 'size={} fill={}'
+                                           .format(size, fill))
+
+    def test_distance_field__copy(self):
+        """Ensures the returned distance field does not change with the
+        mask."""
+        mask = pygame.mask.Mask((6, 6))
+        field = mask.distance_field(3)
+        raw = field.raw
+
+        mask.set_at((2, 2))
+
+        self.assertEqual(field.raw, raw)
+        self.assertNotEqual(mask.distance_field(3).raw, raw)
+
+    def test_distance_field__invalid_limit(self):
+        """Ensures distance_field handles invalid limits."""
+        mask = pygame.mask.Mask((5, 5))
+
+        for limit in (0, -3):
+            with self.assertRaises(ValueError):
+                mask.distance_field(limit)
+
+        with self.assertRaises(TypeError):
+            mask.distance_field('3')
+
+    def test_raycast(self):
+        """Ensures raycast finds the first set bit along a ray."""
+        mask = pygame.mask.Mask((10, 8))
+        mask.set_at((7, 3))
+        mask.set_at((2, 6))
+
+        for args, expected in ((((0, 3), (1, 0)), (7, 3)),
+                               (((0.5, 3.5), (5, 0)), (7, 3)),
+                               (((9.5, 3.5), (-1, 0)), (7, 3)),
+                               (((7.5, 0.5), (0, 1)), (7, 3)),
+                               (((0.5, 0.5), (1, 1)), None),
+                               (((7.5, 3.5), (0, -1)), (7, 3)),
+                               (((-20, 6.5), (1, 0)), (2, 6)),
+                               (((2.5, 50), (0, -1)), (2, 6)),
+                               (((0, 0), (2, 6)), (2, 6)),
+                               (((0, 4), (1, 0)), None),
+                               (((-1, -1), (-1, 0)), None),
+                               (((0, 3), (1, 0), 6.9), None),
+                               (((0, 3), (1, 0), 7), (7, 3)),
+                               (((0, 3), (1, 0), None), (7, 3))):
+            self.assertEqual(mask.raycast(*args), expected, args)
+
+        self.assertEqual(mask.raycast(origin=Vector2(0, 3),
+                                      direction=Vector2(1, 0), max_dist=10),
+                         (7, 3))
+        self.assertIsNone(pygame.mask.Mask((0, 0)).raycast((0, 0), (1, 1)))
+
+    def test_raycast__distance_field(self):
+        """Ensures raycast finds the same bits with a distance field."""
+        random.seed(23)
+        width, height = size = (150, 110)
+        mask = pygame.mask.Mask(size)
+        block = pygame.mask.Mask((6, 4), fill=True)
+        for i in range(25):
+            mask.draw(block, (random.randrange(width),
+                              random.randrange(height)))
+        rays = [((random.uniform(-20, width + 20),
+                  random.uniform(-20, height + 20)),
+                 (random.uniform(-1, 1), random.uniform(-1, 1)))
+                for i in range(300)]
+        rays += [((x + 0.5, 55.5), direction) for x in range(0, width, 10)
+                 for direction in ((1, 0), (-1, 0), (0, 1), (0, -1))]
+
+        for limit in (1, 8, 40):
+            field_mask = pygame.mask.Mask(size)
+            field_mask.draw(mask, (0, 0))
+            field_mask.distance_field(limit)
+
+            self.assertEqual([field_mask.raycast(*ray) for ray in rays],
+                             [mask.raycast(*ray) for ray in rays],
+                             'limit={}'.format(limit))
+
+            # Still the same after changes.
+            field_mask.draw(block, (70, 50))
+            field_mask.erase(block, (limit * 2, 30))
+            mask.draw(block, (70, 50))
+            mask.erase(block, (limit * 2, 30))
+
+            self.assertEqual([field_mask.raycast(*ray) for ray in rays],
+                             [mask.raycast(*ray) for ray in rays],
+                             'limit={}'.format(limit))
+
+    def test_raycast__invalid_args(self):
+        """Ensures raycast handles invalid args."""
+        mask = pygame.mask.Mask((5, 5))
+
+        with self.assertRaises(ValueError):
+            mask.raycast((1, 1), (0, 0))
+
+        with self.assertRaises(ValueError):
+            mask.raycast((1, 1), (1, 0), -1)
+
+        for args in (((1,), (1, 0)), ((1, 1), 'ab'), ((1, 1), (1, 0), '5')):
+            with self.assertRaises(TypeError):
+                mask.raycast(*args)
+
+    def test_raycast_many(self):
+        """Ensures raycast_many gives the result of raycast for each ray."""
+        random.seed(24)
+        mask = random_mask((30, 20))
+        mask.erase(pygame.mask.Mask((10, 8), fill=True), (10, 6))
+        origins = [(random.uniform(0, 30), random.uniform(0, 20))
+                   for i in range(50)]
+        directions = [(random.uniform(-1, 1), random.uniform(-1, 1))
+                      for i in range(50)]
+
+        for max_dist in (None, 3):
+            expected = [mask.raycast(origin, direction, max_dist)
+                        for origin, direction in zip(origins, directions)]
+
+            self.assertEqual(mask.raycast_many(origins, directions, max_dist),
+                             expected)
+
+        self.assertEqual(mask.raycast_many([], []), [])
+
+    def test_raycast_many__threads(self):
+        """Ensures a mask is not changed under raycast_many in another
+        thread."""
+        import threading
+
+        mask = pygame.mask.Mask((200, 200))
+        mask.set_at((199, 100))
+        mask.distance_field()
+        count = 20000
+        origins = [(0, 100)] * count
+        directions = [(1, 0)] * count
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(mask.raycast_many(origins,
+                                                            directions)))
+
+        thread.start()
+        sizes = ((150, 200), (200, 200))
+        i = 0
+        while thread.is_alive():
+            try:
+                mask.__init__(sizes[i % 2])
+                mask.distance_field()
+            except RuntimeError:
+                pass
+            i += 1
+        thread.join()
+
+        # the bits the rays were cast on were not freed, or changed in size
+        self.assertEqual(len(results[0]), count)
+        self.assertEqual(set(results[0]), {(199, 100)})
+
+    def test_raycast_many__invalid_args(self):
+        """Ensures raycast_many handles invalid args."""
+        mask = pygame.mask.Mask((5, 5))
+
+        with self.assertRaises(ValueError):
+            mask.raycast_many([(1, 1), (2, 2)], [(1, 0)])
+
+        with self.assertRaises(ValueError):
+            mask.raycast_many([(1, 1)], [(0, 0)])
+
+        for args in ((3, [(1, 0)]), ([(1, 1)], [None])):
+            with self.assertRaises(TypeError):
+                mask.raycast_many(*args)
+
+    def _mask_bits(self, mask):
+        width, height = mask.get_size()
+        return [[mask.get_at((x, y)) for x in range(width)]
+                for y in range(height)]
+
+    def _surface_bits(self, surface, threshold):
+        """The bits from_surface should set, found pixel by pixel."""
+        width, height = surface.get_size()
+        colorkey = surface.get_colorkey()
+        if colorkey is not None:
+            key = surface.map_rgb(colorkey)
+            return [[int(surface.get_at_mapped((x, y)) != key)
+                     for x in range(width)] for y in range(height)]
+        return [[int(surface.get_at((x, y)).a > threshold)
+                 for x in range(width)] for y in range(height)]
+
+    def _random_fills(self, surface, colors):
+        width, height = surface.get_size()
+        for i in range(4 * width // 3 + 4):
+            surface.fill(random.choice(colors),
+                         (random.randint(-2, width - 1),
+                          random.randint(-1, height - 1),
+                          random.randint(1, 30), random.randint(1, 3)))
+
+    def test_update_from_surface(self):
+        """Ensures update_from_surface sets the bits by the pixels' alpha."""
+        random.seed(31)
+        # Around and between the 4 pixel and mask word boundaries, so rows
+        # end part way through words.
+        sizes = ((1, 3), (3, 2), (31, 5), (33, 4), (67, 3), (150, 7))
+        colors = [(random.randint(0, 255), random.randint(0, 255),
+                   random.randint(0, 255), random.randint(0, 255))
+                  for i in range(8)] + [(1, 2, 3, 127), (1, 2, 3, 128)]
+
+        for size in sizes:
+            for depth, flags in ((32, SRCALPHA), (32, 0), (24, 0),
+                                 (16, SRCALPHA), (8, 0)):
+                surface = pygame.Surface(size, flags, depth)
+                self._random_fills(surface, colors)
+
+                for threshold in (-1, 0, 127, 200, 255):
+                    mask = pygame.mask.Mask(size, fill=True)
+
+                    self.assertIsNone(mask.update_from_surface(surface,
+                                                               threshold))
+                    self.assertEqual(
+                        self._mask_bits(mask),
+                        self._surface_bits(surface, threshold),
+                        "size=%s depth=%d threshold=%d"
+                        % (size, depth, threshold))
+
+    def test_update_from_surface__colorkey(self):
+        """Ensures update_from_surface uses the surface's colorkey."""
+        random.seed(37)
+        key = (10, 20, 30)
+        colors = [key, (200, 0, 0), (0, 0, 248), (10, 20, 38)]
+
+        for size in ((1, 2), (3, 3), (31, 4), (33, 2), (70, 3)):
+            for depth in (32, 24, 16, 8):
+                surface = pygame.Surface(size, 0, depth)
+                surface.fill(key)
+                self._random_fills(surface, colors)
+                surface.set_colorkey(key)
+                mask = pygame.mask.Mask(size, fill=True)
+
+                mask.update_from_surface(surface, 255)
+
+                self.assertEqual(self._mask_bits(mask),
+                                 self._surface_bits(surface, 255),
+                                 "size=%s depth=%d" % (size, depth))
+
+        # by hand, for one which is not random
+        surface = pygame.Surface((70, 3), 0, 32)
+        surface.fill(key)
+        surface.fill((200, 0, 0), (5, 1, 63, 1))
+        surface.set_colorkey(key)
+        mask = pygame.mask.Mask((70, 3), fill=True)
+
+        mask.update_from_surface(surface)
+
+        self.assertEqual(mask.count(), 63)
+        self.assertEqual(mask.get_bounding_rects(),
+                         [pygame.Rect((5, 1), (63, 1))])
+
+    def test_update_from_surface__rect(self):
+        """Ensures update_from_surface only changes the bits in the rect."""
+        size = width, height = (100, 10)
+        surface = pygame.Surface(size, SRCALPHA, 32)
+        limit = 4
+
+        for rect in ((60, 2, 20, 5), (-5, -5, 200, 8), (90, 8, 30, 30),
+                     (0, 0, 0, 0), (200, 0, 5, 5)):
+            mask = pygame.mask.Mask(size, fill=True)
+            mask.distance_field(limit)
+            clipped = pygame.Rect(rect).clip((0, 0, width, height))
+
+            mask.update_from_surface(surface, rect=rect)
+
+            for y in range(height):
+                for x in range(width):
+                    self.assertEqual(mask.get_at((x, y)),
+                                     0 if clipped.collidepoint(x, y) else 1,
+                                     (rect, x, y))
+
+            self._assertDistanceFieldEqual(mask, limit, rect)
+
+    def test_update_from_surface__invalid_args(self):
+        """Ensures update_from_surface handles invalid args."""
+        mask = pygame.mask.Mask((5, 5))
+
+        with self.assertRaises(ValueError):
+            mask.update_from_surface(pygame.Surface((5, 6)))
+
+        for args in ((None,), (pygame.Surface((5, 5)), 127, 'rect')):
+            with self.assertRaises(TypeError):
+                mask.update_from_surface(*args)
+
     def test_to_surface(self):
         """Ensures masks can be drawn onto surfaces."""
         expected_color = pygame.Color('blue')
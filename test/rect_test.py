@@ -1,5 +1,10 @@
+import array
+import sys
 import unittest
-from pygame import Rect
+from pygame import Rect, Region
+
+# array.array only exports the new buffer interface in Python 3
+PACKED_ARRAYS = sys.version_info >= (3, 3)
 
 class RectTypeTest(unittest.TestCase):
     def testConstructionXYWidthHeight(self):
@@ -635,6 +640,89 @@ class RectTypeTest(unittest.TestCase):
         f = [Rect(50, 50, 1, 1), Rect(20, 20, 5, 5)]
         self.assertFalse(r.collidelistall(f))
 
+    @unittest.skipIf(not PACKED_ARRAYS, "needs the new buffer interface")
+    def test_collidelist__packed_array(self):
+        r = Rect(1, 1, 10, 10)
+        packed = array.array('i', [50, 50, 1, 1, 5, 5, 10, 10, 15, 15, 1, 1])
+
+        self.assertEqual(r.collidelist(packed), 1)
+        self.assertEqual(r.collidelist(array.array('i', [100, 100, 4, 4])), -1)
+        self.assertEqual(r.collidelist(array.array('i')), -1)
+
+        # 64 bit integers are accepted too
+        packed = array.array('q', [50, 50, 1, 1, 5, 5, 10, 10])
+        self.assertEqual(r.collidelist(packed), 1)
+
+    @unittest.skipIf(not PACKED_ARRAYS, "needs the new buffer interface")
+    def test_collidelistall__packed_array(self):
+        r = Rect(1, 1, 10, 10)
+        rects = [(1, 1, 10, 10), (5, 5, 10, 10), (15, 15, 1, 1), (2, 2, 1, 1)]
+        packed = array.array('i', [v for rect in rects for v in rect])
+
+        self.assertEqual(r.collidelistall(packed), [0, 1, 3])
+        self.assertEqual(r.collidelistall(packed), r.collidelistall(rects))
+
+        # other arrays are sequences, so a flat one must hold whole rects
+        self.assertRaises(TypeError, r.collidelistall,
+                          array.array('i', [1, 2, 3]))
+
+    @unittest.skipIf(not PACKED_ARRAYS, "needs the new buffer interface")
+    def test_collidelist__packed_array_out_of_range(self):
+        r = Rect(1, 1, 10, 10)
+        packed = array.array('q', [5, 5, 10, 10, 2 ** 32 + 5, 5, 10, 10])
+
+        self.assertRaises(ValueError, r.collidelist, packed)
+        self.assertRaises(ValueError, r.collidelistall, packed)
+        self.assertRaises(ValueError, Rect.collide_pairs, [r], packed)
+
+    def test_collidelist__rows_array(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("needs numpy")
+        r = Rect(1, 1, 10, 10)
+        # an array of ((x, y), (w, h)) rect style items, not a packed array
+        rows = numpy.array([[[50, 50], [1, 1]], [[5, 5], [10, 10]]],
+                           dtype=numpy.int32)
+
+        self.assertEqual(r.collidelist(rows), 1)
+        self.assertEqual(r.collidelistall(rows), [1])
+
+    def test_collide_pairs(self):
+        rects_a = [Rect(0, 0, 10, 10), Rect(100, 100, 5, 5),
+                   Rect(5, 5, 50, 1)]
+        rects_b = [(50, 0, 10, 10), (2, 2, 2, 2), (8, -5, 100, 20),
+                   (200, 200, 1, 1)]
+
+        pairs = Rect.collide_pairs(rects_a, rects_b)
+
+        self.assertIsInstance(pairs, array.array)
+        self.assertEqual(list(pairs), [0, 1, 0, 2, 2, 0, 2, 2])
+
+        self.assertEqual(len(Rect.collide_pairs(rects_a, [])), 0)
+
+        if PACKED_ARRAYS:
+            packed_b = array.array('i', [v for rect in rects_b for v in rect])
+            self.assertEqual(Rect.collide_pairs(rects_a, packed_b), pairs)
+
+    def test_collide_pairs__matches_collidelistall(self):
+        rects_a = [Rect((i * 37) % 200, (i * 91) % 200,
+                        (i * 13) % 30, (i * 17) % 30) for i in range(60)]
+        rects_b = [Rect((i * 53) % 200 - 10, (i * 29) % 200 - 10,
+                        (i * 7) % 60 - 5, (i * 11) % 60) for i in range(80)]
+
+        expected = []
+        for a, rect in enumerate(rects_a):
+            for b in rect.collidelistall(rects_b):
+                expected.extend((a, b))
+
+        self.assertEqual(list(Rect.collide_pairs(rects_a, rects_b)), expected)
+
+    def test_collide_pairs__invalid_args(self):
+        self.assertRaises(TypeError, Rect.collide_pairs, [Rect(0, 0, 1, 1)],
+                          [1, 2])
+        self.assertRaises(TypeError, Rect.collide_pairs, 1, [])
+
 
     def test_fit(self):
 
@@ -718,6 +806,175 @@ class RectTypeTest(unittest.TestCase):
         self.assertEqual(r, [14, 13, 12, 11])
 
 
+class RegionTypeTest(unittest.TestCase):
+
+    def _random_rects(self, count, seed):
+        import random
+        rng = random.Random(seed)
+        return [Rect(rng.randrange(200), rng.randrange(200),
+                     rng.randrange(1, 40), rng.randrange(1, 40))
+                for i in range(count)]
+
+    def _pixels(self, rects):
+        pixels = set()
+        for r in rects:
+            for x in range(r.left, r.right):
+                for y in range(r.top, r.bottom):
+                    pixels.add((x, y))
+        return pixels
+
+    def _assert_disjoint(self, rects):
+        for i, r in enumerate(rects):
+            self.assertEqual(r.collidelist(rects[i + 1:]), -1)
+
+    def test_empty(self):
+        region = Region()
+        self.assertEqual(region.rects(), [])
+        self.assertEqual(len(region), 0)
+
+    def test_add__ignores_empty(self):
+        region = Region()
+        region.add(Rect(10, 10, 0, 5))
+        region.add((10, 10, 5, 0))
+        self.assertEqual(region.rects(), [])
+
+    def test_add__normalizes(self):
+        region = Region()
+        region.add((10, 10, -5, -5))
+        self.assertEqual(region.rects(), [Rect(5, 5, 5, 5)])
+
+    def test_add__invalid_arg(self):
+        region = Region()
+        self.assertRaises(TypeError, region.add, "rect")
+        self.assertRaises(TypeError, region.add, (1, 2, 3))
+
+    def test_rects__overlapping_merged(self):
+        region = Region()
+        region.add(Rect(0, 0, 10, 10))
+        region.add(Rect(5, 5, 10, 10))
+        region.add(Rect(50, 50, 10, 10))
+        self.assertEqual(sorted(region.rects()),
+                         [Rect(0, 0, 15, 15), Rect(50, 50, 10, 10)])
+        self.assertEqual(len(region), 2)
+
+    def test_rects__chained_merges(self):
+        # merging the last two rects makes a box overlapping the first
+        region = Region()
+        region.add(Rect(0, 20, 10, 10))
+        region.add(Rect(20, 0, 10, 10))
+        region.add(Rect(5, 5, 20, 20))
+        self.assertEqual(region.rects(), [Rect(0, 0, 30, 30)])
+
+    def test_rects__merge_reaches_back(self):
+        # the sweep has passed the first rect when the last two are merged
+        # into a box reaching back over it
+        region = Region()
+        region.add(Rect(0, 0, 10, 10))
+        region.add(Rect(5, 20, 95, 10))
+        region.add(Rect(50, 5, 10, 20))
+        self.assertEqual(region.rects(), [Rect(0, 0, 100, 30)])
+
+    def test_rects__stacked(self):
+        # rects touching but not overlapping are kept apart
+        rects = [Rect(i % 3, i * 2, 10 + i, 2) for i in range(300)]
+        region = Region()
+        for r in reversed(rects):
+            region.add(r)
+        self.assertEqual(sorted(region.rects()), sorted(rects))
+
+        # a tall rect merges the rects of the rows it crosses
+        tall = Rect(0, 101, 1, 400)
+        region.add(tall)
+        crossed = tall.unionall(rects[50:251])
+        self.assertEqual(sorted(region.rects()),
+                         sorted(rects[:50] + [crossed] + rects[251:]))
+
+    def test_rects__bbox_disjoint(self):
+        rects = self._random_rects(200, 1)
+        region = Region()
+        for r in rects:
+            region.add(r)
+        merged = region.rects()
+        self._assert_disjoint(merged)
+        for r in rects:
+            self.assertNotEqual(r.collidelist(merged), -1)
+            self.assertTrue(any(m.contains(r) for m in merged))
+
+    def test_rects__exact(self):
+        rects = self._random_rects(100, 2)
+        region = Region(exact=True)
+        for r in rects:
+            region.add(r)
+        merged = region.rects()
+        self._assert_disjoint(merged)
+        self.assertEqual(self._pixels(merged), self._pixels(rects))
+        self.assertEqual(sum(r.w * r.h for r in merged),
+                         len(self._pixels(rects)))
+
+    def test_rects__exact_joins_bands(self):
+        region = Region(exact=True)
+        region.add(Rect(0, 0, 10, 10))
+        region.add(Rect(0, 5, 10, 10))
+        region.add(Rect(10, 0, 5, 15))
+        self.assertEqual(region.rects(), [Rect(0, 0, 15, 15)])
+
+    def test_max_overhead(self):
+        near = [Rect(0, 0, 10, 10), Rect(11, 0, 10, 10)]
+        region = Region()
+        for r in near:
+            region.add(r)
+        self.assertEqual(len(region.rects()), 2)
+
+        region = Region(max_overhead=0.5)
+        for r in near:
+            region.add(r)
+        self.assertEqual(region.rects(), [Rect(0, 0, 21, 10)])
+
+        region = Region(max_overhead=0.5)
+        region.add(Rect(0, 0, 10, 10))
+        region.add(Rect(50, 50, 10, 10))
+        self.assertEqual(len(region.rects()), 2)
+
+    def test_max_overhead__disjoint(self):
+        import random
+        for seed in range(40):
+            rects = self._random_rects(60, seed)
+            # rects inside other rects, and clusters of small ones
+            rng = random.Random(seed)
+            for r in rects[:20]:
+                rects.append(r.inflate(-rng.randrange(r.w),
+                                       -rng.randrange(r.h)))
+                rects.append(Rect(r.x + rng.randrange(-5, 5),
+                                  r.y + rng.randrange(-5, 5), 3, 3))
+            rng.shuffle(rects)
+            for max_overhead in (0.1, 0.5, 2.0):
+                region = Region(max_overhead=max_overhead)
+                for r in rects:
+                    region.add(r)
+                merged = region.rects()
+                self._assert_disjoint(merged)
+                for r in rects:
+                    self.assertTrue(any(m.contains(r) for m in merged))
+
+    def test_max_overhead__invalid(self):
+        self.assertRaises(ValueError, Region, max_overhead=-1.0)
+
+    def test_rects__add_after_merge(self):
+        region = Region()
+        region.add(Rect(0, 0, 10, 10))
+        self.assertEqual(region.rects(), [Rect(0, 0, 10, 10)])
+        region.add(Rect(5, 0, 10, 10))
+        self.assertEqual(region.rects(), [Rect(0, 0, 15, 10)])
+
+    def test_clear(self):
+        region = Region()
+        region.add(Rect(0, 0, 10, 10))
+        region.clear()
+        self.assertEqual(region.rects(), [])
+        region.add(Rect(1, 1, 1, 1))
+        self.assertEqual(region.rects(), [Rect(1, 1, 1, 1)])
+
+
 class SubclassTest(unittest.TestCase):
     class MyRect(Rect):
         def __init__(self, *args, **kwds):
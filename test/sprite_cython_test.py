@@ -0,0 +1,48 @@
+import unittest
+
+from pygame.tests import sprite_test
+
+try:
+    import pygame._sprite as cython_sprite
+except ImportError:
+    cython_sprite = None
+
+
+def _to_cython(value):
+    """the pygame._sprite version of a pygame.sprite class, if there is one"""
+    if getattr(value, '__module__', None) == 'pygame.sprite':
+        return getattr(cython_sprite, value.__name__, value)
+    return value
+
+
+def _cython_test_case(case):
+    """subclass a sprite_test test case to test pygame._sprite instead
+
+    Besides the module under test, the sprite and group classes that some
+    test cases keep as class attributes are swapped for the Cython ones.
+    """
+    attrs = {'sprite_module': cython_sprite}
+    for name in dir(case):
+        if name.startswith('__'):
+            continue
+        value = getattr(case, name)
+        if isinstance(value, type):
+            attrs[name] = _to_cython(value)
+        elif isinstance(value, list):
+            attrs[name] = [_to_cython(v) for v in value]
+    return type('Cython%s' % case.__name__, (case, ), attrs)
+
+
+def _add_test_cases(namespace):
+    for name in dir(sprite_test):
+        case = getattr(sprite_test, name)
+        if isinstance(case, type) and issubclass(case, unittest.TestCase):
+            cython_case = _cython_test_case(case)
+            namespace[cython_case.__name__] = cython_case
+
+
+if cython_sprite is not None:
+    _add_test_cases(globals())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,13 +16,16 @@ class SpriteModuleTest( unittest.TestCase ):
 ######################### SPRITECOLLIDE FUNCTIONS TEST #########################
 
 class SpriteCollideTest( unittest.TestCase ):
+    # the module under test, sprite_cython_test.py runs these tests again
+    # with pygame._sprite
+    sprite_module = sprite
 
     def setUp(self):
-        self.ag = sprite.AbstractGroup()
-        self.ag2 = sprite.AbstractGroup()
-        self.s1 = sprite.Sprite(self.ag)
-        self.s2 = sprite.Sprite(self.ag2)
-        self.s3 = sprite.Sprite(self.ag2)
+        self.ag = self.sprite_module.AbstractGroup()
+        self.ag2 = self.sprite_module.AbstractGroup()
+        self.s1 = self.sprite_module.Sprite(self.ag)
+        self.s2 = self.sprite_module.Sprite(self.ag2)
+        self.s3 = self.sprite_module.Sprite(self.ag2)
 
         self.s1.image = pygame.Surface((50,10), pygame.SRCALPHA, 32)
         self.s2.image = pygame.Surface((10,10), pygame.SRCALPHA, 32)
@@ -37,7 +40,7 @@ class SpriteCollideTest( unittest.TestCase ):
     def test_spritecollide__works_if_collided_cb_is_None(self):
         # Test that sprites collide without collided function.
         self.assertEqual (
-            sprite.spritecollide (
+            self.sprite_module.spritecollide (
                 self.s1, self.ag2, dokill = False, collided = None
             ),
             [self.s2]
@@ -45,7 +48,7 @@ class SpriteCollideTest( unittest.TestCase ):
 
     def test_spritecollide__works_if_collided_cb_not_passed(self):
         # Should also work when collided function isn't passed at all.
-        self.assertEqual(sprite.spritecollide (
+        self.assertEqual(self.sprite_module.spritecollide (
             self.s1, self.ag2, dokill = False),
             [self.s2]
         )
@@ -54,14 +57,16 @@ class SpriteCollideTest( unittest.TestCase ):
         # Need to pass a callable.
         self.assertRaises (
             TypeError,
-            sprite.spritecollide, self.s1, self.ag2, dokill = False, collided = 1
+            self.sprite_module.spritecollide, self.s1, self.ag2,
+            dokill = False, collided = 1
         )
 
     def test_spritecollide__collided_defaults_to_collide_rect(self):
         # collide_rect should behave the same as default.
         self.assertEqual (
-            sprite.spritecollide (
-                self.s1, self.ag2, dokill = False, collided = sprite.collide_rect
+            self.sprite_module.spritecollide (
+                self.s1, self.ag2, dokill = False,
+                collided = self.sprite_module.collide_rect
             ),
             [self.s2]
         )
@@ -69,19 +74,19 @@ class SpriteCollideTest( unittest.TestCase ):
     def test_collide_rect_ratio__ratio_of_one_like_default(self):
         # collide_rect_ratio should behave the same as default at a 1.0 ratio.
         self.assertEqual (
-            sprite.spritecollide (
+            self.sprite_module.spritecollide (
                 self.s1, self.ag2, dokill = False,
-                collided = sprite.collide_rect_ratio(1.0)
+                collided = self.sprite_module.collide_rect_ratio(1.0)
             ),
             [self.s2]
         )
 
     def test_collide_rect_ratio__collides_all_at_ratio_of_twenty(self):
         # collide_rect_ratio should collide all at a 20.0 ratio.
-        collided_func = sprite.collide_rect_ratio(20.0)
+        collided_func = self.sprite_module.collide_rect_ratio(20.0)
         expected_sprites = sorted(self.ag2.sprites(), key=id)
 
-        collided_sprites = sorted(sprite.spritecollide(
+        collided_sprites = sorted(self.sprite_module.spritecollide(
             self.s1, self.ag2, dokill=False, collided=collided_func), key=id)
 
         self.assertListEqual(collided_sprites, expected_sprites)
@@ -89,8 +94,9 @@ class SpriteCollideTest( unittest.TestCase ):
     def test_collide_circle__no_radius_set(self):
         # collide_circle with no radius set.
         self.assertEqual (
-            sprite.spritecollide (
-                self.s1, self.ag2, dokill = False, collided = sprite.collide_circle
+            self.sprite_module.spritecollide (
+                self.s1, self.ag2, dokill = False,
+                collided = self.sprite_module.collide_circle
             ),
             [self.s2]
         )
@@ -98,19 +104,19 @@ class SpriteCollideTest( unittest.TestCase ):
     def test_collide_circle_ratio__no_radius_and_ratio_of_one(self):
         # collide_circle_ratio with no radius set, at a 1.0 ratio.
         self.assertEqual (
-            sprite.spritecollide (
+            self.sprite_module.spritecollide (
                 self.s1, self.ag2, dokill = False,
-                collided = sprite.collide_circle_ratio(1.0)
+                collided = self.sprite_module.collide_circle_ratio(1.0)
             ),
             [self.s2]
         )
 
     def test_collide_circle_ratio__no_radius_and_ratio_of_twenty(self):
         # collide_circle_ratio with no radius set, at a 20.0 ratio.
-        collided_func = sprite.collide_circle_ratio(20.0)
+        collided_func = self.sprite_module.collide_circle_ratio(20.0)
         expected_sprites = sorted(self.ag2.sprites(), key=id)
 
-        collided_sprites = sorted(sprite.spritecollide(
+        collided_sprites = sorted(self.sprite_module.spritecollide(
             self.s1, self.ag2, dokill=False, collided=collided_func), key=id)
 
         self.assertListEqual(expected_sprites, collided_sprites)
@@ -120,12 +126,12 @@ class SpriteCollideTest( unittest.TestCase ):
         self.s1.radius = 50
         self.s2.radius = 10
         self.s3.radius = 400
-        collided_func = sprite.collide_circle
+        collided_func = self.sprite_module.collide_circle
         expected_sprites = sorted(self.ag2.sprites(), key=id)
 
         collided_sprites = sorted(
-            sprite.spritecollide(self.s1, self.ag2, dokill=False,
-                                 collided=collided_func), key=id)
+            self.sprite_module.spritecollide(self.s1, self.ag2, dokill=False,
+                                             collided=collided_func), key=id)
 
         self.assertListEqual(expected_sprites, collided_sprites)
 
@@ -134,10 +140,10 @@ class SpriteCollideTest( unittest.TestCase ):
         self.s1.radius = 50
         self.s2.radius = 10
         self.s3.radius = 400
-        collided_func = sprite.collide_circle_ratio(0.5)
+        collided_func = self.sprite_module.collide_circle_ratio(0.5)
         expected_sprites = sorted(self.ag2.sprites(), key=id)
 
-        collided_sprites = sorted(sprite.spritecollide(
+        collided_sprites = sorted(self.sprite_module.spritecollide(
             self.s1, self.ag2, dokill=False, collided=collided_func), key=id)
 
         self.assertListEqual(expected_sprites, collided_sprites)
@@ -150,9 +156,9 @@ class SpriteCollideTest( unittest.TestCase ):
 
         # masks should be autogenerated from image if they don't exist.
         self.assertEqual (
-            sprite.spritecollide (
+            self.sprite_module.spritecollide (
                 self.s1, self.ag2, dokill = False,
-                collided = sprite.collide_mask
+                collided = self.sprite_module.collide_mask
             ),
             [self.s2]
         )
@@ -163,13 +169,62 @@ class SpriteCollideTest( unittest.TestCase ):
 
         # with set masks.
         self.assertEqual (
-            sprite.spritecollide (
+            self.sprite_module.spritecollide (
                 self.s1, self.ag2, dokill = False,
-                collided = sprite.collide_mask
+                collided = self.sprite_module.collide_mask
             ),
             [self.s2]
         )
 
+    def test_collide_mask__cached_mask(self):
+        """Ensure masks made from images are reused until they change."""
+        calls = []
+        def counting_from_surface(surface, *args):
+            calls.append(surface)
+            return pygame.mask.from_surface(surface, *args)
+        image = pygame.Surface((50, 50), pygame.SRCALPHA, 32)
+        image.fill((255, 255, 255, 255))
+        self.s1.image = image
+        self.s2.image = image
+        self.s3.image = image
+        original_from_surface = self.sprite_module.from_surface
+        self.sprite_module.from_surface = counting_from_surface
+        try:
+            for i in range(3):
+                self.assertEqual(self.sprite_module.spritecollide(
+                    self.s1, self.ag2, False, self.sprite_module.collide_mask),
+                    [self.s2])
+            self.assertEqual(calls, [image])
+
+            # an image change is seen
+            image.fill((255, 255, 255, 0))
+            self.assertEqual(self.sprite_module.spritecollide(
+                self.s1, self.ag2, False, self.sprite_module.collide_mask), [])
+            self.assertEqual(calls, [image, image])
+        finally:
+            self.sprite_module.from_surface = original_from_surface
+
+    def test_collide_mask__cached_mask_dest_surface(self):
+        """Ensure a transform drawing into an image changes its mask."""
+        opaque = pygame.Surface((50, 50), pygame.SRCALPHA, 32)
+        opaque.fill((255, 255, 255, 255))
+        clear = pygame.Surface((25, 25), pygame.SRCALPHA, 32)
+        clear.fill((255, 255, 255, 0))
+        for spr in (self.s1, self.s2, self.s3):
+            spr.image = opaque.copy()
+        collide = self.sprite_module.collide_mask
+
+        self.assertEqual(self.sprite_module.spritecollide(
+            self.s1, self.ag2, False, collide), [self.s2])
+
+        pygame.transform.smoothscale(clear, (50, 50), self.s2.image)
+        self.assertEqual(self.sprite_module.spritecollide(
+            self.s1, self.ag2, False, collide), [])
+
+        pygame.transform.scale(opaque, (50, 50), self.s2.image)
+        self.assertEqual(self.sprite_module.spritecollide(
+            self.s1, self.ag2, False, collide), [self.s2])
+
     def test_collide_mask__transparent(self):
         # make some sprites that are fully transparent, so they won't collide.
         self.s1.image.fill((255,255,255,0))
@@ -181,8 +236,9 @@ class SpriteCollideTest( unittest.TestCase ):
         self.s3.mask = pygame.mask.from_surface(self.s3.image, 255)
 
         self.assertFalse (
-            sprite.spritecollide (
-                self.s1, self.ag2, dokill = False, collided = sprite.collide_mask
+            self.sprite_module.spritecollide (
+                self.s1, self.ag2, dokill = False,
+                collided = self.sprite_module.collide_mask
             )
         )
 
@@ -198,27 +254,31 @@ class SpriteCollideTest( unittest.TestCase ):
 
         # s2 in, s3 out
         expected_sprite = self.s2
-        collided_sprite = sprite.spritecollideany(self.s1, self.ag2)
+        collided_sprite = self.sprite_module.spritecollideany(self.s1,
+                                                              self.ag2)
 
         self.assertEqual(collided_sprite, expected_sprite)
 
         # s2 and s3 out
         self.s2.rect.move_ip(0, 10)
-        collided_sprite = sprite.spritecollideany(self.s1, self.ag2)
+        collided_sprite = self.sprite_module.spritecollideany(self.s1,
+                                                              self.ag2)
 
         self.assertIsNone(collided_sprite)
 
         # s2 out, s3 in
         self.s3.rect.move_ip(-105, -105)
         expected_sprite = self.s3
-        collided_sprite = sprite.spritecollideany(self.s1, self.ag2)
+        collided_sprite = self.sprite_module.spritecollideany(self.s1,
+                                                              self.ag2)
 
         self.assertEqual(collided_sprite, expected_sprite)
 
         # s2 and s3 in
         self.s2.rect.move_ip(0, -10)
         expected_sprite_choices = self.ag2.sprites()
-        collided_sprite = sprite.spritecollideany(self.s1, self.ag2)
+        collided_sprite = self.sprite_module.spritecollideany(self.s1,
+                                                              self.ag2)
 
         self.assertIn(collided_sprite, expected_sprite_choices)
 
@@ -255,8 +315,8 @@ class SpriteCollideTest( unittest.TestCase ):
         # This should return a sprite from self.ag2 because the callback
         # function (collided_callback()) currently returns True.
         expected_sprite_choices = self.ag2.sprites()
-        collided_sprite = sprite.spritecollideany(self.s1, self.ag2,
-                                                  collided_callback)
+        collided_sprite = self.sprite_module.spritecollideany(
+            self.s1, self.ag2, collided_callback)
 
         self.assertIn(collided_sprite, expected_sprite_choices)
 
@@ -278,8 +338,8 @@ class SpriteCollideTest( unittest.TestCase ):
 
         # This should return None because the callback function
         # (collided_callback()) currently returns False.
-        collided_sprite = sprite.spritecollideany(self.s1, self.ag2,
-                                                  collided_callback)
+        collided_sprite = self.sprite_module.spritecollideany(
+            self.s1, self.ag2, collided_callback)
 
         self.assertIsNone(collided_sprite)
 
@@ -427,17 +487,167 @@ class SpriteCollideTest( unittest.TestCase ):
         self.assertFalse(pygame.sprite.collide_rect(self.s1, self.s3))
         self.assertFalse(pygame.sprite.collide_rect(self.s3, self.s1))
 
+    def test_spritecollide__with_spatial_index(self):
+        spritecollide = self.sprite_module.spritecollide
+        self.ag2.set_spatial_index(16)
+
+        self.assertEqual(spritecollide(self.s1, self.ag2, False),
+                         [self.s2])
+        self.assertEqual(spritecollide(self.s1, self.ag2, False,
+                                       self.sprite_module.collide_rect),
+                         [self.s2])
+
+        # The index follows a sprite moved outside of update() once it is
+        # told about it.
+        self.s3.rect.topleft = (20, 0)
+        self.ag2.reindex(self.s3)
+        self.assertEqual(spritecollide(self.s1, self.ag2, False),
+                         self.ag2.sprites())
+
+        self.assertEqual(spritecollide(self.s1, self.ag2, True),
+                         [self.s2, self.s3])
+        self.assertEqual(len(self.ag2), 0)
+        self.assertEqual(spritecollide(self.s1, self.ag2, False), [])
+
+    def test_spritecollide__spatial_index_matches_linear_scan(self):
+        spritecollide = self.sprite_module.spritecollide
+        spritecollideany = self.sprite_module.spritecollideany
+        group = self.sprite_module.Group()
+        for i in range(200):
+            s = self.sprite_module.Sprite(group)
+            s.rect = pygame.Rect((i * 37) % 300 - 20, (i * 53) % 300 - 20,
+                                 (i * 7) % 40, (i * 11) % 40)
+        probe = self.sprite_module.Sprite()
+        probes = [pygame.Rect(x, y, 30, 30)
+                  for x in range(-40, 320, 45) for y in range(-40, 320, 45)]
+        probes.append(pygame.Rect(-100, -100, 500, 500))
+
+        expected = []
+        for rect in probes:
+            probe.rect = rect
+            expected.append(spritecollide(probe, group, False))
+
+        group.set_spatial_index(32)
+        for rect, colliding in zip(probes, expected):
+            probe.rect = rect
+            self.assertEqual(spritecollide(probe, group, False),
+                             colliding)
+            any_sprite = spritecollideany(probe, group)
+            self.assertEqual(any_sprite, colliding[0] if colliding else None)
+
+    def test_spatial_index__rebuilt_after_add_and_update(self):
+        spritecollide = self.sprite_module.spritecollide
+        spritecollideany = self.sprite_module.spritecollideany
+        self.ag2.set_spatial_index(16)
+        self.assertEqual(spritecollideany(self.s1, self.ag2), self.s2)
+
+        self.s2.kill()
+        self.assertIsNone(spritecollideany(self.s1, self.ag2))
+
+        self.s2.add(self.ag2)
+        self.assertEqual(spritecollideany(self.s1, self.ag2), self.s2)
+
+        def update():
+            self.s3.rect.topleft = (0, 0)
+        self.s3.update = update
+        self.ag2.update()
+        self.assertEqual(sorted(spritecollide(self.s1, self.ag2, False),
+                                key=id),
+                         sorted([self.s2, self.s3], key=id))
+
+    def test_spatial_index__reindex(self):
+        spritecollide = self.sprite_module.spritecollide
+        spritecollideany = self.sprite_module.spritecollideany
+        groupcollide = self.sprite_module.groupcollide
+        self.ag2.set_spatial_index(16)
+        self.assertEqual(spritecollide(self.s1, self.ag2, False),
+                         [self.s2])
+
+        # a new rect is assigned, and the old one is moved in place
+        self.s3.rect = pygame.Rect(5, 5, 10, 10)
+        self.ag2.reindex(self.s3)
+        self.assertEqual(spritecollide(self.s1, self.ag2, False),
+                         [self.s2, self.s3])
+        self.s2.rect.topleft = (200, 200)
+        self.ag2.reindex(self.s2)
+        self.assertEqual(spritecollideany(self.s1, self.ag2), self.s3)
+        self.assertEqual(groupcollide(self.ag, self.ag2, False, False),
+                         {self.s1: [self.s3]})
+
+        # with no sprites, every sprite is checked
+        self.s3.rect.move_ip(200, 200)
+        self.ag2.reindex()
+        self.assertEqual(spritecollide(self.s1, self.ag2, False), [])
+        self.assertEqual(spritecollide(self.s2, self.ag2, False),
+                         [self.s2, self.s3])
+
+        # a sprite which is not a member is ignored
+        self.ag2.reindex(self.s1)
+        self.assertEqual(spritecollide(self.s2, self.ag2, False),
+                         [self.s2, self.s3])
+
+    def test_spatial_index__update_of_another_group(self):
+        spritecollide = self.sprite_module.spritecollide
+        self.ag2.set_spatial_index(16)
+        self.assertEqual(spritecollide(self.s1, self.ag2, False),
+                         [self.s2])
+
+        # s3 is moved by the update() of a group without an index
+        other = self.sprite_module.Group(self.s3)
+
+        def update():
+            self.s3.rect.topleft = (20, 0)
+        self.s3.update = update
+        other.update()
+        self.assertEqual(spritecollide(self.s1, self.ag2, False),
+                         [self.s2, self.s3])
+
+    def test_spatial_index__sprite_added_before_its_rect(self):
+        spritecollide = self.sprite_module.spritecollide
+        spritecollideany = self.sprite_module.spritecollideany
+        self.ag2.set_spatial_index(16)
+        self.assertEqual(spritecollideany(self.s1, self.ag2), self.s2)
+
+        s = self.sprite_module.Sprite(self.ag2)
+        s.rect = pygame.Rect(self.s1.rect)
+
+        self.assertIn(s, spritecollide(self.s1, self.ag2, False))
+
+    def test_set_spatial_index__invalid_cell_size(self):
+        self.assertRaises(ValueError, self.ag.set_spatial_index, 0)
+        self.assertRaises(ValueError, self.ag.set_spatial_index, -8)
+
+    def test_groupcollide__with_spatial_index(self):
+        expected_dict = {self.s1: [self.s2]}
+        self.ag2.set_spatial_index(16)
+
+        crashed = pygame.sprite.groupcollide(self.ag, self.ag2, False, False)
+        self.assertDictEqual(expected_dict, crashed)
+
+        crashed = pygame.sprite.groupcollide(self.ag, self.ag2, False, True)
+        self.assertDictEqual(expected_dict, crashed)
+
+        crashed = pygame.sprite.groupcollide(self.ag, self.ag2, False, False)
+        self.assertDictEqual({}, crashed)
+
+        # Without an index the same call gives the same result.
+        self.ag2.set_spatial_index(None)
+        crashed = pygame.sprite.groupcollide(self.ag, self.ag2, False, False)
+        self.assertDictEqual({}, crashed)
+
 
 ################################################################################
 
 class AbstractGroupTypeTest( unittest.TestCase ):
+    sprite_module = sprite
+
     def setUp(self):
-        self.ag = sprite.AbstractGroup()
-        self.ag2 = sprite.AbstractGroup()
-        self.s1 = sprite.Sprite(self.ag)
-        self.s2 = sprite.Sprite(self.ag)
-        self.s3 = sprite.Sprite(self.ag2)
-        self.s4 = sprite.Sprite(self.ag2)
+        self.ag = self.sprite_module.AbstractGroup()
+        self.ag2 = self.sprite_module.AbstractGroup()
+        self.s1 = self.sprite_module.Sprite(self.ag)
+        self.s2 = self.sprite_module.Sprite(self.ag)
+        self.s3 = self.sprite_module.Sprite(self.ag2)
+        self.s4 = self.sprite_module.Sprite(self.ag2)
 
         self.s1.image = pygame.Surface((10, 10))
         self.s1.image.fill(pygame.Color('red'))
@@ -475,8 +685,8 @@ class AbstractGroupTypeTest( unittest.TestCase ):
         # see if one of them not being in there.
         self.assertNotEqual(True, self.ag.has([self.s1, self.s2, self.s3]))
         self.assertNotEqual(True, self.ag.has(self.s1, self.s2, self.s3))
-        self.assertNotEqual(True, self.ag.has(self.s1,
-                                              sprite.Group(self.s2, self.s3)))
+        self.assertNotEqual(True, self.ag.has(
+            self.s1, self.sprite_module.Group(self.s2, self.s3)))
         self.assertNotEqual(True, self.ag.has(self.s1, [self.s2, self.s3]))
 
         # test empty list processing
@@ -488,7 +698,7 @@ class AbstractGroupTypeTest( unittest.TestCase ):
         self.assertEqual(True, self.ag2.has(self.s3))
 
     def test_add(self):
-        ag3 = sprite.AbstractGroup()
+        ag3 = self.sprite_module.AbstractGroup()
         sprites = (self.s1, self.s2, self.s3, self.s4)
 
         for s in sprites:
@@ -523,6 +733,32 @@ class AbstractGroupTypeTest( unittest.TestCase ):
         self.assertEqual((0, 255, 0, 255),
                          self.scr.get_at((15, 5)))
 
+    def test_draw__spritedict(self):
+        """Ensure draw() stores the blitted rects of the sprites."""
+        self.s2.rect.left = 15
+        self.ag.draw(self.scr)
+        self.assertEqual(self.ag.spritedict[self.s1], pygame.Rect(0, 0, 10, 10))
+        # clipped by the surface
+        self.assertEqual(self.ag.spritedict[self.s2], pygame.Rect(15, 0, 5, 10))
+
+    def test_draw__surface_subclass(self):
+        """Ensure draw() uses the blit() of a Surface subclass."""
+        blitted = []
+
+        class MySurface(pygame.Surface):
+            def blit(self, source, dest, *args):
+                blitted.append(source)
+                return pygame.Surface.blit(self, source, dest, *args)
+
+        scr = MySurface((20, 20))
+        self.ag.draw(scr)
+        self.assertEqual(blitted, [self.s1.image, self.s2.image])
+        self.assertEqual((255, 0, 0, 255), scr.get_at((5, 5)))
+
+    def test_draw__invalid_image(self):
+        self.s1.image = None
+        self.assertRaises(TypeError, self.ag.draw, self.scr)
+
     def test_empty(self):
 
         self.ag.empty()
@@ -550,7 +786,7 @@ class AbstractGroupTypeTest( unittest.TestCase ):
         # containing a sprite and another group containing 2 sprites.
         self.ag.add(self.s1, self.s3, self.s4)
         self.ag2.add(self.s3, self.s4)
-        g = sprite.Group(self.s2)
+        g = self.sprite_module.Group(self.s2)
         self.ag.remove([self.s1, g], self.ag2)
         self.assertFalse(self.ag in self.s1.groups())
         self.assertFalse(self.ag in self.s2.groups())
@@ -584,11 +820,77 @@ class AbstractGroupTypeTest( unittest.TestCase ):
         self.assertEqual(test_sprite.sink, [1, 2, 3])
 
 
+class RenderUpdatesTypeTest(unittest.TestCase):
+    sprite_module = sprite
+    group_classes = [sprite.RenderUpdates, sprite.OrderedUpdates,
+                     sprite.LayeredUpdates]
+
+    def _draw_moved(self, group_class, surface, merge):
+        """Draw, move or remove the sprites, and draw again."""
+        image = pygame.Surface((10, 10))
+        sprites = []
+        for i in range(3):
+            spr = self.sprite_module.Sprite()
+            spr.image = image
+            spr.rect = pygame.Rect(i * 30, 0, 10, 10)
+            sprites.append(spr)
+        group = group_class(*sprites)
+        group.draw(surface)
+        sprites[0].rect.move_ip(5, 5)
+        sprites[1].rect.move_ip(0, 40)
+        group.remove(sprites[2])
+        return group.draw(surface, merge=merge)
+
+    def test_draw__changed_areas(self):
+        """Ensure draw() returns the old and new areas of each sprite."""
+        # the union of the two areas if they overlap, or else both
+        expected = [pygame.Rect(0, 0, 15, 15),
+                    pygame.Rect(30, 40, 10, 10),
+                    pygame.Rect(30, 0, 10, 10)]
+
+        class MySurface(pygame.Surface):
+            def blit(self, *args):
+                return pygame.Surface.blit(self, *args)
+
+        for group_class in self.group_classes:
+            for surface in (pygame.Surface((100, 100)),
+                            MySurface((100, 100))):
+                rects = self._draw_moved(group_class, surface, False)
+
+                # after the areas of the removed sprites
+                self.assertEqual(rects[-3:], expected)
+                self.assertIn(pygame.Rect(60, 0, 10, 10), rects[:-3])
+
+    def test_draw__merge(self):
+        """Ensure draw(merge=True) merges overlapping areas."""
+        for group_class in self.group_classes:
+            image = pygame.Surface((10, 10))
+            group = group_class()
+            for i in range(5):
+                spr = self.sprite_module.Sprite(group)
+                spr.image = image
+                spr.rect = pygame.Rect(i * 5, 0, 10, 10)
+
+            rects = group.draw(pygame.Surface((100, 100)), merge=True)
+
+            self.assertEqual(rects, [pygame.Rect(0, 0, 30, 10)])
+
+            rects = self._draw_moved(group_class, pygame.Surface((100, 100)),
+                                     True)
+            self.assertEqual(sorted(rects),
+                             [pygame.Rect(0, 0, 15, 15),
+                              pygame.Rect(30, 0, 10, 10),
+                              pygame.Rect(30, 40, 10, 10),
+                              pygame.Rect(60, 0, 10, 10)])
+
+
 ################################################################################
 
 # A base class to share tests between similar classes
 
 class LayeredGroupBase:
+    sprite_module = sprite
+
     def test_get_layer_of_sprite(self):
         expected_layer = 666
         spr = self.sprite()
@@ -640,7 +942,7 @@ class LayeredGroupBase:
 
     def test_add__adding_sprite_on_init(self):
         spr = self.sprite()
-        lrg2 = sprite.LayeredUpdates(spr)
+        lrg2 = self.sprite_module.LayeredUpdates(spr)
         expected_layer = lrg2._default_layer
         layer = lrg2._spritelayers[spr]
 
@@ -651,7 +953,7 @@ class LayeredGroupBase:
         expected_layer = 20
         spr = self.sprite()
         spr._layer = expected_layer
-        lrg2 = sprite.LayeredUpdates(spr)
+        lrg2 = self.sprite_module.LayeredUpdates(spr)
         layer = lrg2._spritelayers[spr]
 
         self.assertEqual(len(lrg2._spritelist), 1)
@@ -660,7 +962,7 @@ class LayeredGroupBase:
     def test_add__sprite_init_passing_layer(self):
         expected_layer = 33
         spr = self.sprite()
-        lrg2 = sprite.LayeredUpdates(spr, layer=expected_layer)
+        lrg2 = self.sprite_module.LayeredUpdates(spr, layer=expected_layer)
         layer = lrg2._spritelayers[spr]
 
         self.assertEqual(len(lrg2._spritelist), 1)
@@ -670,7 +972,7 @@ class LayeredGroupBase:
         expected_layer = 33
         spr = self.sprite()
         spr._layer = 55
-        lrg2 = sprite.LayeredUpdates(spr, layer=expected_layer)
+        lrg2 = self.sprite_module.LayeredUpdates(spr, layer=expected_layer)
         layer = lrg2._spritelayers[spr]
 
         self.assertEqual(len(lrg2._spritelist), 1)
@@ -741,7 +1043,7 @@ class LayeredGroupBase:
         sprite_count = 10
         sprites = [self.sprite() for _ in range(sprite_count)]
 
-        lrg2 = sprite.LayeredUpdates(sprites)
+        lrg2 = self.sprite_module.LayeredUpdates(sprites)
         expected_layer = lrg2._default_layer
 
         self.assertEqual(len(lrg2._spritelist), sprite_count)
@@ -832,6 +1134,109 @@ class LayeredGroupBase:
 
         self.assertEqual(spr2.layer, expected_layer)
 
+    def _add_scattered_sprites(self):
+        sprites = []
+        for i in range(40):
+            spr = self.sprite()
+            spr.rect = pygame.Rect((i * 37) % 100 - 10, (i * 53) % 100 - 10,
+                                   (i * 7) % 30 + 1, (i * 11) % 30 + 1)
+            self.LG.add(spr, layer=i % 4)
+            sprites.append(spr)
+        return sprites
+
+    def _assert_queries_match_linear_scan(self):
+        points = [(x, y) for x in range(-5, 100, 9) for y in range(-5, 100, 9)]
+        rects = [pygame.Rect(x, y, 25, 15) for x, y in points[::3]]
+        rects.append(pygame.Rect(-50, -50, 200, 200))
+        for pos in points:
+            expected = [spr for spr in self.LG.sprites()
+                        if pygame.Rect(pos, (0, 0)).colliderect(spr.rect)]
+            self.assertEqual(self.LG.get_sprites_at(pos), expected)
+        for rect in rects:
+            expected = [spr for spr in self.LG.sprites()
+                        if rect.colliderect(spr.rect)]
+            self.assertEqual(self.LG.get_sprites_in_rect(rect), expected)
+
+    def test_get_sprites_at(self):
+        bottom = self.sprite()
+        bottom.rect = pygame.Rect(0, 0, 10, 10)
+        top = self.sprite()
+        top.rect = pygame.Rect(5, 5, 10, 10)
+        self.LG.add(top, layer=1)
+        self.LG.add(bottom, layer=0)
+
+        self.assertEqual(self.LG.get_sprites_at((7, 7)), [bottom, top])
+        self.assertEqual(self.LG.get_sprites_at((12, 12)), [top])
+        self.assertEqual(self.LG.get_sprites_at((20, 20)), [])
+
+    def test_get_sprites_in_rect(self):
+        self._add_scattered_sprites()
+
+        self._assert_queries_match_linear_scan()
+        self.assertEqual(self.LG.get_sprites_in_rect((-50, -50, 200, 200)),
+                         self.LG.sprites())
+        self.assertEqual(self.LG.get_sprites_in_rect((500, 500, 5, 5)), [])
+
+    def test_get_sprites_at__spatial_index(self):
+        """Ensure the spatial index follows adds, removes and layer changes.
+        """
+        sprites = self._add_scattered_sprites()
+        self.LG.set_spatial_index(16)
+        self._assert_queries_match_linear_scan()
+
+        self.LG.remove(sprites[3], sprites[20])
+        self.LG.change_layer(sprites[5], 2)
+        self.LG.move_to_front(sprites[8])
+        self.LG.move_to_back(sprites[9])
+        self.LG.switch_layer(0, 3)
+        spr = self.sprite()
+        spr.rect = pygame.Rect(30, 30, 40, 40)
+        self.LG.add(spr, layer=1)
+        self.LG.add(sprites[3])
+
+        self._assert_queries_match_linear_scan()
+
+    def test_get_sprites_at__spatial_index_moved_rects(self):
+        """Ensure the spatial index follows rects moved without update().
+        """
+        sprites = self._add_scattered_sprites()
+        self.LG.set_spatial_index(16)
+        self._assert_queries_match_linear_scan()
+
+        moved = sprites[::3]
+        for i, spr in enumerate(moved):
+            if i % 2:
+                spr.rect = pygame.Rect(spr.rect.y, spr.rect.x, 12, 12)
+            else:
+                spr.rect.move_ip(23, -17)
+        self.LG.reindex(*moved)
+
+        self._assert_queries_match_linear_scan()
+
+        for spr in sprites[1::3]:
+            spr.rect.move_ip(-31, 8)
+        self.LG.reindex()
+
+        self._assert_queries_match_linear_scan()
+
+    def test_get_sprites_at__spatial_index_after_update(self):
+        """Ensure the spatial index follows rects moved by update().
+        """
+        sprites = self._add_scattered_sprites()
+        self.LG.set_spatial_index(16)
+        self._assert_queries_match_linear_scan()
+
+        def make_update(spr, offset):
+            def update():
+                spr.rect.move_ip(offset, -offset)
+            return update
+        for i, spr in enumerate(sprites):
+            spr.update = make_update(spr, i % 7 * 5)
+
+        for i in range(3):
+            self.LG.update()
+            self._assert_queries_match_linear_scan()
+
     def test_get_top_layer(self):
         layers = [1, 5, 2, 8, 4, 5, 3, 88, 23, 0]
         for i in layers:
@@ -960,19 +1365,19 @@ class LayeredUpdatesTypeTest__SpriteTest(LayeredGroupBase, unittest.TestCase):
     sprite = sprite.Sprite
 
     def setUp(self):
-        self.LG = sprite.LayeredUpdates()
+        self.LG = self.sprite_module.LayeredUpdates()
 
 class LayeredUpdatesTypeTest__DirtySprite(LayeredGroupBase, unittest.TestCase):
     sprite = sprite.DirtySprite
 
     def setUp(self):
-        self.LG = sprite.LayeredUpdates()
+        self.LG = self.sprite_module.LayeredUpdates()
 
 class LayeredDirtyTypeTest__DirtySprite(LayeredGroupBase, unittest.TestCase):
     sprite = sprite.DirtySprite
 
     def setUp(self):
-        self.LG = sprite.LayeredDirty()
+        self.LG = self.sprite_module.LayeredDirty()
 
     def test_repaint_rect(self):
         group = self.LG
@@ -1031,7 +1436,7 @@ class LayeredDirtyTypeTest__DirtySprite(LayeredGroupBase, unittest.TestCase):
         # The blue_sprite is stationary and will not reset its dirty flag. It
         # will be the non-dirty sprite in this test. Its values are dependent
         # on the use_source_rect flag.
-        blue_sprite = pygame.sprite.DirtySprite(self.LG)
+        blue_sprite = self.sprite(self.LG)
 
         if use_source_rect:
             blue_sprite.image = image_source
@@ -1050,7 +1455,7 @@ class LayeredDirtyTypeTest__DirtySprite(LayeredGroupBase, unittest.TestCase):
             end_x, end_y = blue_sprite.rect.bottomright
 
         # The red_sprite is moving and will always be dirty.
-        red_sprite = pygame.sprite.DirtySprite(self.LG)
+        red_sprite = self.sprite(self.LG)
         red_sprite.image = image_source
         red_sprite.rect = pygame.Rect(start_pos, red_sprite_source.size)
         red_sprite.source_rect = red_sprite_source
@@ -1096,12 +1501,242 @@ class LayeredDirtyTypeTest__DirtySprite(LayeredGroupBase, unittest.TestCase):
         """
         self._nondirty_intersections_redrawn(True)
 
+    def test_draw__merges_dirty_rects(self):
+        """Ensure the dirty rects returned by draw() do not overlap."""
+        surface = pygame.Surface((100, 100))
+        image = pygame.Surface((10, 10))
+        self.LG._use_update = True
+        sprites = []
+        for i in range(20):
+            spr = self.sprite()
+            spr.image = image
+            spr.rect = pygame.Rect(i * 4, i * 3, 10, 10)
+            spr.dirty = 2
+            sprites.append(spr)
+        self.LG.add(*sprites)
+        self.LG.draw(surface)
+        for spr in sprites:
+            spr.rect.move_ip(1, 1)
+
+        rects = self.LG.draw(surface)
+
+        for i, r in enumerate(rects):
+            self.assertEqual(r.collidelist(rects[i + 1:]), -1)
+        for spr in sprites:
+            self.assertTrue(any(r.contains(spr.rect) for r in rects))
+
+
+############################## PARTICLE GROUP TESTS ############################
+
+class ParticleGroupBase:
+    sprite_module = sprite
+    use_numpy = None
+
+    def setUp(self):
+        self.image = pygame.Surface((2, 2))
+        self.image.fill((255, 0, 0))
+        self.sprites = []
+        for i in range(5):
+            spr = self.sprite_module.Sprite()
+            spr.image = self.image
+            spr.rect = self.image.get_rect(topleft=(i * 10, 20))
+            spr.velocity = (0.5, -0.75)
+            self.sprites.append(spr)
+        self.group = self.sprite_module.ParticleGroup(self.sprites,
+                                                      use_numpy=self.use_numpy)
+
+    def test_update(self):
+        """Ensure update() moves every sprite by its velocity."""
+        self.group.update()
+        self.group.update(2)
+
+        for i, spr in enumerate(self.sprites):
+            self.assertEqual(self.group.get_position(spr),
+                             (i * 10 + 1.5, 17.75))
+
+    def test_update__rects_moved_lazily(self):
+        """Ensure the rects only move when they are next needed."""
+        self.group.update()
+
+        self.assertEqual(self.sprites[1].rect.topleft, (10, 20))
+        self.assertIn(self.sprites[1], self.group.sprites())
+        self.assertEqual(self.sprites[1].rect.topleft, (10, 19))
+
+    def test_draw(self):
+        """Ensure draw() moves the rects and draws at the new positions."""
+        surface = pygame.Surface((60, 40))
+        self.group.set_velocity(self.sprites[0], (-3, 2))
+        self.group.update()
+
+        self.group.draw(surface)
+
+        self.assertEqual(self.sprites[0].rect.topleft, (-3, 22))
+        self.assertEqual(self.sprites[2].rect.topleft, (20, 19))
+        self.assertEqual(self.group.spritedict[self.sprites[2]],
+                         pygame.Rect(20, 19, 2, 2))
+        self.assertEqual(surface.get_at((20, 19)), (255, 0, 0, 255))
+        self.assertEqual(surface.get_at((20, 21)), (0, 0, 0, 255))
+
+    def test_draw__surface_subclass(self):
+        """Ensure sprites are moved when drawing with an overridden blit."""
+        class MySurface(pygame.Surface):
+            def blit(self, *args):
+                return pygame.Surface.blit(self, *args)
+        surface = MySurface((60, 40))
+        self.group.update()
+
+        self.group.draw(surface)
+
+        self.assertEqual(self.sprites[2].rect.topleft, (20, 19))
+        self.assertEqual(surface.get_at((20, 19)), (255, 0, 0, 255))
+
+    def test_remove(self):
+        """Ensure removing a sprite keeps the others in place."""
+        self.group.update()
+        removed = self.sprites[1]
+
+        self.group.remove(removed)
+        self.group.update()
+
+        self.assertEqual(len(self.group), 4)
+        self.assertEqual(removed.rect.topleft, (10, 19))
+        for i, spr in enumerate(self.sprites):
+            if spr is not removed:
+                self.assertEqual(self.group.get_position(spr),
+                                 (i * 10 + 1, 18.5))
+
+    def test_set_position(self):
+        """Ensure set_position() moves the sprite and its rect."""
+        spr = self.sprites[3]
+
+        self.group.set_position(spr, (-4.5, 7))
+        self.group.update()
+
+        self.assertEqual(self.group.get_position(spr), (-4, 6.25))
+        self.group.draw(pygame.Surface((10, 10)))
+        self.assertEqual(spr.rect.topleft, (-4, 6))
+
+    def test_draw__far_positions(self):
+        """Ensure far positions are clamped, and NaN ones raise."""
+        spr = self.sprites[0]
+        far = (2 ** 30, -2 ** 30)
+        self.group.set_velocity(spr, (0, 0))
+
+        self.group.set_position(spr, (1e20, float('-inf')))
+        self.assertEqual(spr.rect.topleft, far)
+        self.group.update()
+        self.group.draw(pygame.Surface((10, 10)))
+        self.assertEqual(spr.rect.topleft, far)
+
+        self.assertRaises(ValueError, self.group.set_position, spr,
+                          (float('nan'), 0))
+        self.group.positions[0] = float('nan')
+        self.assertRaises(ValueError, self.group.draw,
+                          pygame.Surface((10, 10)))
+
+    def test_velocity__default(self):
+        """Ensure sprites without a velocity attribute do not move."""
+        spr = self.sprite_module.Sprite()
+        spr.rect = pygame.Rect(1, 2, 3, 4)
+
+        self.group.add(spr)
+        self.group.update()
+
+        self.assertEqual(self.group.get_velocity(spr), (0, 0))
+        self.assertEqual(self.group.get_position(spr), (1, 2))
+
+    def test_positions(self):
+        """Ensure changing the positions array moves the sprites."""
+        positions = self.group.positions
+        positions[0] += 3
+        positions[1] += 4
+
+        self.group.draw(pygame.Surface((60, 40)))
+
+        order = self.group.sprites()
+        self.assertEqual(len(self.group.velocities), len(positions))
+        self.assertEqual(order[0].rect.topleft,
+                         (self.sprites.index(order[0]) * 10 + 3, 24))
+
+    def test_copy(self):
+        """Ensure copies keep the positions and velocities."""
+        self.group.set_velocity(self.sprites[0], (2, 3))
+        self.group.update()
+
+        group = self.group.copy()
+
+        self.assertEqual(group.get_velocity(self.sprites[0]), (2, 3))
+        self.assertEqual(group.get_position(self.sprites[1]), (10.5, 19.25))
+        # the copy keeps the same kind of arrays
+        self.assertIs(type(group.positions), type(self.group.positions))
+
+    def test_spatial_index(self):
+        """Ensure the spatial index follows the sprites as they move."""
+        spritecollide = self.sprite_module.spritecollide
+        probe = self.sprite_module.Sprite()
+        probe.rect = pygame.Rect(20, 16, 2, 2)
+        self.group.set_spatial_index(4)
+        self.assertEqual(spritecollide(probe, self.group, False), [])
+        spatial_hash = self.group._spatial_hash
+
+        # rects only move when needed, so the index moves them first
+        self.group.set_velocity(self.sprites[3], (-10, -4))
+        self.group.update()
+        self.assertEqual(spritecollide(probe, self.group, False),
+                         [self.sprites[3]])
+
+        self.group.set_position(self.sprites[0], (21, 17))
+        self.assertEqual(spritecollide(probe, self.group, False),
+                         [self.sprites[0], self.sprites[3]])
+
+        self.group.positions[0] += 100
+        self.assertEqual(spritecollide(probe, self.group, False),
+                         [self.sprites[3]])
+
+        # the moved sprites were put in their new cells, without a rebuild
+        self.assertIs(self.group._spatial_hash, spatial_hash)
+
+
+class ParticleGroupTypeTest__array(ParticleGroupBase, unittest.TestCase):
+    use_numpy = False
+
+    def test_update__in_place(self):
+        """Ensure update() moves the sprites without a new array."""
+        positions = self.group.positions
+
+        self.group.update(0.5)
+
+        self.assertIs(self.group.positions, positions)
+        self.assertEqual(list(positions[:2]), [0.25, 19.625])
+
+
+try:
+    import numpy
+except ImportError:
+    pass
+else:
+    class ParticleGroupTypeTest__numpy(ParticleGroupBase, unittest.TestCase):
+        use_numpy = True
+
+        def test_positions(self):
+            """Ensure changing the positions array moves the sprites."""
+            self.group.positions[:, 1] += 4
+
+            self.group.draw(pygame.Surface((60, 40)))
+
+            self.assertEqual(self.group.positions.shape, (5, 2))
+            self.assertEqual(self.group.velocities.shape, (5, 2))
+            for i, spr in enumerate(self.sprites):
+                self.assertEqual(spr.rect.topleft, (i * 10, 24))
+
 
 ############################### SPRITE BASE CLASS ##############################
 #
 # tests common between sprite classes
 
 class SpriteBase:
+    sprite_module = sprite
+
     def setUp(self):
         self.groups = []
         for Group in self.Groups:
@@ -1211,6 +1846,8 @@ class DirtySpriteTypeTest(SpriteBase, unittest.TestCase):
 ############################## BUG TESTS #######################################
 
 class SingleGroupBugsTest(unittest.TestCase):
+    sprite_module = sprite
+
     def test_memoryleak_bug(self):
         # For memoryleak bug posted to mailing list by Tobias Steinrücken on 16/11/10.
         # Fixed in revision 2953.
@@ -1218,13 +1855,15 @@ class SingleGroupBugsTest(unittest.TestCase):
         import weakref
         import gc
 
-        class MySprite(sprite.Sprite):
+        sprite_module = self.sprite_module
+
+        class MySprite(sprite_module.Sprite):
             def __init__(self, *args, **kwargs):
-                sprite.Sprite.__init__(self, *args, **kwargs)
+                sprite_module.Sprite.__init__(self, *args, **kwargs)
                 self.image = pygame.Surface( (2, 4), 0, 24 )
                 self.rect = self.image.get_rect()
 
-        g = sprite.GroupSingle()
+        g = sprite_module.GroupSingle()
         screen = pygame.Surface((4, 8), 0, 24)
         s = MySprite()
         r = weakref.ref(s)
@@ -240,6 +240,74 @@ class SurfaceTypeTest(AssertRaisesRegexMixin, unittest.TestCase):
         self.assertEqual(s1.get_at((0, 0)), (0, 0, 0, 255))
         self.assertEqual(s1.get_at((1, 1)), color)
 
+    def test_fill_rects(self):
+        """Ensure fill_rects() fills each rect like fill() does."""
+        color = (25, 50, 75, 100)
+        rects = [pygame.Rect(0, 0, 4, 4), (10, 2, 5, 20), [-3, 28, 8, 8],
+                 (30, 30, 10, 10), (32, 0, 5, 5), (5, 5, -2, 3)]
+        expected = pygame.Surface((32, 32), pygame.SRCALPHA, 32)
+        for rect in rects:
+            expected.fill(color, rect)
+        s1 = pygame.Surface((32, 32), pygame.SRCALPHA, 32)
+
+        self.assertIsNone(s1.fill_rects(color, rects))
+        self.assertEqual(pygame.image.tostring(s1, 'RGBA'),
+                         pygame.image.tostring(expected, 'RGBA'))
+
+        s1.fill_rects(color=(0, 0, 0, 0), rects=[])
+        self.assertEqual(s1.get_at((0, 0)), color)
+
+    def test_fill_rects__buffer(self):
+        """Ensure fill_rects() takes the rects as a buffer of ints."""
+        import array
+
+        color = (1, 2, 3, 255)
+        rects = [(1, 1, 2, 2), (-1, 5, 3, 1), (6, 6, 4, 4)]
+        expected = pygame.Surface((8, 8), 0, 32)
+        for rect in rects:
+            expected.fill(color, rect, pygame.BLEND_ADD)
+
+        for typecode in ('i', 'l', 'q'):
+            s1 = pygame.Surface((8, 8), 0, 32)
+
+            s1.fill_rects(color, array.array(typecode,
+                                             [v for r in rects for v in r]),
+                          pygame.BLEND_ADD)
+
+            self.assertEqual(pygame.image.tostring(s1, 'RGB'),
+                             pygame.image.tostring(expected, 'RGB'),
+                             typecode)
+
+        # read like Rect.collidelist reads them
+        with self.assertRaises(TypeError):
+            s1.fill_rects(color, array.array('i', [1, 2, 3]))
+        with self.assertRaises(ValueError):
+            s1.fill_rects(color, array.array('q', [1, 2, 2 ** 40, 4]))
+        with self.assertRaises(TypeError):
+            s1.fill_rects(color, array.array('d', [1, 2, 3, 4]))
+        with self.assertRaises(TypeError):
+            s1.fill_rects(color, array.array('h', [1, 2, 3, 4]))
+
+    def test_fill_rects__clip(self):
+        """Ensure fill_rects() keeps to the clip area with blend modes."""
+        s1 = pygame.Surface((10, 10), 0, 32)
+        s1.set_clip((2, 2, 4, 4))
+
+        s1.fill_rects((100, 100, 100), [(0, 0, 3, 3), (7, 7, 3, 3)],
+                      pygame.BLEND_ADD)
+
+        self.assertEqual(s1.get_at((2, 2)), (100, 100, 100, 255))
+        for pt in ((1, 1), (2, 3), (7, 7), (9, 9)):
+            self.assertEqual(s1.get_at(pt), (0, 0, 0, 255), pt)
+
+    def test_fill_rects__invalid_args(self):
+        """Ensure fill_rects() handles invalid args."""
+        s1 = pygame.Surface((4, 4), 0, 32)
+
+        self.assertRaises(TypeError, s1.fill_rects, 'red?', [(0, 0, 1, 1)])
+        self.assertRaises(TypeError, s1.fill_rects, (0, 0, 0), 5)
+        self.assertRaises(TypeError, s1.fill_rects, (0, 0, 0), [(0, 0)])
+
     ########################################################################
 
     def test_get_alpha(self):
@@ -511,6 +579,52 @@ class SurfaceTypeTest(AssertRaisesRegexMixin, unittest.TestCase):
         self.assertEqual(segaddr, s._pixels_address + s.get_bytesize() * 7)
         self.assertEqual(seglen, s.get_bytesize())
 
+    def test__pixels_version(self):
+        """Ensure the pixel version changes when the pixels may change."""
+        s = pygame.Surface((4, 4), pygame.SRCALPHA, 32)
+        other = pygame.Surface((4, 4), pygame.SRCALPHA, 32)
+        version = s._pixels_version
+
+        # reading or blitting from the surface leaves it alone
+        s.get_size()
+        other.blit(s, (0, 0))
+        self.assertEqual(s._pixels_version, version)
+
+        changes = [lambda: s.blit(other, (0, 0)),
+                   lambda: s.fill((1, 2, 3)),
+                   lambda: s.set_at((1, 1), (4, 5, 6)),
+                   lambda: s.set_colorkey((1, 2, 3)),
+                   lambda: s.set_alpha(128),
+                   lambda: (s.lock(), s.unlock())]
+        for change in changes:
+            change()
+            self.assertNotEqual(s._pixels_version, version)
+            version = s._pixels_version
+
+        # while locked, the pixels can change at any time
+        s.lock()
+        self.assertNotEqual(s._pixels_version, s._pixels_version)
+        s.unlock()
+        self.assertEqual(s._pixels_version, s._pixels_version)
+
+    def test__pixels_version__subsurface(self):
+        """Ensure a subsurface and its parent see each other's changes."""
+        parent = pygame.Surface((8, 8), pygame.SRCALPHA, 32)
+        sub = parent.subsurface((2, 2, 4, 4))
+        subsub = sub.subsurface((1, 1, 2, 2))
+        other = pygame.Surface((2, 2), pygame.SRCALPHA, 32)
+
+        changes = [lambda: sub.fill((1, 2, 3)),
+                   lambda: subsub.blit(other, (0, 0)),
+                   lambda: subsub.fill((4, 5, 6)),
+                   lambda: parent.fill((7, 8, 9)),
+                   lambda: parent.blit(other, (3, 3))]
+        for change in changes:
+            versions = [s._pixels_version for s in (parent, sub, subsub)]
+            change()
+            for s, version in zip((parent, sub, subsub), versions):
+                self.assertNotEqual(s._pixels_version, version)
+
     def test_set_colorkey(self):
 
         # __doc__ (as of 2008-06-25) for pygame.surface.Surface.set_colorkey:
@@ -2293,6 +2407,44 @@ class SurfaceBlendTest(unittest.TestCase):
                 dst.fill(fill_color, special_flags=getattr(pygame, blend_name))
                 self._assert_surface(dst, p, ", %s" % blend_name)
 
+    def test_fill_blend_backends(self):
+        """The SIMD blend fills give the same pixels as the generic ones."""
+        flags = (BLEND_ADD, BLEND_SUB, BLEND_MULT, BLEND_MIN, BLEND_MAX,
+                 BLEND_RGBA_ADD, BLEND_RGBA_SUB, BLEND_RGBA_MULT,
+                 BLEND_RGBA_MIN, BLEND_RGBA_MAX)
+
+        def fill_pixels(backend):
+            pygame.surface._set_blit_backend(backend)
+            pixels = []
+            for dst in destinations:
+                for flag in flags:
+                    surf = dst.copy()
+                    surf.fill_rects((90, 180, 30, 140),
+                                    [(x, x % 3, x + 1, 5) for x in range(9)],
+                                    flag)
+                    pixels.append(pygame.image.tostring(surf, 'RGBA'))
+            return pixels
+
+        destinations = [self._make_surface(32),
+                        self._make_surface(32, srcalpha=True),
+                        pygame.Surface((11, 7), 0, 32,
+                                       (0xFF, 0xFF00, 0xFF0000, 0xFF000000))]
+        for dst in destinations:
+            self._fill_surface(dst)
+
+        original_backend = pygame.surface._get_blit_backend()
+        try:
+            expected = fill_pixels('GENERIC')
+            for backend in ('SSE2', 'AVX2'):
+                try:
+                    pixels = fill_pixels(backend)
+                except ValueError:
+                    # not on this machine
+                    continue
+                self.assertEqual(pixels, expected, backend)
+        finally:
+            pygame.surface._set_blit_backend(original_backend)
+
 
 class SurfaceSelfBlitTest(unittest.TestCase):
     """Blit to self tests.
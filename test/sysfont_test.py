@@ -1,6 +1,24 @@
+import os
+import shutil
+import sys
+import tempfile
 import unittest
 import platform
 
+FAKE_FC = """#!/bin/sh
+basename "$0" >> "%(log)s"
+if [ "$1" = "--format" ]; then
+    shift 2
+else
+    set -- "%(fonts)s"/*
+fi
+for f in "$@"; do
+    name=`basename "$f" | sed 's/\\..*//'`
+    echo "$f: $name:Regular"
+done
+"""
+
+
 class SysfontModuleTest(unittest.TestCase):
     def todo_test_create_aliases(self):
         self.fail()
@@ -18,12 +36,150 @@ class SysfontModuleTest(unittest.TestCase):
         pygame.font.init()
         arial = pygame.font.SysFont('Arial', 40)
 
+    def test_sysfont__cache(self):
+        import pygame.font
+        made = []
+
+        def constructor(fontpath, size, bold, italic):
+            made.append((fontpath, size, bold, italic))
+            return object()
+
+        first = pygame.font.SysFont('Arial', 40, constructor=constructor,
+                                    cache=True)
+        again = pygame.font.SysFont('Arial', 40, constructor=constructor,
+                                    cache=True)
+        self.assertIs(first, again)
+        self.assertEqual(len(made), 1)
+
+        bold = pygame.font.SysFont('Arial', 40, True, constructor=constructor,
+                                   cache=True)
+        self.assertIsNot(bold, first)
+        uncached = pygame.font.SysFont('Arial', 40, constructor=constructor)
+        self.assertIsNot(uncached, first)
+        self.assertEqual(len(made), 3)
+
+    def test_sysfont__cache_quit(self):
+        """Ensure cached fonts are made again after a font.quit()."""
+        import pygame.font
+        made = []
+
+        def constructor(fontpath, size, bold, italic):
+            made.append((fontpath, size, bold, italic))
+            return object()
+
+        pygame.font.init()
+        first = pygame.font.SysFont('Arial', 40, constructor=constructor,
+                                    cache=True)
+
+        pygame.font.quit()
+        pygame.font.init()
+        again = pygame.font.SysFont('Arial', 40, constructor=constructor,
+                                    cache=True)
+
+        self.assertIsNot(again, first)
+        self.assertIs(pygame.font.SysFont('Arial', 40, constructor=constructor,
+                                          cache=True), again)
+        self.assertEqual(len(made), 2)
+
     def todo_test_initsysfonts_unix(self):
         self.fail()
 
     def todo_test_initsysfonts_win32(self):
         self.fail()
 
+
+@unittest.skipIf(sys.platform == 'win32', 'no fontconfig on windows')
+class SysfontIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.fonts = os.path.join(self.tmp, 'fonts')
+        self.log = os.path.join(self.tmp, 'log')
+        os.mkdir(self.fonts)
+        for name in ('Alpha.ttf', 'Beta.otf'):
+            open(os.path.join(self.fonts, name), 'w').close()
+        bin_dir = os.path.join(self.tmp, 'bin')
+        os.mkdir(bin_dir)
+        for tool in ('fc-list', 'fc-scan'):
+            path = os.path.join(bin_dir, tool)
+            with open(path, 'w') as f:
+                f.write(FAKE_FC % {'log': self.log, 'fonts': self.fonts})
+            os.chmod(path, 0o755)
+        self.fc_list = os.path.join(bin_dir, 'fc-list')
+        self.old_cache = os.environ.get('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = os.path.join(self.tmp, 'cache')
+
+    def tearDown(self):
+        if self.old_cache is None:
+            del os.environ['XDG_CACHE_HOME']
+        else:
+            os.environ['XDG_CACHE_HOME'] = self.old_cache
+        shutil.rmtree(self.tmp)
+
+    def runs(self):
+        """the fake fontconfig tools which were run, in order"""
+        if not os.path.exists(self.log):
+            return []
+        with open(self.log) as f:
+            return f.read().split()
+
+    def touch_fonts(self):
+        """make sure the font directory time changes"""
+        mtime = os.stat(self.fonts).st_mtime
+        os.utime(self.fonts, (mtime + 10, mtime + 10))
+
+    def test_initsysfonts_unix__index(self):
+        from pygame.sysfont import initsysfonts_unix
+
+        fonts = initsysfonts_unix(self.fc_list)
+        self.assertEqual(sorted(fonts), ['alpha', 'beta'])
+        self.assertEqual(self.runs(), ['fc-list'])
+        index = os.path.join(self.tmp, 'cache', 'pygame', 'sysfont.json')
+        self.assertTrue(os.path.exists(index))
+
+        # nothing changed, so the index is used without running fc-list
+        self.assertEqual(initsysfonts_unix(self.fc_list), fonts)
+        self.assertEqual(self.runs(), ['fc-list'])
+
+    def test_initsysfonts_unix__refresh(self):
+        from pygame.sysfont import initsysfonts_unix
+
+        initsysfonts_unix(self.fc_list)
+        self.assertEqual(self.runs(), ['fc-list'])
+
+        # only the new font is read, with fc-scan
+        open(os.path.join(self.fonts, 'Gamma.ttc'), 'w').close()
+        os.remove(os.path.join(self.fonts, 'Alpha.ttf'))
+        self.touch_fonts()
+        fonts = initsysfonts_unix(self.fc_list)
+        self.assertEqual(sorted(fonts), ['beta', 'gamma'])
+        self.assertEqual(self.runs(), ['fc-list', 'fc-scan'])
+
+        # a font in a new directory is found too
+        os.mkdir(os.path.join(self.fonts, 'more'))
+        open(os.path.join(self.fonts, 'more', 'Delta.ttf'), 'w').close()
+        self.touch_fonts()
+        fonts = initsysfonts_unix(self.fc_list)
+        self.assertEqual(sorted(fonts), ['beta', 'delta', 'gamma'])
+        self.assertEqual(initsysfonts_unix(self.fc_list), fonts)
+        self.assertEqual(self.runs(), ['fc-list', 'fc-scan', 'fc-scan'])
+
+    def test_initsysfonts_unix__other_fc_list(self):
+        from pygame.sysfont import initsysfonts_unix
+
+        initsysfonts_unix(self.fc_list)
+        self.assertEqual(initsysfonts_unix(os.path.join(self.tmp, 'none')),
+                         {})
+        self.assertEqual(sorted(initsysfonts_unix(self.fc_list)),
+                         ['alpha', 'beta'])
+        self.assertEqual(self.runs(), ['fc-list'])
+
+    def test_update_font_index(self):
+        import pygame.font
+        path = pygame.font.update_font_index()
+        if path is not None:
+            self.assertTrue(os.path.exists(path))
+            self.assertTrue(path.startswith(self.tmp))
+
 ################################################################################
 
 if __name__ == '__main__':
@@ -1,3 +1,7 @@
+import os
+import shutil
+import sys
+import tempfile
 import unittest
 from pygame.threads import FuncResult, tmap, WorkerQueue, Empty, STOP
 from pygame import threads
@@ -127,6 +131,42 @@ class ThreadsModuleTest(unittest.TestCase):
 
         self.assertEqual(tmapped, mapped)
 
+    def test_tmap__chunksize(self):
+        """Ensure the results keep their order, whatever the chunksize"""
+        data = list(xrange_(257))
+        expected = [x * 2 for x in data]
+        wq = WorkerQueue(4)
+
+        try:
+            for chunksize in (None, 1, 3, 64, 1000):
+                results = tmap(lambda x: x * 2, data, worker_queue=wq,
+                               chunksize=chunksize)
+                self.assertEqual(list(results), expected)
+
+            self.assertEqual(list(tmap(lambda x: x, [], worker_queue=wq)), [])
+            self.assertRaises(ValueError, tmap, abs, data, worker_queue=wq,
+                              chunksize=0)
+        finally:
+            wq.stop()
+
+    def test_tmap__errors(self):
+        """Ensure the first error is raised, or None is the result"""
+        def f(x):
+            if x % 10 == 3:
+                raise ValueError(x)
+            return x
+
+        try:
+            tmap(f, xrange_(100), num_workers=4, chunksize=7)
+        except ValueError:
+            self.assertEqual(sys.exc_info()[1].args, (3,))
+        else:
+            self.fail("no ValueError raised")
+
+        results = tmap(f, xrange_(100), num_workers=4, stop_on_error=False)
+        self.assertEqual(list(results),
+                         [None if x % 10 == 3 else x for x in xrange_(100)])
+
     def todo_test_tmap__None_func_and_multiple_sequences(self):
         """Using a None as func and multiple sequences"""
         self.fail()
@@ -169,6 +209,152 @@ class ThreadsModuleTest(unittest.TestCase):
 
         self.assertIs(fr.exception, exception)
 
+    def test_tuned_workers(self):
+        """Ensure the benchmark is only run again when asked for"""
+        runs = []
+
+        def benchmark_workers():
+            runs.append(1)
+            return 3
+
+        old_cache = os.environ.get('XDG_CACHE_HOME')
+        old_benchmark = threads.benchmark_workers
+        tmp = tempfile.mkdtemp()
+        os.environ['XDG_CACHE_HOME'] = tmp
+        threads.benchmark_workers = benchmark_workers
+        try:
+            self.assertEqual(threads.tuned_workers(), 3)
+            self.assertEqual(threads.tuned_workers(), 3)
+            self.assertEqual(len(runs), 1)
+            self.assertTrue(os.path.exists(
+                os.path.join(tmp, 'pygame', 'threads.json')))
+
+            self.assertEqual(threads.tuned_workers(retune=True), 3)
+            self.assertEqual(len(runs), 2)
+
+            threads.init()
+            self.assertEqual(len(threads._wq.pool), 3)
+            self.assertEqual(len(runs), 2)
+            threads.quit()
+        finally:
+            threads.benchmark_workers = old_benchmark
+            if old_cache is None:
+                del os.environ['XDG_CACHE_HOME']
+            else:
+                os.environ['XDG_CACHE_HOME'] = old_cache
+            shutil.rmtree(tmp)
+
+    def test_pmap(self):
+        """Ensure pmap works like map, keeping its pool until quit()"""
+        data = list(xrange_(-50, 50))
+
+        self.assertEqual(threads.pmap(abs, data, 2), list(map(abs, data)))
+        pool = threads._pool
+        self.assertEqual(threads.pmap(abs, data, 2, chunksize=1),
+                         list(map(abs, data)))
+        self.assertIs(threads._pool, pool)
+        self.assertRaises(ValueError, threads.pmap, abs, data, -1)
+
+        threads.quit()
+        self.assertIsNone(threads._pool)
+
+    def test_map_tiles(self):
+        """Ensure the tiles are put together as one surface"""
+        import pygame
+        from pygame.locals import SRCALPHA, BLEND_ADD
+
+        def brighten(tile):
+            result = tile.copy()
+            result.fill((10, 20, 30), None, BLEND_ADD)
+            return result
+
+        for flags in (0, SRCALPHA):
+            surf = pygame.Surface((37, 29), flags, 32)
+            for x in range(0, 37, 3):
+                surf.fill((x * 6, 255 - x * 6, x, 100 + x), (x, 0, 3, 29))
+            expected = brighten(surf)
+
+            for tile_size in (1, 8, (10, 3), 100):
+                dest = threads.map_tiles(brighten, surf, tile_size,
+                                         num_workers=4)
+                self.assertEqual(dest.get_size(), surf.get_size())
+                self.assertEqual(dest.get_flags() & SRCALPHA, flags)
+                self.assertEqual(pygame.image.tostring(dest, 'RGBA'),
+                                 pygame.image.tostring(expected, 'RGBA'))
+
+            # drawing on the tiles, with no workers
+            tiled = surf.copy()
+            dest = pygame.Surface(surf.get_size(), flags, 32)
+            result = threads.map_tiles(
+                lambda tile: tile.fill((10, 20, 30), None, BLEND_ADD) and None,
+                tiled, 8, dest, num_workers=0)
+            self.assertIs(result, dest)
+            self.assertEqual(pygame.image.tostring(tiled, 'RGBA'),
+                             pygame.image.tostring(expected, 'RGBA'))
+
+        surf = pygame.Surface((10, 10))
+        self.assertRaises(ValueError, threads.map_tiles, brighten, surf, 0)
+        self.assertRaises(ValueError, threads.map_tiles, brighten, surf,
+                          (4, -1))
+        self.assertRaises(ValueError, threads.map_tiles, brighten, surf, 4,
+                          pygame.Surface((5, 5)))
+
+
+@unittest.skipIf(threads.Future is None, "no concurrent.futures")
+class ExecutorTest(unittest.TestCase):
+    def test_submit(self):
+        """Ensure submit returns futures with the results or errors"""
+        with threads.Executor(4) as executor:
+            futures = [executor.submit(pow, x, 2) for x in xrange_(20)]
+            error = executor.submit(int, 'not a number')
+
+            self.assertEqual([f.result() for f in futures],
+                             [x * x for x in xrange_(20)])
+            self.assertIsInstance(error.exception(), ValueError)
+
+        self.assertRaises(RuntimeError, executor.submit, abs, 1)
+        for thread in executor._wq.pool:
+            self.assertFalse(thread.is_alive())
+
+    def test_map(self):
+        """Ensure map keeps the order, whatever the chunksize"""
+        with threads.Executor(3) as executor:
+            for chunksize in (1, 4, 100):
+                self.assertEqual(
+                    list(executor.map(pow, xrange_(50), [2] * 50,
+                                      chunksize=chunksize)),
+                    [x * x for x in xrange_(50)])
+            self.assertRaises(ValueError, executor.map, abs, [1], chunksize=0)
+            self.assertRaises(ValueError, list,
+                              executor.map(int, ['1', 'x', '3']))
+
+    def test_worker_queue(self):
+        """Ensure a WorkerQueue passed in is used, and not stopped"""
+        wq = WorkerQueue(2)
+        executor = threads.Executor(worker_queue=wq)
+        self.assertEqual(executor.submit(abs, -4).result(), 4)
+        executor.shutdown()
+        for thread in wq.pool:
+            self.assertTrue(thread.is_alive())
+        wq.stop()
+
+        self.assertRaises(ValueError, threads.Executor, 0)
+
+    def test_init_without_workers(self):
+        """Ensure calls still run when init() found no workers were best"""
+        old_tuned_workers = threads.tuned_workers
+        threads.tuned_workers = lambda retune=False: 0
+        try:
+            threads.init()
+            self.assertEqual(len(threads._wq.pool), 0)
+
+            with threads.Executor() as executor:
+                self.assertIsNot(executor._wq, threads._wq)
+                self.assertEqual(executor.submit(abs, -4).result(10), 4)
+        finally:
+            threads.quit()
+            threads.tuned_workers = old_tuned_workers
+
 
 ################################################################################
 
@@ -116,6 +116,58 @@ class TransformModuleTest( unittest.TestCase ):
         # the wrong size surface is past in.  Should raise an error.
         self.assertRaises(ValueError, pygame.transform.smoothscale, s, (33,64), s3)
 
+    def test_smoothscale__threads(self):
+        """ see if scaling in bands gives the same pixels as one thread.
+        """
+        s = pygame.Surface((37, 29), 0, 32)
+        for y in range(29):
+            for x in range(37):
+                s.set_at((x, y), ((x * 7) % 256, (y * 11) % 256,
+                                  (x * y) % 256))
+        for size in ((80, 61), (12, 9), (80, 9), (12, 61)):
+            expected = pygame.image.tostring(
+                pygame.transform.smoothscale(s, size), 'RGBX')
+            for threads in (2, 3, 0):
+                scaled = pygame.transform.smoothscale(s, size,
+                                                      threads=threads)
+                self.assertEqual(pygame.image.tostring(scaled, 'RGBX'),
+                                 expected)
+
+        dest = pygame.Surface((80, 61), 0, 32)
+        self.assertIs(pygame.transform.smoothscale(surface=s, size=(80, 61),
+                                                   dest_surface=dest,
+                                                   threads=2),
+                      dest)
+        self.assertRaises(ValueError, pygame.transform.smoothscale, s,
+                          (80, 61), threads=-1)
+
+    def test_smoothscale__backends(self):
+        """ see if every backend gives the same pixels as 'GENERIC'.
+        """
+        s = pygame.Surface((53, 41), 0, 24)
+        for y in range(41):
+            for x in range(53):
+                s.set_at((x, y), ((x * 5) % 256, (y * 13) % 256,
+                                  (x * y * 3) % 256))
+        sizes = ((101, 77), (20, 15), (101, 15), (20, 77), (1, 1))
+        original_type = pygame.transform.get_smoothscale_backend()
+        try:
+            pygame.transform.set_smoothscale_backend('GENERIC')
+            expected = [pygame.image.tostring(
+                            pygame.transform.smoothscale(s, size), 'RGB')
+                        for size in sizes]
+            for backend in ('AVX2',):
+                try:
+                    pygame.transform.set_smoothscale_backend(backend)
+                except ValueError:
+                    continue
+                for size, pixels in zip(sizes, expected):
+                    scaled = pygame.transform.smoothscale(s, size)
+                    self.assertEqual(pygame.image.tostring(scaled, 'RGB'),
+                                     pixels)
+        finally:
+            pygame.transform.set_smoothscale_backend(original_type)
+
     def test_scale__zero_surface_transform(self):
         tmp_surface = pygame.transform.scale(pygame.Surface((128, 128)), (0, 0))
         self.assertEqual(tmp_surface.get_size(), (0, 0))
@@ -518,6 +570,33 @@ class TransformModuleTest( unittest.TestCase ):
 
         ################################################################
 
+    def test_threshold__formats(self):
+        """ see if every pixel format is compared by its colors.
+        """
+        for depth in (8, 16, 24, 32):
+            s = pygame.Surface((21, 5), 0, depth)
+            s.fill((200, 100, 0))
+            s.fill((0, 0, 255), (0, 0, 10, 5))
+            dest = pygame.Surface((21, 5), 0, depth)
+            dest.fill((0, 255, 0))
+
+            num = pygame.transform.threshold(None, s, s.get_at((0, 0)),
+                                             (8, 8, 8), None, 0)
+            self.assertEqual(num, 50)
+            num = pygame.transform.threshold(dest, s, s.get_at((20, 0)),
+                                             (8, 8, 8), (0, 0, 0))
+            self.assertEqual(num, 55)
+            self.assertEqual(dest.get_at((9, 4)), (0, 0, 0, 255))
+            self.assertEqual(dest.get_at((10, 0)), (0, 255, 0, 255))
+
+            # against another surface, setting the pixels from it
+            search = s.copy()
+            search.fill((0, 255, 0), (0, 0, 21, 2))
+            num = pygame.transform.threshold(dest, s, None, (8, 8, 8), None,
+                                             2, search, True)
+            self.assertEqual(num, 63)
+            self.assertEqual(dest.get_at((20, 4)), s.get_at((20, 4)))
+
     def test_threshold_set_behavior2(self):
         """ raises an error when set_behavior=2 and set_color is not None.
         """
@@ -746,6 +825,164 @@ class TransformModuleTest( unittest.TestCase ):
         self.assertEqual(s2.get_at((0,31)), (255,0,0,255))
         self.assertEqual(s2.get_at((31,31)), (255,0,0,255))
 
+    def _filter_surface(self, size, depth):
+        s = pygame.Surface(size, 0, depth)
+        for y in range(size[1]):
+            for x in range(size[0]):
+                s.set_at((x, y), ((x * 9) % 256, (y * 17) % 256,
+                                  (x * y * 5) % 256))
+        return s
+
+    def test_box_blur(self):
+        """ see if box_blur averages the pixels around each pixel.
+        """
+        s = pygame.Surface((20, 10), 0, 32)
+        s.fill((30, 60, 90))
+        for repeat in (True, False):
+            blurred = pygame.transform.box_blur(s, 3, repeat)
+            self.assertEqual(blurred.get_size(), (20, 10))
+            self.assertEqual(blurred.get_at((10, 5)), (30, 60, 90, 255))
+        # at the edge only the pixels inside count when repeating edges
+        self.assertEqual(pygame.transform.box_blur(s, 3).get_at((0, 0)),
+                         (30, 60, 90, 255))
+
+        # a single white pixel is spread over a 3x3 square
+        s.fill((0, 0, 0))
+        s.set_at((10, 5), (90, 90, 90))
+        blurred = pygame.transform.box_blur(s, 1)
+        self.assertEqual(blurred.get_at((9, 4)), (10, 10, 10, 255))
+        self.assertEqual(blurred.get_at((11, 6)), (10, 10, 10, 255))
+        self.assertEqual(blurred.get_at((12, 5)), (0, 0, 0, 255))
+
+        # radius 0 gives a copy
+        s = self._filter_surface((13, 7), 24)
+        self.assertEqual(
+            pygame.image.tostring(pygame.transform.box_blur(s, 0), 'RGB'),
+            pygame.image.tostring(s, 'RGB'))
+
+    def test_gaussian_blur(self):
+        """ see if gaussian_blur keeps a flat color and spreads a dot.
+        """
+        s = pygame.Surface((20, 10), 0, 24)
+        s.fill((200, 100, 50))
+        blurred = pygame.transform.gaussian_blur(s, 4)
+        for pos in ((0, 0), (10, 5), (19, 9)):
+            self.assertEqual(blurred.get_at(pos), (200, 100, 50, 255))
+
+        s.fill((0, 0, 0))
+        s.set_at((10, 5), (255, 255, 255))
+        blurred = pygame.transform.gaussian_blur(s, 2)
+        center = blurred.get_at((10, 5))[0]
+        near = blurred.get_at((11, 5))[0]
+        far = blurred.get_at((12, 5))[0]
+        self.assertTrue(255 > center > near > far > 0)
+        self.assertEqual(blurred.get_at((11, 5)), blurred.get_at((9, 5)))
+        self.assertEqual(blurred.get_at((10, 6)), blurred.get_at((10, 4)))
+        self.assertEqual(blurred.get_at((14, 5)), (0, 0, 0, 255))
+
+    def test_blur__threads_and_dest_surface(self):
+        """ see if threads and dest_surface give the same pixels.
+        """
+        for depth in (24, 32):
+            s = self._filter_surface((31, 23), depth)
+            for blur in (pygame.transform.box_blur,
+                         pygame.transform.gaussian_blur):
+                expected = pygame.image.tostring(blur(s, 3), 'RGB')
+                for threads in (2, 3, 0):
+                    self.assertEqual(
+                        pygame.image.tostring(blur(s, 3, threads=threads),
+                                              'RGB'),
+                        expected)
+                dest = pygame.Surface((31, 23), 0, s)
+                self.assertIs(blur(surface=s, radius=3, dest_surface=dest),
+                              dest)
+                self.assertEqual(pygame.image.tostring(dest, 'RGB'),
+                                 expected)
+                # the source can also be the destination
+                copy = s.copy()
+                blur(copy, 3, dest_surface=copy)
+                self.assertEqual(pygame.image.tostring(copy, 'RGB'),
+                                 expected)
+
+    def test_blur__errors(self):
+        """ see if bad arguments raise errors.
+        """
+        s = pygame.Surface((10, 10), 0, 32)
+        for blur in (pygame.transform.box_blur,
+                     pygame.transform.gaussian_blur):
+            self.assertRaises(ValueError, blur, s, -1)
+            self.assertRaises(ValueError, blur, s, 1, threads=-1)
+            self.assertRaises(ValueError, blur, pygame.Surface((10, 10), 0, 8),
+                              1)
+            self.assertRaises(ValueError, blur, s, 1,
+                              dest_surface=pygame.Surface((9, 10), 0, 32))
+            self.assertRaises(ValueError, blur, s, 1,
+                              dest_surface=pygame.Surface((10, 10), 0, 24))
+        # the weights of a gaussian blur run out of bits
+        self.assertRaises(ValueError, pygame.transform.gaussian_blur, s,
+                          16383)
+        self.assertRaises(ValueError, pygame.transform.gaussian_blur, s,
+                          65535)
+        self.assertEqual(pygame.transform.box_blur(s, 65535).get_size(),
+                         (10, 10))
+
+    def test_filters__empty_surface(self):
+        """ see if surfaces without pixels are filtered.
+        """
+        filters = [lambda s, **kw: pygame.transform.box_blur(s, 3, **kw),
+                   lambda s, **kw: pygame.transform.gaussian_blur(s, 3, **kw),
+                   lambda s, **kw: pygame.transform.convolve(s, [[1, 2, 1]],
+                                                             **kw),
+                   lambda s, **kw: pygame.transform.convolve(
+                       s, [[1, 0], [0, 1]], **kw)]
+        for size in ((0, 10), (10, 0), (0, 0)):
+            s = pygame.Surface(size, 0, 32)
+            for f in filters:
+                self.assertEqual(f(s).get_size(), size)
+                self.assertEqual(f(s, threads=4).get_size(), size)
+                self.assertIs(f(s, dest_surface=s), s)
+
+    def test_convolve(self):
+        """ see if convolve weights the pixels around each pixel.
+        """
+        s = self._filter_surface((17, 11), 32)
+        pixels = pygame.image.tostring(s, 'RGB')
+        self.assertEqual(
+            pygame.image.tostring(pygame.transform.convolve(s, [[1]]), 'RGB'),
+            pixels)
+        self.assertEqual(
+            pygame.image.tostring(
+                pygame.transform.convolve(s, [[0, 0, 0], [0, 1, 0], [0, 0, 0]],
+                                          threads=2),
+                'RGB'),
+            pixels)
+
+        # sharpening a flat color leaves it alone
+        flat = pygame.Surface((12, 12), 0, 24)
+        flat.fill((50, 100, 150))
+        sharp = pygame.transform.convolve(flat, [[0, -1, 0], [-1, 5, -1],
+                                                 [0, -1, 0]])
+        for pos in ((0, 0), (6, 6), (11, 11)):
+            self.assertEqual(sharp.get_at(pos), (50, 100, 150, 255))
+
+        # a kernel taking the pixel to the left, results are clamped to 0
+        shifted = pygame.transform.convolve(s, [[1, 0, 0]])
+        self.assertEqual(shifted.get_at((5, 3)), s.get_at((4, 3)))
+        edges = pygame.transform.convolve(s, [[1, 0, -1]], False)
+        self.assertEqual(edges.get_at((0, 0))[:3], (0, 0, 0))
+
+        # a box kernel is done in two passes, like box_blur
+        self.assertEqual(
+            pygame.image.tostring(
+                pygame.transform.convolve(s, [[1 / 9.0] * 3] * 3), 'RGB'),
+            pygame.image.tostring(pygame.transform.box_blur(s, 1), 'RGB'))
+
+        self.assertRaises(ValueError, pygame.transform.convolve, s, [])
+        self.assertRaises(ValueError, pygame.transform.convolve, s,
+                          [[1, 2], [3]])
+        self.assertRaises(ValueError, pygame.transform.convolve, s, [[1e9]])
+        self.assertRaises(TypeError, pygame.transform.convolve, s, [['a']])
+
     def test_average_surfaces(self):
         """
         """
@@ -865,6 +1102,43 @@ class TransformModuleTest( unittest.TestCase ):
             self.assertEqual(pygame.transform.average_color(s),(5,75,150,0))
             self.assertEqual(pygame.transform.average_color(s, (16,0,16,32)), (0,100,200,0))
 
+    def test_average_color__rects(self):
+        """ see if many regions can be averaged in one call.
+        """
+        for i in (8, 16, 24, 32):
+            s = pygame.Surface((32, 32), 0, i)
+            s.fill((0, 0, 255))
+            s.fill((255, 0, 0), (0, 0, 16, 32))
+            left = pygame.transform.average_color(s, (0, 0, 16, 32))
+            right = pygame.transform.average_color(s, (16, 0, 16, 32))
+            # 16 bit colors lose their low bits
+            self.assertEqual(left[1:3], (0, 0))
+            self.assertEqual(right[:2], (0, 0))
+            self.assertTrue(left[0] >= 248 and right[2] >= 248)
+
+            rects = [(0, 0, 16, 32), pygame.Rect(16, 0, 16, 32),
+                     (8, 0, 16, 32), (-16, -16, 32, 32)]
+            colors = pygame.transform.average_color(s, rects=rects)
+            self.assertEqual(colors,
+                             [pygame.transform.average_color(s, rect)
+                              for rect in rects])
+            self.assertEqual(colors[3], left)
+
+        # regions with no pixels in the surface
+        self.assertEqual(pygame.transform.average_color(s, (40, 40, 5, 5)),
+                         (0, 0, 0, 0))
+        self.assertEqual(
+            pygame.transform.average_color(s, rects=[(0, 0, 0, 0)]),
+            [(0, 0, 0, 0)])
+        self.assertEqual(pygame.transform.average_color(s, rects=[]), [])
+
+        self.assertRaises(TypeError, pygame.transform.average_color, s,
+                          rects=[(0, 0, 1)])
+        self.assertRaises(TypeError, pygame.transform.average_color, s,
+                          rects=5)
+        self.assertRaises(TypeError, pygame.transform.average_color, s,
+                          (0, 0, 1, 1), [(0, 0, 1, 1)])
+
     def todo_test_rotate(self):
 
         # __doc__ (as of 2008-06-25) for pygame.transform.rotate:
@@ -912,9 +1186,82 @@ class TransformModuleTest( unittest.TestCase ):
         s2 = pygame.transform.scale2x(s)
         self.assertEqual(s2.get_rect().size, (64, 64))
 
+    def test_scale3x(self):
+        """ see if scale3x triples the size and smooths a diagonal.
+        """
+        for depth in (8, 16, 24, 32):
+            s = pygame.Surface((3, 3), 0, depth)
+            s.fill((0, 0, 0))
+            s.set_at((0, 0), (255, 255, 255))
+            s.set_at((1, 1), (255, 255, 255))
+            s.set_at((2, 2), (255, 255, 255))
+
+            s3 = pygame.transform.scale3x(s)
+            self.assertEqual(s3.get_size(), (9, 9))
+            white = s3.get_at((4, 4))
+            self.assertEqual(white[:3], (255, 255, 255))
+            # the corners of the middle block next to the line are filled in
+            self.assertEqual(s3.get_at((5, 3)), white)
+            self.assertEqual(s3.get_at((3, 5)), white)
+            self.assertEqual(s3.get_at((3, 3)), white)
+            self.assertNotEqual(s3.get_at((6, 3)), white)
+
+            dest = pygame.Surface((9, 9), 0, s)
+            self.assertIs(pygame.transform.scale3x(s, dest), dest)
+            self.assertEqual(pygame.image.tostring(dest, 'RGB'),
+                             pygame.image.tostring(s3, 'RGB'))
+            self.assertRaises(ValueError, pygame.transform.scale3x, s,
+                              pygame.Surface((6, 6), 0, s))
+
+    def test_scale__whole_numbers(self):
+        """ see if scaling up by whole numbers copies each pixel.
+        """
+        for depth in (8, 16, 24, 32):
+            s = pygame.Surface((7, 3), 0, depth)
+            for y in range(3):
+                for x in range(7):
+                    s.set_at((x, y), ((x * 40) % 256, y * 100, 50))
+            for xscale, yscale in ((1, 1), (2, 2), (3, 5), (6, 1), (9, 4)):
+                scaled = pygame.transform.scale(s, (7 * xscale, 3 * yscale))
+                for y in range(3 * yscale):
+                    for x in range(7 * xscale):
+                        self.assertEqual(scaled.get_at((x, y)),
+                                         s.get_at((x // xscale, y // yscale)))
+
+    def test_scale_by(self):
+        """ see if scale_by scales by a factor or a pair of factors.
+        """
+        s = pygame.Surface((10, 6), 0, 32)
+        s.fill((10, 20, 30))
+        s.set_at((9, 5), (200, 100, 0))
+
+        scaled = pygame.transform.scale_by(s, 4)
+        self.assertEqual(scaled.get_size(), (40, 24))
+        self.assertEqual(scaled.get_at((39, 23)), (200, 100, 0, 255))
+        self.assertEqual(scaled.get_at((35, 19)), (10, 20, 30, 255))
+        self.assertEqual(
+            pygame.image.tostring(scaled, 'RGB'),
+            pygame.image.tostring(pygame.transform.scale(s, (40, 24)), 'RGB'))
+
+        self.assertEqual(pygame.transform.scale_by(s, (2, 0.5)).get_size(),
+                         (20, 3))
+        self.assertEqual(pygame.transform.scale_by(s, 1.5).get_size(), (15, 9))
+        self.assertEqual(pygame.transform.scale_by(s, 0).get_size(), (0, 0))
+
+        dest = pygame.Surface((30, 18), 0, s)
+        self.assertIs(pygame.transform.scale_by(surface=s, factor=3,
+                                                dest_surface=dest),
+                      dest)
+        self.assertEqual(dest.get_at((29, 17)), (200, 100, 0, 255))
+
+        self.assertRaises(ValueError, pygame.transform.scale_by, s, -1)
+        self.assertRaises(ValueError, pygame.transform.scale_by, s, 2, dest)
+        self.assertRaises(TypeError, pygame.transform.scale_by, s, 'x')
+        self.assertRaises(TypeError, pygame.transform.scale_by, s, (1, 2, 3))
+
     def test_get_smoothscale_backend(self):
         filter_type = pygame.transform.get_smoothscale_backend()
-        self.assertTrue(filter_type in ['GENERIC', 'MMX', 'SSE'])
+        self.assertTrue(filter_type in ['GENERIC', 'MMX', 'SSE', 'AVX2'])
         # It would be nice to test if a non-generic type corresponds to an x86
         # processor. But there is no simple test for this. platform.machine()
         # returns process version specific information, like 'i686'.
@@ -1092,5 +1439,155 @@ class TransformDisplayModuleTest(unittest.TestCase):
         self.assertEqual(surf2.get_at((0, 0)), (255, 0, 0, 255))
 
 
+class RotationCacheTest(unittest.TestCase):
+
+    def _sprite(self):
+        surf = pygame.Surface((20, 12), SRCALPHA, 32)
+        surf.fill((255, 0, 0, 255), (0, 0, 10, 12))
+        surf.fill((0, 0, 255, 128), (10, 0, 10, 12))
+        return surf
+
+    def test_rotate(self):
+        """ see if results are reused and match transform.rotate.
+        """
+        cache = pygame.transform.RotationCache(angle_step=5)
+        surf = self._sprite()
+
+        # locking the source outside the cache counts as a change
+        expected = pygame.transform.rotate(surf, 40)
+        first = cache.rotate(surf, 42)
+        self.assertEqual(first.get_size(), expected.get_size())
+        self.assertEqual(pygame.image.tostring(first, 'RGBA'),
+                         pygame.image.tostring(expected, 'RGBA'))
+        self.assertIs(cache.rotate(surf, 38), first)
+        self.assertIs(cache.rotate(surf, 400), first)
+        self.assertIsNot(cache.rotate(surf, 45), first)
+        zoomed = cache.rotozoom(surf, 40, 2)
+        self.assertIsNot(zoomed, first)
+        self.assertIs(cache.rotozoom(surf, 40, 2.0), zoomed)
+
+        stats = cache.get_stats()
+        self.assertEqual(stats['hits'], 3)
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['entries'], 3)
+        self.assertEqual(len(cache), 3)
+
+    def test_invalidate(self):
+        """ see if changing or deleting a source drops its results.
+        """
+        cache = pygame.transform.RotationCache()
+        surf = self._sprite()
+        other = self._sprite()
+
+        first = cache.rotate(surf, 30)
+        surf.fill((0, 255, 0, 255), (0, 0, 2, 2))
+        second = cache.rotate(surf, 30)
+        self.assertIsNot(second, first)
+        self.assertEqual(cache.invalidations, 1)
+        self.assertIs(cache.rotate(surf, 30), second)
+
+        # a change through a subsurface, or to the colorkey, counts too
+        surf.subsurface((2, 2, 2, 2)).fill((0, 0, 255, 255))
+        third = cache.rotate(surf, 30)
+        self.assertIsNot(third, second)
+        surf.set_colorkey((0, 0, 255))
+        self.assertIsNot(cache.rotate(surf, 30), third)
+        self.assertEqual(cache.invalidations, 3)
+        second = cache.rotate(surf, 30)
+
+        cache.rotate(other, 30)
+        cache.invalidate(surf)
+        self.assertEqual(len(cache), 1)
+        self.assertIsNot(cache.rotate(surf, 30), second)
+
+        del surf
+        self.assertEqual(len(cache), 1)
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.bytes, 0)
+
+        unchecked = pygame.transform.RotationCache(check_source=False)
+        first = unchecked.rotate(other, 30)
+        other.fill((0, 0, 0, 0))
+        self.assertIs(unchecked.rotate(other, 30), first)
+
+    def test_invalidate__dest_surface(self):
+        """ see if a transform drawing into a source counts as a change.
+        """
+        cache = pygame.transform.RotationCache()
+        surf = self._sprite()
+        other = self._sprite()
+        other.fill((0, 255, 0, 255))
+        small = pygame.Surface((10, 6), SRCALPHA, 32)
+        transform = pygame.transform
+        writers = [
+            lambda: transform.scale(other, (20, 12), surf),
+            lambda: transform.smoothscale(other, (20, 12), surf),
+            lambda: transform.scale2x(small, surf),
+            lambda: transform.laplacian(other, surf),
+            lambda: transform.average_surfaces([other, other], surf),
+            lambda: transform.box_blur(other, 1, True, surf),
+            lambda: transform.gaussian_blur(other, 1, True, surf),
+            lambda: transform.convolve(other, [[1]], True, surf),
+        ]
+
+        for write in writers:
+            first = cache.rotate(surf, 30)
+            write()
+            self.assertIsNot(cache.rotate(surf, 30), first)
+
+    def test_max_bytes(self):
+        """ see if the least recently used results are dropped first.
+        """
+        surf = self._sprite()
+        size = pygame.transform.rotate(surf, 90).get_pitch() * 20
+        cache = pygame.transform.RotationCache(max_bytes=size * 2)
+
+        first = cache.rotate(surf, 90)
+        cache.rotate(surf, 270)
+        cache.rotate(surf, 90)
+        cache.rotate(surf, 180)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.bytes, size * 2)
+        self.assertIs(cache.rotate(surf, 90), first)
+
+        cache = pygame.transform.RotationCache(max_bytes=size - 1)
+        cache.rotate(surf, 90)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.bytes, 0)
+
+        self.assertRaises(ValueError, pygame.transform.RotationCache, -1)
+        for angle_step in (0, -1, 361, float('nan')):
+            self.assertRaises(ValueError, pygame.transform.RotationCache,
+                              angle_step=angle_step)
+
+    def test_rotation_atlas(self):
+        """ see if the atlas holds each angle, centered in its cell.
+        """
+        surf = self._sprite()
+        atlas, rects = pygame.transform.rotation_atlas(surf, 8)
+
+        self.assertEqual(len(rects), 8)
+        self.assertEqual(atlas.get_flags() & SRCALPHA, SRCALPHA)
+        cell_w = atlas.get_width() // 3
+        cell_h = atlas.get_height() // 3
+        for i, rect in enumerate(rects):
+            image = pygame.transform.rotate(surf, i * 45)
+            self.assertEqual(rect.size, image.get_size())
+            self.assertEqual(rect.center,
+                             ((i % 3) * cell_w + cell_w // 2,
+                              (i // 3) * cell_h + cell_h // 2))
+            self.assertEqual(
+                pygame.image.tostring(atlas.subsurface(rect), 'RGBA'),
+                pygame.image.tostring(image, 'RGBA'))
+
+        atlas, rects = pygame.transform.rotation_atlas(surf, 3, scale=0.5,
+                                                       columns=1)
+        self.assertEqual(len(rects), 3)
+        self.assertEqual(atlas.get_width(), max(r.w for r in rects))
+        self.assertRaises(ValueError, pygame.transform.rotation_atlas,
+                          surf, 0)
+
+
 if __name__ == '__main__':
     unittest.main()